@@ -26,364 +26,291 @@ import sys
 import os
 import datetime
 
+import controls
+import gfs_io
+import geometry
+
 GFS_dir = os.environ['SWIFT_GFS']
 
+# fields read by main, used by the plot.py scheduler to load (and derive) them before the
+# plotting job runs. Each entry is a variable followed by its levels, in hPa ("lev" is the level
+# main is called with, "lev+1" the next level index, "low:high" all levels in between) or as
+# integer level indices. Single level fields have no levels.
+
+requires = {"fields": [["PWAT_P0_L200_GLL0"]],
+            "derived": []}
+
+# names of the images main writes (without .png), used by the plot.py job ledger (see ledger.py)
+# to find the frames already plotted: the analysis image (None if main does not plot the analysis)
+# and the forecast images. {region}, {init}, {valid}, {lev} and {lead} are the region, the
+# initialisation and valid times (YYYYMMDDHH), the level main is called with and the lead time.
+
+images = {"analysis": "GFSanalysis_{region}_{init}_PWAT_SNGL",
+          "forecast": "GFSforecast_{region}_{valid}_PWAT_SNGL_{init}_{lead:03d}"}
+
 # Main script to plot PWAT
 
-# define directory
+def main(init_dt, lev_hPa, latbl, lonbl, lattr, lontr):
 
-diri = (os.getcwd())+"/"
+   # define directory
 
-# forecast times (currently set to plot 0 to 48 hours)
+   diri = (os.getcwd())+"/"
 
-fore = (os.popen("cat %s/controls/namelist | grep 'fore:' | awk -F: '{print $2}' | tr ',' ' '"%(GFS_dir))).read().split()
-fore = [np.int(f) for f in fore]
+   # forecast times (currently set to plot 0 to 48 hours)
 
-# accept initialisation time and dates as an argument
+   fore = controls.forecast_times(GFS_dir)
 
-init_dt = (sys.argv[1])
+   # accept initialisation time and dates as an argument
 
-# read in domains and accept lat and lon limits as arguments
+   init_dt = str(init_dt)
 
-b = open(GFS_dir+"/controls/domains")
-domains_content = b.readlines()
+   # read in domains and accept lat and lon limits as arguments
 
-key_list = []
-latlon_list = []
+   domains_dict = controls.read_domains(GFS_dir+"/controls/domains")
 
-for domain in domains_content:
-   key_list.append(domain.split(":")[0])
-   latlon_str = (domain.split(":")[1]).strip().split(",")
-   latlon_flt = []
-   for ll in latlon_str:
-      latlon_flt.append(float(ll))
-   latlon_list.append(latlon_flt)
-   del(latlon_flt)
+   latbl = float(latbl)
+   lonbl = float(lonbl)
+   lattr = float(lattr)
+   lontr = float(lontr)
 
-domains_dict = dict(zip(key_list,latlon_list))
+   region = "unnamedregion"
 
-latbl = float(sys.argv[3])
-lonbl = float(sys.argv[4])
-lattr = float(sys.argv[5])
-lontr = float(sys.argv[6])
+   for domain in domains_dict.keys():
+      if ((latbl == domains_dict[domain][0] and lattr == domains_dict[domain][2]) or (latbl == domains_dict[domain][2] or lattr == domains_dict[domain][0])) and ((lonbl == domains_dict[domain][1] and lontr == domains_dict[domain][3]) or (lonbl == domains_dict[domain][3] and lontr == domains_dict[domain][1])):
+         region = domain
 
-region = "unnamedregion"
+   # arrange lat and lon values to get bottom left and top right lat lon values
 
-for domain in domains_dict.keys():
-   if ((latbl == domains_dict[domain][0] and lattr == domains_dict[domain][2]) or (latbl == domains_dict[domain][2] or lattr == domains_dict[domain][0])) and ((lonbl == domains_dict[domain][1] and lontr == domains_dict[domain][3]) or (lonbl == domains_dict[domain][3] and lontr == domains_dict[domain][1])):
-      region = domain
+   if latbl == lattr or lonbl == lontr:
+      sys.exit('lat and lon values must be different')
+   else:
+      if latbl < lattr:
+         latbl, lattr = lattr, latbl
+      if lonbl > lontr:
+         lonbl, lontr = lontr, lonbl
 
-# arrange lat and lon values to get bottom left and top right lat lon values
+   # read in analysis files
 
-if latbl == lattr or lonbl == lontr:
-   sys.exit('lat and lon values must be different')
-else:
-   if latbl < lattr:
-      latbl, lattr = lattr, latbl
-   if lonbl > lontr:
-      lonbl, lontr = lontr, lonbl
+   a_fili = "analysis_gfs_4_%s_%s00_000.nc" % (init_dt[:8], init_dt[8:10])
+   analysis = gfs_io.open_file(diri+a_fili, region)
 
-# read in analysis files
- 
-a_fili = "analysis_gfs_4_%s_%s00_000.nc" % (init_dt[:8], init_dt[8:10])
-analysis = nio.open_file(diri+a_fili)
+   # read in lat and lon of the region from the region geometry cache (for boxes crossing the
+   # Greenwich Meridian lonbl and lontr are swapped and lon values run from -180 to 180)
 
-# read in lat
+   geom = geometry.region(analysis, latbl, lonbl, lattr, lontr)
 
-lat1 = analysis.variables["lat_0"]
-lat_temp = lat1[:]
+   lonbl, lontr = geom.lonbl, geom.lontr
+   lat = geom.lat
+   lon = geom.lon
 
-latbl_idx = (np.abs(lat_temp-latbl)).argmin()
-lattr_idx = (np.abs(lat_temp-lattr)).argmin()
+   # read in PWAT.
 
-if latbl_idx == lattr_idx:
-   sys.exit('lat values are not different enough, they must have relate to different grid points')
-elif latbl_idx > 1 and lattr_idx < len(lat_temp)-2:
-   lat_box1 = latbl_idx-2
-   lat_box2 = lattr_idx+2
-   lat = lat_temp[lat_box1:lat_box2]
-else:
-   lat_box1 = latbl_idx
-   lat_box2 = lattr_idx
-   lat = lat_temp[lat_box1:lat_box2]
+   PWAT = geometry.cut(analysis.variables["PWAT_P0_L200_GLL0"], geom)
 
-del(latbl_idx)
-del(lattr_idx)
-del(lat1)
-del(lat_temp)
+   # 2d lat and lon
 
-# read in lon 
-lon1 = analysis.variables["lon_0"]
+   lat2d = geom.lat2d
+   lon2d = geom.lon2d
 
-# check to see if box crosses Greenwich Meridian. If so then the lon values must be modified for plot to work.
+   # analysis plot, only the forecast plots are made when a forecast lead time is streamed
+   # (see controls.analysis_plotted)
 
-if (np.sign(lonbl) + np.sign(lontr)) >= -1 and (np.sign(lonbl) + np.sign(lontr)) <= 1:
+   if controls.analysis_plotted():
 
-   lonbl, lontr = lontr, lonbl
+      # open workspace for analysis plot
 
-   lon_temp = np.where(lon1[:]>=180.0, lon1[:]-360.0, lon1[:])
+      wks_type = "png"
+      wks = ngl.open_wks(wks_type, "GFSanalysis_%s_%s_PWAT_SNGL" % (region, init_dt[0:10]))
 
-   lonbl_idx = (np.abs(lon_temp-lonbl)).argmin()
-   lontr_idx = (np.abs(lon_temp-lontr)).argmin()
+      # define resources for analysis plot
 
-   if lonbl_idx == lontr_idx:
-      sys.exit('lon values are not different enough, they must have relate to different grid points')
-   elif lontr_idx > len(lon_temp)/2 and lonbl_idx <= len(lon_temp)/2:
-      lon_box1 = lonbl_idx+2
-      lon_box2 = lontr_idx-2
-      lon_box3 = len(lon_temp)-1
+      res = ngl.Resources()
+      res.nglDraw  = False
+      res.nglFrame = False
 
-      lon_temp1 = lon_temp[0:lon_box1]
-      lon_temp2 = lon_temp[lon_box2:lon_box3]
-   else:
-      lon_box1 = lonbl_idx
-      lon_box2 = lontr_idx
-      lon_box3 = len(lon_temp)-1
+      cmap = ngl.read_colormap_file("WhiteBlueGreenYellowRed")
 
-      lon_temp1 = lon_temp[0:lon_box1]
-      lon_temp2 = lon_temp[lon_box2:lon_box3]
+      res.mpGridAndLimbOn        = False
+      res.pmTickMarkDisplayMode = "Never"
 
+      res.cnInfoLabelOn              = False
+      res.cnFillOn                   = True
+      res.cnFillPalette              = cmap[::-1]
+      res.cnLineLabelsOn             = False
+      res.cnLinesOn                  = False
+      res.cnMonoLineLabelFontColor   = True
 
-   lon = np.append(lon_temp2, lon_temp1)
+      res.lbAutoManage          = False
+      res.lbLabelFontHeightF         = 0.005
+      res.lbOrientation              = "horizontal"
+      res.lbLabelAngleF              = 45
+      res.pmLabelBarOrthogonalPosF = -1.
+      res.pmLabelBarParallelPosF = 0.25
+      res.pmLabelBarWidthF      = 0.3
+      res.pmLabelBarHeightF     = 0.1
+      res.lbTitleString         = "Precipitable water (mm)"
+      res.lbTitleFontHeightF   = 0.0125
 
-   del(lon_temp1)
-   del(lon_temp2)
-   del(lonbl_idx)
-   del(lontr_idx)
-   del(lon_temp)
+      res.sfXArray = lon2d
+      res.sfYArray = lat2d
 
-else:
+      res.mpProjection              = "CylindricalEquidistant"
+      res.mpLimitMode = "LatLon"    # Limit the map view.
+      res.mpMinLonF   = lontr
+      res.mpMaxLonF   = lonbl
+      res.mpMinLatF   = lattr
+      res.mpMaxLatF   = latbl
+      res.mpPerimOn   = True
+      res.mpOutlineBoundarySets     = "AllBoundaries"
+      res.mpNationalLineColor       = "gray40"
+      res.mpNationalLineThicknessF  = 1.5
+      res.mpGeophysicalLineColor    = "gray40"
+      res.mpGeophysicalLineThicknessF = 1.5
+      res.cnMonoLineColor           = True
 
-   lon_temp = lon1[:]
+      res.cnLevelSelectionMode = "ManualLevels"
+      res.cnMinLevelValF       = 0.0
+      res.cnMaxLevelValF       = 65.0
+      res.cnLevelSpacingF      = 2.5
+      res.cnLineThicknessF     = 2.5
 
-   lonbl_idx = (np.abs(lon_temp-lonbl)).argmin()
-   lontr_idx = (np.abs(lon_temp-lontr)).argmin()
+      # create PWAT plot for analysis data
 
-   if lonbl_idx == lontr_idx:
-      sys.exit('lon values are not different enough, they must have relate to different grid points')
-   elif lonbl_idx > 1 and lontr_idx < len(lon_temp)-2:
-      lon_box1 = lonbl_idx-2
-      lon_box2 = lontr_idx+2
-      lon = lon_temp[lon_box1:lon_box2]
-   else:
-      lon_box1 = lonbl_idx
-      lon_box2 = lontr_idx
-      lon = lon_temp[lon_box1:lon_box2]
-
-# read in PWAT, checking whether box crosses Greenwich Meridian.
-
-if (np.sign(lonbl) + np.sign(lontr)) >= -1 and (np.sign(lonbl) + np.sign(lontr)) <= 1:
-
-   PWAT1 = analysis.variables["PWAT_P0_L200_GLL0"][:,:]
-   PWAT_temp1 = PWAT1[lat_box1:lat_box2,0:lon_box1]
-   PWAT_temp2 = PWAT1[lat_box1:lat_box2,lon_box2:lon_box3]
-   PWAT = np.concatenate((PWAT_temp2,PWAT_temp1),axis=1)
-   del PWAT1
-   del PWAT_temp1
-   del PWAT_temp2
-
-else:
-
-   PWAT1 = analysis.variables["PWAT_P0_L200_GLL0"][:,:]
-   PWAT = PWAT1[lat_box1:lat_box2,lon_box1:lon_box2]
-   del PWAT1
-
-# create 2d lat and lon
-
-lat2d = np.zeros((len(lat),len(lon)))
-lon2d = np.zeros((len(lat),len(lon)))
-
-for i in range(0, len(lon)):
-   lat2d[:,i] = lat
-
-for i in range(0, len(lat)):
-   lon2d[i,:] = lon
-   
-# open workspace for analysis plot
-
-wks_type = "png"
-wks = ngl.open_wks(wks_type, "GFSanalysis_%s_%s_PWAT_SNGL" % (region, init_dt[0:10]))
-
-# define resources for analysis plot
-
-res = ngl.Resources()
-res.nglDraw  = False
-res.nglFrame = False
-
-cmap = ngl.read_colormap_file("WhiteBlueGreenYellowRed")
-
-res.mpGridAndLimbOn        = False
-res.pmTickMarkDisplayMode = "Never"
-
-res.cnInfoLabelOn              = False
-res.cnFillOn                   = True
-res.cnFillPalette              = cmap[::-1]
-res.cnLineLabelsOn             = False
-res.cnLinesOn                  = False
-res.cnMonoLineLabelFontColor   = True
-
-res.lbAutoManage          = False
-res.lbLabelFontHeightF         = 0.005
-res.lbOrientation              = "horizontal"
-res.lbLabelAngleF              = 45
-res.pmLabelBarOrthogonalPosF = -1.
-res.pmLabelBarParallelPosF = 0.25
-res.pmLabelBarWidthF      = 0.3
-res.pmLabelBarHeightF     = 0.1
-res.lbTitleString         = "Precipitable water (mm)"
-res.lbTitleFontHeightF   = 0.0125
-
-res.sfXArray = lon2d
-res.sfYArray = lat2d
-
-res.mpProjection              = "CylindricalEquidistant"
-res.mpLimitMode = "LatLon"    # Limit the map view.
-res.mpMinLonF   = lontr
-res.mpMaxLonF   = lonbl
-res.mpMinLatF   = lattr
-res.mpMaxLatF   = latbl
-res.mpPerimOn   = True
-res.mpOutlineBoundarySets     = "AllBoundaries"
-res.mpNationalLineColor       = "gray40"
-res.mpNationalLineThicknessF  = 1.5
-res.mpGeophysicalLineColor    = "gray40"
-res.mpGeophysicalLineThicknessF = 1.5
-res.cnMonoLineColor           = True
-
-res.cnLevelSelectionMode = "ManualLevels"
-res.cnMinLevelValF       = 0.0
-res.cnMaxLevelValF       = 65.0
-res.cnLevelSpacingF      = 2.5
-res.cnLineThicknessF     = 2.5
-
-# create PWAT plot for analysis data
-
-PWAT_plot = ngl.contour_map(wks,PWAT,res)
-
-ngl.maximize_plot(wks, PWAT_plot)
-ngl.draw(PWAT_plot)
-ngl.frame(wks)
-
-ngl.destroy(wks)
-del res
-del PWAT
-#del CIN
+      PWAT_plot = ngl.contour_map(wks,PWAT,res)
 
-###################################################################################################
+      ngl.maximize_plot(wks, PWAT_plot)
+      ngl.draw(PWAT_plot)
+      ngl.frame(wks)
 
-# open forecast file
+      ngl.destroy(wks)
+      del res
+      del PWAT
+      #del CIN
 
-f_fili = "GFS_forecast_%s_%s.nc" % (init_dt[:8], init_dt[8:10])
-forecast = nio.open_file(diri+f_fili)
+   ###################################################################################################
 
-# loop through forecast times
+   # forecast plots, none when only the analysis is plotted
 
-for i in range(0, len(fore)):
+   if len(fore) > 0:
 
-# create string for valid time
+      # open forecast file
 
-   valid_date = (datetime.datetime(int(init_dt[:4]), int(init_dt[4:6]), int(init_dt[6:8]), int(init_dt[8:10])) + datetime.timedelta(hours=int(fore[i]))).strftime("%Y%m%d%H")
+      f_fili = "GFS_forecast_%s_%s.nc" % (init_dt[:8], init_dt[8:10])
+      forecast = gfs_io.open_file(diri+f_fili, region)
 
-# read in PWAT, checking whether box crosses Greenwich Meridian.
+      # read in and calculate the fields for all forecast times at once, only the plotting is done
+      # for each forecast time
 
-   if (np.sign(lonbl) + np.sign(lontr)) >= -1 and (np.sign(lonbl) + np.sign(lontr)) <= 1:
+      steps = slice(0, len(fore))
 
-      PWAT1 = forecast.variables["PWAT_P0_L200_GLL0"][i,:,:]
-      PWAT_temp1 = PWAT1[lat_box1:lat_box2,0:lon_box1]
-      PWAT_temp2 = PWAT1[lat_box1:lat_box2,lon_box2:lon_box3]
-      PWAT = np.concatenate((PWAT_temp2,PWAT_temp1),axis=1)
-      del PWAT1
-      del PWAT_temp1
-      del PWAT_temp2
+      # read in PWAT.
 
-   else:
+      PWAT_steps = geometry.cut(forecast.variables["PWAT_P0_L200_GLL0"], geom, steps)
+
+      # loop through forecast times
+
+      for i in range(0, len(fore)):
+
+         # frames already in the ledger for the same files are not plotted again (see ledger.py)
+
+         if not controls.frame_wanted(fore[i]):
+            continue
+
+      # create string for valid time
+
+         valid_date = (datetime.datetime(int(init_dt[:4]), int(init_dt[4:6]), int(init_dt[6:8]), int(init_dt[8:10])) + datetime.timedelta(hours=int(fore[i]))).strftime("%Y%m%d%H")
+
+      # fields for this forecast time
+
+         PWAT = PWAT_steps[i]
+
+      # open workspace for forecast plots
+
+         wks_type = "png"
+         wks = ngl.open_wks(wks_type, "GFSforecast_%s_%s_PWAT_SNGL_%s_%03d" % (region, valid_date, init_dt[0:10], fore[i]))
+
+      # define resources for forecast plots
+
+         res = ngl.Resources()
+         res.nglDraw  = False
+         res.nglFrame = False
+
+         cmap = ngl.read_colormap_file("WhiteBlueGreenYellowRed")
+
+         res.mpGridAndLimbOn        = False
+         res.pmTickMarkDisplayMode = "Never"
+
+         res.cnInfoLabelOn              = False
+         res.cnFillOn                   = True
+         res.cnFillPalette              = cmap[::-1]
+         res.cnInfoLabelOn              = False
+         res.cnLineLabelsOn             = False
+         res.cnLinesOn                  = False
+         res.cnMonoLineLabelFontColor   = True
+
+         res.lbAutoManage          = False
+         res.lbLabelFontHeightF         = 0.005
+         res.lbOrientation              = "horizontal"
+         res.lbLabelAngleF              = 45
+         res.pmLabelBarOrthogonalPosF = -1.
+         res.pmLabelBarParallelPosF = 0.25
+         res.pmLabelBarWidthF      = 0.3
+         res.pmLabelBarHeightF     = 0.1
+         res.lbTitleString         = "Precipitable water (mm)"
+         res.lbTitleFontHeightF   = 0.0125
+
+         res.sfXArray = lon2d
+         res.sfYArray = lat2d
+
+         res.mpProjection              = "CylindricalEquidistant"
+         res.mpLimitMode = "LatLon"    # Limit the map view.
+         res.mpMinLonF   = lontr
+         res.mpMaxLonF   = lonbl
+         res.mpMinLatF   = lattr
+         res.mpMaxLatF   = latbl
+         res.mpPerimOn   = True
+         res.mpOutlineBoundarySets     = "AllBoundaries"
+         res.mpNationalLineColor       = "gray40"
+         res.mpNationalLineThicknessF  = 1.5
+         res.mpGeophysicalLineColor    = "gray40"
+         res.mpGeophysicalLineThicknessF = 1.5
+         res.cnMonoLineColor           = True
+
+         res.cnLevelSelectionMode = "ManualLevels"
+         res.cnMinLevelValF       = 0.0
+         res.cnMaxLevelValF       = 65.0
+         res.cnLevelSpacingF      = 2.5
+         res.cnLineThicknessF     = 2.5
+
+      # create PWAT plots for forecast times
+
+         PWAT_plot = ngl.contour_map(wks,PWAT,res)
+
+         ngl.maximize_plot(wks, PWAT_plot)
+         ngl.draw(PWAT_plot)
+         ngl.frame(wks)
+
+         ngl.destroy(wks)
+         del res
+         del PWAT
+
+   os.system('mogrify -trim *_'+region+'_'+init_dt[0:10]+'_PWAT_SNGL.png')
+   #if region == "WA" or region == "unknownWA":
+   #   os.system('mogrify -resize 886x600 *_'+region+'_'+init_dt[0:10]+'_PWAT_SNGL.png')
+   #elif region == "EA" or region == "unknownEA":
+   #   os.system('mogrify -resize 600x733 *_'+region+'_'+init_dt[0:10]+'_PWAT_SNGL.png')
+
+   os.system('mv *_'+region+'_'+init_dt[0:10]+'_PWAT_SNGL.png %s/MARTIN/GFS/'%(GFS_dir)+region+'/'+init_dt[0:10]+'/PWAT')
+
+   os.system('mogrify -trim *'+region+'_*PWAT_SNGL_'+init_dt[0:10]+'*.png')
+   #if region == "WA" or region == "unknownWA":
+   #   os.system('mogrify -resize 886x600 *'+region+'_*PWAT_SNGL_'+init_dt[0:10]+'*.png')
+   #elif region == "EA" or region == "unknownEA":
+   #   os.system('mogrify -resize 600x733 *'+region+'_*PWAT_SNGL_'+init_dt[0:10]+'*.png')
+
+   os.system('mv *'+region+'_*PWAT_SNGL_'+init_dt[0:10]+'*.png %s/MARTIN/GFS/'%(GFS_dir)+region+'/'+init_dt[0:10]+'/PWAT')
+
+###################################################################################################
 
-      PWAT1 = forecast.variables["PWAT_P0_L200_GLL0"][i,:,:]
-      PWAT = PWAT1[lat_box1:lat_box2,lon_box1:lon_box2]
-      del PWAT1
-
-# open workspace for forecast plots
-
-   wks_type = "png"
-   wks = ngl.open_wks(wks_type, "GFSforecast_%s_%s_PWAT_SNGL_%s_%03d" % (region, valid_date, init_dt[0:10], fore[i]))
-
-# define resources for forecast plots
-
-   res = ngl.Resources()
-   res.nglDraw  = False
-   res.nglFrame = False
-
-   cmap = ngl.read_colormap_file("WhiteBlueGreenYellowRed")
-
-   res.mpGridAndLimbOn        = False
-   res.pmTickMarkDisplayMode = "Never"
-
-   res.cnInfoLabelOn              = False
-   res.cnFillOn                   = True
-   res.cnFillPalette              = cmap[::-1]
-   res.cnInfoLabelOn              = False
-   res.cnLineLabelsOn             = False
-   res.cnLinesOn                  = False
-   res.cnMonoLineLabelFontColor   = True
-
-   res.lbAutoManage          = False
-   res.lbLabelFontHeightF         = 0.005
-   res.lbOrientation              = "horizontal"
-   res.lbLabelAngleF              = 45
-   res.pmLabelBarOrthogonalPosF = -1.
-   res.pmLabelBarParallelPosF = 0.25
-   res.pmLabelBarWidthF      = 0.3
-   res.pmLabelBarHeightF     = 0.1
-   res.lbTitleString         = "Precipitable water (mm)"
-   res.lbTitleFontHeightF   = 0.0125
-
-   res.sfXArray = lon2d
-   res.sfYArray = lat2d
-
-   res.mpProjection              = "CylindricalEquidistant"
-   res.mpLimitMode = "LatLon"    # Limit the map view.
-   res.mpMinLonF   = lontr
-   res.mpMaxLonF   = lonbl
-   res.mpMinLatF   = lattr
-   res.mpMaxLatF   = latbl
-   res.mpPerimOn   = True
-   res.mpOutlineBoundarySets     = "AllBoundaries"
-   res.mpNationalLineColor       = "gray40"
-   res.mpNationalLineThicknessF  = 1.5
-   res.mpGeophysicalLineColor    = "gray40"
-   res.mpGeophysicalLineThicknessF = 1.5
-   res.cnMonoLineColor           = True
-
-   res.cnLevelSelectionMode = "ManualLevels"
-   res.cnMinLevelValF       = 0.0
-   res.cnMaxLevelValF       = 65.0
-   res.cnLevelSpacingF      = 2.5
-   res.cnLineThicknessF     = 2.5
-
-# create PWAT plots for forecast times
-
-   PWAT_plot = ngl.contour_map(wks,PWAT,res)
-
-   ngl.maximize_plot(wks, PWAT_plot)
-   ngl.draw(PWAT_plot)
-   ngl.frame(wks)
-
-   ngl.destroy(wks)
-   del res
-   del PWAT
-
-os.system('mogrify -trim *_'+region+'_'+init_dt[0:10]+'_PWAT_SNGL.png')
-#if region == "WA" or region == "unknownWA":
-#   os.system('mogrify -resize 886x600 *_'+region+'_'+init_dt[0:10]+'_PWAT_SNGL.png')
-#elif region == "EA" or region == "unknownEA":
-#   os.system('mogrify -resize 600x733 *_'+region+'_'+init_dt[0:10]+'_PWAT_SNGL.png')
-
-os.system('mv *_'+region+'_'+init_dt[0:10]+'_PWAT_SNGL.png %s/MARTIN/GFS/'%(GFS_dir)+region+'/'+init_dt[0:10]+'/PWAT')
-
-os.system('mogrify -trim *'+region+'_*PWAT_SNGL_'+init_dt[0:10]+'*.png')
-#if region == "WA" or region == "unknownWA":
-#   os.system('mogrify -resize 886x600 *'+region+'_*PWAT_SNGL_'+init_dt[0:10]+'*.png')
-#elif region == "EA" or region == "unknownEA":
-#   os.system('mogrify -resize 600x733 *'+region+'_*PWAT_SNGL_'+init_dt[0:10]+'*.png')
-
-os.system('mv *'+region+'_*PWAT_SNGL_'+init_dt[0:10]+'*.png %s/MARTIN/GFS/'%(GFS_dir)+region+'/'+init_dt[0:10]+'/PWAT')
+if __name__ == "__main__":
+   main(*sys.argv[1:7])
@@ -0,0 +1,290 @@
+###################################################################################################
+# Project           : Global Challenges Research Fund (GCRF) African SWIFT (Science for Weather
+#                     Information and Forecasting Techniques.
+#
+# Program name      : backfill.py
+#
+# Author            : Alexander J. Roberts, University of Leeds, NCAS
+#
+# Date created      : Oct 2026
+#
+# Purpose           : Download, convert and plot many initialisation times (e.g. for a case study)
+#                     as a pipeline. Each initialisation time goes through three stages, download
+#                     (get_GFS_archived.sh, which takes files from the local GRIB2 cache where it
+#                     can), conversion (convert_GFS.sh for that initialisation time only) and
+#                     plotting (plot.py for that initialisation time only), and the stages of
+#                     different initialisation times run at the same time, so while one is being
+#                     plotted the next is converted and the one after that downloaded. Each stage
+#                     has its own number of workers, so the network and disk heavy stages are
+#                     limited separately from the CPU heavy plotting:
+#                     SWIFT_GFS_BACKFILL_DOWNLOADS (default 2), SWIFT_GFS_BACKFILL_CONVERSIONS
+#                     (default 1, convert_GFS.sh converts several files at once itself) and
+#                     SWIFT_GFS_BACKFILL_PLOTS (default 1, each plot.py runs n_processes render
+#                     processes). Stages that have already been done (files downloaded or
+#                     converted before) are skipped. The time each stage took, the time spent
+#                     waiting for a free worker between stages and the number of images are
+#                     written for each initialisation time to MARTIN/GFS/backfill_report.txt as it
+#                     finishes, with the overall throughput at the end. The output of each stage is written to
+#                     MARTIN/GFS/backfill_logs.
+#
+#                     "grib" reads the GRIB2 files directly rather than converting them (see
+#                     grib_io.py). "clean" removes the files of an initialisation time from GFS_NWP
+#                     once it has been plotted, the GRIB2 files stay in the cache.
+#
+# Revision History  :
+#
+# Usage             : Run from the python directory
+#                     "python3 backfill.py n_processes [grib] [clean] [YYYYMMDDHH ...]", the
+#                     initialisation times are those in the namelist if none are given
+###################################################################################################
+
+import os
+import sys
+import glob
+import time
+import queue
+import shutil
+import threading
+import subprocess
+
+import controls
+
+GFS_dir = os.environ.get("SWIFT_GFS", "")
+
+workers = {"download": int(os.environ.get("SWIFT_GFS_BACKFILL_DOWNLOADS", "2")),
+           "convert": int(os.environ.get("SWIFT_GFS_BACKFILL_CONVERSIONS", "1")),
+           "plot": int(os.environ.get("SWIFT_GFS_BACKFILL_PLOTS", "1"))}
+
+stages = ["download", "convert", "plot"]
+
+###################################################################################################
+
+class Cycle(object):
+
+   def __init__(self, init_dt):
+      self.init_dt = init_dt
+      self.queued = time.time()
+      self.start = None
+      self.end = None
+      self.times = {}
+      self.waits = {}
+      self.ok = True
+      self.images = 0
+
+   def dir(self):
+      return "%s/GFS_NWP/%s" % (GFS_dir, self.init_dt)
+
+# files written by the conversion (or the GRIB2 manifests standing in for them)
+
+def converted_files(cycle, grib):
+
+   if grib:
+      ext = "grib"
+   else:
+      ext = "nc"
+
+   return [path for path in ["%s/analysis_gfs_4_%s_%s00_000.%s" % (cycle.dir(), cycle.init_dt[:8], cycle.init_dt[8:10], ext),
+                             "%s/GFS_forecast_%s_%s.%s" % (cycle.dir(), cycle.init_dt[:8], cycle.init_dt[8:10], ext)] if os.path.isfile(path)]
+
+def grib_files(cycle):
+
+   return glob.glob("%s/gfs.t%sz.pgrb2.0p50.f*" % (cycle.dir(), cycle.init_dt[8:10]))
+
+# run a script of a stage with its output going to the log of the stage, returns True if it worked
+
+def call(cycle, stage, command, cwd, env=None):
+
+   os.makedirs(GFS_dir+"/MARTIN/GFS/backfill_logs", exist_ok=True)
+   log = open("%s/MARTIN/GFS/backfill_logs/%s_%s.log" % (GFS_dir, cycle.init_dt, stage), "w")
+   returncode = subprocess.call(command, cwd=cwd, env=env, stdout=log, stderr=subprocess.STDOUT)
+   log.close()
+
+   return returncode == 0
+
+###################################################################################################
+
+# the stages, each returns True if the initialisation time can go on to the next stage
+
+def download(cycle, options):
+
+   if len(converted_files(cycle, options["grib"])) == 2 or len(grib_files(cycle)) == len(options["leads"]):
+      return True
+
+   call(cycle, "download", ["/bin/bash", GFS_dir+"/scripts/get_GFS_archived.sh", cycle.init_dt[8:10], cycle.init_dt[:8]], GFS_dir+"/scripts")
+
+   # get_GFS_archived.sh removes the directory if any of the files are not in the archive
+
+   return len(grib_files(cycle)) > 0
+
+def convert(cycle, options):
+
+   if len(converted_files(cycle, options["grib"])) == 2:
+      return True
+
+   command = ["/bin/bash", GFS_dir+"/scripts/convert_GFS.sh", GFS_dir, cycle.init_dt]
+   if options["grib"]:
+      command.append("grib")
+   call(cycle, "convert", command, GFS_dir+"/scripts")
+
+   return len(converted_files(cycle, options["grib"])) == 2
+
+def plot(cycle, options):
+
+   # the converted files are linked into the python directory (as convert_GFS.sh does) in case the
+   # links have been removed since they were converted
+
+   for path in converted_files(cycle, options["grib"]):
+      link = GFS_dir+"/python/"+os.path.basename(path)
+      if not os.path.exists(link):
+         if os.path.islink(link):
+            os.unlink(link)
+         os.symlink(path, link)
+
+   env = dict(os.environ)
+   env["SWIFT_GFS_INIT"] = cycle.init_dt
+   ok = call(cycle, "plot", ["python3", "plot.py", str(options["n_processes"])], GFS_dir+"/python", env)
+
+   cycle.images = len([image for image in glob.glob("%s/MARTIN/GFS/*/%s/*/*" % (GFS_dir, cycle.init_dt)) if os.path.isfile(image)])
+
+   if options["clean"]:
+      for path in converted_files(cycle, options["grib"]):
+         link = GFS_dir+"/python/"+os.path.basename(path)
+         if os.path.islink(link):
+            os.unlink(link)
+      shutil.rmtree(cycle.dir(), ignore_errors=True)
+
+   return ok
+
+###################################################################################################
+
+def report_line(cycle):
+
+   total = cycle.end-cycle.start
+   if cycle.ok:
+      status = "OK"
+   else:
+      status = "FAILED"
+
+   times = " ".join("%9.1f" % (cycle.times.get(stage, 0.0)) for stage in stages)
+   return "%-10s %s %9.1f %9.1f %7d %9.1f  %s" % (cycle.init_dt, times, sum(cycle.waits.values()), total, cycle.images, cycle.images/max(total, 1.0)*60.0, status)
+
+def report_header():
+
+   return "%-10s %9s %9s %9s %9s %9s %7s %9s" % ("init", "download", "convert", "plot", "wait", "total", "images", "images/m")
+
+# worker thread of a stage, takes initialisation times from the queue of the stage and passes them
+# on to the next stage (initialisation times that failed a stage are passed straight to the end)
+
+def stage_worker(stage, function, queues, done, options):
+
+   index = stages.index(stage)
+
+   while True:
+      cycle = queues[index].get()
+      if cycle is None:
+         break
+
+      if cycle.ok:
+         if cycle.start is None:
+            cycle.start = time.time()
+         else:
+            cycle.waits[stage] = time.time()-cycle.queued
+         start = time.time()
+         try:
+            cycle.ok = function(cycle, options)
+         except Exception as e:
+            print("%s %s failed: %s" % (cycle.init_dt, stage, e), flush=True)
+            cycle.ok = False
+         cycle.times[stage] = time.time()-start
+         if not cycle.ok:
+            print("%s %s failed, see MARTIN/GFS/backfill_logs" % (cycle.init_dt, stage), flush=True)
+
+      cycle.queued = time.time()
+      if index+1 < len(stages):
+         queues[index+1].put(cycle)
+      else:
+         if cycle.start is None:
+            cycle.start = time.time()
+         cycle.end = time.time()
+         done.put(cycle)
+
+# run the pipeline over the initialisation times, the report is written as they finish
+
+def backfill(init_dts, options):
+
+   functions = {"download": download, "convert": convert, "plot": plot}
+   queues = [queue.Queue() for stage in stages]
+   done = queue.Queue()
+
+   threads = []
+   for stage in stages:
+      threads.append([threading.Thread(target=stage_worker, args=(stage, functions[stage], queues, done, options)) for i in range(workers[stage])])
+      for thread in threads[-1]:
+         thread.start()
+
+   for init_dt in init_dts:
+      queues[0].put(Cycle(init_dt))
+
+   # the workers of a stage are stopped once those of the stage before have finished
+
+   def stop():
+      for index in range(len(stages)):
+         for thread in threads[index]:
+            queues[index].put(None)
+         for thread in threads[index]:
+            thread.join()
+
+   stopper = threading.Thread(target=stop)
+   stopper.start()
+
+   start = time.time()
+   b = open(GFS_dir+"/MARTIN/GFS/backfill_report.txt", "w")
+   b.write(report_header()+"\n")
+   print(report_header(), flush=True)
+
+   cycles = []
+   for i in range(len(init_dts)):
+      cycles.append(done.get())
+      line = report_line(cycles[-1])
+      print(line, flush=True)
+      b.write(line+"\n")
+      b.flush()
+
+   stopper.join()
+   wall = time.time()-start
+
+   # busy time of each stage against the time its workers were available
+
+   lines = [""]
+   for stage in stages:
+      busy = sum(cycle.times.get(stage, 0.0) for cycle in cycles)
+      lines.append("%-8s workers %2d busy %9.1f s utilisation %5.1f%%" % (stage, workers[stage], busy, 100.0*busy/max(wall*workers[stage], 1.0e-6)))
+   ok = [cycle for cycle in cycles if cycle.ok]
+   lines.append("%d of %d initialisation times in %.1f s, %.1f per hour, %d images" % (len(ok), len(cycles), wall, len(ok)/max(wall, 1.0e-6)*3600.0, sum(cycle.images for cycle in cycles)))
+
+   print("\n".join(lines))
+   b.write("\n".join(lines)+"\n")
+   b.close()
+
+   return cycles
+
+###################################################################################################
+
+if __name__ == "__main__":
+
+   if len(sys.argv) < 2:
+      sys.exit("Usage: python3 backfill.py n_processes [grib] [clean] [YYYYMMDDHH ...]")
+
+   options = {"n_processes": int(sys.argv[1]), "grib": "grib" in sys.argv[2:], "clean": "clean" in sys.argv[2:]}
+   options["leads"] = ["000"]+controls.read_namelist(GFS_dir)["fore"]
+
+   init_dts = [arg for arg in sys.argv[2:] if arg not in ["grib", "clean"]]
+   if len(init_dts) == 0:
+      init_dts = controls.read_namelist(GFS_dir)["init"]
+
+   os.makedirs(GFS_dir+"/MARTIN/GFS", exist_ok=True)
+
+   cycles = backfill(init_dts, options)
+
+   if not all(cycle.ok for cycle in cycles):
+      sys.exit(1)
@@ -0,0 +1,106 @@
+###################################################################################################
+# Project           : Global Challenges Research Fund (GCRF) African SWIFT (Science for Weather
+#                     Information and Forecasting Techniques.
+#
+# Program name      : bench_smth9.py
+#
+# Author            : Alexander J. Roberts, University of Leeds, NCAS
+#
+# Date created      : Oct 2026
+#
+# Purpose           : Benchmark the shared vectorised 9-point smoother (smooth.py) against the
+#                     original per grid point loop on a domain sized field and check that both
+#                     give identical output.
+#
+# Revision History  :
+#
+# Usage             : "python3 bench_smth9.py [region] [resolution] [repeats]"
+#                     e.g. "python3 bench_smth9.py TropA 0.5 20"
+###################################################################################################
+
+import numpy as np
+import sys
+import os
+import timeit
+
+from smooth import smth9
+
+#####################################################################################################
+
+# original loop based smoother, kept here as the reference implementation
+
+def smth9_loop(x,p,q):
+  ni = x.shape[0]
+  nj = x.shape[1]
+
+  po4 = p/4.
+  qo4 = q/4.
+
+  output = np.zeros([ni,nj],'f')
+  for j in range(1,nj-1):
+    for i in range(1,ni-1):
+      jm1 = j-1
+      jp1 = j+1
+      im1 = i-1
+      ip1 = i+1
+      term1 = po4*(x[im1,j]+x[i,jm1]+x[ip1,j]+x[i,jp1]-4.*x[i,j])
+      term2 = qo4*(x[im1,jp1]+x[im1,jm1]+x[ip1,jm1]+x[ip1,jp1]-4.*x[i,j])
+      output[i,j] = float(x[i,j]) + term1 + term2
+
+  output[0,:]    = x[0,:]
+  output[ni-1,:] = x[ni-1,:]
+  output[:,0]    = x[:,0]
+  output[:,nj-1] = x[:,nj-1]
+
+  return output
+
+###################################################################################################
+
+# Main script to benchmark smth9
+
+region = sys.argv[1] if len(sys.argv) > 1 else "TropA"
+resolution = float(sys.argv[2]) if len(sys.argv) > 2 else 0.5
+repeats = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+
+# read domain limits, the plotting scripts pad each box by 2 grid points on every side
+
+GFS_dir = os.environ.get('SWIFT_GFS', os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+b = open(GFS_dir+"/controls/domains")
+domains_content = b.readlines()
+b.close()
+
+latlon = None
+for domain in domains_content:
+   if domain.split(":")[0].strip() == region:
+      latlon = [float(ll) for ll in (domain.split(":")[1]).strip().split(",")]
+
+if latlon is None:
+   sys.exit('region %s not found in domains file' % region)
+
+nlat = int(round(abs(latlon[2]-latlon[0])/resolution)) + 4
+nlon = int(round(abs(latlon[3]-latlon[1])/resolution)) + 4
+
+# synthetic geopotential like field in single precision, as read from the GFS netCDF files
+
+lat = np.linspace(latlon[0], latlon[2], nlat)
+lon = np.linspace(latlon[1], latlon[3], nlon)
+lon2d, lat2d = np.meshgrid(lon, lat)
+rng = np.random.RandomState(0)
+field = (5500.0 + 50.0*np.sin(np.radians(4.0*lon2d))*np.cos(np.radians(3.0*lat2d)) + rng.standard_normal((nlat, nlon))).astype('f')
+
+# check output is identical before timing
+
+ref = smth9_loop(field, 0.5, 0.25)
+new = smth9(field, 0.5, 0.25)
+
+if not np.array_equal(ref, new):
+   sys.exit('smth9 output differs from reference loop, max difference %g' % np.max(np.abs(ref-new)))
+
+t_loop = min(timeit.repeat(lambda: smth9_loop(field, 0.5, 0.25), number=1, repeat=max(1, repeats//10)))
+t_vec = min(timeit.repeat(lambda: smth9(field, 0.5, 0.25), number=1, repeat=repeats))
+
+print("region %s at %s degrees: %d x %d grid points" % (region, resolution, nlat, nlon))
+print("loop smth9       : %10.3f ms per call" % (t_loop*1000.0))
+print("vectorised smth9 : %10.3f ms per call" % (t_vec*1000.0))
+print("speedup          : %10.1f x (outputs identical)" % (t_loop/t_vec))
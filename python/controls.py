@@ -0,0 +1,242 @@
+###################################################################################################
+# Project           : Global Challenges Research Fund (GCRF) African SWIFT (Science for Weather
+#                     Information and Forecasting Techniques.
+#
+# Program name      : controls.py
+#
+# Author            : Alexander J. Roberts, University of Leeds, NCAS
+#
+# Date created      : Oct 2026
+#
+# Purpose           : Read the namelist and domains control files for SWIFT_GFSplotting. Results
+#                     are cached per process (and refreshed if a file is modified) so long-lived
+#                     plot.py render workers only parse the control files once. Also reads the
+#                     fields each plotting script needs, without importing PyNIO or PyNGL, for
+#                     the plot.py scheduler and the GRIB2 to netCDF conversion.
+#
+# Revision History  : Oct 2026 - read the "requires" entries of the plotting scripts and the inputs
+#                                of the derived fields without importing them
+#                     Oct 2026 - plot a single lead time when one is streamed (SWIFT_GFS_LEAD, see
+#                                stream_GFS.sh)
+#                     Oct 2026 - leave out the frames of a plotting job that are already plotted
+#                                (see ledger.py)
+#                     Oct 2026 - names of the GFS files of a cycle (moved from gfs_io.py and
+#                                scheduler.py) and the "images" entries of the plotting scripts, so
+#                                ledger.py needs neither PyNIO nor the scheduler
+#
+# Usage             : import controls
+#                     fore = controls.forecast_times(GFS_dir)
+#                     domains_dict = controls.read_domains(GFS_dir+"/controls/domains")
+#                     requires = controls.read_requires("winds.py")
+#                     images = controls.read_images("winds.py")
+###################################################################################################
+
+import ast
+import os
+
+_cache = {}
+
+###################################################################################################
+
+# return the contents of a control file as a list of lines, re-reading it only when it changes
+
+def _read_lines(path):
+
+   mtime = os.path.getmtime(path)
+
+   if path not in _cache or _cache[path][0] != mtime:
+      b = open(path)
+      content = b.readlines()
+      b.close()
+      _cache[path] = (mtime, content)
+
+   return _cache[path][1]
+
+###################################################################################################
+
+# read the domains file into a dictionary of region name : [lower_Lat, left_Lon, upper_Lat, right_Lon]
+
+def read_domains(path):
+
+   domains_dict = {}
+
+   for domain in _read_lines(path):
+      if ":" not in domain:
+         continue
+      domains_dict[domain.split(":")[0].strip()] = [float(ll) for ll in (domain.split(":")[1]).strip().split(",")]
+
+   return domains_dict
+
+###################################################################################################
+
+# read the namelist file into a dictionary of entry : list of comma separated values
+
+def read_namelist(GFS_dir):
+
+   namelist = {}
+
+   for line in _read_lines(GFS_dir+"/controls/namelist"):
+      if ":" not in line:
+         continue
+      key, values = line.rstrip().split(":", 1)
+      namelist[key.strip()] = [value.strip() for value in values.split(",") if value.strip()]
+
+   return namelist
+
+###################################################################################################
+
+# forecast times (hours) to be plotted, from the fore entry of the namelist
+
+def forecast_times(GFS_dir):
+
+   return streamed_times([int(f) for f in read_namelist(GFS_dir)["fore"]])
+
+# lead time (hours) being plotted on its own as soon as its GRIB2 file has arrived (the
+# SWIFT_GFS_LEAD environment variable set by stream_GFS.sh), None when whole cycles are plotted
+
+def streamed_lead():
+
+   lead = os.environ.get("SWIFT_GFS_LEAD", "")
+   if lead == "":
+      return None
+
+   return int(lead)
+
+# the forecast times of fore that are plotted, only the streamed lead time if there is one (none
+# for the analysis)
+
+def streamed_times(fore):
+
+   lead = streamed_lead()
+   if lead is None:
+      return fore
+
+   return [f for f in fore if int(f) == lead]
+
+# True if the plotting scripts plot the analysis, i.e. unless a forecast lead time is streamed or
+# the analysis frame of the job is already plotted
+
+def analysis_plotted():
+
+   return streamed_lead() in [None, 0] and frame_wanted(0)
+
+# lead times of the frames the running plotting job still has to plot, set by plot.py from the job
+# ledger (see ledger.py) for jobs run as function calls and passed in SWIFT_GFS_FRAMES to jobs run
+# as scripts, None plots every frame
+
+pending_frames = None
+
+def frame_wanted(lead):
+
+   frames = pending_frames
+   if frames is None and os.environ.get("SWIFT_GFS_FRAMES", "") != "":
+      frames = [int(f) for f in os.environ["SWIFT_GFS_FRAMES"].split(",")]
+
+   return frames is None or int(lead) in frames
+
+###################################################################################################
+
+# name of the manifest of GRIB2 files (see grib_io.py) standing in for a GFS netCDF file
+
+def grib_manifest(path):
+
+   return "%s.grib" % (os.path.splitext(path)[0])
+
+# name of the file holding a single lead time of a GFS forecast file, written by stream_GFS.sh as
+# soon as the GRIB2 file of that lead time has arrived
+
+def lead_path(path, lead):
+
+   return "%s_f%03d.nc" % (os.path.splitext(path)[0], lead)
+
+# file holding the streamed lead time in place of a GFS forecast file, path itself for the analysis
+# file, for the file of the lead time (or its regional file) or when whole cycles are plotted. The
+# plotting scripts take the first forecast time of the file they open to be the streamed lead time,
+# so a forecast file whose lead time has not been written is an error rather than the whole forecast
+# file being read.
+
+def streamed_path(path):
+
+   lead = streamed_lead()
+   name = os.path.basename(path)
+   if lead is None or name.startswith("analysis_") or "_f%03d" % (lead) in name:
+      return path
+
+   if not exists(lead_path(path, lead)):
+      raise IOError("lead time %03d of %s has not been written (see stream_GFS.sh)" % (lead, path))
+
+   return lead_path(path, lead)
+
+# True if a GFS netCDF file or the manifest standing in for it exists
+
+def exists(path):
+
+   return os.path.isfile(path) or os.path.isfile(grib_manifest(path))
+
+# name of the regional file extracted from a GFS netCDF file for region
+
+def regional_path(path, region):
+
+   return "%s_%s.nc" % (os.path.splitext(path)[0], region)
+
+# GFS netCDF files (analysis and forecast) for an initialisation time, as opened by the plotting
+# scripts from the current directory (or the GRIB2 manifests standing in for them, see grib_io.py).
+# If region is given the regional files extracted for it are used where they exist. The file of the
+# streamed lead time (see streamed_path) is used in place of the forecast file, which is
+# left out when the analysis is streamed (lead time 0 has no forecast file).
+
+def cycle_files(init_dt, region=None):
+
+   filis = ["analysis_gfs_4_%s_%s00_000.nc" % (init_dt[:8], init_dt[8:10])]
+   if streamed_lead() != 0:
+      filis.append("GFS_forecast_%s_%s.nc" % (init_dt[:8], init_dt[8:10]))
+   filis = [streamed_path(fili) for fili in filis]
+
+   if region is not None:
+      filis = [regional_path(fili, region) if os.path.isfile(regional_path(fili, region)) else fili for fili in filis]
+
+   return [os.getcwd()+"/"+fili for fili in filis if exists(fili)]
+
+###################################################################################################
+
+# value of a top level assignment to name in a python script (in the same directory as this
+# module), read without importing the script. None if the script does not assign name.
+
+def _read_assignment(script, name):
+
+   b = open(os.path.join(os.path.dirname(os.path.abspath(__file__)), script))
+   tree = ast.parse(b.read(), script)
+   b.close()
+
+   value = None
+   for statement in tree.body:
+      if isinstance(statement, ast.Assign) and [getattr(t, "id", None) for t in statement.targets] == [name]:
+         value = ast.literal_eval(statement.value)
+
+   return value
+
+# fields and derived fields needed by a plotting script, from the "requires" entry near the top of
+# the script
+
+def read_requires(script):
+
+   requires = {"fields": [], "derived": []}
+   requires.update(_read_assignment(script, "requires") or {})
+
+   return requires
+
+# names of the images a plotting script writes (without .png), from the "images" entry near the top
+# of the script. The analysis image is None if the script does not plot the analysis.
+
+def read_images(script):
+
+   images = {"analysis": None, "forecast": None}
+   images.update(_read_assignment(script, "images") or {})
+
+   return images
+
+# variables each derived field is calculated from (the "inputs" entry of derived.py)
+
+def derived_inputs():
+
+   return _read_assignment("derived.py", "inputs")
@@ -0,0 +1,80 @@
+###################################################################################################
+# Project           : Global Challenges Research Fund (GCRF) African SWIFT (Science for Weather
+#                     Information and Forecasting Techniques.
+#
+# Program name      : conversion_vars.py
+#
+# Author            : Alexander J. Roberts, University of Leeds, NCAS
+#
+# Date created      : Oct 2026
+#
+# Purpose           : Work out which variables of a converted GFS forecast file are needed by the
+#                     plotting scripts in the m_lev_vars and s_lev_vars entries of the namelist,
+#                     from the "requires" entry of each script and the inputs of the derived fields
+#                     it uses. Used by convert_GFS.sh to select only those variables before the
+#                     forecast files are concatenated. Only needs the standard library so it can
+#                     run outside the pyn_env environment.
+#
+# Revision History  :
+#
+# Usage             : "python3 conversion_vars.py $( cdo -s showname file.nc )"
+#                     prints the needed variables of file.nc separated by commas
+###################################################################################################
+
+import os
+import sys
+
+import controls
+
+###################################################################################################
+
+# plotting scripts in the namelist
+
+def namelist_scripts(GFS_dir):
+
+   namelist = controls.read_namelist(GFS_dir)
+
+   scripts = [entry.split()[0]+".py" for entry in namelist.get("m_lev_vars", []) if len(entry.split()) > 0]
+   scripts = scripts + [entry+".py" for entry in namelist.get("s_lev_vars", [])]
+
+   return [script for script in scripts if os.path.isfile(os.path.join(os.path.dirname(os.path.abspath(__file__)), script))]
+
+# variable names needed by a list of plotting scripts, as given in their "requires" entries (some
+# are part of a name, e.g. PRATE)
+
+def needed_names(scripts):
+
+   inputs = controls.derived_inputs()
+   names = []
+
+   for script in scripts:
+      requires = controls.read_requires(script)
+      for entry in requires["fields"]:
+         names.append(entry[0])
+      for entry in requires["derived"]:
+         names = names + inputs[entry[0]][0]
+
+   return sorted(set(names))
+
+# variables of a file (in file order) that are needed, a name that is not in the file matches
+# every variable containing it, as the plotting scripts take the first of these
+
+def select(file_names, names):
+
+   selected = []
+
+   for file_name in file_names:
+      if file_name in names or any(name in file_name and name not in file_names for name in names):
+         selected.append(file_name)
+
+   return selected
+
+###################################################################################################
+
+if __name__ == "__main__":
+
+   GFS_dir = os.environ['SWIFT_GFS']
+
+   names = needed_names(namelist_scripts(GFS_dir))
+
+   print(",".join(select(sys.argv[1:], names)))
@@ -0,0 +1,331 @@
+###################################################################################################
+# Project           : Global Challenges Research Fund (GCRF) African SWIFT (Science for Weather
+#                     Information and Forecasting Techniques.
+#
+# Program name      : derived.py
+#
+# Author            : Alexander J. Roberts, University of Leeds, NCAS
+#
+# Date created      : Oct 2026
+#
+# Purpose           : Derived fields (wind speed, shear, maximum shear, dewpoint, potential
+#                     temperature and potential vorticity) shared between the SWIFT_GFSplotting scripts. Each field
+#                     is calculated once per cycle, for all forecast times, on the union bounding box
+#                     of the domains in the controls/domains file (padded by a few grid points) and
+#                     stored in the gfs_io field cache. Plotting jobs index the returned field with
+#                     the usual full grid lat and lon indices and get a view of it for their region,
+#                     so overlapping regions do not repeat the calculation. The plot.py scheduler
+#                     runs these as derived field jobs before the plotting jobs that need them.
+#                     Fields are calculated and stored in the gfs_io working precision (float32),
+#                     a plotting script that needs double precision passes dtype=np.float64 and
+#                     gets a separate float64 copy of the field. The intermediate arrays of a
+#                     calculation are working arrays from the gfs_io pool, the field itself is a
+#                     new array as it is what the field cache keeps.
+#
+# Revision History  : Oct 2026 - calculate on the union bounding box of the domains instead of the
+#                                full grid, add potential vorticity
+#                     Oct 2026 - add the maximum shear between two sets of levels
+#                     Oct 2026 - take the union bounding box and the input fields on it from the
+#                                gfs_io field cache
+#                     Oct 2026 - calculate PV for several levels at once, reading only the
+#                                temperature either side and the absolute vorticity at each level
+#                     Oct 2026 - calculate in the gfs_io working precision (float32) unless
+#                                float64 is asked for with the dtype argument
+#                     Oct 2026 - intermediate arrays from the gfs_io pool
+#
+# Usage             : import derived
+#                     ws = geometry.cut(derived.wind_speed(forecast, lev_index), geom, i)
+###################################################################################################
+
+import numpy as np
+
+import gfs_io
+
+# variables each derived field is calculated from, the level index offsets (from the level the
+# field is calculated for) that are read, for all the variables or for each variable, and whether
+# the function also takes the list of pressure levels (hPa) of the file
+
+inputs = {"wind_speed": (["UGRD_P0_L100_GLL0", "VGRD_P0_L100_GLL0"], [0], False),
+          "shear": (["UGRD_P0_L100_GLL0", "VGRD_P0_L100_GLL0"], [0], False),
+          "dewpoint": (["TMP_P0_L100_GLL0", "RH_P0_L100_GLL0"], [0], False),
+          "theta": (["TMP_P0_L100_GLL0"], [0], True),
+          "pv": (["TMP_P0_L100_GLL0", "ABSV_P0_L100_GLL0"], {"TMP_P0_L100_GLL0": [-1, 1], "ABSV_P0_L100_GLL0": [0]}, True),
+          "max_shear": (["UGRD_P0_L100_GLL0", "VGRD_P0_L100_GLL0"], [0], False)}
+
+# derived fields the plot.py scheduler calculates for all the levels requested in a cycle in one
+# job, the function is then called with a list of level indices
+
+batched = ["pv"]
+
+# bytes of the level pair arrays max_shear works with at once
+
+batch_limit = 64*1024*1024
+
+# read one level of a variable in a window, for all forecast times if the file has a time dimension,
+# in precision dtype. The field cache already holds the window covering the domains.
+
+def _level(gfsfile, name, lev, window, dtype):
+
+   if window == gfs_io.window(gfsfile):
+      field = gfsfile.field(name, lev)
+      if field is not None:
+         return gfs_io.working(np.asarray(field.data), dtype)
+
+   var = gfsfile.handle.variables[name]
+
+   if len(var.dimensions) == 4:
+      return gfs_io.working(gfs_io.read_window(var, (slice(None), lev), window), dtype)
+   else:
+      return gfs_io.working(gfs_io.read_window(var, (lev,), window), dtype)
+
+# fields of the same shape stacked along a new first dimension, in a working array from the gfs_io
+# pool
+
+def _stack(fields, dtype):
+
+   out = gfs_io.buffer((len(fields),)+fields[0].shape, dtype)
+   for i, field in enumerate(fields):
+      out[i] = field
+
+   return out
+
+# precision of a derived field, the working precision unless dtype is given
+
+def _dtype(dtype):
+
+   if dtype is None:
+      return np.dtype(gfs_io.precision)
+
+   return np.dtype(dtype)
+
+# return a derived field from the field cache, calculating it on the window covering the domains
+# if this is the first request this cycle. Requests outside the window are served by calculating
+# the field on the full grid. Fields in a precision other than the working precision are cached
+# separately.
+
+def _derived(gfsfile, key, compute, dtype):
+
+   window = gfs_io.window(gfsfile)
+   key = "%s_%d_%d_%d_%d" % ((key,)+window)
+   if dtype != np.dtype(gfs_io.precision):
+      key = "%s_%s" % (key, dtype.name)
+
+   data = gfsfile.cached(key, lambda: gfs_io.working(compute(window), dtype))
+   if data is None:
+      data = gfs_io.working(compute(window), dtype)
+
+   shape = gfsfile.grid_shape()
+   full = []
+
+   def fallback(key):
+      if len(full) == 0:
+         full.append(gfs_io.working(compute((0, shape[0], 0, shape[1])), dtype))
+      return full[0][key]
+
+   return gfs_io.Window(data, window, shape, fallback)
+
+###################################################################################################
+
+# wind speed at level index lev
+
+def wind_speed(gfsfile, lev, dtype=None):
+
+   dtype = _dtype(dtype)
+
+   def compute(window):
+      u = _level(gfsfile, "UGRD_P0_L100_GLL0", lev, window, dtype)
+      v = _level(gfsfile, "VGRD_P0_L100_GLL0", lev, window, dtype)
+
+      ws = np.square(u)
+      v2 = np.square(v, out=gfs_io.buffer(v.shape, v.dtype))
+      np.add(ws, v2, out=ws)
+
+      return np.sqrt(ws, out=ws)
+
+   return _derived(gfsfile, "wind_speed_%d" % (lev), compute, dtype)
+
+# magnitude of the wind shear between level indices lev1 and lev2
+
+def shear(gfsfile, lev1, lev2, dtype=None):
+
+   dtype = _dtype(dtype)
+
+   def compute(window):
+      u2 = _level(gfsfile, "UGRD_P0_L100_GLL0", lev2, window, dtype)
+      u_diff = np.subtract(u2, _level(gfsfile, "UGRD_P0_L100_GLL0", lev1, window, dtype), out=gfs_io.buffer(u2.shape, dtype))
+      v2 = _level(gfsfile, "VGRD_P0_L100_GLL0", lev2, window, dtype)
+      v_diff = np.subtract(v2, _level(gfsfile, "VGRD_P0_L100_GLL0", lev1, window, dtype), out=gfs_io.buffer(v2.shape, dtype))
+
+      sh = np.square(u_diff)
+      np.add(sh, np.square(v_diff, out=v_diff), out=sh)
+
+      return np.sqrt(sh, out=sh)
+
+   return _derived(gfsfile, "shear_%d_%d" % (lev1, lev2), compute, dtype)
+
+# maximum magnitude of the wind shear between any level index in levs1 and any level index in levs2
+# (e.g. the low and mid levels), returned as three fields: the magnitude and the u and v components
+# of the shear for the pair of levels with the largest shear (the first pair, in levs1 then levs2
+# order, if several pairs have the same shear). All pairs are compared in one pass, over blocks of
+# forecast times so the pair arrays stay within batch_limit bytes. The shear is calculated in the
+# working precision (float32), with dtype=np.float64 it matches the float64 loops of the plotting
+# scripts it replaced exactly (see precision_report.py for the difference).
+
+def max_shear(gfsfile, levs1, levs2, dtype=None):
+
+   dtype = _dtype(dtype)
+
+   def compute(window):
+      u1 = _stack([_level(gfsfile, "UGRD_P0_L100_GLL0", lev, window, dtype) for lev in levs1], dtype)
+      v1 = _stack([_level(gfsfile, "VGRD_P0_L100_GLL0", lev, window, dtype) for lev in levs1], dtype)
+      u2 = _stack([_level(gfsfile, "UGRD_P0_L100_GLL0", lev, window, dtype) for lev in levs2], dtype)
+      v2 = _stack([_level(gfsfile, "VGRD_P0_L100_GLL0", lev, window, dtype) for lev in levs2], dtype)
+
+      pairs = len(levs1)*len(levs2)
+      shape = u1.shape[1:]
+      fields = np.empty((3,)+shape, dtype=dtype)
+
+      # blocks along the first dimension (forecast times, or rows for a file without a time
+      # dimension), each pair array is pairs x block x the rest of the field
+
+      step = max(int(batch_limit//(dtype.itemsize*pairs*int(np.prod(shape[1:])))), 1)
+
+      # working arrays for the largest block, the last block uses the start of them
+
+      size = pairs*min(step, shape[0])*int(np.prod(shape[1:]))
+      working = [gfs_io.buffer((size,), dtype) for k in range(4)]
+
+      for start in range(0, shape[0], step):
+         block = slice(start, start+step)
+         block_shape = (len(levs1), len(levs2))+u1[0,block].shape
+         u_diff, v_diff, shear, v_square = [w[:int(np.prod(block_shape))].reshape(block_shape) for w in working]
+
+         np.subtract(u2[None,:,block], u1[:,None,block], out=u_diff)
+         np.subtract(v2[None,:,block], v1[:,None,block], out=v_diff)
+         u_diff, v_diff, shear, v_square = [a.reshape((pairs,)+block_shape[2:]) for a in (u_diff, v_diff, shear, v_square)]
+
+         np.square(u_diff, out=shear)
+         np.add(shear, np.square(v_diff, out=v_square), out=shear)
+         np.sqrt(shear, out=shear)
+
+         pair = np.argmax(shear, axis=0)[None]
+
+         fields[0,block] = np.take_along_axis(shear, pair, axis=0)[0]
+         fields[1,block] = np.take_along_axis(u_diff, pair, axis=0)[0]
+         fields[2,block] = np.take_along_axis(v_diff, pair, axis=0)[0]
+
+      return fields
+
+   field = _derived(gfsfile, "max_shear_%s_%s" % ("_".join("%d" % lev for lev in levs1), "_".join("%d" % lev for lev in levs2)), compute, dtype)
+
+   return tuple(gfs_io.Window(field.data[k], field.window, field.grid_shape, lambda key, k=k: field.fallback((k,)+key)) for k in range(3))
+
+# dewpoint temperature (over water) at level index lev from temperature and relative humidity
+
+def dewpoint(gfsfile, lev, dtype=None):
+
+   dtype = _dtype(dtype)
+
+   def compute(window):
+      temp = _level(gfsfile, "TMP_P0_L100_GLL0", lev, window, dtype)
+      rh = np.divide(_level(gfsfile, "RH_P0_L100_GLL0", lev, window, dtype), 100.0, out=gfs_io.buffer(temp.shape, dtype))
+      mask = gfs_io.buffer(temp.shape, np.bool_)
+      np.copyto(rh, 0.0001, where=np.equal(rh, 0.0, out=mask))
+
+      warm = np.greater(temp, 273.15, out=mask)
+
+      c1 = 6.10780
+      c2 = gfs_io.buffer(temp.shape, dtype)
+      c2[...] = dtype.type(17.84362)
+      np.copyto(c2, dtype.type(17.08085), where=warm)
+      c3 = gfs_io.buffer(temp.shape, dtype)
+      c3[...] = dtype.type(245.425)
+      np.copyto(c3, dtype.type(234.175), where=warm)
+
+      # ps = c1*exp((c2*(temp-273.15))/(c3+(temp-273.15))), pd = ps*rh
+
+      tc = np.subtract(temp, 273.15, out=gfs_io.buffer(temp.shape, dtype))
+      pd = np.multiply(c2, tc, out=gfs_io.buffer(temp.shape, dtype))
+      np.divide(pd, np.add(c3, tc, out=tc), out=pd)
+      np.exp(pd, out=pd)
+      np.multiply(c1, pd, out=pd)
+      np.multiply(pd, rh, out=pd)
+
+      # ((log(pd/c1))*c3*-1.0)/((log(pd/c1))-c2)
+
+      log_pd = np.log(np.divide(pd, c1, out=pd), out=pd)
+      top = np.multiply(log_pd, c3, out=rh)
+      np.multiply(top, -1.0, out=top)
+
+      return top/np.subtract(log_pd, c2, out=log_pd)
+
+   return _derived(gfsfile, "dewpoint_%d" % (lev), compute, dtype)
+
+# potential temperature at level index lev, levs_p are the pressure levels (hPa) of the file
+
+def theta(gfsfile, lev, levs_p, dtype=None):
+
+   dtype = _dtype(dtype)
+
+   def compute(window):
+      return _level(gfsfile, "TMP_P0_L100_GLL0", lev, window, dtype)*((1000.0/float(levs_p[lev]))**0.286)
+
+   return _derived(gfsfile, "theta_%d" % (lev), compute, dtype)
+
+# potential vorticity (PVU) at level index lev from the absolute vorticity and the vertical
+# gradient of potential temperature across the levels either side (a centred difference, only the
+# temperature either side is read), levs_p are the pressure levels (hPa) of the file. If lev is a
+# list of level indices PV is calculated for all of them together, temperature levels shared by
+# neighbouring levels are read once, and a tuple of fields is returned.
+
+def pv(gfsfile, lev, levs_p, dtype=None):
+
+   dtype = _dtype(dtype)
+
+   if isinstance(lev, list):
+      levs = lev
+   else:
+      levs = [lev]
+
+   batch = {}
+
+   def compute_all(window):
+      t = {}
+      for l in sorted(set([l-1 for l in levs]+[l+1 for l in levs])):
+         t[l] = _level(gfsfile, "TMP_P0_L100_GLL0", l, window, dtype)
+
+      p_below = np.array([float(levs_p[l-1])*100.0 for l in levs], dtype=dtype).reshape((len(levs),)+(1,)*t[levs[0]-1].ndim)
+      p_above = np.array([float(levs_p[l+1])*100.0 for l in levs], dtype=dtype).reshape(p_below.shape)
+
+      theta_below = _stack([t[l-1] for l in levs], dtype)
+      np.multiply(theta_below, (100000.0/p_below)**0.286, out=theta_below)
+      theta_above = _stack([t[l+1] for l in levs], dtype)
+      np.multiply(theta_above, (100000.0/p_above)**0.286, out=theta_above)
+
+      # ((theta_above-theta_below)/2.0)/((p_above-p_below)/2.0)
+
+      dthdp = np.subtract(theta_above, theta_below, out=theta_above)
+      np.divide(dthdp, 2.0, out=dthdp)
+      np.divide(dthdp, (p_above-p_below)/2.0, out=dthdp)
+
+      avort = _stack([_level(gfsfile, "ABSV_P0_L100_GLL0", l, window, dtype) for l in levs], dtype)
+
+      # -G*(avort)*dthdp*10.0**5
+
+      G = 9.80665
+      np.multiply(-G, avort, out=avort)
+      np.multiply(avort, dthdp, out=avort)
+
+      return avort*10.0**5
+
+   def compute(window, k):
+      if window not in batch:
+         batch[window] = compute_all(window)
+      return batch[window][k]
+
+   fields = tuple(_derived(gfsfile, "pv_%d" % (l), lambda window, k=k: compute(window, k), dtype) for k, l in enumerate(levs))
+
+   if isinstance(lev, list):
+      return fields
+
+   return fields[0]
@@ -0,0 +1,315 @@
+###################################################################################################
+# Project           : Global Challenges Research Fund (GCRF) African SWIFT (Science for Weather
+#                     Information and Forecasting Techniques.
+#
+# Program name      : extract_regions.py
+#
+# Author            : Alexander J. Roberts, University of Leeds, NCAS
+#
+# Date created      : Oct 2026
+#
+# Purpose           : Write compact regional copies of the GFS analysis and forecast netCDF files
+#                     for each region in the namelist, holding only the variables and pressure
+#                     levels the plotting jobs for that region need (from the "requires" entries of
+#                     the plotting scripts, see scheduler.py) on the region's box plus one grid point.
+#                     Files are written as compressed NetCDF4 (classic model) chunked by forecast
+#                     time and level so a plotting job only decompresses the fields it reads. Boxes
+#                     crossing the Greenwich Meridian are stored in one piece with lon values from
+#                     -180 to 180. The plotting scripts and the plot.py scheduler open the regional
+#                     file (e.g. GFS_forecast_YYYYMMDD_HH_WA.nc) instead of the global one when it
+#                     exists (see gfs_io.open_file).
+#
+# Revision History  : Oct 2026 - extract from the GRIB2 manifests of a cycle (see grib_io.py) when
+#                                it has not been converted to netCDF
+#
+# Usage             : Run from the directory holding the converted files (see convert_GFS.sh)
+#                     "python3 extract_regions.py YYYYMMDDHH"
+###################################################################################################
+
+import os
+import sys
+import numpy as np
+import Nio as nio
+
+import controls
+import gfs_io
+import geometry
+import scheduler
+
+# extra grid points kept around the region, the plotting scripts pad their boxes by 2 grid points
+# which are already part of the region geometry
+
+margin = 1
+
+# compression level of the regional files
+
+compression = 4
+
+###################################################################################################
+
+# plotting jobs for each region in the namelist, in the same form as the list built by plot.py
+
+def plotting_jobs(GFS_dir, init_dt):
+
+   namelist = controls.read_namelist(GFS_dir)
+   domains_dict = controls.read_domains(GFS_dir+"/controls/domains")
+
+   jobs = {}
+
+   for region in namelist["region"]:
+      if region not in domains_dict:
+         continue
+      latlon = ["%s" % (ll) for ll in domains_dict[region]]
+
+      jobs[region] = []
+      for entry in namelist["m_lev_vars"]:
+         var = entry.split()[0]
+         for lev in entry.split()[1:]:
+            jobs[region].append({"pyver": "python3", "var": var+".py", "time": init_dt, "lat1": latlon[0], "lon1": latlon[1], "lat2": latlon[2], "lon2": latlon[3], "lev": lev, "region": region})
+      for var in namelist["s_lev_vars"]:
+         jobs[region].append({"pyver": "python3", "var": var+".py", "time": init_dt, "lat1": latlon[0], "lon1": latlon[1], "lat2": latlon[2], "lon2": latlon[3], "lev": "", "region": region})
+
+   return jobs
+
+# variables (and their level indices, None for all levels) read by a list of plotting jobs, from
+# the data load jobs of the scheduler graph
+
+def needed_fields(jobs):
+
+   fields = {}
+
+   for node in scheduler.build_graph(jobs).values():
+      if node.kind == "load":
+         fields.setdefault(node.payload["name"], set()).add(node.payload["lev"])
+
+   return fields
+
+# level dimension of a variable, None for single level fields
+
+def _level_dim(var):
+
+   dims = var.dimensions
+   if len(dims) == 4:
+      return dims[1]
+   elif len(dims) == 3 and not dims[0].startswith("forecast_time"):
+      return dims[0]
+
+   return None
+
+# level indices to keep for each level dimension. Only pressure level dimensions are cut down (the
+# plotting scripts find pressure levels by value, other levels are read by index), all their
+# levels are kept if any job reads a variable on them for all levels.
+
+def level_indices(handles, fields):
+
+   keep = {}
+
+   for handle in handles:
+      for name in fields:
+         if name not in handle.variables:
+            continue
+         level_dim = _level_dim(handle.variables[name])
+         if level_dim is None or not level_dim.startswith("lv_ISBL"):
+            continue
+         if None in fields[name] or keep.get(level_dim, set()) is None:
+            keep[level_dim] = None
+         else:
+            keep[level_dim] = keep.get(level_dim, set()) | fields[name]
+
+   return dict((dim, None if levs is None else sorted(levs)) for dim, levs in keep.items())
+
+# rows and parts of the columns of the grid held in the regional file, from the region geometry on
+# the global grid. For boxes crossing the Greenwich Meridian the last column of the grid is left
+# out, as it is by the plotting scripts.
+
+def regional_box(geom, nlat, nlon):
+
+   rows = slice(max(geom.lat_box1-margin, 0), min(geom.lat_box2+margin, nlat))
+
+   if geom.wrap:
+      cols = [slice(geom.lon_box2-margin, geom.lon_box3), slice(0, geom.lon_box1+margin)]
+   else:
+      cols = [slice(max(geom.lon_box1-margin, 0), min(geom.lon_box2+margin, nlon))]
+
+   return rows, cols
+
+###################################################################################################
+
+# read a variable (lead are the indices of the dimensions before lat and lon) on the regional box
+
+def _read(var, lead, rows, cols):
+
+   parts = [var[lead+(rows, c)] for c in cols]
+   if len(parts) == 1:
+      return parts[0]
+
+   if any(np.ma.isMaskedArray(part) for part in parts):
+      return np.ma.concatenate(parts, axis=-1)
+
+   return np.concatenate(parts, axis=-1)
+
+# write the regional file for one region of a GFS netCDF file
+
+def extract(path, region, geom, fields, keep):
+
+   handle = gfs_io.open_handle(path)[1]
+   out_path = controls.regional_path(path, region)
+   tmp_path = out_path[:-3]+".tmp.nc"
+
+   nlat = handle.variables["lat_0"].shape[0]
+   nlon = handle.variables["lon_0"].shape[0]
+   rows, cols = regional_box(geom, nlat, nlon)
+
+   names = [name for name in sorted(fields) if name in handle.variables]
+
+   # dimensions of the variables written and their sizes in the regional file
+
+   sizes = {}
+   for name in names:
+      var = handle.variables[name]
+      for dim, size in zip(var.dimensions, var.shape):
+         sizes[dim] = size
+   for dim in keep:
+      if dim in sizes and keep[dim] is not None:
+         sizes[dim] = len(keep[dim])
+   sizes["lat_0"] = len(range(*rows.indices(nlat)))
+   sizes["lon_0"] = sum(len(range(*c.indices(nlon))) for c in cols)
+
+   if os.path.isfile(tmp_path):
+      os.remove(tmp_path)
+
+   opt = nio.options()
+   opt.Format = "NetCDF4Classic"
+   opt.CompressionLevel = compression
+
+   regional = nio.open_file(tmp_path, "c", options=opt)
+
+   for att in getattr(handle, "attributes", {}):
+      setattr(regional, att, handle.attributes[att])
+
+   for dim in sorted(sizes):
+      regional.create_dimension(dim, sizes[dim])
+
+   # one chunk per forecast time and level
+
+   if hasattr(regional, "create_chunk_dimension"):
+      for dim in sorted(sizes):
+         if dim in ["lat_0", "lon_0"]:
+            regional.create_chunk_dimension(dim, sizes[dim])
+         else:
+            regional.create_chunk_dimension(dim, 1)
+
+   def create(name, dims, data):
+      var = handle.variables[name]
+      new = regional.create_variable(name, var.typecode(), dims)
+      for att in getattr(var, "attributes", {}):
+         setattr(new, att, var.attributes[att])
+      new.assign_value(data)
+
+   # coordinate variables
+
+   for dim in sorted(sizes):
+      if dim not in handle.variables:
+         continue
+      values = handle.variables[dim][:]
+      if dim == "lat_0":
+         values = values[rows]
+      elif dim == "lon_0":
+         values = np.concatenate([values[c] for c in cols])
+         if geom.wrap:
+            values = np.where(values >= 180.0, values-360.0, values)
+      elif keep.get(dim) is not None:
+         values = values[keep[dim]]
+      create(dim, (dim,), values)
+
+   # fields, read one level at a time on the regional box
+
+   for name in names:
+      var = handle.variables[name]
+      level_dim = _level_dim(var)
+
+      if level_dim is None:
+         data = _read(var, (slice(None),)*(len(var.dimensions)-2), rows, cols)
+      else:
+         if keep.get(level_dim) is None:
+            levs = range(var.shape[var.dimensions.index(level_dim)])
+         else:
+            levs = keep[level_dim]
+         if len(var.dimensions) == 4:
+            data = [_read(var, (slice(None), lev), rows, cols) for lev in levs]
+            data = np.ma.stack(data, axis=1) if any(np.ma.isMaskedArray(d) for d in data) else np.stack(data, axis=1)
+         else:
+            data = [_read(var, (lev,), rows, cols) for lev in levs]
+            data = np.ma.stack(data) if any(np.ma.isMaskedArray(d) for d in data) else np.stack(data)
+
+      create(name, var.dimensions, data)
+
+   regional.close()
+   handle.close()
+
+   os.rename(tmp_path, out_path)
+
+   return out_path
+
+###################################################################################################
+
+if __name__ == "__main__":
+
+   GFS_dir = os.environ['SWIFT_GFS']
+
+   if len(sys.argv) < 2:
+      sys.exit("Usage: python3 extract_regions.py YYYYMMDDHH")
+
+   init_dt = sys.argv[1]
+
+   filis = [os.getcwd()+"/"+fili for fili in ["analysis_gfs_4_%s_%s00_000.nc" % (init_dt[:8], init_dt[8:10]), "GFS_forecast_%s_%s.nc" % (init_dt[:8], init_dt[8:10])] if controls.exists(fili)]
+
+   if len(filis) == 0:
+      sys.exit("No GFS files for %s in %s" % (init_dt, os.getcwd()))
+
+   jobs = plotting_jobs(GFS_dir, init_dt)
+
+   # regional files from an earlier extraction would be picked up when building the job graph
+
+   for region in jobs:
+      for fili in filis:
+         if os.path.isfile(controls.regional_path(fili, region)):
+            os.remove(controls.regional_path(fili, region))
+
+   for region in jobs:
+
+      fields = needed_fields(jobs[region])
+      handles = [gfs_io.open_handle(fili)[1] for fili in filis]
+      keep = level_indices(handles, fields)
+      for handle in handles:
+         handle.close()
+
+      # region geometry on the global grid, with the corners arranged as the plotting scripts
+      # arrange them
+
+      latbl, lonbl, lattr, lontr = [float(ll) for ll in (jobs[region][0]["lat1"], jobs[region][0]["lon1"], jobs[region][0]["lat2"], jobs[region][0]["lon2"])]
+      if latbl < lattr:
+         latbl, lattr = lattr, latbl
+      if lonbl > lontr:
+         lonbl, lontr = lontr, lonbl
+
+      geom = geometry.region(gfs_io.open_file(filis[0]), latbl, lonbl, lattr, lontr)
+
+      written = []
+      for fili in filis:
+         written.append(extract(fili, region, geom, fields, keep))
+         print("Written %s" % (written[-1]))
+
+      # the region must come out the same on the regional grid, otherwise the global files are
+      # used for it
+
+      regional = nio.open_file(written[0])
+      check = geometry.Region.calculate(regional.variables["lat_0"][:], regional.variables["lon_0"][:], geom.latbl, geom.lonbl, geom.lattr, geom.lontr, False)
+      regional.close()
+
+      if not (np.array_equal(check.lat, geom.lat) and np.array_equal(check.lon, geom.lon)):
+         print("Region %s differs on the regional grid, removing regional files" % (region))
+         for fili in written:
+            os.remove(fili)
+
+   gfs_io.close_all()
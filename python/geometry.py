@@ -0,0 +1,259 @@
+###################################################################################################
+# Project           : Global Challenges Research Fund (GCRF) African SWIFT (Science for Weather
+#                     Information and Forecasting Techniques.
+#
+# Program name      : geometry.py
+#
+# Author            : Alexander J. Roberts, University of Leeds, NCAS
+#
+# Date created      : Oct 2026
+#
+# Purpose           : Region geometry for the SWIFT_GFSplotting scripts. Works out the lat and lon
+#                     indices of a plotting region (including the split of boxes crossing the
+#                     Greenwich Meridian), the lat and lon values of the region and the 2d lat and
+#                     lon arrays once per grid and region. Results are kept for the lifetime of the
+#                     process and stored in a geometry directory of the field cache (see gfs_io.py),
+#                     named by a hash of the grid, so they are reused by later cycles as long as
+#                     the GFS grid does not change.
+#
+# Revision History  : Oct 2026 - cut regions out of fields without reading the full grid or
+#                                concatenating the parts either side of the Greenwich Meridian
+#                     Oct 2026 - regional files hold boxes crossing the Greenwich Meridian in
+#                                one piece
+#                     Oct 2026 - take the arrays for boxes crossing the Greenwich Meridian from
+#                                the gfs_io pool of working arrays
+#
+# Usage             : import geometry
+#                     geom = geometry.region(analysis, latbl, lonbl, lattr, lontr)
+#                     u = geometry.cut(analysis.variables["UGRD_P0_L100_GLL0"], geom, lev_index)
+###################################################################################################
+
+import os
+import sys
+import hashlib
+import numpy as np
+
+import gfs_io
+
+_grids = {}
+_regions = {}
+
+###################################################################################################
+
+# True if a box crosses the Greenwich Meridian (the plotting scripts make the same check before
+# reading each field)
+
+def crosses_greenwich(lonbl, lontr):
+
+   return (np.sign(lonbl) + np.sign(lontr)) >= -1 and (np.sign(lonbl) + np.sign(lontr)) <= 1
+
+###################################################################################################
+
+# lat and lon values of the grid of an open GFSFile and a hash identifying the grid
+
+def _grid(gfsfile):
+
+   if gfsfile.path not in _grids:
+      lat = np.asarray(gfsfile.variables["lat_0"][:])
+      lon = np.asarray(gfsfile.variables["lon_0"][:])
+
+      grid_hash = hashlib.sha1()
+      for values in (lat, lon):
+         grid_hash.update(str(values.dtype).encode())
+         grid_hash.update(np.ascontiguousarray(values).tobytes())
+
+      _grids[gfsfile.path] = (grid_hash.hexdigest()[:16], lat, lon)
+
+   return _grids[gfsfile.path]
+
+###################################################################################################
+
+# geometry of the region with corners latbl, lonbl, lattr and lontr (after they have been arranged
+# by the plotting script) on the grid of gfsfile
+
+def region(gfsfile, latbl, lonbl, lattr, lontr):
+
+   grid_hash, lat_grid, lon_grid = _grid(gfsfile)
+
+   if crosses_greenwich(lonbl, lontr):
+      lonbl, lontr = lontr, lonbl
+
+   # the box is only split if the grid runs from 0 to 360, regional files (see extract_regions.py)
+   # already hold boxes crossing the Greenwich Meridian in one piece with lon values from -180
+
+   wrap = crosses_greenwich(lonbl, lontr) and np.max(lon_grid) >= 180.0
+
+   key = "%s_%.4f_%.4f_%.4f_%.4f" % (grid_hash, latbl, lonbl, lattr, lontr)
+
+   if key not in _regions:
+
+      if gfsfile.cache_dir is None:
+         geom_dir = None
+      else:
+         geom_dir = os.path.join(os.path.dirname(gfsfile.cache_dir), "geometry")
+
+      geom = None
+      if geom_dir is not None and os.path.isfile(os.path.join(geom_dir, key+".npz")):
+         try:
+            geom = Region.load(os.path.join(geom_dir, key+".npz"), latbl, lonbl, lattr, lontr)
+         except (IOError, ValueError, KeyError):
+            geom = None
+
+      if geom is None:
+         geom = Region.calculate(lat_grid, lon_grid, latbl, lonbl, lattr, lontr, wrap)
+
+         if geom_dir is not None:
+            geom.save(geom_dir, key)
+
+      _regions[key] = geom
+
+   return _regions[key]
+
+###################################################################################################
+
+# cut a region out of a gridded field. source is anything indexed with lat and lon as its last two
+# dimensions (a gfs_io variable, a derived field or an array), lead are the indices of the other
+# dimensions (e.g. forecast time and level index). Only the region is read from the source: for
+# boxes crossing the Greenwich Meridian the two parts either side of it are copied straight into
+# one output array (from the gfs_io pool of working arrays), otherwise the region is returned as
+# read (a view of the field cache). If out is given the region is written into it.
+
+def cut(source, geom, *lead, out=None):
+
+   rows = slice(geom.lat_box1, geom.lat_box2)
+
+   if not geom.wrap:
+      data = source[lead+(rows, slice(geom.lon_box1, geom.lon_box2))]
+      if out is None:
+         return data
+      out[...] = data
+      return out
+
+   west = source[lead+(rows, slice(geom.lon_box2, geom.lon_box3))]
+   east = source[lead+(rows, slice(0, geom.lon_box1))]
+
+   if out is None:
+      out = gfs_io.buffer(west.shape[:-1]+(west.shape[-1]+east.shape[-1],), np.result_type(west, east))
+
+   out[...,:west.shape[-1]] = west
+   out[...,west.shape[-1]:] = east
+
+   return out
+
+###################################################################################################
+
+# lat and lon indices of a region (lat_box1:lat_box2 rows, lon_box1:lon_box2 columns or, for
+# boxes crossing the Greenwich Meridian on a 0 to 360 grid, columns lon_box2:lon_box3 followed by
+# 0:lon_box1, wrap is then True), lat and lon values of the region and 2d lat and lon arrays. lonbl
+# and lontr are swapped for boxes crossing the Greenwich Meridian, as the plotting scripts use them
+# for the map limits.
+
+class Region(object):
+
+   def __init__(self, latbl, lonbl, lattr, lontr, boxes, lat, lon, lat2d, lon2d):
+      self.latbl = latbl
+      self.lonbl = lonbl
+      self.lattr = lattr
+      self.lontr = lontr
+      self.lat_box1, self.lat_box2, self.lon_box1, self.lon_box2, self.lon_box3 = boxes
+      self.wrap = self.lon_box3 is not None
+      self.lat = lat
+      self.lon = lon
+      self.lat2d = lat2d
+      self.lon2d = lon2d
+
+   @classmethod
+   def calculate(cls, lat_temp, lon1, latbl, lonbl, lattr, lontr, wrap):
+
+      # lat indices
+
+      latbl_idx = (np.abs(lat_temp-latbl)).argmin()
+      lattr_idx = (np.abs(lat_temp-lattr)).argmin()
+
+      if latbl_idx == lattr_idx:
+         sys.exit('lat values are not different enough, they must have relate to different grid points')
+      elif latbl_idx > 1 and lattr_idx < len(lat_temp)-2:
+         lat_box1 = latbl_idx-2
+         lat_box2 = lattr_idx+2
+      else:
+         lat_box1 = latbl_idx
+         lat_box2 = lattr_idx
+
+      lat = lat_temp[lat_box1:lat_box2]
+
+      # lon indices, boxes crossing the Greenwich Meridian use lon values from -180 to 180
+
+      if wrap:
+
+         lon_temp = np.where(lon1[:]>=180.0, lon1[:]-360.0, lon1[:])
+
+         lonbl_idx = (np.abs(lon_temp-lonbl)).argmin()
+         lontr_idx = (np.abs(lon_temp-lontr)).argmin()
+
+         if lonbl_idx == lontr_idx:
+            sys.exit('lon values are not different enough, they must have relate to different grid points')
+         elif lontr_idx > len(lon_temp)/2 and lonbl_idx <= len(lon_temp)/2:
+            lon_box1 = lonbl_idx+2
+            lon_box2 = lontr_idx-2
+         else:
+            lon_box1 = lonbl_idx
+            lon_box2 = lontr_idx
+         lon_box3 = len(lon_temp)-1
+
+         lon = np.append(lon_temp[lon_box2:lon_box3], lon_temp[0:lon_box1])
+
+      else:
+
+         lon_temp = lon1[:]
+
+         lonbl_idx = (np.abs(lon_temp-min(lonbl, lontr))).argmin()
+         lontr_idx = (np.abs(lon_temp-max(lonbl, lontr))).argmin()
+
+         if lonbl_idx == lontr_idx:
+            sys.exit('lon values are not different enough, they must have relate to different grid points')
+         elif lonbl_idx > 1 and lontr_idx < len(lon_temp)-2:
+            lon_box1 = lonbl_idx-2
+            lon_box2 = lontr_idx+2
+         else:
+            lon_box1 = lonbl_idx
+            lon_box2 = lontr_idx
+         lon_box3 = None
+
+         lon = lon_temp[lon_box1:lon_box2]
+
+      # 2d lat and lon
+
+      lon2d, lat2d = np.meshgrid(lon.astype(np.float64), lat.astype(np.float64))
+
+      boxes = (int(lat_box1), int(lat_box2), int(lon_box1), int(lon_box2), lon_box3)
+
+      return cls(latbl, lonbl, lattr, lontr, boxes, lat, lon, lat2d, lon2d)
+
+   @classmethod
+   def load(cls, path, latbl, lonbl, lattr, lontr):
+
+      stored = np.load(path)
+      try:
+         boxes = [int(b) for b in stored["boxes"]]
+         if boxes[4] < 0:
+            boxes[4] = None
+         return cls(latbl, lonbl, lattr, lontr, tuple(boxes), stored["lat"], stored["lon"], stored["lat2d"], stored["lon2d"])
+      finally:
+         stored.close()
+
+   def save(self, geom_dir, key):
+
+      if self.lon_box3 is None:
+         lon_box3 = -1
+      else:
+         lon_box3 = self.lon_box3
+      boxes = np.array([self.lat_box1, self.lat_box2, self.lon_box1, self.lon_box2, lon_box3])
+
+      try:
+         if not os.path.isdir(geom_dir):
+            os.makedirs(geom_dir)
+         tmp = os.path.join(geom_dir, "%s.%d.tmp.npz" % (key, os.getpid()))
+         np.savez(tmp, boxes=boxes, lat=self.lat, lon=self.lon, lat2d=self.lat2d, lon2d=self.lon2d)
+         os.rename(tmp, os.path.join(geom_dir, key+".npz"))
+      except OSError:
+         pass
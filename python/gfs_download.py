@@ -0,0 +1,285 @@
+###################################################################################################
+# Project           : Global Challenges Research Fund (GCRF) African SWIFT (Science for Weather
+#                     Information and Forecasting Techniques.
+#
+# Program name      : gfs_download.py
+#
+# Author            : Alexander J. Roberts, University of Leeds, NCAS
+#
+# Date created      : Oct 2026
+#
+# Purpose           : Download the GRIB2 files of the lead times of a GFS cycle over HTTP, a few at
+#                     a time. Every lead time waits for its own file: a file is fetched as soon as
+#                     its .idx inventory is on the server (NCEP writes it once the GRIB2 file is
+#                     complete) and the lead times that are not there yet are asked for again every
+#                     5 minutes (up to 24 times) without holding up the others. At most
+#                     SWIFT_GFS_CONNECTIONS (default 4) files are downloaded at once, each over a
+#                     connection kept open for the files that follow it. The download goes to a
+#                     .part file which is carried on from where it stopped if the connection drops,
+#                     and it is only given the name of the GRIB2 file once it has been checked to
+#                     be a run of complete GRIB2 messages. With "idx" only the messages the
+#                     plotting scripts in the namelist need are downloaded (see idx_download.py).
+#                     Whole files are kept in the local GRIB2 cache and taken from it when they
+#                     are there (see grib_cache.py). Only needs the standard library so it can run
+#                     outside the pyn_env environment.
+#
+#                     The server is given by SWIFT_GFS_URL as for idx_download.py, e.g. the stand-in
+#                     server of "python3 idx_download.py serve directory port" for testing.
+#                     SWIFT_GFS_POLL gives the time in seconds between two attempts at a file.
+#
+# Revision History  : Oct 2026 - whole files kept in and taken from the local GRIB2 cache
+#                     Oct 2026 - ranges that stop short are carried on rather than taken as complete
+#
+# Usage             : Run from the directory the GRIB2 files are downloaded to (see
+#                     get_GFS_operational.sh and stream_GFS.sh)
+#                     "python3 gfs_download.py YYYYMMDDHH 000 003 006 ..."
+#                     "python3 gfs_download.py idx YYYYMMDDHH 000 003 006 ..."
+###################################################################################################
+
+import os
+import sys
+import time
+import asyncio
+import threading
+import http.client
+import concurrent.futures
+
+import conversion_vars
+import grib_cache
+import idx_download
+
+connections = int(os.environ.get("SWIFT_GFS_CONNECTIONS", "4"))
+
+# seconds between two attempts at a file and the number of attempts
+
+poll = int(os.environ.get("SWIFT_GFS_POLL", "300"))
+attempts = 24
+
+chunk = 1 << 20
+
+###################################################################################################
+
+# byte ranges still to be downloaded when done bytes of the ranges have already been written
+
+def remaining(ranges, done):
+
+   left = []
+   for start, end in ranges:
+      if end is not None and end-start+1 <= done:
+         done = done-(end-start+1)
+         continue
+      left.append((start+done, end))
+      done = 0
+
+   return left
+
+# copy the body of a response to f, leaving out the first skip bytes and stopping after length
+# bytes (at the end if length is None)
+
+def copy(response, f, skip, length):
+
+   copied = 0
+   while length is None or copied < length:
+      n = chunk
+      if skip > 0:
+         n = min(n, skip)
+      elif length is not None:
+         n = min(n, length-copied)
+      data = response.read(n)
+      if len(data) == 0:
+         break
+      if skip > 0:
+         skip = skip-len(data)
+         continue
+      f.write(data)
+      copied = copied+len(data)
+
+   return copied
+
+###################################################################################################
+
+# each thread of the pool keeps its own connection to the server
+
+local = threading.local()
+servers = []
+
+def server(base):
+
+   if not hasattr(local, "server"):
+      local.server = idx_download.Server(base)
+      servers.append(local.server)
+
+   return local.server
+
+# download the GRIB2 file of a lead time (only the needed messages if pairs is not None) to its
+# .part file, carrying on from the end of the .part file. Returns the bytes downloaded, the size of
+# the file and the size of the whole file on the server (None if not known) once the file is
+# complete, or None if the file is not on the server yet or the download stopped
+
+def download(base, init_dt, lead, pairs):
+
+   name = idx_download.grib_name(init_dt, lead)
+   part = name+".part"
+   connection = server(base)
+   f = None
+
+   try:
+      status, content_range, text = connection.get(name+".idx")
+      if status != 200:
+         return None
+
+      if pairs is None:
+         ranges = [(0, None)]
+      else:
+         ranges = idx_download.byte_ranges(idx_download.select(idx_download.read_inventory(text.decode("ascii", "replace")), pairs))
+
+      done = 0
+      if os.path.isfile(part):
+         done = os.path.getsize(part)
+
+      total = None
+      downloaded = 0
+      f = open(part, "ab")
+
+      for start, end in remaining(ranges, done):
+         response = connection.open(name, (start, end))
+         if end is None:
+            length = None
+         else:
+            length = end-start+1
+
+         if response.status == 206:
+            content_range = response.getheader("Content-Range")
+            if content_range is not None and not content_range.endswith("/*"):
+               total = int(content_range.split("/")[-1])
+            copied = copy(response, f, 0, length)
+         elif response.status == 200:
+            # the server does not do range requests and sends the whole file
+            total = response.length
+            copied = copy(response, f, start, length)
+         elif response.status == 416:
+            # the .part file already runs to the end of the file
+            response.read()
+            break
+         else:
+            response.read()
+            return None
+
+         downloaded = downloaded+copied
+
+         # a range that stopped short (the server closed the connection) is carried on from the
+         # last byte written the next time, the .part file is kept
+
+         expected = length
+         if total is not None and (expected is None or total-start < expected):
+            expected = total-start
+         if expected is not None and copied < expected:
+            connection.close()
+            return None
+
+         # the rest of a response cut short by length is read so the connection can be used again
+         response.read()
+
+   except (http.client.HTTPException, OSError):
+      # the connection dropped, the .part file is carried on from the next time
+      connection.close()
+      return None
+
+   finally:
+      if f is not None:
+         f.close()
+
+   # a .part file that is not complete GRIB2 messages after all of its bytes have been downloaded
+   # cannot be carried on, it is downloaded again from the start the next time
+
+   if not idx_download.valid_grib_file(part) or (pairs is None and total is not None and os.path.getsize(part) != total):
+      os.remove(part)
+      return None
+
+   os.rename(part, name)
+
+   if pairs is None:
+      grib_cache.store(init_dt, lead, idx_download.resolution, name)
+
+   return downloaded, os.path.getsize(name), total
+
+# keep trying for the file of a lead time until it has been downloaded or the attempts have run out,
+# at most connections downloads run at once
+
+async def fetch(loop, executor, semaphore, base, init_dt, lead, pairs):
+
+   name = idx_download.grib_name(init_dt, lead)
+
+   # whole files are taken from the local cache if they are there (see grib_cache.py)
+
+   if pairs is None and grib_cache.fetch(init_dt, lead, idx_download.resolution, name):
+      print("%s from the cache" % (name), flush=True)
+      return True
+
+   for attempt in range(attempts):
+      if attempt > 0:
+         await asyncio.sleep(poll)
+
+      async with semaphore:
+         start = time.time()
+         result = await loop.run_in_executor(executor, download, base, init_dt, lead, pairs)
+
+      if result is not None:
+         line = "%s %.1f MB in %.1f s" % (name, result[1]/1.0e6, time.time()-start)
+         if result[2] is not None and result[2] != result[1]:
+            line = line+" (%.1f MB on the server)" % (result[2]/1.0e6)
+         if result[0] < result[1]:
+            line = line+" (carried on from %.1f MB)" % ((result[1]-result[0])/1.0e6)
+         print(line, flush=True)
+         return True
+
+      if attempt < attempts-1:
+         print("%s not complete, trying again in %d s" % (name, poll), flush=True)
+
+   print("%s not available" % (name), flush=True)
+
+   return False
+
+def download_all(init_dt, leads, pairs):
+
+   base = idx_download.url.format(date=init_dt[:8], HH=init_dt[8:10])
+
+   loop = asyncio.get_event_loop()
+   executor = concurrent.futures.ThreadPoolExecutor(max_workers=connections)
+   semaphore = asyncio.Semaphore(connections)
+
+   tasks = [fetch(loop, executor, semaphore, base, init_dt, lead, pairs) for lead in leads]
+   results = loop.run_until_complete(asyncio.gather(*tasks))
+
+   executor.shutdown()
+   for connection in servers:
+      connection.close()
+
+   return results
+
+###################################################################################################
+
+if __name__ == "__main__":
+
+   args = sys.argv[1:]
+   pairs = None
+   if len(args) > 0 and args[0] == "idx":
+      args = args[1:]
+      GFS_dir = os.environ.get("SWIFT_GFS", "")
+      if os.path.isfile(GFS_dir+"/controls/namelist"):
+         pairs = idx_download.wanted(conversion_vars.needed_names(conversion_vars.namelist_scripts(GFS_dir)))
+      else:
+         pairs = []
+
+   if len(args) < 2:
+      sys.exit("Usage: python3 gfs_download.py [idx] YYYYMMDDHH XXX [XXX ...]")
+
+   init_dt = args[0]
+   leads = [lead for lead in args[1:] if not os.path.isfile(idx_download.grib_name(init_dt, lead))]
+
+   start = time.time()
+   results = download_all(init_dt, leads, pairs)
+   print("%d of %d files downloaded in %.1f s" % (sum(results), len(leads), time.time()-start))
+
+   if not all(results):
+      sys.exit(1)
@@ -0,0 +1,577 @@
+###################################################################################################
+# Project           : Global Challenges Research Fund (GCRF) African SWIFT (Science for Weather
+#                     Information and Forecasting Techniques.
+#
+# Program name      : gfs_io.py
+#
+# Author            : Alexander J. Roberts, University of Leeds, NCAS
+#
+# Date created      : Oct 2026
+#
+# Purpose           : Shared data access layer for the SWIFT_GFSplotting scripts. Keeps GFS netCDF
+#                     files open for the lifetime of a process so that plot.py render workers
+#                     running many plotting jobs only open each file once.
+#
+#                     Gridded fields are also served from a cycle level field cache. The first
+#                     read of a variable (and pressure level) reads that field for all forecast
+#                     times from the netCDF file in one go and stores it as a .npy file. Every
+#                     later read, from any plotting job, region or forecast step, memory maps that
+#                     file rather than reading the netCDF file again. Fields are read once per
+#                     cycle and worker processes share the same pages of memory (zero-copy).
+#
+#                     Only the part of the grid covering the domains in the controls/domains
+#                     file (the union bounding box, padded by a few grid points) is read, so the
+#                     bytes read and the memory used scale with the area of the domains rather
+#                     than the global grid. Requests outside it are read from the file directly.
+#
+#                     Gridded fields are served in the working precision, float32 (the precision
+#                     of the GRIB data) so the field cache and the calculations done with it move
+#                     half the bytes of float64. Products that need double precision ask the
+#                     derived.py and kinematics.py functions for float64 with their dtype argument.
+#
+#                     Working arrays (e.g. regions crossing the Greenwich Meridian put together by
+#                     geometry.cut) are taken from a pool of arrays kept by shape and type. The
+#                     plot.py render workers hand them back after each plotting job, so the next
+#                     job for the same region reuses them rather than allocating new ones.
+#
+#                     The cache is kept in a field_cache directory next to the (real) netCDF
+#                     file, or under $SWIFT_GFS_CACHE if set (e.g. /dev/shm/swift_gfs for a RAM
+#                     backed cache). Setting SWIFT_GFS_CACHE=off keeps recently read fields in the
+#                     memory of each process instead.
+#
+# Revision History  : Oct 2026 - read fields on the union bounding box of the domains only, keep
+#                                fields in memory when the field cache is switched off
+#                     Oct 2026 - open regional files (see extract_regions.py) in place of the
+#                                global files when they exist
+#                     Oct 2026 - keep gridded fields in the working precision (float32)
+#                     Oct 2026 - add a pool of working arrays reused between plotting jobs
+#                     Oct 2026 - read the GRIB2 files of a cycle directly (see grib_io.py) when
+#                                it has not been converted to netCDF
+#                     Oct 2026 - open the file of the streamed lead time (see stream_GFS.sh) in
+#                                place of the forecast file, an error if it has not been written
+#                     Oct 2026 - names of the files of a cycle moved to controls.py
+#
+# Usage             : import gfs_io
+#                     analysis = gfs_io.open_file(diri+a_fili)
+#                     u = analysis.variables["UGRD_P0_L100_GLL0"][lev_index,lat_box1:lat_box2,:]
+###################################################################################################
+
+import os
+import fcntl
+import numbers
+import shutil
+import collections
+import numpy as np
+import Nio as nio
+
+import controls
+
+# grid points added around the domains, the plotting scripts pad their boxes by 2 grid points
+
+pad = 3
+
+# bytes of fields each process keeps in memory (per file) when the field cache is switched off
+
+memory_limit = 512*1024*1024
+
+# working precision of gridded fields and derived fields
+
+precision = np.float32
+
+# bytes of free working arrays each process keeps in the pool
+
+buffer_limit = 256*1024*1024
+
+_open_files = {}
+_windows = {}
+_free_buffers = collections.OrderedDict()
+_taken_buffers = []
+
+###################################################################################################
+
+# open a GFS netCDF file, returning the existing handle if this process already has it open and
+# the file has not been replaced since. If region is given and a regional file has been extracted
+# for it (see extract_regions.py) that file is opened instead. If the netCDF file has not been
+# converted the GRIB2 files in its manifest (see grib_io.py) are read instead. When a single lead
+# time is streamed (see controls.streamed_lead) the file holding only that lead time is opened in
+# place of the forecast file.
+
+def open_file(path, region=None):
+
+   path = controls.streamed_path(path)
+
+   if region is not None and os.path.isfile(controls.regional_path(path, region)):
+      path = controls.regional_path(path, region)
+   elif not os.path.isfile(path) and os.path.isfile(controls.grib_manifest(path)):
+      path = controls.grib_manifest(path)
+
+   key = os.path.realpath(path)
+   stat = os.stat(key)
+   ident = (stat.st_mtime, stat.st_size)
+
+   if key in _open_files and _open_files[key][0] == ident:
+      return _open_files[key][1]
+
+   if key in _open_files:
+      _open_files[key][1].close()
+
+   _open_files[key] = (ident, GFSFile(path, open_handle(path)[1]))
+
+   return _open_files[key][1]
+
+# open a GFS netCDF file with PyNIO without the field cache, or the GRIB2 files of its manifest if
+# it has not been converted. Returns the path opened and the handle.
+
+def open_handle(path):
+
+   if not os.path.isfile(path) and os.path.isfile(controls.grib_manifest(path)):
+      path = controls.grib_manifest(path)
+
+   if path.endswith(".grib"):
+      import grib_io
+      return path, grib_io.open_file(path)
+
+   return path, nio.open_file(path)
+
+###################################################################################################
+
+# close all open files, e.g. at the end of a plotting cycle
+
+def close_all():
+
+   for key in list(_open_files.keys()):
+      _open_files.pop(key)[1].close()
+
+###################################################################################################
+
+# directory holding the field cache for a netCDF file, the name includes the file modification
+# time and size so a re-converted file never picks up an old cache
+
+def cache_dir(path):
+
+   real = os.path.realpath(path)
+   stat = os.stat(real)
+   stamp = "%s.%d.%d" % (os.path.basename(real), int(stat.st_mtime), stat.st_size)
+
+   cache_root = os.environ.get("SWIFT_GFS_CACHE", "")
+   if cache_root.lower() == "off":
+      return None
+   if cache_root == "":
+      cache_root = os.path.join(os.path.dirname(real), "field_cache")
+
+   return os.path.join(cache_root, stamp)
+
+# remove the field cache for a netCDF file (all versions), e.g. once a cycle has been plotted
+
+def clear_cache(path):
+
+   cdir = cache_dir(path)
+   if cdir is None or not os.path.isdir(os.path.dirname(cdir)):
+      return
+
+   prefix = os.path.basename(os.path.realpath(path)) + "."
+   for entry in os.listdir(os.path.dirname(cdir)):
+      if entry.startswith(prefix):
+         shutil.rmtree(os.path.join(os.path.dirname(cdir), entry), ignore_errors=True)
+
+###################################################################################################
+
+# part of the grid (first row, last row + 1, first column, number of columns) covering all the
+# domains in the domains file, columns wrap around the Greenwich Meridian / dateline. The full
+# grid if there is no domains file or the file only covers part of the globe (a regional file).
+
+def window(gfsfile):
+
+   domains_file = os.environ.get("SWIFT_GFS", "")+"/controls/domains"
+   if os.path.isfile(domains_file):
+      stamp = os.path.getmtime(domains_file)
+   else:
+      stamp = None
+
+   if gfsfile.path in _windows and _windows[gfsfile.path][0] == stamp:
+      return _windows[gfsfile.path][1]
+
+   lat = gfsfile.handle.variables["lat_0"][:]
+   lon = gfsfile.handle.variables["lon_0"][:]
+   nlat = len(lat)
+   nlon = len(lon)
+
+   if stamp is None or nlon*abs(float(lon[1])-float(lon[0])) < 359.0:
+      box = (0, nlat, 0, nlon)
+   else:
+      rows = []
+      covered = np.zeros(nlon, dtype=bool)
+
+      for latlon in controls.read_domains(domains_file).values():
+         rows.append((np.abs(lat-latlon[0])).argmin())
+         rows.append((np.abs(lat-latlon[2])).argmin())
+
+         west = (np.abs(((lon-min(latlon[1], latlon[3]))+180.0) % 360.0 - 180.0)).argmin()
+         east = (np.abs(((lon-max(latlon[1], latlon[3]))+180.0) % 360.0 - 180.0)).argmin()
+         covered[(west-pad+np.arange(((east-west) % nlon)+2*pad+1)) % nlon] = True
+
+      if len(rows) == 0 or covered.all():
+         first_col = 0
+         ncols = nlon
+      else:
+
+         # the window starts after the largest gap between domains
+
+         start = np.argmax(covered)
+         gaps = np.concatenate(([0], (~np.roll(covered, -start)).astype(int), [0]))
+         edges = np.flatnonzero(np.diff(gaps))
+         gap_starts = edges[0::2]
+         gap_ends = edges[1::2]
+         largest = np.argmax(gap_ends-gap_starts)
+         first_col = (start+gap_ends[largest]) % nlon
+         ncols = nlon-(gap_ends[largest]-gap_starts[largest])
+
+      if len(rows) == 0:
+         box = (0, nlat, int(first_col), int(ncols))
+      else:
+         box = (max(min(rows)-pad, 0), min(max(rows)+pad+1, nlat), int(first_col), int(ncols))
+
+   _windows[gfsfile.path] = (stamp, box)
+
+   return box
+
+# read a window of the grid from a netCDF variable, lead are the indices of the dimensions before
+# lat and lon. Only the rows and columns of the window are read, a window that wraps around the end
+# of the grid is read in two parts straight into one array.
+
+def read_window(var, lead, box):
+
+   rows = slice(box[0], box[1])
+   nlon = var.shape[-1]
+
+   if box[2]+box[3] <= nlon:
+      return var[lead+(rows, slice(box[2], box[2]+box[3]))]
+
+   first = var[lead+(rows, slice(box[2], nlon))]
+   second = var[lead+(rows, slice(0, box[2]+box[3]-nlon))]
+
+   if np.ma.isMaskedArray(first) or np.ma.isMaskedArray(second):
+      return np.ma.concatenate((first, second), axis=-1)
+
+   out = np.empty(first.shape[:-1]+(box[3],), dtype=np.result_type(first, second))
+   out[...,:nlon-box[2]] = first
+   out[...,nlon-box[2]:] = second
+
+   return out
+
+# floating point data in the working precision, or in dtype if given (other data is returned as it
+# is)
+
+def working(data, dtype=None):
+
+   if dtype is None:
+      dtype = precision
+
+   if data.dtype.kind != "f" or data.dtype == np.dtype(dtype):
+      return data
+
+   return data.astype(dtype)
+
+###################################################################################################
+
+# working array of shape and dtype from the pool, allocated if there is no free one. The array is
+# only handed out again after release_buffers has been called.
+
+def buffer(shape, dtype):
+
+   key = (tuple(shape), np.dtype(dtype).str)
+
+   if len(_free_buffers.get(key, [])) > 0:
+      data = _free_buffers[key].pop()
+      _free_buffers[key] = _free_buffers.pop(key)
+   else:
+      data = np.empty(shape, dtype=dtype)
+
+   _taken_buffers.append((key, data))
+
+   return data
+
+# hand back all the working arrays taken from the pool, e.g. at the end of a plotting job. The
+# least recently used arrays are freed once the pool holds more than buffer_limit bytes.
+
+def release_buffers():
+
+   for key, data in _taken_buffers:
+      _free_buffers.setdefault(key, []).append(data)
+      _free_buffers[key] = _free_buffers.pop(key)
+   del _taken_buffers[:]
+
+   while len(_free_buffers) > 0 and sum(data.nbytes for free in _free_buffers.values() for data in free) > buffer_limit:
+      _free_buffers.popitem(last=False)
+
+###################################################################################################
+
+# wrapper around an open PyNIO file that serves gridded fields through the field cache
+
+class GFSFile(object):
+
+   def __init__(self, path, handle):
+      self.path = path
+      self.handle = handle
+      self.cache_dir = cache_dir(path)
+      self.variables = Variables(self)
+      self._fields = {}
+      self._memory = collections.OrderedDict()
+
+   def __getattr__(self, name):
+      return getattr(self.handle, name)
+
+   def close(self):
+      self._fields = {}
+      self._memory = collections.OrderedDict()
+      self.handle.close()
+
+# number of lat and lon points of the grid
+
+   def grid_shape(self):
+
+      return (self.handle.variables["lat_0"].shape[0], self.handle.variables["lon_0"].shape[0])
+
+# pressure levels (hPa, as strings in the same format as the plotting scripts use) of a variable
+# with a level dimension, an empty list for single level fields
+
+   def levels_hPa(self, name):
+
+      dims = self.handle.variables[name].dimensions
+      if len(dims) == 4:
+         level_dim = dims[1]
+      elif len(dims) == 3 and not dims[0].startswith("forecast_time"):
+         level_dim = dims[0]
+      else:
+         return []
+
+      return ['{:.0f}'.format(x) for x in self.handle.variables[level_dim][:]/100.0]
+
+# one cached field (variable, level) on the window of the grid covering the domains, for all
+# forecast times, read from the netCDF file by whichever process needs it first. Returns a Window
+# or None if the field has missing values.
+
+   def field(self, name, lev):
+
+      var = self.handle.variables[name]
+      box = window(self)
+
+      if lev is None:
+         lead = (slice(None),)*(len(var.dimensions)-2)
+         key = name
+      elif len(var.dimensions) == 4:
+         lead = (slice(None), lev)
+         key = "%s_%d" % (name, lev)
+      else:
+         lead = (lev,)
+         key = "%s_%d" % (name, lev)
+
+      data = self.cached("%s_%d_%d_%d_%d" % ((key,)+box), lambda: working(read_window(var, lead, box)))
+      if data is None:
+         return None
+
+      return Window(data, box, self.grid_shape(), lambda key: working(var[lead+key]))
+
+# memory mapped array stored in the field cache under key, computed by whichever process needs it
+# first (compute is called at most once per cycle). If the cache is switched off the array is kept
+# in the memory of this process instead (the most recently used, up to memory_limit bytes). Returns
+# None if the data has missing values, in which case the caller reads or computes it itself.
+
+   def cached(self, key, compute):
+
+      if key in self._fields:
+         return self._fields[key]
+
+      if self.cache_dir is None:
+         return self._in_memory(key, compute)
+
+      base = os.path.join(self.cache_dir, key)
+
+      if not os.path.isfile(base+".npy") and not os.path.isfile(base+".nocache"):
+         if not os.path.isdir(self.cache_dir):
+            try:
+               os.makedirs(self.cache_dir)
+            except OSError:
+               if not os.path.isdir(self.cache_dir):
+                  return None
+
+         lock = open(base+".lock", "w")
+         fcntl.flock(lock, fcntl.LOCK_EX)
+         try:
+            if not os.path.isfile(base+".npy") and not os.path.isfile(base+".nocache"):
+               data = compute()
+
+               # fields with missing values keep their mask by always being read from the file
+
+               if np.ma.is_masked(data):
+                  open(base+".nocache", "w").close()
+               else:
+                  np.save(base+".tmp.npy", np.ma.getdata(data))
+                  os.rename(base+".tmp.npy", base+".npy")
+         finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+            lock.close()
+
+      if os.path.isfile(base+".npy"):
+         self._fields[key] = np.load(base+".npy", mmap_mode="c")
+      else:
+         self._fields[key] = None
+
+      return self._fields[key]
+
+   def _in_memory(self, key, compute):
+
+      if key in self._memory:
+         self._memory[key] = self._memory.pop(key)
+         return self._memory[key]
+
+      data = compute()
+      if np.ma.is_masked(data):
+         data = None
+      else:
+         data = np.ma.getdata(data)
+
+         while len(self._memory) > 0 and sum(d.nbytes for d in self._memory.values() if d is not None)+data.nbytes > memory_limit:
+            self._memory.popitem(last=False)
+
+      self._memory[key] = data
+
+      return data
+
+class Variables(object):
+
+   def __init__(self, gfsfile):
+      self.gfsfile = gfsfile
+
+   def __getitem__(self, name):
+      return Variable(self.gfsfile, name)
+
+   def __contains__(self, name):
+      return name in self.gfsfile.handle.variables
+
+   def keys(self):
+      return self.gfsfile.handle.variables.keys()
+
+# a variable in a GFSFile, indexing it returns data from the field cache when the request is for
+# one or a range of levels (or a single level field) inside the window covering the domains and
+# falls back to reading the netCDF file (only the requested hyperslab) otherwise
+
+class Variable(object):
+
+   def __init__(self, gfsfile, name):
+      self.gfsfile = gfsfile
+      self.name = name
+      self.var = gfsfile.handle.variables[name]
+
+   def __getattr__(self, name):
+      return getattr(self.var, name)
+
+   def __getitem__(self, key):
+
+      if not isinstance(key, tuple):
+         key = (key,)
+
+      dims = self.var.dimensions
+
+      if len(key) != len(dims) or len(dims) < 2 or not (dims[-2].startswith("lat") and dims[-1].startswith("lon")):
+         return self.var[key]
+
+      # position of the level dimension, if there is one
+
+      if len(dims) == 4:
+         lev_axis = 1
+      elif len(dims) == 3 and not dims[0].startswith("forecast_time"):
+         lev_axis = 0
+      else:
+         lev_axis = None
+
+      if lev_axis is None:
+         return self._from_field(None, key, key)
+
+      subkey = key[:lev_axis] + key[lev_axis+1:]
+
+      if _is_index(key[lev_axis]):
+         return self._from_field(int(key[lev_axis]), subkey, key)
+
+      # a range of levels is put together from the cached fields for each level
+
+      levs = range(*key[lev_axis].indices(self.var.shape[lev_axis]))
+      fields = [self.gfsfile.field(self.name, lev) for lev in levs]
+      if len(fields) == 0 or any(field is None for field in fields):
+         return working(self.var[key])
+
+      views = [field.view(subkey) for field in fields]
+      if any(view is None for view in views):
+         return working(self.var[key])
+
+      stack_axis = len([k for k in key[:lev_axis] if not _is_index(k)])
+      return np.stack(views, axis=stack_axis)
+
+# data for key from the cached field for level lev, read from the netCDF file if the field is not
+# cached or key is not inside its window
+
+   def _from_field(self, lev, subkey, key):
+
+      field = self.gfsfile.field(self.name, lev)
+      if field is not None:
+         data = field.view(subkey)
+         if data is not None:
+            return np.asarray(data)
+
+      return working(self.var[key])
+
+# a field held on a window of the grid (box is the first row, last row + 1, first column and
+# number of columns of the window). Indexing it with full grid lat and lon slices returns a view of
+# the window, requests that fall outside the window (e.g. a region that is not in the domains file)
+# are passed to fallback with the full grid key. Indexing with [...,:,:] returns a Window of the
+# selected forecast time / level.
+
+class Window(object):
+
+   def __init__(self, data, box, grid_shape, fallback, lead=()):
+      self.data = data
+      self.window = box
+      self.grid_shape = grid_shape
+      self.fallback = fallback
+      self.lead = lead
+
+   def view(self, key):
+
+      if not isinstance(key, tuple):
+         key = (key,)
+
+      lead = key[:-2]
+      lat_key, lon_key = key[-2:]
+
+      if not (isinstance(lat_key, slice) and isinstance(lon_key, slice) and lat_key.step is None and lon_key.step is None):
+         return None
+
+      lat_start, lat_stop, _ = lat_key.indices(self.grid_shape[0])
+      lon_start, lon_stop, _ = lon_key.indices(self.grid_shape[1])
+
+      row = lat_start-self.window[0]
+      col = (lon_start-self.window[2]) % self.grid_shape[1]
+
+      if row >= 0 and lat_stop <= self.window[1] and col+max(lon_stop-lon_start, 0) <= self.window[3]:
+         return self.data[lead+(slice(row, row+max(lat_stop-lat_start, 0)), slice(col, col+max(lon_stop-lon_start, 0)))]
+
+      return None
+
+   def __getitem__(self, key):
+
+      if not isinstance(key, tuple):
+         key = (key,)
+
+      lead = key[:-2]
+
+      if key[-2:] == (slice(None), slice(None)):
+         return Window(self.data[lead+(slice(None), slice(None))], self.window, self.grid_shape, self.fallback, self.lead+lead)
+
+      data = self.view(key)
+      if data is None:
+         return self.fallback(self.lead+key)
+
+      return data
+
+def _is_index(k):
+   return isinstance(k, (numbers.Integral, np.integer))
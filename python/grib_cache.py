@@ -0,0 +1,215 @@
+###################################################################################################
+# Project           : Global Challenges Research Fund (GCRF) African SWIFT (Science for Weather
+#                     Information and Forecasting Techniques.
+#
+# Program name      : grib_cache.py
+#
+# Author            : Alexander J. Roberts, University of Leeds, NCAS
+#
+# Date created      : Oct 2026
+#
+# Purpose           : Keep the GRIB2 files that have been downloaded (or taken from tape) in a
+#                     local cache so that backfills and plotting cycles again read them from disk
+#                     rather than downloading them again. The files are stored under the SHA-256 of
+#                     their contents (objects/ab/abcdef...) and index.json maps each (cycle, lead
+#                     time, resolution) to a file, so a file is only stored once. Files are hard
+#                     linked into and out of the cache where the cache is on the same file system
+#                     (they are only ever renamed or deleted there, never written to) and copied
+#                     otherwise. When the files take more than SWIFT_GFS_GRIB_CACHE_GB (default 20)
+#                     GB the least recently used ones are removed, 0 turns the cache off. Only
+#                     complete GRIB2 files are stored. Only needs the standard library so it can
+#                     run outside the pyn_env environment.
+#
+#                     The cache is SWIFT_GFS/GRIB_cache (outside GFS_NWP, so cleanup.sh leaves it
+#                     alone) unless SWIFT_GFS_GRIB_CACHE gives another directory. It has its own
+#                     variables, SWIFT_GFS_CACHE belongs to the field cache of gfs_io.py (often a
+#                     RAM backed /dev/shm directory, or off).
+#
+# Revision History  : Oct 2026 - own SWIFT_GFS_GRIB_CACHE and SWIFT_GFS_GRIB_CACHE_GB variables,
+#                                rather than those of the gfs_io.py field cache
+#
+# Usage             : "python3 grib_cache.py get YYYYMMDDHH XXX RESOL file" links the cached file
+#                     to file, exits 1 if it is not in the cache
+#                     "python3 grib_cache.py put YYYYMMDDHH XXX RESOL file" stores file, exits 1
+#                     if it is not a complete GRIB2 file
+#                     "python3 grib_cache.py list" lists the cached files, most recently used last
+###################################################################################################
+
+import os
+import sys
+import time
+import json
+import fcntl
+import shutil
+import hashlib
+
+import idx_download
+
+cache_dir = os.environ.get("SWIFT_GFS_GRIB_CACHE", os.environ.get("SWIFT_GFS", ".")+"/GRIB_cache")
+
+quota = float(os.environ.get("SWIFT_GFS_GRIB_CACHE_GB", "20"))*1.0e9
+
+chunk = 1 << 20
+
+###################################################################################################
+
+def key(init_dt, lead, resol):
+
+   return "%s/%s/%s" % (init_dt, lead, resol)
+
+def object_path(digest):
+
+   return "%s/objects/%s/%s" % (cache_dir, digest[:2], digest)
+
+def sha256(path):
+
+   h = hashlib.sha256()
+   f = open(path, "rb")
+   data = f.read(chunk)
+   while len(data) > 0:
+      h.update(data)
+      data = f.read(chunk)
+   f.close()
+
+   return h.hexdigest()
+
+# hard link src to dst, copying it if they are on different file systems
+
+def link(src, dst):
+
+   try:
+      os.link(src, dst)
+   except OSError:
+      shutil.copyfile(src, dst)
+
+###################################################################################################
+
+# the index is read and written with the cache locked, so that downloads running at the same time
+# (see gfs_download.py) do not lose each other's entries
+
+class Index(object):
+
+   def __enter__(self):
+
+      os.makedirs(cache_dir, exist_ok=True)
+      self.lock = open(cache_dir+"/lock", "w")
+      fcntl.flock(self.lock, fcntl.LOCK_EX)
+
+      if os.path.isfile(cache_dir+"/index.json"):
+         f = open(cache_dir+"/index.json")
+         self.entries = json.load(f)
+         f.close()
+      else:
+         self.entries = {}
+
+      return self
+
+   def write(self):
+
+      f = open(cache_dir+"/index.json.tmp", "w")
+      json.dump(self.entries, f, indent=1, sort_keys=True)
+      f.close()
+      os.rename(cache_dir+"/index.json.tmp", cache_dir+"/index.json")
+
+   def __exit__(self, *args):
+
+      fcntl.flock(self.lock, fcntl.LOCK_UN)
+      self.lock.close()
+
+# remove the least recently used files until the cache is within the quota (an object is used when
+# any of the keys pointing to it is)
+
+def evict(index):
+
+   used = {}
+   sizes = {}
+   for entry in index.entries.values():
+      used[entry["sha256"]] = max(used.get(entry["sha256"], 0.0), entry["used"])
+      sizes[entry["sha256"]] = entry["size"]
+
+   total = sum(sizes.values())
+   for digest in sorted(used, key=lambda digest: used[digest]):
+      if total <= quota:
+         break
+      if os.path.isfile(object_path(digest)):
+         os.remove(object_path(digest))
+      for name in [name for name in index.entries if index.entries[name]["sha256"] == digest]:
+         del index.entries[name]
+      total = total-sizes[digest]
+
+###################################################################################################
+
+# link the cached file of a lead time to dst, returns False if it is not in the cache
+
+def fetch(init_dt, lead, resol, dst):
+
+   if quota <= 0.0:
+      return False
+
+   with Index() as index:
+      entry = index.entries.get(key(init_dt, lead, resol))
+      if entry is None:
+         return False
+
+      path = object_path(entry["sha256"])
+      if not os.path.isfile(path) or os.path.getsize(path) != entry["size"]:
+         del index.entries[key(init_dt, lead, resol)]
+         index.write()
+         return False
+
+      if os.path.isfile(dst+".part"):
+         os.remove(dst+".part")
+      link(path, dst+".part")
+      os.rename(dst+".part", dst)
+
+      entry["used"] = time.time()
+      index.write()
+
+   return True
+
+# store the file of a lead time, returns False if it is not a complete GRIB2 file
+
+def store(init_dt, lead, resol, src):
+
+   if quota <= 0.0 or not os.path.isfile(src) or not idx_download.valid_grib_file(src):
+      return False
+
+   digest = sha256(src)
+   path = object_path(digest)
+
+   with Index() as index:
+      if not os.path.isfile(path):
+         os.makedirs(os.path.dirname(path), exist_ok=True)
+         link(src, path+".part")
+         os.rename(path+".part", path)
+
+      index.entries[key(init_dt, lead, resol)] = {"sha256": digest, "size": os.path.getsize(path), "used": time.time()}
+      evict(index)
+      index.write()
+
+   return True
+
+###################################################################################################
+
+if __name__ == "__main__":
+
+   if len(sys.argv) == 6 and sys.argv[1] == "get":
+      if not fetch(sys.argv[2], sys.argv[3], sys.argv[4], sys.argv[5]):
+         sys.exit(1)
+      print("%s from the cache" % (sys.argv[5]))
+
+   elif len(sys.argv) == 6 and sys.argv[1] == "put":
+      if quota > 0.0 and not store(sys.argv[2], sys.argv[3], sys.argv[4], sys.argv[5]):
+         sys.exit("%s is not a complete GRIB2 file, not cached" % (sys.argv[5]))
+
+   elif len(sys.argv) == 2 and sys.argv[1] == "list":
+      with Index() as index:
+         names = sorted(index.entries, key=lambda name: index.entries[name]["used"])
+         for name in names:
+            entry = index.entries[name]
+            print("%-25s %s %8.1f MB %s" % (name, entry["sha256"][:12], entry["size"]/1.0e6, time.strftime("%Y-%m-%d %H:%M", time.gmtime(entry["used"]))))
+         digests = set(entry["sha256"] for entry in index.entries.values())
+         print("%d files, %.1f MB of %.1f MB" % (len(digests), sum(os.path.getsize(object_path(digest)) for digest in digests if os.path.isfile(object_path(digest)))/1.0e6, quota/1.0e6))
+
+   else:
+      sys.exit("Usage: python3 grib_cache.py get|put YYYYMMDDHH XXX RESOL file\n       python3 grib_cache.py list")
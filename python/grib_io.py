@@ -0,0 +1,454 @@
+###################################################################################################
+# Project           : Global Challenges Research Fund (GCRF) African SWIFT (Science for Weather
+#                     Information and Forecasting Techniques.
+#
+# Program name      : grib_io.py
+#
+# Author            : Alexander J. Roberts, University of Leeds, NCAS
+#
+# Date created      : Oct 2026
+#
+# Purpose           : Read the downloaded GFS GRIB2 files (gfs.tHHz.pgrb2.0p50.fXXX) directly with
+#                     eccodes, so the ncl_convert2nc and cdo conversion in convert_GFS.sh can be
+#                     skipped. Each GRIB2 file is scanned once and an index of its messages (the
+#                     variable, level and forecast step of each message and where it is in the
+#                     file) is stored next to it as a .index.json file. A manifest file listing the
+#                     GRIB2 files of the analysis (f000) or of the forecast steps stands in for each
+#                     converted netCDF file (e.g. GFS_forecast_YYYYMMDD_HH.grib in place of
+#                     GFS_forecast_YYYYMMDD_HH.nc) and is opened by gfs_io.open_file when the netCDF
+#                     file does not exist.
+#
+#                     An open manifest looks like a PyNIO file holding the variables as
+#                     ncl_convert2nc names them (e.g. TMP_P0_L100_GLL0 with dimensions lv_ISBL0,
+#                     lat_0 and lon_0, forecast_time0 first for the forecast steps), indexing a
+#                     variable decodes only the messages of the forecast times and levels asked
+#                     for. Data is returned as float32 (masked where the GRIB2 bitmap has missing
+#                     values).
+#
+# Revision History  : Oct 2026 - manifests of a single lead time for stream_GFS.sh
+#                     Oct 2026 - statistical fields named with their period (e.g. PRATE_P8_L1_GLL0_avg6h)
+#                                and layers keyed by both their bounds, as ncl_convert2nc does, two
+#                                messages of a variable at the same step and level are an error
+#
+# Usage             : Run from the directory holding the GRIB2 files of a cycle (see convert_GFS.sh)
+#                     "python3 grib_io.py YYYYMMDDHH"
+#                     writes the manifests and message indexes of the cycle,
+#                     "python3 grib_io.py YYYYMMDDHH XXX"
+#                     the manifest of lead time XXX only (see stream_GFS.sh), then
+#                     forecast = grib_io.open_file("GFS_forecast_YYYYMMDD_HH.grib")
+###################################################################################################
+
+import os
+import sys
+import glob
+import json
+import numbers
+import numpy as np
+import eccodes
+
+# ncl_convert2nc abbreviations of the GRIB2 parameters (discipline, category, number), others are
+# named VAR_discipline_category_number as ncl_convert2nc does
+
+parameters = {(0, 0, 0): "TMP", (0, 0, 6): "DPT", (0, 1, 0): "SPFH", (0, 1, 1): "RH",
+              (0, 1, 3): "PWAT", (0, 1, 7): "PRATE", (0, 2, 2): "UGRD", (0, 2, 3): "VGRD",
+              (0, 2, 8): "VVEL", (0, 2, 10): "ABSV", (0, 2, 22): "GUST", (0, 3, 0): "PRES",
+              (0, 3, 1): "PRMSL", (0, 3, 5): "HGT", (0, 3, 192): "MSLET", (0, 3, 196): "HPBL",
+              (0, 6, 1): "TCDC", (0, 6, 6): "CWAT", (0, 7, 6): "CAPE", (0, 7, 7): "CIN",
+              (0, 7, 8): "HLCY", (0, 7, 192): "LFTX", (0, 16, 196): "REFC", (0, 19, 0): "VIS"}
+
+# names of the level dimensions of the level types (lv_ISBL0 ...)
+
+level_types = {100: "ISBL", 103: "HTGL", 104: "SIGL", 106: "DBLL", 108: "SPDL", 109: "PVL"}
+
+# suffixes of the statistical processes of product definition template 8 (time averages etc)
+
+statistics = {0: "avg", 1: "acc", 2: "max", 3: "min"}
+
+# version of the message indexes, indexes written by an older version are built again
+
+index_version = 2
+
+###################################################################################################
+
+# name of the index of a GRIB2 file
+
+def index_path(path):
+
+   return path + ".index.json"
+
+# value of a fixed surface (First or Second), 0.0 if it is missing
+
+def _surface(gid, surface):
+
+   value = eccodes.codes_get(gid, "scaledValueOf%sFixedSurface" % (surface))
+   factor = eccodes.codes_get(gid, "scaleFactorOf%sFixedSurface" % (surface))
+   if value == eccodes.CODES_MISSING_LONG or factor == eccodes.CODES_MISSING_LONG:
+      return 0.0
+
+   return value/10.0**factor
+
+# ncl_convert2nc name of the variable a message belongs to, its level type and its level, a
+# [top, bottom] pair for a layer (e.g. the 0.44-1 and 0.44-0.72 sigma layers of RH_P0_2L104_GLL0).
+# Statistical fields (template 8) are named with the process and its period in hours, e.g.
+# PRATE_P8_L1_GLL0_avg6h, so the 0-3 and 0-6 hour averages are separate variables.
+
+def _describe(gid):
+
+   key = (eccodes.codes_get(gid, "discipline"), eccodes.codes_get(gid, "parameterCategory"), eccodes.codes_get(gid, "parameterNumber"))
+   parameter = parameters.get(key, "VAR_%d_%d_%d" % key)
+
+   template = eccodes.codes_get(gid, "productDefinitionTemplateNumber")
+   ltype = eccodes.codes_get(gid, "typeOfFirstFixedSurface")
+
+   if eccodes.codes_get(gid, "typeOfSecondFixedSurface") == ltype:
+      layer = "2L"
+   else:
+      layer = "L"
+
+   name = "%s_P%d_%s%d_GLL0" % (parameter, template, layer, ltype)
+   if template == 8:
+      period = eccodes.codes_get(gid, "endStep")-eccodes.codes_get(gid, "startStep")
+      name = "%s_%s%dh" % (name, statistics.get(eccodes.codes_get(gid, "typeOfStatisticalProcessing"), "stat"), period)
+
+   if layer == "2L":
+      level = [_surface(gid, "First"), _surface(gid, "Second")]
+   else:
+      level = _surface(gid, "First")
+
+   return name, ltype, level
+
+# index of the messages of a GRIB2 file (grid, variables and, for each message, its variable, level,
+# forecast step, offset and length), read from the .index.json file next to it if that was written
+# for the current version of the file
+
+def read_index(path):
+
+   stat = os.stat(path)
+   stamp = [int(stat.st_mtime), stat.st_size]
+
+   if os.path.isfile(index_path(path)):
+      f = open(index_path(path))
+      index = json.load(f)
+      f.close()
+      if index.get("stamp") == stamp and index.get("version") == index_version:
+         return index
+
+   index = {"version": index_version, "stamp": stamp, "grid": None, "variables": {}, "messages": []}
+
+   f = open(path, "rb")
+   while True:
+      gid = eccodes.codes_grib_new_from_file(f)
+      if gid is None:
+         break
+      try:
+         name, ltype, level = _describe(gid)
+
+         if index["grid"] is None:
+            index["grid"] = {"nlat": eccodes.codes_get(gid, "Nj"), "nlon": eccodes.codes_get(gid, "Ni"),
+                             "lat1": eccodes.codes_get(gid, "latitudeOfFirstGridPointInDegrees"),
+                             "lat2": eccodes.codes_get(gid, "latitudeOfLastGridPointInDegrees"),
+                             "lon1": eccodes.codes_get(gid, "longitudeOfFirstGridPointInDegrees"),
+                             "dlon": eccodes.codes_get(gid, "iDirectionIncrementInDegrees")}
+
+         if name not in index["variables"]:
+            index["variables"][name] = {"ltype": ltype, "long_name": eccodes.codes_get(gid, "name"), "units": eccodes.codes_get(gid, "units")}
+
+         index["messages"].append({"name": name, "level": level, "step": eccodes.codes_get(gid, "endStep"),
+                                   "offset": eccodes.codes_get(gid, "offset"), "length": eccodes.codes_get(gid, "totalLength")})
+      finally:
+         eccodes.codes_release(gid)
+   f.close()
+
+   # written under a temporary name first, so another process never reads half an index
+
+   tmp_path = "%s.%d.tmp" % (index_path(path), os.getpid())
+   f = open(tmp_path, "w")
+   json.dump(index, f)
+   f.close()
+   os.rename(tmp_path, index_path(path))
+
+   return index
+
+# GRIB2 files listed in a manifest (one path per line, relative paths are relative to the manifest)
+
+def read_manifest(path):
+
+   f = open(path)
+   lines = [line.strip() for line in f.readlines() if line.strip() != ""]
+   f.close()
+
+   real = os.path.dirname(os.path.realpath(path))
+
+   return [os.path.join(real, line) for line in lines]
+
+# open a manifest of GRIB2 files
+
+def open_file(path):
+
+   return GribFile(path)
+
+###################################################################################################
+
+# GRIB2 files of a cycle (the analysis and the forecast steps) in manifests named after the netCDF
+# files convert_GFS.sh would write, with the indexes of all their messages built. If lead is given
+# only the manifest of that lead time is written, named as controls.lead_path names it for forecast
+# lead times.
+
+def write_manifests(init_dt, lead=None):
+
+   HH = init_dt[8:10]
+   steps = sorted(glob.glob("gfs.t%sz.pgrb2.0p50.f[0-9][0-9][0-9]" % (HH)))
+
+   if lead is None:
+      manifests = {"analysis_gfs_4_%s_%s00_000.grib" % (init_dt[:8], HH): [fili for fili in steps if fili.endswith(".f000")],
+                   "GFS_forecast_%s_%s.grib" % (init_dt[:8], HH): [fili for fili in steps if not fili.endswith(".f000")]}
+   elif int(lead) == 0:
+      manifests = {"analysis_gfs_4_%s_%s00_000.grib" % (init_dt[:8], HH): [fili for fili in steps if fili.endswith(".f000")]}
+   else:
+      manifests = {"GFS_forecast_%s_%s_f%03d.grib" % (init_dt[:8], HH, int(lead)): [fili for fili in steps if fili.endswith(".f%03d" % (int(lead)))]}
+
+   for manifest in sorted(manifests):
+      if len(manifests[manifest]) == 0:
+         continue
+      for fili in manifests[manifest]:
+         read_index(fili)
+      f = open(manifest, "w")
+      f.write("\n".join(os.path.abspath(fili) for fili in manifests[manifest])+"\n")
+      f.close()
+      print("Written %s" % (manifest))
+
+###################################################################################################
+
+# a manifest of GRIB2 files opened as one file, with the same variables and dimensions as the netCDF
+# file ncl_convert2nc and cdo would write from them
+
+class GribFile(object):
+
+   def __init__(self, path):
+
+      self.path = path
+      self.attributes = {}
+      self.dimensions = {}
+      self.variables = {}
+      self._handles = {}
+
+      filis = read_manifest(path)
+      indexes = [read_index(fili) for fili in filis]
+
+      grid = indexes[0]["grid"]
+      lat = np.linspace(grid["lat1"], grid["lat2"], grid["nlat"]).astype(np.float32)
+      lon = (grid["lon1"]+grid["dlon"]*np.arange(grid["nlon"])).astype(np.float32)
+
+      # messages of each variable by (step, level), the level of a layer is its (top, bottom) pair.
+      # Two messages at the same step and level would leave one of them unread, so are an error.
+
+      messages = {}
+      ltypes = {}
+      steps = set()
+      for fili, index in zip(filis, indexes):
+         for message in index["messages"]:
+            if isinstance(message["level"], list):
+               key = (message["step"], tuple(message["level"]))
+            else:
+               key = (message["step"], message["level"])
+            if key in messages.setdefault(message["name"], {}):
+               raise ValueError("%s: more than one %s message at step %d level %s (%s and %s)" % (path, message["name"], key[0], key[1], messages[message["name"]][key][0], fili))
+            messages[message["name"]][key] = (fili, message["offset"], message["length"])
+            steps.add(message["step"])
+         for name in index["variables"]:
+            ltypes.setdefault(name, index["variables"][name])
+
+      steps = sorted(steps)
+
+      # the analysis has no time dimension, as for the netCDF analysis file
+
+      if len(filis) > 1 or steps != [0]:
+         time_dims = ("forecast_time0",)
+         self._add_coordinate("forecast_time0", np.array(steps, dtype=np.int32), {"long_name": "Forecast offset from initial time", "units": "hours"})
+      else:
+         time_dims = ()
+
+      self._add_coordinate("lat_0", lat, {"long_name": "latitude", "units": "degrees_north"})
+      self._add_coordinate("lon_0", lon, {"long_name": "longitude", "units": "degrees_east"})
+
+      # a level dimension for each different set of levels of a level type, numbered in the order
+      # they are first used. Layers have the coordinates lv_XXXX0_l0 and lv_XXXX0_l1 of their bounds
+      # in place of lv_XXXX0.
+
+      dims_of_levels = {}
+      level_dims = {}
+      for name in sorted(messages):
+         levels = sorted(set(level for step, level in messages[name]))
+         if len(levels) == 1:
+            continue
+
+         ltype = ltypes[name]["ltype"]
+         if (ltype, tuple(levels)) not in dims_of_levels:
+            abbreviation = level_types.get(ltype, "L%d_" % (ltype))
+            dim = "lv_%s%d" % (abbreviation, len([key for key in dims_of_levels if key[0] == ltype]))
+            dims_of_levels[(ltype, tuple(levels))] = dim
+            if isinstance(levels[0], tuple):
+               self.dimensions[dim] = len(levels)
+               for k in range(2):
+                  self.variables["%s_l%d" % (dim, k)] = Coordinate(dim, np.array([level[k] for level in levels], dtype=np.float32), {})
+            else:
+               self._add_coordinate(dim, np.array(levels, dtype=np.float32), {})
+         level_dims[name] = (dims_of_levels[(ltype, tuple(levels))], levels)
+
+      for name in sorted(messages):
+         if name not in level_dims:
+            dims = time_dims
+            levels = [sorted(set(level for step, level in messages[name]))[0]]
+         else:
+            dims = time_dims + (level_dims[name][0],)
+            levels = level_dims[name][1]
+         attributes = {"long_name": ltypes[name]["long_name"], "units": ltypes[name]["units"]}
+         self.variables[name] = GribVariable(self, dims+("lat_0", "lon_0"), steps if len(time_dims) > 0 else steps[:1], levels, messages[name], attributes)
+
+   def _add_coordinate(self, dim, values, attributes):
+
+      self.dimensions[dim] = len(values)
+      self.variables[dim] = Coordinate(dim, values, attributes)
+
+   def close(self):
+
+      for f in self._handles.values():
+         f.close()
+      self._handles = {}
+
+# decoded values of the message at offset in a GRIB2 file, masked where the bitmap has missing
+# values
+
+   def decode(self, fili, offset, length):
+
+      if fili not in self._handles:
+         self._handles[fili] = open(fili, "rb")
+
+      f = self._handles[fili]
+      f.seek(offset)
+      gid = eccodes.codes_new_from_message(f.read(length))
+      try:
+         shape = (eccodes.codes_get(gid, "Nj"), eccodes.codes_get(gid, "Ni"))
+         values = eccodes.codes_get_values(gid).reshape(shape)
+         if eccodes.codes_get(gid, "bitmapPresent"):
+            values = np.ma.masked_equal(values, eccodes.codes_get(gid, "missingValue"))
+      finally:
+         eccodes.codes_release(gid)
+
+      return values.astype(np.float32)
+
+# a coordinate variable (forecast times, levels, lat or lon)
+
+class Coordinate(object):
+
+   def __init__(self, name, values, attributes):
+      self.dimensions = (name,)
+      self.shape = values.shape
+      self.rank = 1
+      self.attributes = attributes
+      self._values = values
+
+   def typecode(self):
+      return self._values.dtype.char
+
+   def get_value(self):
+      return self._values.copy()
+
+   def __getitem__(self, key):
+      return self._values[key]
+
+# a gridded variable, indexing it decodes the messages of the forecast times and levels asked for
+# and cuts lat and lon from them
+
+class GribVariable(object):
+
+   def __init__(self, gribfile, dims, steps, levels, messages, attributes):
+      self.gribfile = gribfile
+      self.dimensions = dims
+      self.rank = len(dims)
+      self.attributes = attributes
+      self._steps = steps
+      self._levels = levels
+      self._messages = messages
+
+      lead = []
+      if dims[0] == "forecast_time0":
+         lead.append(len(steps))
+      if len(dims)-len(lead) == 3:
+         lead.append(len(levels))
+      self._has_time = dims[0] == "forecast_time0"
+      self.shape = tuple(lead) + (gribfile.dimensions["lat_0"], gribfile.dimensions["lon_0"])
+
+   def typecode(self):
+      return "f"
+
+   def get_value(self):
+      return self[...]
+
+   def __getitem__(self, key):
+
+      if not isinstance(key, tuple):
+         key = (key,)
+
+      # expand the Ellipsis and any missing trailing dimensions to full slices
+
+      if Ellipsis in key:
+         i = key.index(Ellipsis)
+         key = key[:i] + (slice(None),)*(self.rank-len(key)+1) + key[i+1:]
+      key = key + (slice(None),)*(self.rank-len(key))
+
+      # indices of the forecast times and levels, and whether their dimension is kept
+
+      lead = []
+      for k, size in zip(key[:-2], self.shape[:-2]):
+         if isinstance(k, (numbers.Integral, np.integer)):
+            lead.append(([int(k) % size], False))
+         elif isinstance(k, slice):
+            lead.append((list(range(*k.indices(size))), True))
+         else:
+            lead.append(([int(i) % size for i in np.atleast_1d(k)], True))
+
+      if self._has_time:
+         step_indices = lead[0][0]
+      else:
+         step_indices = [0]
+      if len(lead) > int(self._has_time):
+         level_indices = lead[-1][0]
+      else:
+         level_indices = [0]
+
+      fields = []
+      for s in step_indices:
+         for l in level_indices:
+            message = self._messages.get((self._steps[s], self._levels[l]))
+            if message is None:
+               values = np.ma.masked_all(self.shape[-2:], dtype=np.float32)
+            else:
+               values = self.gribfile.decode(*message)
+            fields.append(values[key[-2:]])
+
+      shape = tuple(len(indices) for indices, keep in lead) + fields[0].shape
+      if any(np.ma.isMaskedArray(field) for field in fields):
+         data = np.ma.stack(fields).reshape(shape)
+      else:
+         data = np.stack(fields).reshape(shape)
+
+      # dimensions indexed with a single index are dropped, as for PyNIO
+
+      squeeze = tuple(axis for axis, (indices, keep) in enumerate(lead) if not keep)
+      if len(squeeze) > 0:
+         data = data.reshape(tuple(n for axis, n in enumerate(data.shape) if axis not in squeeze))
+
+      return data
+
+###################################################################################################
+
+if __name__ == "__main__":
+
+   if len(sys.argv) < 2:
+      sys.exit("Usage: python3 grib_io.py YYYYMMDDHH [XXX]")
+
+   if len(sys.argv) > 2:
+      write_manifests(sys.argv[1], sys.argv[2])
+   else:
+      write_manifests(sys.argv[1])
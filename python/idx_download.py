@@ -0,0 +1,289 @@
+###################################################################################################
+# Project           : Global Challenges Research Fund (GCRF) African SWIFT (Science for Weather
+#                     Information and Forecasting Techniques.
+#
+# Program name      : idx_download.py
+#
+# Author            : Alexander J. Roberts, University of Leeds, NCAS
+#
+# Date created      : Oct 2026
+#
+# Purpose           : Download only the GRIB2 messages of the GFS files that the plotting scripts
+#                     in the namelist need. The .idx inventory NCEP publishes next to each
+#                     gfs.tHHz.pgrb2.0p50.fXXX file gives the variable, level and byte offset of
+#                     every message. The messages of the variables worked out by conversion_vars.py
+#                     are fetched with HTTP range requests (neighbouring messages in one request,
+#                     over a connection kept open) and written one after the other, which is
+#                     a valid GRIB2 file holding only those messages. If the needed variables
+#                     cannot be worked out whole files are downloaded. The files are downloaded by
+#                     gfs_download.py. Only needs the standard library so it can run outside the
+#                     pyn_env environment.
+#
+#                     Messages are selected by variable and level type only: every isobaric level
+#                     of a needed isobaric variable is downloaded, not just the levels in the
+#                     namelist. The plotting scripts and derived.py find levels by their index in
+#                     the level coordinate of the converted file (the level below or above, level
+#                     ranges and fixed level indices in the "requires" entries), which only
+#                     holds if the variables keep all their levels.
+#
+#                     The server is https://nomads.ncep.noaa.gov unless SWIFT_GFS_URL gives
+#                     another one, e.g. the stand-in server started with "serve" which serves a
+#                     directory of GRIB2 and .idx files with range requests for testing.
+#
+# Revision History  : Oct 2026 - files downloaded by gfs_download.py, which fetches the lead
+#                                times concurrently
+#                     Oct 2026 - check command for downloads made outside python (see
+#                                get_GFS_archived.sh)
+#                     Oct 2026 - note that messages are selected per level type, not per level
+#
+# Usage             : "python3 gfs_download.py idx YYYYMMDDHH 000 003 006 ..." (see
+#                     gfs_download.py)
+#                     "python3 idx_download.py serve directory port"
+#                     "python3 idx_download.py check file" exits with status 1 unless the file is
+#                     a run of complete GRIB2 messages
+###################################################################################################
+
+import os
+import re
+import sys
+import struct
+import socketserver
+import http.client
+import http.server
+import urllib.parse
+
+# directory of the files of a cycle on the server, {date} and {HH} are the initialisation date and
+# hour
+
+url = os.environ.get("SWIFT_GFS_URL", "https://nomads.ncep.noaa.gov/pub/data/nccf/com/gfs/prod/gfs.{date}/{HH}/atmos")
+
+resolution = "0p50"
+
+# level descriptions in the .idx files of the level types of the variable names (as ncl_convert2nc
+# names them, e.g. L100 in TMP_P0_L100_GLL0), variables on other level types are downloaded on all
+# their levels
+
+level_types = {"L1": r"surface$", "L4": r"0C isotherm$", "L6": r"max wind$", "L7": r"tropopause$",
+               "L10": r"entire atmosphere$", "L100": r"[0-9.]+ mb$", "L101": r"mean sea level$",
+               "L102": r"[0-9.]+ m above mean sea level$", "L103": r"[0-9.]+ m above ground$",
+               "L104": r"[0-9.]+ sigma level$", "L105": r"[0-9.]+ hybrid level$", "L109": r"PV=",
+               "L200": r"entire atmosphere \(considered as a single layer\)$",
+               "L204": r"highest tropospheric freezing level$", "L220": r"planetary boundary layer$",
+               "2L103": r"[0-9.]+-[0-9.]+ m above ground$", "2L104": r"[0-9.]+-[0-9.]+ sigma layer$",
+               "2L106": r"[0-9.]+-[0-9.]+ m below ground$", "2L108": r"[0-9.]+-[0-9.]+ mb above ground$"}
+
+###################################################################################################
+
+# name of the GRIB2 file of a lead time (a string, e.g. "003")
+
+def grib_name(init_dt, lead):
+
+   return "gfs.t%sz.pgrb2.%s.f%s" % (init_dt[8:10], resolution, lead)
+
+# messages of an .idx inventory as (start, end, variable, level) with end None for the last
+# message (it runs to the end of the file)
+
+def read_inventory(text):
+
+   messages = []
+   for line in text.splitlines():
+      fields = line.split(":")
+      if len(fields) < 6:
+         continue
+      messages.append([int(fields[1]), None, fields[3], fields[4]])
+
+   for i in range(len(messages)-1):
+      messages[i][1] = messages[i+1][0]-1
+
+   return [tuple(message) for message in messages]
+
+# (variable, level pattern) pairs of the needed variable names, the level pattern is None for names
+# that only give the variable (e.g. PRATE) or have a level type not in level_types. The pattern
+# matches every level of the level type (see above for why the levels are not narrowed down).
+
+def wanted(names):
+
+   pairs = []
+   for name in names:
+      parts = name.lstrip("\\").split("_")
+      pattern = None
+      if len(parts) > 2 and parts[2] in level_types:
+         pattern = re.compile(level_types[parts[2]])
+      pairs.append((parts[0], pattern))
+
+   return pairs
+
+# messages of an inventory that are needed, all of them if pairs is empty
+
+def select(messages, pairs):
+
+   if len(pairs) == 0:
+      return list(messages)
+
+   return [message for message in messages if any(message[2] == var and (pattern is None or pattern.match(message[3])) for var, pattern in pairs)]
+
+# byte ranges (start, end) covering the selected messages, neighbouring messages are fetched in one
+# range
+
+def byte_ranges(selected):
+
+   ranges = []
+   for start, end, var, level in selected:
+      if len(ranges) > 0 and ranges[-1][1] is not None and ranges[-1][1]+1 == start:
+         ranges[-1] = (ranges[-1][0], end)
+      else:
+         ranges.append((start, end))
+
+   return ranges
+
+# True if the file is a run of complete GRIB2 messages (each starts with GRIB, has the length given
+# in its indicator section and ends with 7777), only the ends of the messages are read
+
+def valid_grib_file(path):
+
+   size = os.path.getsize(path)
+   f = open(path, "rb")
+
+   pos = 0
+   valid = size > 0
+   while valid and pos < size:
+      f.seek(pos)
+      head = f.read(16)
+      if len(head) < 16 or head[:4] != b"GRIB":
+         valid = False
+         break
+      length = struct.unpack(">Q", head[8:16])[0]
+      f.seek(pos+length-4)
+      valid = f.read(4) == b"7777"
+      pos = pos + length
+
+   f.close()
+
+   return valid and pos == size
+
+###################################################################################################
+
+# HTTP(S) connection to the server, kept open for the requests that follow
+
+class Server(object):
+
+   def __init__(self, base):
+
+      parts = urllib.parse.urlsplit(base)
+      if parts.scheme == "https":
+         self.connection = http.client.HTTPSConnection(parts.netloc, timeout=120)
+      else:
+         self.connection = http.client.HTTPConnection(parts.netloc, timeout=120)
+      self.path = parts.path.rstrip("/")
+
+# response of a GET request for a file (part of it if byte_range is given), opening the connection
+# again if the server has closed it
+
+   def open(self, name, byte_range=None):
+
+      headers = {}
+      if byte_range is not None:
+         if byte_range[1] is None:
+            headers["Range"] = "bytes=%d-" % (byte_range[0])
+         else:
+            headers["Range"] = "bytes=%d-%d" % byte_range
+
+      try:
+         self.connection.request("GET", "%s/%s" % (self.path, name), headers=headers)
+         return self.connection.getresponse()
+      except (http.client.HTTPException, OSError):
+         self.connection.close()
+         self.connection.request("GET", "%s/%s" % (self.path, name), headers=headers)
+         return self.connection.getresponse()
+
+# status, Content-Range header and body of a GET request
+
+   def get(self, name, byte_range=None):
+
+      response = self.open(name, byte_range)
+
+      return response.status, response.getheader("Content-Range"), response.read()
+
+   def close(self):
+      self.connection.close()
+
+###################################################################################################
+
+# stand-in for the NCEP server that serves a directory with range requests (http.server only
+# serves whole files)
+
+class RangeHandler(http.server.SimpleHTTPRequestHandler):
+
+   protocol_version = "HTTP/1.1"
+
+   def send_head(self):
+
+      match = re.match(r"bytes=(\d+)-(\d*)$", self.headers.get("Range", ""))
+      path = self.translate_path(self.path)
+      if match is None or not os.path.isfile(path):
+         return http.server.SimpleHTTPRequestHandler.send_head(self)
+
+      size = os.path.getsize(path)
+      start = int(match.group(1))
+      if start >= size:
+         self.send_response(416)
+         self.send_header("Content-Range", "bytes */%d" % (size))
+         self.send_header("Content-Length", "0")
+         self.end_headers()
+         return None
+
+      if match.group(2) == "":
+         end = size-1
+      else:
+         end = min(int(match.group(2)), size-1)
+
+      f = open(path, "rb")
+      f.seek(start)
+      self.send_response(206)
+      self.send_header("Content-Type", "application/octet-stream")
+      self.send_header("Content-Range", "bytes %d-%d/%d" % (start, end, size))
+      self.send_header("Content-Length", str(end-start+1))
+      self.end_headers()
+
+      return _Part(f, end-start+1)
+
+class _Part(object):
+
+   def __init__(self, f, length):
+      self.f = f
+      self.length = length
+
+   def read(self, n=-1):
+      if n < 0 or n > self.length:
+         n = self.length
+      data = self.f.read(n)
+      self.length = self.length-len(data)
+      return data
+
+   def close(self):
+      self.f.close()
+
+# one thread for each connection, as the connections are kept open
+
+class ThreadingServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+
+   daemon_threads = True
+
+def serve(directory, port):
+
+   os.chdir(directory)
+   ThreadingServer(("", port), RangeHandler).serve_forever()
+
+###################################################################################################
+
+if __name__ == "__main__":
+
+   if len(sys.argv) == 3 and sys.argv[1] == "check":
+      if not os.path.isfile(sys.argv[2]) or not valid_grib_file(sys.argv[2]):
+         sys.exit("%s is not a complete GRIB2 file" % (sys.argv[2]))
+
+   elif len(sys.argv) == 4 and sys.argv[1] == "serve":
+      serve(sys.argv[2], int(sys.argv[3]))
+
+   else:
+      sys.exit("Usage: python3 idx_download.py serve directory port\n       python3 idx_download.py check file")
@@ -0,0 +1,200 @@
+###################################################################################################
+# Project           : Global Challenges Research Fund (GCRF) African SWIFT (Science for Weather
+#                     Information and Forecasting Techniques.
+#
+# Program name      : kinematics.py
+#
+# Author            : Alexander J. Roberts, University of Leeds, NCAS
+#
+# Date created      : Oct 2026
+#
+# Purpose           : Kinematic fields (divergence and the planetary vorticity used for relative
+#                     vorticity) for the SWIFT_GFSplotting scripts. The grid spacing of a region
+#                     (metpy lat_lon_grid_deltas) and the finite difference weights built from it
+#                     are worked out once per region grid and kept for the lifetime of the process.
+#                     Derivatives are taken for all forecast times in one call, with the same
+#                     second order differences (centred inside the region, one sided at its edges)
+#                     as metpy first_derivative. The divergence of a region is stored in the gfs_io
+#                     field cache, so divergence.py and convergence.py share one calculation.
+#
+# Revision History  : Oct 2026 - calculate in the gfs_io working precision (float32) unless
+#                                float64 is asked for with the dtype argument
+#                     Oct 2026 - work out the differences in working arrays from the gfs_io pool
+#
+# Usage             : import kinematics
+#                     div = kinematics.divergence(forecast, geom, lev_index)
+#                     vort = vort - kinematics.grid(geom).e_vort
+###################################################################################################
+
+import numpy as np
+import metpy.calc as mpcalc
+
+import gfs_io
+import geometry
+
+_grids = {}
+
+###################################################################################################
+
+# key of a region (its lat and lon indices on the grid of the file)
+
+def _region_key(geom):
+
+   if geom.lon_box3 is None:
+      lon_box3 = -1
+   else:
+      lon_box3 = geom.lon_box3
+
+   return "%d_%d_%d_%d_%d" % (geom.lat_box1, geom.lat_box2, geom.lon_box1, geom.lon_box2, lon_box3)
+
+# index for the slice s along axis (-1 for lon, -2 for lat) of a field with any leading dimensions
+
+def _along(s, axis):
+
+   if axis == -1:
+      return (Ellipsis, s)
+
+   return (Ellipsis, s, slice(None))
+
+# weights of the three points used for the first derivative at each point along axis, delta are the
+# grid spacings along that axis (one fewer than the points)
+
+def _weights(delta, axis):
+
+   d0 = delta[_along(slice(None, -1), axis)]
+   d1 = delta[_along(slice(1, None), axis)]
+   combined = d0 + d1
+
+   interior = (-d1/(combined*d0), (d1-d0)/(d0*d1), d0/(combined*d1))
+
+   d0 = delta[_along(0, axis)]
+   d1 = delta[_along(1, axis)]
+   combined = d0 + d1
+   big = combined + d0
+
+   first = (-big/(combined*d0), combined/(d0*d1), -(d0/(combined*d1)))
+
+   d0 = delta[_along(-2, axis)]
+   d1 = delta[_along(-1, axis)]
+   combined = d0 + d1
+   big = combined + d1
+
+   last = (d1/(combined*d0), -(combined/(d0*d1)), big/(combined*d1))
+
+   return interior, first, last
+
+###################################################################################################
+
+# grid spacing and finite difference weights of a region, and the planetary vorticity the plotting
+# scripts subtract from the absolute vorticity
+
+class Grid(object):
+
+   def __init__(self, geom):
+
+      dx, dy = mpcalc.lat_lon_grid_deltas(geom.lon2d, geom.lat2d)
+
+      self.dx = np.asarray(getattr(dx, "magnitude", dx), dtype=np.float64)
+      self.dy = np.asarray(getattr(dy, "magnitude", dy), dtype=np.float64)
+
+      self._weights = {}
+
+      self.e_vort = gfs_io.working(0.0000727*np.sin(np.deg2rad(geom.lat2d)))
+
+# finite difference weights along axis in the precision of the fields they are used with (worked out
+# in double precision)
+
+   def weights(self, axis, dtype):
+
+      if (axis, dtype) not in self._weights:
+         if axis == -1:
+            delta = self.dx
+         else:
+            delta = self.dy
+         self._weights[(axis, dtype)] = tuple(tuple(gfs_io.working(w, dtype) for w in part) for part in _weights(delta, axis))
+
+      return self._weights[(axis, dtype)]
+
+# first derivative of f (lat and lon as its last two dimensions) along axis, in the precision of f,
+# written into out if given. The terms of the differences are worked out in a working array from the
+# gfs_io pool.
+
+   def derivative(self, f, axis, out=None):
+
+      f = np.asarray(f)
+      interior, first, last = self.weights(axis, f.dtype)
+
+      if out is None:
+         out = np.empty(f.shape, dtype=f.dtype)
+      term = gfs_io.buffer(f.shape, f.dtype)
+
+      for index, weights, points in [(slice(1, -1), interior, (slice(None, -2), slice(1, -1), slice(2, None))),
+                                     (0, first, (0, 1, 2)), (-1, last, (-3, -2, -1))]:
+         o = out[_along(index, axis)]
+         t = term[_along(index, axis)]
+         np.multiply(weights[0], f[_along(points[0], axis)], out=o)
+         for weight, point in zip(weights[1:], points[1:]):
+            np.multiply(weight, f[_along(point, axis)], out=t)
+            np.add(o, t, out=o)
+
+      return out
+
+# divergence and vorticity, a new array (it is what the field cache keeps) with the second derivative
+# in a working array from the gfs_io pool
+
+   def divergence(self, u, v):
+
+      out = self.derivative(u, -1)
+      return np.add(out, self.derivative(v, -2, gfs_io.buffer(out.shape, out.dtype)), out=out)
+
+   def vorticity(self, u, v):
+
+      out = self.derivative(v, -1)
+      return np.subtract(out, self.derivative(u, -2, gfs_io.buffer(out.shape, out.dtype)), out=out)
+
+# grid of a region, worked out the first time it is needed by this process (regions are kept by
+# geometry.region for the lifetime of the process)
+
+def grid(geom):
+
+   if id(geom) not in _grids:
+      _grids[id(geom)] = (geom, Grid(geom))
+
+   return _grids[id(geom)][1]
+
+###################################################################################################
+
+# one level of a variable on a region, for all forecast times if the file has a time dimension
+
+def _level(gfsfile, geom, name, lev):
+
+   var = gfsfile.variables[name]
+
+   if len(var.dimensions) == 4:
+      return geometry.cut(var, geom, slice(None), lev)
+   else:
+      return geometry.cut(var, geom, lev)
+
+# divergence of the wind at level index lev on a region, for all forecast times, in the working
+# precision unless dtype is given. Calculated by whichever plotting job needs it first this cycle
+# and stored in the field cache.
+
+def divergence(gfsfile, geom, lev, dtype=None):
+
+   if dtype is None:
+      dtype = gfs_io.precision
+
+   key = "divergence_%d_%s" % (lev, _region_key(geom))
+   if np.dtype(dtype) != np.dtype(gfs_io.precision):
+      key = "%s_%s" % (key, np.dtype(dtype).name)
+
+   def compute():
+      u = gfs_io.working(_level(gfsfile, geom, "UGRD_P0_L100_GLL0", lev), dtype)
+      v = gfs_io.working(_level(gfsfile, geom, "VGRD_P0_L100_GLL0", lev), dtype)
+      return grid(geom).divergence(u, v)
+
+   data = gfsfile.cached(key, compute)
+   if data is None:
+      data = compute()
+
+   return data
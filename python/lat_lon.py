@@ -25,107 +25,100 @@ import sys
 import os
 import datetime
 
+import controls
+import gfs_io
+
 GFS_dir = os.environ['SWIFT_GFS']
 
 #####################################################################################################
 # Main script
 
-# read in domains and accept lat and lon limits as arguments
-
-b = open(GFS_dir+"/controls/domains")
-domains_content = b.readlines()
+def main(init_dt, lev_hPa, latbl, lonbl, lattr, lontr):
 
-key_list = []
-latlon_list = []
+   # read in domains and accept lat and lon limits as arguments
 
-for domain in domains_content:
-   key_list.append(domain.split(":")[0])
-   latlon_str = (domain.split(":")[1]).strip().split(",")
-   latlon_flt = []
-   for ll in latlon_str:
-      latlon_flt.append(float(ll))
-   latlon_list.append(latlon_flt)
-   del(latlon_flt)
+   domains_dict = controls.read_domains(GFS_dir+"/controls/domains")
 
-domains_dict = dict(zip(key_list,latlon_list))
+   latbl = float(latbl)
+   lonbl = float(lonbl)
+   lattr = float(lattr)
+   lontr = float(lontr)
 
-latbl = float(sys.argv[3])
-lonbl = float(sys.argv[4])
-lattr = float(sys.argv[5])
-lontr = float(sys.argv[6])
+   region = "unnamedregion"
 
-region = "unnamedregion"
+   for domain in domains_dict.keys():
+      if ((latbl == domains_dict[domain][0] and lattr == domains_dict[domain][2]) or (latbl == domains_dict[domain][2] or lattr == domains_dict[domain][0])) and ((lonbl == domains_dict[domain][1] and lontr == domains_dict[domain][3]) or (lonbl == domains_dict[domain][3] and lontr == domains_dict[domain][1])):
+         region = domain
 
-for domain in domains_dict.keys():
-   if ((latbl == domains_dict[domain][0] and lattr == domains_dict[domain][2]) or (latbl == domains_dict[domain][2] or lattr == domains_dict[domain][0])) and ((lonbl == domains_dict[domain][1] and lontr == domains_dict[domain][3]) or (lonbl == domains_dict[domain][3] and lontr == domains_dict[domain][1])):
-      region = domain
+   # arrange lat and lon values to get bottom left and top right lat lon values
 
-# arrange lat and lon values to get bottom left and top right lat lon values
+   if latbl == lattr or lonbl == lontr:
+      sys.exit('lat and lon values must be different')
+   else:
+      if latbl < lattr:
+         latbl, lattr = lattr, latbl
+      if lonbl > lontr:
+         lonbl, lontr = lontr, lonbl
 
-if latbl == lattr or lonbl == lontr:
-   sys.exit('lat and lon values must be different')
-else:
-   if latbl < lattr:
-      latbl, lattr = lattr, latbl
-   if lonbl > lontr:
-      lonbl, lontr = lontr, lonbl
+   colours = ["black", "white"]
 
-colours = ["black", "white"]
+   for colour in colours:
 
-for colour in colours:
+      imagename = "grid_"+colour+'_'+region
 
-   imagename = "grid_"+colour+'_'+region
+      wks_type = "png"
+      wks_res = ngl.Resources()
+      wks_res.wkBackgroundOpacityF = 0.0
+      wks = ngl.open_wks(wks_type, imagename, wks_res)
 
-   wks_type = "png"
-   wks_res = ngl.Resources()
-   wks_res.wkBackgroundOpacityF = 0.0
-   wks = ngl.open_wks(wks_type, imagename, wks_res)
+   # define resources for analysis plot
 
-# define resources for analysis plot
+      res = ngl.Resources()
+      res.nglDraw  = False
+      res.nglFrame = False
 
-   res = ngl.Resources()
-   res.nglDraw  = False
-   res.nglFrame = False
+      res.vpWidthF  = 0.9
+      res.vpHeightF = 0.6
 
-   res.vpWidthF  = 0.9
-   res.vpHeightF = 0.6
+      res.mpGridAndLimbOn        = True
 
-   res.mpGridAndLimbOn        = True
+      res.pmTickMarkDisplayMode = "Never"
+      res.mpProjection              = "CylindricalEquidistant"
+      res.mpLimitMode = "LatLon"    # Limit the map view.
+      res.mpMinLonF   = lontr
+      res.mpMaxLonF   = lonbl
+      res.mpMinLatF   = lattr
+      res.mpMaxLatF   = latbl
+      res.mpOutlineBoundarySets     = "AllBoundaries"
+      res.mpNationalLineColor       = -1
+      res.mpNationalLineThicknessF  = 2.0
+      res.mpGeophysicalLineColor    = -1
+      res.mpGeophysicalLineThicknessF = 2.0
+      res.mpGridLatSpacingF = 5.0
+      res.mpGridLonSpacingF = 5.0
+      res.mpGridLineThicknessF = 2.0
+      res.mpGridLineColor             = colour
+      res.cnMonoLineColor           = True
 
-   res.pmTickMarkDisplayMode = "Never"
-   res.mpProjection              = "CylindricalEquidistant"
-   res.mpLimitMode = "LatLon"    # Limit the map view.
-   res.mpMinLonF   = lontr
-   res.mpMaxLonF   = lonbl
-   res.mpMinLatF   = lattr
-   res.mpMaxLatF   = latbl
-   res.mpOutlineBoundarySets     = "AllBoundaries"
-   res.mpNationalLineColor       = -1
-   res.mpNationalLineThicknessF  = 2.0
-   res.mpGeophysicalLineColor    = -1
-   res.mpGeophysicalLineThicknessF = 2.0
-   res.mpGridLatSpacingF = 5.0
-   res.mpGridLonSpacingF = 5.0
-   res.mpGridLineThicknessF = 2.0
-   res.mpGridLineColor             = colour
-   res.cnMonoLineColor           = True
+      grid_plot = ngl.map(wks,res)
 
-   grid_plot = ngl.map(wks,res)
+      ngl.maximize_plot(wks, grid_plot)
+      ngl.draw(grid_plot)
+      ngl.frame(wks)
 
-   ngl.maximize_plot(wks, grid_plot)
-   ngl.draw(grid_plot)
-   ngl.frame(wks)
+      ngl.destroy(wks)
+      del res
 
-   ngl.destroy(wks)
-   del res
+      os.system('mogrify -trim grid_'+colour+'_'+region+'.png')
 
-   os.system('mogrify -trim grid_'+colour+'_'+region+'.png')
-
-#   if region == "WA" or region == "unknownWA":
-#      os.system('mogrify -trim grid_'+colour+'_'+region+'.png')
-#      os.system('mogrify -resize 886x600 grid_'+colour+'_'+region+'.png')
-#   elif region == "EA" or region == "unknownEA":
-#      os.system('mogrify -trim grid_'+colour+'_'+region+'.png')
-#      os.system('mogrify -resize 600x733 grid_'+colour+'_'+region+'.png')
+   #   if region == "WA" or region == "unknownWA":
+   #      os.system('mogrify -trim grid_'+colour+'_'+region+'.png')
+   #      os.system('mogrify -resize 886x600 grid_'+colour+'_'+region+'.png')
+   #   elif region == "EA" or region == "unknownEA":
+   #      os.system('mogrify -trim grid_'+colour+'_'+region+'.png')
+   #      os.system('mogrify -resize 600x733 grid_'+colour+'_'+region+'.png')
 
+###################################################################################################
 
+if __name__ == "__main__":
+   main(*sys.argv[1:7])
@@ -0,0 +1,173 @@
+###################################################################################################
+# Project           : Global Challenges Research Fund (GCRF) African SWIFT (Science for Weather
+#                     Information and Forecasting Techniques.
+#
+# Program name      : ledger.py
+#
+# Author            : Alexander J. Roberts, University of Leeds, NCAS
+#
+# Date created      : Oct 2026
+#
+# Purpose           : Record of the frames (product, level, region, initialisation time and lead
+#                     time, 0 for the analysis) plot.py has plotted, kept in an SQLite database
+#                     (MARTIN/GFS/ledger.sqlite). Each frame is stored with a fingerprint of what
+#                     it was plotted from: the path, size and modification time of the GFS file
+#                     read for it, the plotting script and the region bounds. Before a cycle is
+#                     plotted the frames of each plotting job whose image is still in MARTIN/GFS
+#                     and whose fingerprint is unchanged are left out (see controls.frame_wanted),
+#                     jobs with no frames left are not run at all, so running plot.py again after
+#                     it has been stopped part way only plots the missing frames and the frames of
+#                     files that have been converted again. Setting SWIFT_GFS_LEDGER to 0 plots
+#                     every frame (the frames are still recorded).
+#
+# Revision History  : Oct 2026 - analysis frame and image names from the "images" entries of the
+#                                plotting scripts, GFS file names from controls.py (PyNIO is not
+#                                imported by plot.py to run jobs as scripts)
+#
+# Usage             : import ledger
+#                     command = ledger.plan(command)
+#                     ledger.record(job, start)
+###################################################################################################
+
+import os
+import time
+import sqlite3
+import hashlib
+import datetime
+
+import controls
+
+GFS_dir = os.environ.get("SWIFT_GFS", "")
+
+enabled = os.environ.get("SWIFT_GFS_LEDGER", "1") != "0"
+
+###################################################################################################
+
+def connect():
+
+   os.makedirs(GFS_dir+"/MARTIN/GFS", exist_ok=True)
+
+   # the render processes record their frames at the same time, a writer waits for the others
+
+   connection = sqlite3.connect(GFS_dir+"/MARTIN/GFS/ledger.sqlite", timeout=120)
+   connection.execute("CREATE TABLE IF NOT EXISTS frames (product TEXT, level TEXT, region TEXT, init TEXT, lead INTEGER, fingerprint TEXT, image TEXT, plotted REAL, PRIMARY KEY (product, level, region, init, lead))")
+
+   return connection
+
+# lead times of the frames of a plotting job, 0 for the analysis (only for the scripts that plot
+# one, see the "images" entry of the script)
+
+def frames(job):
+
+   leads = []
+   if controls.streamed_lead() in [None, 0] and controls.read_images(job["var"])["analysis"] is not None:
+      leads.append(0)
+
+   return leads+[int(f) for f in controls.forecast_times(GFS_dir)]
+
+# fingerprint of a frame from the file it is plotted from (the analysis file for lead time 0, the
+# forecast file otherwise, the regional files where plot.py uses them), the plotting script and the
+# region bounds
+
+def fingerprint(job, lead):
+
+   parts = [job["var"], job["lev"], job["lat1"], job["lon1"], job["lat2"], job["lon2"]]
+
+   script = os.path.join(os.path.dirname(os.path.abspath(__file__)), job["var"])
+   filis = [fili for fili in controls.cycle_files(job["time"], job.get("region")) if os.path.basename(fili).startswith("analysis_") == (lead == 0)]
+
+   for path in [script]+filis:
+      if not os.path.isfile(path):
+         path = controls.grib_manifest(path)
+      stat = os.stat(path)
+      parts.append("%s %d %d" % (os.path.realpath(path), stat.st_size, stat.st_mtime_ns))
+
+   return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()
+
+# file name of the image of a frame, from the "images" entry of the plotting script
+
+def image_name(job, lead):
+
+   images = controls.read_images(job["var"])
+   if lead == 0:
+      name = images["analysis"]
+   else:
+      name = images["forecast"]
+
+   valid = datetime.datetime.strptime(job["time"], "%Y%m%d%H")+datetime.timedelta(hours=lead)
+
+   return name.format(region=job["region"], init=job["time"], valid=valid.strftime("%Y%m%d%H"), lev=job["lev"], lead=lead)+".png"
+
+# image of a frame in MARTIN/GFS, None if it has not landed there
+
+def image(job, lead):
+
+   product = job["var"][:-3]
+   if job["lev"] != "":
+      product = product+"_"+job["lev"]
+
+   name = image_name(job, lead)
+
+   # some plotting scripts move their images to MARTIN/GFS in the directory plot.py is run from
+
+   for root in [GFS_dir+"/MARTIN/GFS", os.getcwd()+"/MARTIN/GFS"]:
+      path = "%s/%s/%s/%s/%s" % (root, job["region"], job["time"], product, name)
+      if os.path.isfile(path):
+         return path
+
+   return None
+
+###################################################################################################
+
+# plotting jobs with the frames still to be plotted, each job gets "frames" (the lead times to
+# plot) and "fingerprints" (those of its frames) as tuples so it can still be used as a scheduler
+# key. Jobs with no frames left are left out.
+
+def plan(command):
+
+   connection = connect()
+   planned = []
+   total = 0
+   done = 0
+
+   for job in command:
+      leads = frames(job)
+      prints = tuple((lead, fingerprint(job, lead)) for lead in leads)
+
+      rows = {}
+      if enabled:
+         for lead, old, path in connection.execute("SELECT lead, fingerprint, image FROM frames WHERE product=? AND level=? AND region=? AND init=?", (job["var"][:-3], job["lev"], job["region"], job["time"])):
+            rows[lead] = (old, path)
+
+      pending = tuple(lead for lead, new in prints if lead not in rows or rows[lead][0] != new or not os.path.isfile(rows[lead][1]))
+
+      total = total+len(leads)
+      done = done+len(leads)-len(pending)
+      if len(pending) > 0:
+         planned.append(dict(job, frames=pending, fingerprints=prints))
+
+   connection.close()
+
+   print("ledger: %d of %d frames already plotted, %d of %d jobs to run" % (done, total, len(planned), len(command)))
+
+   return planned
+
+# record the frames of a job started at start that have landed in MARTIN/GFS (images left from
+# before the job are not taken for frames it plotted)
+
+def record(job, start):
+
+   if "frames" not in job:
+      return
+
+   prints = dict(job["fingerprints"])
+   rows = []
+   for lead in job["frames"]:
+      path = image(job, lead)
+      if path is not None and os.path.getmtime(path) >= start-1.0:
+         rows.append((job["var"][:-3], job["lev"], job["region"], job["time"], lead, prints[lead], path, time.time()))
+
+   connection = connect()
+   with connection:
+      connection.executemany("INSERT OR REPLACE INTO frames VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+   connection.close()
@@ -25,98 +25,93 @@ import sys
 import os
 import datetime
 
+import controls
+import gfs_io
+
 GFS_dir = os.environ['SWIFT_GFS']
 
 #####################################################################################################
 # Main script
 
-# read in domains and accept lat and lon limits as arguments
+def main(init_dt, lev_hPa, latbl, lonbl, lattr, lontr):
 
-b = open(GFS_dir+"/controls/domains")
-domains_content = b.readlines()
+   # read in domains and accept lat and lon limits as arguments
 
-key_list = []
-latlon_list = []
+   domains_dict = controls.read_domains(GFS_dir+"/controls/domains")
 
-for domain in domains_content:
-   key_list.append(domain.split(":")[0])
-   latlon_str = (domain.split(":")[1]).strip().split(",")
-   latlon_flt = []
-   for ll in latlon_str:
-      latlon_flt.append(float(ll))
-   latlon_list.append(latlon_flt)
-   del(latlon_flt)
+   latbl = float(latbl)
+   lonbl = float(lonbl)
+   lattr = float(lattr)
+   lontr = float(lontr)
 
-domains_dict = dict(zip(key_list,latlon_list))
+   region = "unnamedregion"
 
-latbl = float(sys.argv[3])
-lonbl = float(sys.argv[4])
-lattr = float(sys.argv[5])
-lontr = float(sys.argv[6])
+   for domain in domains_dict.keys():
+      if ((latbl == domains_dict[domain][0] and lattr == domains_dict[domain][2]) or (latbl == domains_dict[domain][2] or lattr == domains_dict[domain][0])) and ((lonbl == domains_dict[domain][1] and lontr == domains_dict[domain][3]) or (lonbl == domains_dict[domain][3] and lontr == domains_dict[domain][1])):
+         region = domain
 
-region = "unnamedregion"
+   # arrange lat and lon values to get bottom left and top right lat lon values
 
-for domain in domains_dict.keys():
-   if ((latbl == domains_dict[domain][0] and lattr == domains_dict[domain][2]) or (latbl == domains_dict[domain][2] or lattr == domains_dict[domain][0])) and ((lonbl == domains_dict[domain][1] and lontr == domains_dict[domain][3]) or (lonbl == domains_dict[domain][3] and lontr == domains_dict[domain][1])):
-      region = domain
+   if latbl == lattr or lonbl == lontr:
+      sys.exit('lat and lon values must be different')
+   else:
+      if latbl < lattr:
+         latbl, lattr = lattr, latbl
+      if lonbl > lontr:
+         lonbl, lontr = lontr, lonbl
 
-# arrange lat and lon values to get bottom left and top right lat lon values
+   colours = ["black", "white"]
 
-if latbl == lattr or lonbl == lontr:
-   sys.exit('lat and lon values must be different')
-else:
-   if latbl < lattr:
-      latbl, lattr = lattr, latbl
-   if lonbl > lontr:
-      lonbl, lontr = lontr, lonbl
+   for colour in colours:
 
-colours = ["black", "white"]
+      imagename = "map_"+colour+'_'+region
 
-for colour in colours:
+      wks_type = "png"
+      wks_res = ngl.Resources()
+      wks_res.wkBackgroundOpacityF = 0.0
+      wks = ngl.open_wks(wks_type, imagename, wks_res)
 
-   imagename = "map_"+colour+'_'+region
+   # define resources for analysis plot
 
-   wks_type = "png"
-   wks_res = ngl.Resources()
-   wks_res.wkBackgroundOpacityF = 0.0
-   wks = ngl.open_wks(wks_type, imagename, wks_res)
+      res = ngl.Resources()
+      res.nglDraw  = False
+      res.nglFrame = False
 
-# define resources for analysis plot
+      res.vpWidthF  = 0.9
+      res.vpHeightF = 0.6
 
-   res = ngl.Resources()
-   res.nglDraw  = False
-   res.nglFrame = False
+      res.mpGridAndLimbOn        = True
 
-   res.vpWidthF  = 0.9
-   res.vpHeightF = 0.6
+      res.pmTickMarkDisplayMode = "Never"
+      res.mpProjection              = "CylindricalEquidistant"
+      res.mpLimitMode = "LatLon"    # Limit the map view.
+      res.mpMinLonF   = lontr
+      res.mpMaxLonF   = lonbl
+      res.mpMinLatF   = lattr
+      res.mpMaxLatF   = latbl
+      res.mpOutlineBoundarySets     = "AllBoundaries"
+      res.mpNationalLineColor       = colour
+      res.mpNationalLineThicknessF  = 2.0
+      res.mpGeophysicalLineColor    = colour
+      res.mpGeophysicalLineThicknessF = 2.0
+      res.mpGridLatSpacingF = 5.0
+      res.mpGridLonSpacingF = 5.0
+      res.mpGridLineThicknessF = 2.0
+      res.cnMonoLineColor           = True
 
-   res.mpGridAndLimbOn        = True
+      map_plot = ngl.map(wks,res)
 
-   res.pmTickMarkDisplayMode = "Never"
-   res.mpProjection              = "CylindricalEquidistant"
-   res.mpLimitMode = "LatLon"    # Limit the map view.
-   res.mpMinLonF   = lontr
-   res.mpMaxLonF   = lonbl
-   res.mpMinLatF   = lattr
-   res.mpMaxLatF   = latbl
-   res.mpOutlineBoundarySets     = "AllBoundaries"
-   res.mpNationalLineColor       = colour
-   res.mpNationalLineThicknessF  = 2.0
-   res.mpGeophysicalLineColor    = colour
-   res.mpGeophysicalLineThicknessF = 2.0
-   res.mpGridLatSpacingF = 5.0
-   res.mpGridLonSpacingF = 5.0
-   res.mpGridLineThicknessF = 2.0
-   res.cnMonoLineColor           = True
+      ngl.maximize_plot(wks, map_plot)
+      ngl.draw(map_plot)
+      ngl.frame(wks)
 
-   map_plot = ngl.map(wks,res)
+      ngl.destroy(wks)
+      del res
 
-   ngl.maximize_plot(wks, map_plot)
-   ngl.draw(map_plot)
-   ngl.frame(wks)
+      os.system('mogrify -trim map_'+colour+'_'+region+'.png')
+   #   os.system('mogrify -resize 1350x900 map_'+colour+'_'+region+'.png')
 
-   ngl.destroy(wks)
-   del res
+###################################################################################################
 
-   os.system('mogrify -trim map_'+colour+'_'+region+'.png')
-#   os.system('mogrify -resize 1350x900 map_'+colour+'_'+region+'.png')
+if __name__ == "__main__":
+   main(*sys.argv[1:7])
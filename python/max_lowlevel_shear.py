@@ -26,596 +26,391 @@ import sys
 import os
 import datetime
 
+import controls
+import gfs_io
+import geometry
+import derived
+
+# fields read by main, used by the plot.py scheduler to load (and derive) them before the
+# plotting job runs. Each entry is a variable followed by its levels, in hPa ("lev" is the level
+# main is called with, "lev+1" the next level index, "low:high" all levels in between) or as
+# integer level indices. Single level fields have no levels.
+
+requires = {"fields": [["UGRD_P0_L100_GLL0", "925", "900", "850", "800", "700", "650", "600", "550", "500"],
+                       ["VGRD_P0_L100_GLL0", "925", "900", "850", "800", "700", "650", "600", "550", "500"]],
+            "derived": [["max_shear", "925:800", "700:500"]]}
+
+# names of the images main writes (without .png), used by the plot.py job ledger (see ledger.py)
+# to find the frames already plotted: the analysis image (None if main does not plot the analysis)
+# and the forecast images. {region}, {init}, {valid}, {lev} and {lead} are the region, the
+# initialisation and valid times (YYYYMMDDHH), the level main is called with and the lead time.
+
+images = {"analysis": "GFSanalysis_{region}_{init}_max_lowlevel_shear_SNGL",
+          "forecast": "GFSforecast_{region}_{init}_max_lowlevel_shear_SNGL_{init}_{lead:03d}"}
+
 ###################################################################################################
 
 # Main script to plot winds
 
-# define directory
+def main(init_dt, lev_hPa, latbl, lonbl, lattr, lontr):
 
-diri = (os.getcwd())+"/"
+   # define directory
 
-# forecast times (currently set to plot 0 to 48 hours)
+   diri = (os.getcwd())+"/"
 
-fore = np.arange(3,73,3)
+   # forecast times (currently set to plot 0 to 48 hours)
 
-# accept initialisation time and level as arguments
+   fore = controls.streamed_times(np.arange(3,73,3))
 
-init_dt = (sys.argv[1])
-lev1 = ["925", "900", "850", "800"]
-lev2 = ["700", "650", "600", "550", "500"]
+   # accept initialisation time and level as arguments
 
-# read in domains and accept lat and lon limits as arguments
+   init_dt = str(init_dt)
+   lev1 = ["925", "900", "850", "800"]
+   lev2 = ["700", "650", "600", "550", "500"]
 
-b = open(diri+"/domains")
-domains_content = b.readlines()
+   # read in domains and accept lat and lon limits as arguments
 
-key_list = []
-latlon_list = []
+   domains_dict = controls.read_domains(diri+"/domains")
 
-for domain in domains_content:
-   key_list.append(domain.split(":")[0])
-   latlon_str = (domain.split(":")[1]).strip().split(",")
-   latlon_flt = []
-   for ll in latlon_str:
-      latlon_flt.append(float(ll))
-   latlon_list.append(latlon_flt)
-   del(latlon_flt)
+   latbl = float(latbl)
+   lonbl = float(lonbl)
+   lattr = float(lattr)
+   lontr = float(lontr)
 
-domains_dict = dict(zip(key_list,latlon_list))
+   region = "unnamedregion"
 
-latbl = float(sys.argv[3])
-lonbl = float(sys.argv[4])
-lattr = float(sys.argv[5])
-lontr = float(sys.argv[6])
+   for domain in domains_dict.keys():
+      if ((latbl == domains_dict[domain][0] and lattr == domains_dict[domain][2]) or (latbl == domains_dict[domain][2] or lattr == domains_dict[domain][0])) and ((lonbl == domains_dict[domain][1] and lontr == domains_dict[domain][3]) or (lonbl == domains_dict[domain][3] and lontr == domains_dict[domain][1])):
+         region = domain
 
-region = "unnamedregion"
+   # arrange lat and lon values to get bottom left and top right lat lon values
 
-for domain in domains_dict.keys():
-   if ((latbl == domains_dict[domain][0] and lattr == domains_dict[domain][2]) or (latbl == domains_dict[domain][2] or lattr == domains_dict[domain][0])) and ((lonbl == domains_dict[domain][1] and lontr == domains_dict[domain][3]) or (lonbl == domains_dict[domain][3] and lontr == domains_dict[domain][1])):
-      region = domain
+   if latbl == lattr or lonbl == lontr:
+      sys.exit('lat and lon values must be different')
+   else:
+      if latbl < lattr:
+         latbl, lattr = lattr, latbl
+      if lonbl > lontr:
+         lonbl, lontr = lontr, lonbl
 
-# arrange lat and lon values to get bottom left and top right lat lon values
+   # read in analysis files
 
-if latbl == lattr or lonbl == lontr:
-   sys.exit('lat and lon values must be different')
-else:
-   if latbl < lattr:
-      latbl, lattr = lattr, latbl
-   if lonbl > lontr:
-      lonbl, lontr = lontr, lonbl
+   a_fili = "analysis_gfs_4_%s_%s00_000.nc" % (init_dt[:8], init_dt[8:10])
+   analysis = gfs_io.open_file(diri+a_fili, region)
 
-# read in analysis files
+   # read pressure levels from analysis file
 
-a_fili = "analysis_gfs_4_%s_%s00_000.nc" % (init_dt[:8], init_dt[8:10])
-analysis = nio.open_file(diri+a_fili)
+   levs_p = analysis.levels_hPa("UGRD_P0_L100_GLL0")
 
-# read pressure levels from analysis file
+   # identify level index
 
-levs_p1 = analysis.variables["lv_ISBL0"]
-levs_p = ['{:.0f}'.format(x) for x in levs_p1[:]/100.0]
-del levs_p1
+   lev_index1 = []
+   lev_index2 = []
 
-# identify level index
+   for i in np.arange(0,len(lev1), 1):
+      lev_index1.append(levs_p.index(lev1[i]))
+   for i in np.arange(0,len(lev2), 1):
+      lev_index2.append(levs_p.index(lev2[i]))
 
-lev_index1 = []
-lev_index2 = []
+   # read in lat and lon of the region from the region geometry cache (for boxes crossing the
+   # Greenwich Meridian lonbl and lontr are swapped and lon values run from -180 to 180)
 
-for i in np.arange(0,len(lev1), 1):
-   lev_index1.append(levs_p.index(lev1[i]))
-for i in np.arange(0,len(lev2), 1):
-   lev_index2.append(levs_p.index(lev2[i]))
+   geom = geometry.region(analysis, latbl, lonbl, lattr, lontr)
 
-# read in lat
+   lonbl, lontr = geom.lonbl, geom.lontr
+   lat = geom.lat
+   lon = geom.lon
 
-lat1 = analysis.variables["lat_0"]
-lat_temp = lat1[:]
+   # calculate max shear (derived.py, in the gfs_io working precision, float32)
 
-latbl_idx = (np.abs(lat_temp-latbl)).argmin()
-lattr_idx = (np.abs(lat_temp-lattr)).argmin()
+   shear = derived.max_shear(analysis, lev_index1, lev_index2)
+   max_shear = geometry.cut(shear[0], geom)
+   max_shear_u2_u1 = geometry.cut(shear[1], geom)
+   max_shear_v2_v1 = geometry.cut(shear[2], geom)
 
-if latbl_idx == lattr_idx:
-   sys.exit('lat values are not different enough, they must have relate to different grid points')
-elif latbl_idx > 1 and lattr_idx < len(lat_temp)-2:
-   lat_box1 = latbl_idx-2
-   lat_box2 = lattr_idx+2
-   lat = lat_temp[lat_box1:lat_box2]
-else:
-   lat_box1 = latbl_idx
-   lat_box2 = lattr_idx
-   lat = lat_temp[lat_box1:lat_box2]
+   # 2d lat and lon
 
-del(latbl_idx)
-del(lattr_idx)
-del(lat1)
-del(lat_temp)
+   lat2d = geom.lat2d
+   lon2d = geom.lon2d
 
-# read in lon 
+   # analysis plot, only the forecast plots are made when a forecast lead time is streamed
+   # (see controls.analysis_plotted)
 
-lon1 = analysis.variables["lon_0"]
+   if controls.analysis_plotted():
 
-# check to see if box crosses Greenwich Meridian. If so then the lon values must be modified for plot to work.
+      # open workspace for analysis plot
 
-if (np.sign(lonbl) + np.sign(lontr)) >= -1 and (np.sign(lonbl) + np.sign(lontr)) <= 1:
+      wks_type = "png"
+      wks = ngl.open_wks(wks_type, "GFSanalysis_%s_%s_max_lowlevel_shear_SNGL" % (region, init_dt[0:10]))
 
-   lonbl, lontr = lontr, lonbl
+      # define resources for analysis plot
 
-   lon_temp = np.where(lon1[:]>=180.0, lon1[:]-360.0, lon1[:])
+      res = ngl.Resources()
+      res.nglDraw                     = False
+      res.nglFrame                    = False
 
-   lonbl_idx = (np.abs(lon_temp-lonbl)).argmin()
-   lontr_idx = (np.abs(lon_temp-lontr)).argmin()
+      cmap = ngl.read_colormap_file("WhiteBlueGreenYellowRed")
 
-   if lonbl_idx == lontr_idx:
-      sys.exit('lon values are not different enough, they must have relate to different grid points')
-   elif lontr_idx > len(lon_temp)/2 and lonbl_idx <= len(lon_temp)/2:
-      lon_box1 = lonbl_idx+2
-      lon_box2 = lontr_idx-2
-      lon_box3 = len(lon_temp)-1
+      res.cnLinesOn                   = False
+      res.cnLineLabelsOn              = False
+      res.cnFillOn                    = True
+      res.cnFillPalette               = cmap[15:,:]
 
-      lon_temp1 = lon_temp[0:lon_box1]
-      lon_temp2 = lon_temp[lon_box2:lon_box3]
-   else:
-      lon_box1 = lonbl_idx
-      lon_box2 = lontr_idx
-      lon_box3 = len(lon_temp)-1
+      res.lbAutoManage          = False
+      res.lbLabelFontHeightF         = 0.005
+      res.lbOrientation              = "horizontal"
+      res.lbLabelAngleF              = 45
+      res.pmLabelBarOrthogonalPosF = -1.
+      res.pmLabelBarParallelPosF = 0.25
+      res.pmLabelBarWidthF      = 0.3
+      res.pmLabelBarHeightF     = 0.1
+      res.lbTitleString         = "max shear (m/s)"
+      res.lbTitleFontHeightF   = 0.0125
 
-      lon_temp1 = lon_temp[0:lon_box1]
-      lon_temp2 = lon_temp[lon_box2:lon_box3]
+      res.mpFillOn                    = False
+      res.mpGeophysicalLineColor      = "Grey18"
+      res.mpGeophysicalLineThicknessF = 1.5
 
+      res.sfXArray                    = lon2d
+      res.sfYArray                    = lat2d
 
-   lon = np.append(lon_temp2, lon_temp1)
+      res.mpGridAndLimbOn        = False
+      res.pmTickMarkDisplayMode = "Never"
 
-   del(lon_temp1)
-   del(lon_temp2)
-   del(lonbl_idx)
-   del(lontr_idx)
-   del(lon_temp)
+      res.cnInfoLabelOn              = False
 
-else:
+      res.mpProjection              = "CylindricalEquidistant"
+      res.mpLimitMode = "LatLon"    # Limit the map view.
+      res.mpMinLonF   = lontr
+      res.mpMaxLonF   = lonbl
+      res.mpMinLatF   = lattr
+      res.mpMaxLatF   = latbl
+      res.mpPerimOn   = True
+      res.mpOutlineBoundarySets     = "AllBoundaries"
+      res.mpNationalLineColor       = "gray40"
+      res.mpNationalLineThicknessF  = 1.5
+      res.mpGeophysicalLineColor    = "gray40"
+      res.mpGeophysicalLineThicknessF = 1.5
+      res.cnMonoLineColor           = True
 
-   lon_temp = lon1[:]
+      #max_cont = 50.0
+      #min_cont = 0.0
 
-   lonbl_idx = (np.abs(lon_temp-lonbl)).argmin()
-   lontr_idx = (np.abs(lon_temp-lontr)).argmin()
+      res.cnLevelSelectionMode = "ExplicitLevels"
+      res.cnLevels = [10.0, 12.0, 14.0, 16.0, 18.0, 20.0, 22.0, 24.0, 26.0, 28.0, 30.0, 32.0, 34.0, 36.0, 38.0, 40.0]
+      res.cnFillColors = [-1, 15, 30, 45, 60, 75, 90, 105, 120, 135, 150, 165, 180, 195, 210, 225,237 ]
 
-   if lonbl_idx == lontr_idx:
-      sys.exit('lon values are not different enough, they must have relate to different grid points')
-   elif lonbl_idx > 1 and lontr_idx < len(lon_temp)-2:
-      lon_box1 = lonbl_idx-2
-      lon_box2 = lontr_idx+2
-      lon = lon_temp[lon_box1:lon_box2]
-   else:
-      lon_box1 = lonbl_idx
-      lon_box2 = lontr_idx
-      lon = lon_temp[lon_box1:lon_box2]
-
-# read in winds, checking whether box crosses Greenwich Meridian.
+      # create shear plot for analysis data
 
-u1 = np.zeros((len(lev1),len(lat), len(lon)), float)
-v1 = np.zeros((len(lev1),len(lat), len(lon)), float)
+      shear_plot = ngl.contour_map(wks,max_shear,res)
 
-u2 = np.zeros((len(lev2),len(lat), len(lon)), float)
-v2 = np.zeros((len(lev2),len(lat), len(lon)), float)
-
-if (np.sign(lonbl) + np.sign(lontr)) >= -1 and (np.sign(lonbl) + np.sign(lontr)) <= 1:
+      # define resources for vectors
 
-   for i in np.arange(0,len(lev1),1):
-      u_temp = analysis.variables["UGRD_P0_L100_GLL0"][lev_index1[i],:,:]
-      u_tempA = u_temp[lat_box1:lat_box2,0:lon_box1]
-      u_tempB = u_temp[lat_box1:lat_box2,lon_box2:lon_box3]
-      u1[i,:,:] = np.concatenate((u_tempB,u_tempA),axis=1)
-      del(u_temp)
-      del(u_tempA)
-      del(u_tempB)
-
-      v_temp = analysis.variables["VGRD_P0_L100_GLL0"][lev_index1[i],:,:]
-      v_tempA = v_temp[lat_box1:lat_box2,0:lon_box1]
-      v_tempB = v_temp[lat_box1:lat_box2,lon_box2:lon_box3]
-      v1[i,:,:] = np.concatenate((v_tempB,v_tempA),axis=1)
-      del(v_temp)
-      del(v_tempA)
-      del(v_tempB)
-
-   for i in np.arange(0,len(lev2),1):
-
-      u_temp = analysis.variables["UGRD_P0_L100_GLL0"][lev_index2[i],:,:]
-      u_tempA = u_temp[lat_box1:lat_box2,0:lon_box1]
-      u_tempB = u_temp[lat_box1:lat_box2,lon_box2:lon_box3]
-      u2[i,:,:] = np.concatenate((u_tempB,u_tempA),axis=1)
-      del(u_temp)
-      del(u_tempA)
-      del(u_tempB)
-
-      v_temp = analysis.variables["VGRD_P0_L100_GLL0"][lev_index2[i],:,:]
-      v_tempA = v_temp[lat_box1:lat_box2,0:lon_box1]
-      v_tempB = v_temp[lat_box1:lat_box2,lon_box2:lon_box3]
-      v2[i,:,:] = np.concatenate((v_tempB,v_tempA),axis=1)
-      del(v_temp)
-      del(v_tempA)
-      del(v_tempB)
-
-else:
-
-   for i in np.arange(0,len(lev1),1):
-      u_temp = analysis.variables["UGRD_P0_L100_GLL0"][lev_index1[i],:,:]
-      u1[i,:,:] = u_temp[lat_box1:lat_box2,lon_box1:lon_box2]
-      del u_temp
-
-      v_temp = analysis.variables["VGRD_P0_L100_GLL0"][lev_index1[i],:,:]
-      v1[i,:,:] = v_temp[lat_box1:lat_box2,lon_box1:lon_box2]
-      del v_temp
-
-   for i in np.arange(0,len(lev2),1):
-      u_temp = analysis.variables["UGRD_P0_L100_GLL0"][lev_index2[i],:,:]
-      u2[i,:,:] = u_temp[lat_box1:lat_box2,lon_box1:lon_box2]
-      del u_temp
-
-      v_temp = analysis.variables["VGRD_P0_L100_GLL0"][lev_index2[i],:,:]
-      v2[i,:,:] = v_temp[lat_box1:lat_box2,lon_box1:lon_box2]
-      del v_temp
-
-# calculate max shear
-
-shear = np.zeros((len(lev1),len(lev2),len(lat), len(lon)), float)
-max_shear = np.zeros((len(lat), len(lon)), float)
-max_shear_u2_u1 = np.zeros((len(lat), len(lon)), float)
-max_shear_v2_v1 = np.zeros((len(lat), len(lon)), float)
-
-for i in np.arange(0,len(lev1),1):
-   for j in np.arange(0,len(lev2),1):
-      shear[i,j,:,:] = np.sqrt((u2[j]-u1[i])**2.0 + (v2[j]-v1[i])**2.0)
-
-      max_shear_u2_u1 = np.where(shear[i,j,:,:] > max_shear, u2[j]-u1[i], max_shear_u2_u1)
-      max_shear_v2_v1 = np.where(shear[i,j,:,:] > max_shear, v2[j]-v1[i], max_shear_v2_v1)
-      max_shear = np.where(shear[i,j,:,:] > max_shear, shear[i,j,:,:], max_shear)
-
-# create 2d lat and lon
-
-lat2d = np.zeros((len(lat),len(lon)))
-lon2d = np.zeros((len(lat),len(lon)))
-
-for i in range(0, len(lon)):
-   lat2d[:,i] = lat
-
-for i in range(0, len(lat)):
-   lon2d[i,:] = lon
-   
-# open workspace for analysis plot
-
-wks_type = "png"
-wks = ngl.open_wks(wks_type, "GFSanalysis_%s_%s_max_lowlevel_shear_SNGL" % (region, init_dt[0:10]))
-
-# define resources for analysis plot
-
-res = ngl.Resources()
-res.nglDraw                     = False
-res.nglFrame                    = False
-
-cmap = ngl.read_colormap_file("WhiteBlueGreenYellowRed")
-
-res.cnLinesOn                   = False
-res.cnLineLabelsOn              = False
-res.cnFillOn                    = True
-res.cnFillPalette               = cmap[15:,:]
-
-res.lbAutoManage          = False
-res.lbLabelFontHeightF         = 0.005
-res.lbOrientation              = "horizontal"
-res.lbLabelAngleF              = 45
-res.pmLabelBarOrthogonalPosF = -1.
-res.pmLabelBarParallelPosF = 0.25
-res.pmLabelBarWidthF      = 0.3
-res.pmLabelBarHeightF     = 0.1
-res.lbTitleString         = "max shear (m/s)"
-res.lbTitleFontHeightF   = 0.0125
-
-res.mpFillOn                    = False
-res.mpGeophysicalLineColor      = "Grey18"
-res.mpGeophysicalLineThicknessF = 1.5
+      vcres                         = ngl.Resources()
+      vcres.nglDraw                 = False
+      vcres.nglFrame                = False
 
-res.sfXArray                    = lon2d
-res.sfYArray                    = lat2d
+      vcres.vfXArray                = lon2d
+      vcres.vfYArray                = lat2d
 
-res.mpGridAndLimbOn        = False
-res.pmTickMarkDisplayMode = "Never"
-
-res.cnInfoLabelOn              = False
+      vcres.vcRefMagnitudeF         = 30.0             # define vector ref mag
+      vcres.vcRefLengthF            = 0.03             # define length of vec ref
+      vcres.vcMinFracLengthF        = 0.3
+      vcres.vcMinDistanceF          = 0.02
+      vcres.vcRefAnnoOrthogonalPosF = -0.20
+      vcres.vcRefAnnoFontHeightF    = 0.005
+      vcres.vcLineArrowThicknessF     = 2.0
 
-res.mpProjection              = "CylindricalEquidistant"
-res.mpLimitMode = "LatLon"    # Limit the map view.
-res.mpMinLonF   = lontr
-res.mpMaxLonF   = lonbl
-res.mpMinLatF   = lattr
-res.mpMaxLatF   = latbl
-res.mpPerimOn   = True
-res.mpOutlineBoundarySets     = "AllBoundaries"
-res.mpNationalLineColor       = "gray40"
-res.mpNationalLineThicknessF  = 1.5
-res.mpGeophysicalLineColor    = "gray40"
-res.mpGeophysicalLineThicknessF = 1.5
-res.cnMonoLineColor           = True
+      # create vector plot for analysis data and overlay on colour contours level 1
 
-#max_cont = 50.0
-#min_cont = 0.0
+      uv_plot1  = ngl.vector(wks,max_shear_u2_u1,max_shear_v2_v1,vcres)
 
-res.cnLevelSelectionMode = "ExplicitLevels"
-res.cnLevels = [10.0, 12.0, 14.0, 16.0, 18.0, 20.0, 22.0, 24.0, 26.0, 28.0, 30.0, 32.0, 34.0, 36.0, 38.0, 40.0]
-res.cnFillColors = [-1, 15, 30, 45, 60, 75, 90, 105, 120, 135, 150, 165, 180, 195, 210, 225,237 ]
+      # create vector plot for analysis data and overlay on colour contours level2
 
-# create shear plot for analysis data
+      #vcres.vcLineArrowColor = "Red"
+      #
+      #uv_plot2 = ngl.vector(wks,u_2,v_2,vcres)
 
-shear_plot = ngl.contour_map(wks,max_shear,res)
+      ngl.overlay(shear_plot,uv_plot1)
+      #ngl.overlay(shear_plot,uv_plot2)
+      ngl.maximize_plot(wks, shear_plot)
+      ngl.draw(shear_plot)
+      ngl.frame(wks)
 
-# define resources for vectors
+      ngl.destroy(wks)
+      del res
+      del vcres
+      del shear
+      del max_shear
+      del max_shear_u2_u1
+      del max_shear_v2_v1
 
-vcres                         = ngl.Resources()
-vcres.nglDraw                 = False
-vcres.nglFrame                = False
+   ###################################################################################################
 
-vcres.vfXArray                = lon2d
-vcres.vfYArray                = lat2d
+   # forecast plots, none when only the analysis is plotted
 
-vcres.vcRefMagnitudeF         = 30.0             # define vector ref mag
-vcres.vcRefLengthF            = 0.03             # define length of vec ref
-vcres.vcMinFracLengthF        = 0.3
-vcres.vcMinDistanceF          = 0.02
-vcres.vcRefAnnoOrthogonalPosF = -0.20
-vcres.vcRefAnnoFontHeightF    = 0.005
-vcres.vcLineArrowThicknessF     = 2.0
+   if len(fore) > 0:
 
-# create vector plot for analysis data and overlay on colour contours level 1
+      # open forecast file
 
-uv_plot1  = ngl.vector(wks,max_shear_u2_u1,max_shear_v2_v1,vcres)
+      f_fili = "GFS_48h_forecast_%s_%s.nc" % (init_dt[:8], init_dt[8:10])
+      forecast = gfs_io.open_file(diri+f_fili, region)
 
-# create vector plot for analysis data and overlay on colour contours level2
+      # read in and calculate the fields for all forecast times at once, only the plotting is done
+      # for each forecast time
 
-#vcres.vcLineArrowColor = "Red"
-#
-#uv_plot2 = ngl.vector(wks,u_2,v_2,vcres)
-
-ngl.overlay(shear_plot,uv_plot1)
-#ngl.overlay(shear_plot,uv_plot2)
-ngl.maximize_plot(wks, shear_plot)
-ngl.draw(shear_plot)
-ngl.frame(wks)
-
-ngl.destroy(wks)
-del res
-del vcres
-del u1
-del v1
-del u2
-del v2
-del shear
-del max_shear
-del max_shear_u2_u1
-del max_shear_v2_v1
+      steps = slice(0, len(fore))
 
-###################################################################################################
+         # calculate max shear (derived.py, in the gfs_io working precision, float32)
 
-# open forecast file
+      shear = derived.max_shear(forecast, lev_index1, lev_index2)
+      max_shear_steps = geometry.cut(shear[0], geom, steps)
+      max_shear_u2_u1_steps = geometry.cut(shear[1], geom, steps)
+      max_shear_v2_v1_steps = geometry.cut(shear[2], geom, steps)
 
-f_fili = "GFS_48h_forecast_%s_%s.nc" % (init_dt[:8], init_dt[8:10])
-forecast = nio.open_file(diri+f_fili)
+      # loop through forecast times
 
-# loop through forecast times
+      for i in range(0, len(fore)):
 
-for i in range(0, len(fore)):
+         # frames already in the ledger for the same files are not plotted again (see ledger.py)
 
-# create string for valid time
+         if not controls.frame_wanted(fore[i]):
+            continue
 
-   valid_date = (datetime.datetime(int(init_dt[:4]), int(init_dt[4:6]), int(init_dt[6:8]), int(init_dt[8:10])) + datetime.timedelta(hours=int(fore[i]))).strftime("%Y%m%d%H")
+      # fields for this forecast time
 
-# read in winds, checking whether box crosses Greenwich Meridian.
+         max_shear = max_shear_steps[i]
+         max_shear_u2_u1 = max_shear_u2_u1_steps[i]
+         max_shear_v2_v1 = max_shear_v2_v1_steps[i]
 
-   u1 = np.zeros((len(lev1),len(lat), len(lon)), float)
-   v1 = np.zeros((len(lev1),len(lat), len(lon)), float)
+      # open workspace for forecast plots
 
-   u2 = np.zeros((len(lev2),len(lat), len(lon)), float)
-   v2 = np.zeros((len(lev2),len(lat), len(lon)), float)
+         wks_type = "png"
+         wks = ngl.open_wks(wks_type, "GFSforecast_%s_%s_max_lowlevel_shear_SNGL_%s_%03d" % (region, init_dt[0:10], init_dt[0:10], fore[i]))
+      #   wks = ngl.open_wks(wks_type, "GFSforecast_%s_%s_wind_%shPa_%s_%03d" % (region, valid_date, lev_hPa, init_dt[0:10], fore[i]))
 
-   if (np.sign(lonbl) + np.sign(lontr)) >= -1 and (np.sign(lonbl) + np.sign(lontr)) <= 1:
+      # define resources for forecast plots
 
-      for j in np.arange(0,len(lev1),1):
-         u_temp = forecast.variables["UGRD_P0_L100_GLL0"][i,lev_index1[j],:,:]
-         u_tempA = u_temp[lat_box1:lat_box2,0:lon_box1]
-         u_tempB = u_temp[lat_box1:lat_box2,lon_box2:lon_box3]
-         u1[j,:,:] = np.concatenate((u_tempB,u_tempA),axis=1)
-         del(u_temp)
-         del(u_tempA)
-         del(u_tempB)
-   
-         v_temp = forecast.variables["VGRD_P0_L100_GLL0"][i,lev_index1[j],:,:]
-         v_tempA = v_temp[lat_box1:lat_box2,0:lon_box1]
-         v_tempB = v_temp[lat_box1:lat_box2,lon_box2:lon_box3]
-         v1[j,:,:] = np.concatenate((v_tempB,v_tempA),axis=1)
-         del(v_temp)
-         del(v_tempA)
-         del(v_tempB)
+         res = ngl.Resources()
+         res.nglDraw                     = False
+         res.nglFrame                    = False
 
-      u2 = np.zeros((len(lev2),len(lat), len(lon)), float)
-      v2 = np.zeros((len(lev2),len(lat), len(lon)), float)
+         cmap = ngl.read_colormap_file("WhiteBlueGreenYellowRed")
 
-      for j in np.arange(0,len(lev2),1):
+         res.cnLinesOn                   = False
+         res.cnLineLabelsOn              = False
+         res.cnFillOn                    = True
+         res.cnFillPalette               = cmap[15:,:]
 
-         u_temp = forecast.variables["UGRD_P0_L100_GLL0"][i,lev_index2[j],:,:]
-         u_tempA = u_temp[lat_box1:lat_box2,0:lon_box1]
-         u_tempB = u_temp[lat_box1:lat_box2,lon_box2:lon_box3]
-         u2[j,:,:] = np.concatenate((u_tempB,u_tempA),axis=1)
-         del(u_temp)
-         del(u_tempA)
-         del(u_tempB)
+         res.lbAutoManage          = False
+         res.lbLabelFontHeightF         = 0.005
+         res.lbOrientation              = "horizontal"
+         res.lbLabelAngleF              = 45
+         res.pmLabelBarOrthogonalPosF = -1.
+         res.pmLabelBarParallelPosF = 0.25
+         res.pmLabelBarWidthF      = 0.3
+         res.pmLabelBarHeightF     = 0.1
+         res.lbTitleString         = "max shear (m/s)"
+         res.lbTitleFontHeightF   = 0.0125   
 
-         v_temp = forecast.variables["VGRD_P0_L100_GLL0"][i,lev_index2[j],:,:]
-         v_tempA = v_temp[lat_box1:lat_box2,0:lon_box1]
-         v_tempB = v_temp[lat_box1:lat_box2,lon_box2:lon_box3]
-         v2[j,:,:] = np.concatenate((v_tempB,v_tempA),axis=1)
-         del(v_temp)
-         del(v_tempA)
-         del(v_tempB)
+         res.mpFillOn                    = False
+         res.mpGeophysicalLineColor      = "Grey18"
+         res.mpGeophysicalLineThicknessF = 1.5
 
-   else:
+         res.sfXArray                    = lon2d
+         res.sfYArray                    = lat2d
 
-      for j in np.arange(0,len(lev1),1):
-         u_temp = forecast.variables["UGRD_P0_L100_GLL0"][i,lev_index1[j],:,:]
-         u1[j,:,:] = u_temp[lat_box1:lat_box2,lon_box1:lon_box2]
-         del u_temp
-
-         v_temp = forecast.variables["VGRD_P0_L100_GLL0"][i,lev_index1[j],:,:]
-         v1[j,:,:] = v_temp[lat_box1:lat_box2,lon_box1:lon_box2]
-         del v_temp
+         res.mpGridAndLimbOn        = False
+         res.pmTickMarkDisplayMode = "Never"
 
-      for j in np.arange(0,len(lev2),1):
-         u_temp = forecast.variables["UGRD_P0_L100_GLL0"][i,lev_index2[j],:,:]
-         u2[j,:,:] = u_temp[lat_box1:lat_box2,lon_box1:lon_box2]
-         del u_temp
+         res.cnInfoLabelOn              = False
 
-         v_temp = forecast.variables["VGRD_P0_L100_GLL0"][i,lev_index2[j],:,:]
-         v2[j,:,:] = v_temp[lat_box1:lat_box2,lon_box1:lon_box2]
-         del v_temp
+         res.mpProjection              = "CylindricalEquidistant"
+         res.mpLimitMode = "LatLon"    # Limit the map view.
+         res.mpMinLonF   = lontr
+         res.mpMaxLonF   = lonbl
+         res.mpMinLatF   = lattr
+         res.mpMaxLatF   = latbl
+         res.mpPerimOn   = True
+         res.mpOutlineBoundarySets     = "AllBoundaries"
+         res.mpNationalLineColor       = "gray40"
+         res.mpNationalLineThicknessF  = 1.5
+         res.mpGeophysicalLineColor    = "gray40"
+         res.mpGeophysicalLineThicknessF = 1.5
+         res.cnMonoLineColor           = True
 
-   # calculate windspeed
+      #   max_cont = 50.0
+      #   min_cont = 0.0
 
-   shear = np.zeros((len(lev1),len(lev2),len(lat), len(lon)), float)
-   max_shear = np.zeros((len(lat), len(lon)), float)
-   max_shear_u2_u1 = np.zeros((len(lat), len(lon)), float)
-   max_shear_v2_v1 = np.zeros((len(lat), len(lon)), float)
-
-   for j in np.arange(0,len(lev1),1):
-      for k in np.arange(0,len(lev2),1):
-         shear[j,k,:,:] = np.sqrt((u2[k]-u1[j])**2.0 + (v2[k]-v1[j])**2.0)
+      #   res.cnLevelSelectionMode = "ManualLevels"
+      #   res.cnMinLevelValF       = min_cont
+      #   res.cnMaxLevelValF       = max_cont
+      #   res.cnLevelSpacingF      = 2.
+      #   res.cnLineThicknessF     = 2.5
 
-         max_shear_u2_u1 = np.where(shear[j,k,:,:] > max_shear, u2[k]-u1[j], max_shear_u2_u1)
-         max_shear_v2_v1 = np.where(shear[j,k,:,:] > max_shear, v2[k]-v1[j], max_shear_v2_v1)
-         max_shear = np.where(shear[j,k,:,:] > max_shear, shear[j,k,:,:], max_shear)
+         res.cnLevelSelectionMode = "ExplicitLevels"
+         res.cnLevels = [10.0, 12.0, 14.0, 16.0, 18.0, 20.0, 22.0, 24.0, 26.0, 28.0, 30.0, 32.0, 34.0, 36.0, 38.0, 40.0]
+         res.cnFillColors = [-1, 15, 30, 45, 60, 75, 90, 105, 120, 135, 150, 165, 180, 195, 210, 225,237 ]
 
-# open workspace for forecast plots
+      # create ws plot for analysis data
 
-   wks_type = "png"
-   wks = ngl.open_wks(wks_type, "GFSforecast_%s_%s_max_lowlevel_shear_SNGL_%s_%03d" % (region, init_dt[0:10], init_dt[0:10], fore[i]))
-#   wks = ngl.open_wks(wks_type, "GFSforecast_%s_%s_wind_%shPa_%s_%03d" % (region, valid_date, lev_hPa, init_dt[0:10], fore[i]))
+         shear_plot = ngl.contour_map(wks,max_shear,res)
 
-# define resources for forecast plots
 
-   res = ngl.Resources()
-   res.nglDraw                     = False
-   res.nglFrame                    = False
-
-   cmap = ngl.read_colormap_file("WhiteBlueGreenYellowRed")
-
-   res.cnLinesOn                   = False
-   res.cnLineLabelsOn              = False
-   res.cnFillOn                    = True
-   res.cnFillPalette               = cmap[15:,:]
-
-   res.lbAutoManage          = False
-   res.lbLabelFontHeightF         = 0.005
-   res.lbOrientation              = "horizontal"
-   res.lbLabelAngleF              = 45
-   res.pmLabelBarOrthogonalPosF = -1.
-   res.pmLabelBarParallelPosF = 0.25
-   res.pmLabelBarWidthF      = 0.3
-   res.pmLabelBarHeightF     = 0.1
-   res.lbTitleString         = "max shear (m/s)"
-   res.lbTitleFontHeightF   = 0.0125   
-
-   res.mpFillOn                    = False
-   res.mpGeophysicalLineColor      = "Grey18"
-   res.mpGeophysicalLineThicknessF = 1.5
-
-   res.sfXArray                    = lon2d
-   res.sfYArray                    = lat2d
-
-   res.mpGridAndLimbOn        = False
-   res.pmTickMarkDisplayMode = "Never"
-
-   res.cnInfoLabelOn              = False
-
-   res.mpProjection              = "CylindricalEquidistant"
-   res.mpLimitMode = "LatLon"    # Limit the map view.
-   res.mpMinLonF   = lontr
-   res.mpMaxLonF   = lonbl
-   res.mpMinLatF   = lattr
-   res.mpMaxLatF   = latbl
-   res.mpPerimOn   = True
-   res.mpOutlineBoundarySets     = "AllBoundaries"
-   res.mpNationalLineColor       = "gray40"
-   res.mpNationalLineThicknessF  = 1.5
-   res.mpGeophysicalLineColor    = "gray40"
-   res.mpGeophysicalLineThicknessF = 1.5
-   res.cnMonoLineColor           = True
-
-#   max_cont = 50.0
-#   min_cont = 0.0
-
-#   res.cnLevelSelectionMode = "ManualLevels"
-#   res.cnMinLevelValF       = min_cont
-#   res.cnMaxLevelValF       = max_cont
-#   res.cnLevelSpacingF      = 2.
-#   res.cnLineThicknessF     = 2.5
-
-   res.cnLevelSelectionMode = "ExplicitLevels"
-   res.cnLevels = [10.0, 12.0, 14.0, 16.0, 18.0, 20.0, 22.0, 24.0, 26.0, 28.0, 30.0, 32.0, 34.0, 36.0, 38.0, 40.0]
-   res.cnFillColors = [-1, 15, 30, 45, 60, 75, 90, 105, 120, 135, 150, 165, 180, 195, 210, 225,237 ]
-
-# create ws plot for analysis data
-
-   shear_plot = ngl.contour_map(wks,max_shear,res)
-
-
-# define resources for vectors
-
-   vcres                         = ngl.Resources()
-   vcres.nglDraw                 = False
-   vcres.nglFrame                = False
-
-   vcres.vfXArray                = lon2d
-   vcres.vfYArray                = lat2d
-
-   #vcres.vcFillArrowsOn          = True
-   res.vcLineArrowColor          = "Black"
-   vcres.vcRefMagnitudeF         = 30.0             # define vector ref mag
-   vcres.vcRefLengthF            = 0.03             # define length of vec ref
-   vcres.vcMinFracLengthF        = 0.3
-   vcres.vcMinDistanceF          = 0.02
-   vcres.vcRefAnnoOrthogonalPosF = -0.20
-   vcres.vcRefAnnoFontHeightF    = 0.005
-   vcres.vcLineArrowThicknessF     = 2.0
-
-# create vector plot for analysis data and overlay on colour contours
-
-   uv_plot1  = ngl.vector(wks,max_shear_u2_u1,max_shear_v2_v1,vcres)
-
-# create vector plot for analysis data and overlay on colour contours level2
-
-   ngl.overlay(shear_plot,uv_plot1)
-   ngl.maximize_plot(wks, shear_plot)
-   ngl.draw(shear_plot)
-   ngl.frame(wks)
-
-   ngl.destroy(wks)
-   del res
-   del vcres
-   del u1
-   del v1
-   del u2 
-   del v2
-   del shear
-   del max_shear
-   del max_shear_u2_u1
-   del max_shear_v2_v1
-
-os.system('mogrify -trim *_'+region+'_'+init_dt[0:10]+'_max_lowlevel_shear_SNGL.png')
-if region == "WA" or region == "unknownWA":
-   os.system('mogrify -resize 886x600 *_'+region+'_'+init_dt[0:10]+'_max_lowlevel_shear_SNGL.png')
-elif region == "EA" or region == "unknownEA":
-   os.system('mogrify -resize 600x733 *_'+region+'_'+init_dt[0:10]+'_max_lowlevel_shear_SNGL.png')
-
-os.system('mv *_'+region+'_'+init_dt[0:10]+'_max_lowlevel_shear_SNGL.png MARTIN/GFS/'+region+'/'+init_dt[0:10]+'/max_lowlevel_shear')
-
-os.system('mogrify -trim *'+region+'_*_max_lowlevel_shear_SNGL_'+init_dt[0:10]+'*.png')
-if region == "WA" or region == "unknownWA":
-   os.system('mogrify -resize 886x600 *'+region+'_*_max_lowlevel_shear_SNGL_'+init_dt[0:10]+'*.png')
-elif region == "EA" or region == "unknownEA":
-   os.system('mogrify -resize 600x733 *'+region+'_*_max_lowlevel_shear_SNGL_'+init_dt[0:10]+'*.png')
-
-os.system('mv *'+region+'_*_max_lowlevel_shear_SNGL_'+init_dt[0:10]+'*.png MARTIN/GFS/'+region+'/'+init_dt[0:10]+'/max_lowlevel_shear')
+      # define resources for vectors
+
+         vcres                         = ngl.Resources()
+         vcres.nglDraw                 = False
+         vcres.nglFrame                = False
+
+         vcres.vfXArray                = lon2d
+         vcres.vfYArray                = lat2d
+
+         #vcres.vcFillArrowsOn          = True
+         res.vcLineArrowColor          = "Black"
+         vcres.vcRefMagnitudeF         = 30.0             # define vector ref mag
+         vcres.vcRefLengthF            = 0.03             # define length of vec ref
+         vcres.vcMinFracLengthF        = 0.3
+         vcres.vcMinDistanceF          = 0.02
+         vcres.vcRefAnnoOrthogonalPosF = -0.20
+         vcres.vcRefAnnoFontHeightF    = 0.005
+         vcres.vcLineArrowThicknessF     = 2.0
+
+      # create vector plot for analysis data and overlay on colour contours
+
+         uv_plot1  = ngl.vector(wks,max_shear_u2_u1,max_shear_v2_v1,vcres)
+
+      # create vector plot for analysis data and overlay on colour contours level2
+
+         ngl.overlay(shear_plot,uv_plot1)
+         ngl.maximize_plot(wks, shear_plot)
+         ngl.draw(shear_plot)
+         ngl.frame(wks)
+
+         ngl.destroy(wks)
+         del res
+         del vcres
+         del max_shear
+         del max_shear_u2_u1
+         del max_shear_v2_v1
+
+   os.system('mogrify -trim *_'+region+'_'+init_dt[0:10]+'_max_lowlevel_shear_SNGL.png')
+   if region == "WA" or region == "unknownWA":
+      os.system('mogrify -resize 886x600 *_'+region+'_'+init_dt[0:10]+'_max_lowlevel_shear_SNGL.png')
+   elif region == "EA" or region == "unknownEA":
+      os.system('mogrify -resize 600x733 *_'+region+'_'+init_dt[0:10]+'_max_lowlevel_shear_SNGL.png')
+
+   os.system('mv *_'+region+'_'+init_dt[0:10]+'_max_lowlevel_shear_SNGL.png MARTIN/GFS/'+region+'/'+init_dt[0:10]+'/max_lowlevel_shear')
+
+   os.system('mogrify -trim *'+region+'_*_max_lowlevel_shear_SNGL_'+init_dt[0:10]+'*.png')
+   if region == "WA" or region == "unknownWA":
+      os.system('mogrify -resize 886x600 *'+region+'_*_max_lowlevel_shear_SNGL_'+init_dt[0:10]+'*.png')
+   elif region == "EA" or region == "unknownEA":
+      os.system('mogrify -resize 600x733 *'+region+'_*_max_lowlevel_shear_SNGL_'+init_dt[0:10]+'*.png')
+
+   os.system('mv *'+region+'_*_max_lowlevel_shear_SNGL_'+init_dt[0:10]+'*.png MARTIN/GFS/'+region+'/'+init_dt[0:10]+'/max_lowlevel_shear')
+
+###################################################################################################
+
+if __name__ == "__main__":
+   main(*sys.argv[1:7])
@@ -27,491 +27,394 @@ import sys
 import os
 import datetime
 
-GFS_dir = os.environ['SWIFT_GFS']
-
-###################################################################################################
-
-# Main script to plot mean winds between 800 and 600 hPa
-
-# define directory
-
-diri = (os.getcwd())+"/"
-
-# define pressure levels
-
-lev1 = "800"
-lev2 = "600"
-
-# forecast times (currently set to 0 to 48 hours)
-
-fore = (os.popen("cat %s/controls/namelist | grep 'fore:' | awk -F: '{print $2}' | tr ',' ' '"%(GFS_dir))).read().split()
-fore = [np.int(f) for f in fore]
-
-# accept initialisation time and dates as an argument
+import controls
+import gfs_io
+import geometry
 
-init_dt = (sys.argv[1])
+GFS_dir = os.environ['SWIFT_GFS']
 
-# read in domains and accept lat and lon limits as arguments
+# fields read by main, used by the plot.py scheduler to load (and derive) them before the
+# plotting job runs. Each entry is a variable followed by its levels, in hPa ("lev" is the level
+# main is called with, "lev+1" the next level index, "low:high" all levels in between) or as
+# integer level indices. Single level fields have no levels.
 
-b = open(GFS_dir+"/controls/domains")
-domains_content = b.readlines()
+requires = {"fields": [["UGRD_P0_L100_GLL0", "600:800"], ["VGRD_P0_L100_GLL0", "600:800"]],
+            "derived": []}
 
-key_list = []
-latlon_list = []
+# names of the images main writes (without .png), used by the plot.py job ledger (see ledger.py)
+# to find the frames already plotted: the analysis image (None if main does not plot the analysis)
+# and the forecast images. {region}, {init}, {valid}, {lev} and {lead} are the region, the
+# initialisation and valid times (YYYYMMDDHH), the level main is called with and the lead time.
 
-for domain in domains_content:
-   key_list.append(domain.split(":")[0])
-   latlon_str = (domain.split(":")[1]).strip().split(",")
-   latlon_flt = []
-   for ll in latlon_str:
-      latlon_flt.append(float(ll))
-   latlon_list.append(latlon_flt)
-   del(latlon_flt)
+images = {"analysis": "GFSanalysis_{region}_{init}_meanwinds_800hPa_600hPa_SNGL",
+          "forecast": "GFSforecast_{region}_{valid}_meanwinds_800hPa_600hPa_SNGL_{init}_{lead:03d}"}
 
-domains_dict = dict(zip(key_list,latlon_list))
+###################################################################################################
 
-latbl = float(sys.argv[3])
-lonbl = float(sys.argv[4])
-lattr = float(sys.argv[5])
-lontr = float(sys.argv[6])
+# Main script to plot mean winds between 800 and 600 hPa
 
-region = "unnamedregion"
+def main(init_dt, lev_hPa, latbl, lonbl, lattr, lontr):
 
-for domain in domains_dict.keys():
-   if ((latbl == domains_dict[domain][0] and lattr == domains_dict[domain][2]) or (latbl == domains_dict[domain][2] or lattr == domains_dict[domain][0])) and ((lonbl == domains_dict[domain][1] and lontr == domains_dict[domain][3]) or (lonbl == domains_dict[domain][3] and lontr == domains_dict[domain][1])):
-      region = domain
+   # define directory
 
-# arrange lat and lon values to get bottom left and top right lat lon values
+   diri = (os.getcwd())+"/"
 
-if latbl == lattr or lonbl == lontr:
-   sys.exit('lat and lon values must be different')
-else:
-   if latbl < lattr:
-      latbl, lattr = lattr, latbl
-   if lonbl > lontr:
-      lonbl, lontr = lontr, lonbl
+   # define pressure levels
 
-# read in analysis files
+   lev1 = "800"
+   lev2 = "600"
 
-a_fili = "analysis_gfs_4_%s_%s00_000.nc" % (init_dt[:8], init_dt[8:10])
+   # forecast times (currently set to 0 to 48 hours)
 
-# read pressure levels from analysis file
+   fore = controls.forecast_times(GFS_dir)
 
-analysis = nio.open_file(diri+a_fili)
+   # accept initialisation time and dates as an argument
 
-level_dim = analysis.variables["UGRD_P0_L100_GLL0"].dimensions[0]
+   init_dt = str(init_dt)
 
-levs_p1 = analysis.variables[level_dim]
-levs_p = ['{:.0f}'.format(x) for x in levs_p1[:]/100.0]
-del levs_p1
+   # read in domains and accept lat and lon limits as arguments
 
-# identify level index
+   domains_dict = controls.read_domains(GFS_dir+"/controls/domains")
 
-lev1_index = levs_p.index(lev1)
-lev2_index = levs_p.index(lev2)
+   latbl = float(latbl)
+   lonbl = float(lonbl)
+   lattr = float(lattr)
+   lontr = float(lontr)
 
-# read in lat
+   region = "unnamedregion"
 
-lat1 = analysis.variables["lat_0"]
-lat_temp = lat1[:]
+   for domain in domains_dict.keys():
+      if ((latbl == domains_dict[domain][0] and lattr == domains_dict[domain][2]) or (latbl == domains_dict[domain][2] or lattr == domains_dict[domain][0])) and ((lonbl == domains_dict[domain][1] and lontr == domains_dict[domain][3]) or (lonbl == domains_dict[domain][3] and lontr == domains_dict[domain][1])):
+         region = domain
 
-latbl_idx = (np.abs(lat_temp-latbl)).argmin()
-lattr_idx = (np.abs(lat_temp-lattr)).argmin()
+   # arrange lat and lon values to get bottom left and top right lat lon values
 
-if latbl_idx == lattr_idx:
-   sys.exit('lat values are not different enough, they must have relate to different grid points')
-elif latbl_idx > 1 and lattr_idx < len(lat_temp)-2:
-   lat_box1 = latbl_idx-2
-   lat_box2 = lattr_idx+2
-   lat = lat_temp[lat_box1:lat_box2]
-else:
-   lat_box1 = latbl_idx
-   lat_box2 = lattr_idx
-   lat = lat_temp[lat_box1:lat_box2]
+   if latbl == lattr or lonbl == lontr:
+      sys.exit('lat and lon values must be different')
+   else:
+      if latbl < lattr:
+         latbl, lattr = lattr, latbl
+      if lonbl > lontr:
+         lonbl, lontr = lontr, lonbl
 
-del(latbl_idx)
-del(lattr_idx)
-del(lat1)
-del(lat_temp)
+   # read in analysis files
 
-# read in lon
+   a_fili = "analysis_gfs_4_%s_%s00_000.nc" % (init_dt[:8], init_dt[8:10])
 
-lon1 = analysis.variables["lon_0"]
+   # read pressure levels from analysis file
 
-# check to see if box crosses Greenwich Meridian. If so then the lon values must be modified for plot to work.
+   analysis = gfs_io.open_file(diri+a_fili, region)
 
-if (np.sign(lonbl) + np.sign(lontr)) >= -1 and (np.sign(lonbl) + np.sign(lontr)) <= 1:
+   level_dim = analysis.variables["UGRD_P0_L100_GLL0"].dimensions[0]
 
-   lonbl, lontr = lontr, lonbl
+   levs_p1 = analysis.variables[level_dim]
+   levs_p = ['{:.0f}'.format(x) for x in levs_p1[:]/100.0]
+   del levs_p1
 
-   lon_temp = np.where(lon1[:]>=180.0, lon1[:]-360.0, lon1[:])
+   # identify level index
 
-   lonbl_idx = (np.abs(lon_temp-lonbl)).argmin()
-   lontr_idx = (np.abs(lon_temp-lontr)).argmin()
+   lev1_index = levs_p.index(lev1)
+   lev2_index = levs_p.index(lev2)
 
-   if lonbl_idx == lontr_idx:
-      sys.exit('lon values are not different enough, they must have relate to different grid points')
-   elif lontr_idx > len(lon_temp)/2 and lonbl_idx <= len(lon_temp)/2:
-      lon_box1 = lonbl_idx+2
-      lon_box2 = lontr_idx-2
-      lon_box3 = len(lon_temp)-1
+   # read in lat and lon of the region from the region geometry cache (for boxes crossing the
+   # Greenwich Meridian lonbl and lontr are swapped and lon values run from -180 to 180)
 
-      lon_temp1 = lon_temp[0:lon_box1]
-      lon_temp2 = lon_temp[lon_box2:lon_box3]
-   else:
-      lon_box1 = lonbl_idx
-      lon_box2 = lontr_idx
-      lon_box3 = len(lon_temp)-1
+   geom = geometry.region(analysis, latbl, lonbl, lattr, lontr)
 
-      lon_temp1 = lon_temp[0:lon_box1]
-      lon_temp2 = lon_temp[lon_box2:lon_box3]
+   lonbl, lontr = geom.lonbl, geom.lontr
+   lat = geom.lat
+   lon = geom.lon
 
+   # read in winds.
 
-   lon = np.append(lon_temp2, lon_temp1)
+   u = np.mean(geometry.cut(analysis.variables["UGRD_P0_L100_GLL0"], geom, slice(lev2_index, lev1_index)), axis = 0)
+   v = np.mean(geometry.cut(analysis.variables["VGRD_P0_L100_GLL0"], geom, slice(lev2_index, lev1_index)), axis = 0)
 
-   del(lon_temp1)
-   del(lon_temp2)
-   del(lonbl_idx)
-   del(lontr_idx)
-   del(lon_temp)
+   # calculate windspeed
 
-else:
+   ws = np.sqrt(u**2.0 + v**2.0)
 
-   lon_temp = lon1[:]
+   # 2d lat and lon
 
-   lonbl_idx = (np.abs(lon_temp-lonbl)).argmin()
-   lontr_idx = (np.abs(lon_temp-lontr)).argmin()
+   lat2d = geom.lat2d
+   lon2d = geom.lon2d
 
-   if lonbl_idx == lontr_idx:
-      sys.exit('lon values are not different enough, they must have relate to different grid points')
-   elif lonbl_idx > 1 and lontr_idx < len(lon_temp)-2:
-      lon_box1 = lonbl_idx-2
-      lon_box2 = lontr_idx+2
-      lon = lon_temp[lon_box1:lon_box2]
-   else:
-      lon_box1 = lonbl_idx
-      lon_box2 = lontr_idx
-      lon = lon_temp[lon_box1:lon_box2]
-
-# read in winds, checking whether box crosses Greenwich Meridian.
-
-if (np.sign(lonbl) + np.sign(lontr)) >= -1 and (np.sign(lonbl) + np.sign(lontr)) <= 1:
-
-   u1 = analysis.variables["UGRD_P0_L100_GLL0"][lev2_index:lev1_index,:,:]
-   u_temp1 = np.mean(u1[:,lat_box1:lat_box2,0:lon_box1], axis = 0)
-   u_temp2 = np.mean(u1[:,lat_box1:lat_box2,lon_box2:lon_box3], axis = 0)
-   u = np.concatenate((u_temp2,u_temp1),axis=1)
-   del u1
-   del u_temp1
-   del u_temp2
-
-   v1 = analysis.variables["VGRD_P0_L100_GLL0"][lev2_index:lev1_index,:,:]
-   v_temp1 = np.mean(v1[:,lat_box1:lat_box2,0:lon_box1], axis=0)
-   v_temp2 = np.mean(v1[:,lat_box1:lat_box2,lon_box2:lon_box3], axis = 0)
-   v = np.concatenate((v_temp2,v_temp1),axis=1)
-   del v1
-   del v_temp1
-   del v_temp2
+   # analysis plot, only the forecast plots are made when a forecast lead time is streamed
+   # (see controls.analysis_plotted)
 
-else:
-   
-   u1 = analysis.variables["UGRD_P0_L100_GLL0"][lev2_index:lev1_index,:,:]
-   u = np.mean(u1[:,lat_box1:lat_box2,lon_box1:lon_box2], axis = 0)
-   del u1
+   if controls.analysis_plotted():
 
-   v1 = analysis.variables["VGRD_P0_L100_GLL0"][lev2_index:lev1_index,:,:]
-   v = np.mean(v1[:,lat_box1:lat_box2,lon_box1:lon_box2], axis = 0)
-   del v1
+      # open workspace for analysis plot
 
-# calculate windspeed
-
-ws = np.sqrt(u**2.0 + v**2.0)
-
-# create 2d lat and lon
-
-lat2d = np.zeros((len(lat),len(lon)))
-lon2d = np.zeros((len(lat),len(lon)))
+      wks_type = "png"
+      wks = ngl.open_wks(wks_type, "GFSanalysis_%s_%s_meanwinds_%shPa_%shPa_SNGL" % (region, init_dt[0:10], lev1, lev2))
 
-for i in range(0, len(lon)):
-   lat2d[:,i] = lat
+      # define resources for analysis plot
 
-for i in range(0, len(lat)):
-   lon2d[i,:] = lon
-   
-# open workspace for analysis plot
+      res = ngl.Resources()
+      res.nglDraw                     = False
+      res.nglFrame                    = False
 
-wks_type = "png"
-wks = ngl.open_wks(wks_type, "GFSanalysis_%s_%s_meanwinds_%shPa_%shPa_SNGL" % (region, init_dt[0:10], lev1, lev2))
+      res.vpWidthF  = 0.9
+      res.vpHeightF = 0.6
 
-# define resources for analysis plot
+      cmap = ngl.read_colormap_file("WhiteBlueGreenYellowRed")
 
-res = ngl.Resources()
-res.nglDraw                     = False
-res.nglFrame                    = False
+      res.pmTickMarkDisplayMode = "Never"
 
-res.vpWidthF  = 0.9
-res.vpHeightF = 0.6
+      res.cnLinesOn                   = False
+      res.cnLineLabelsOn              = False
+      res.cnFillOn                    = True
+      res.cnFillPalette               = cmap[15::]
 
-cmap = ngl.read_colormap_file("WhiteBlueGreenYellowRed")
+      res.lbAutoManage          = False
+      res.lbLabelFontHeightF         = 0.005
+      res.lbOrientation              = "horizontal"
+      res.lbLabelAngleF              = 45
+      res.pmLabelBarOrthogonalPosF = -1.
+      res.pmLabelBarParallelPosF = 0.25
+      res.pmLabelBarWidthF      = 0.3
+      res.pmLabelBarHeightF     = 0.1
+      res.lbTitleString         = "%shPa to %shPa mean winds " % (lev1, lev2)
+      res.lbTitleFontHeightF   = 0.0125
 
-res.pmTickMarkDisplayMode = "Never"
+      res.mpFillOn                    = False
+      res.mpGeophysicalLineColor      = "Grey18"
+      res.mpGeophysicalLineThicknessF = 1.5
 
-res.cnLinesOn                   = False
-res.cnLineLabelsOn              = False
-res.cnFillOn                    = True
-res.cnFillPalette               = cmap[15::]
+      res.sfXArray                    = lon2d
+      res.sfYArray                    = lat2d
 
-res.lbAutoManage          = False
-res.lbLabelFontHeightF         = 0.005
-res.lbOrientation              = "horizontal"
-res.lbLabelAngleF              = 45
-res.pmLabelBarOrthogonalPosF = -1.
-res.pmLabelBarParallelPosF = 0.25
-res.pmLabelBarWidthF      = 0.3
-res.pmLabelBarHeightF     = 0.1
-res.lbTitleString         = "%shPa to %shPa mean winds " % (lev1, lev2)
-res.lbTitleFontHeightF   = 0.0125
+      res.mpGridAndLimbOn        = False
 
-res.mpFillOn                    = False
-res.mpGeophysicalLineColor      = "Grey18"
-res.mpGeophysicalLineThicknessF = 1.5
+      res.cnInfoLabelOn              = False
 
-res.sfXArray                    = lon2d
-res.sfYArray                    = lat2d
+      res.mpProjection              = "CylindricalEquidistant"
+      res.mpLimitMode = "LatLon"    # Limit the map view.
+      res.mpMinLonF   = lontr
+      res.mpMaxLonF   = lonbl
+      res.mpMinLatF   = lattr
+      res.mpMaxLatF   = latbl
+      res.mpPerimOn   = True
+      res.mpOutlineBoundarySets     = "AllBoundaries"
+      res.mpNationalLineColor       = "gray40"
+      res.mpNationalLineThicknessF  = 1.5
+      res.mpGeophysicalLineColor    = "gray40"
+      res.mpGeophysicalLineThicknessF = 1.5
+      res.cnMonoLineColor           = True
 
-res.mpGridAndLimbOn        = False
+      max_cont = 30.0
+      min_cont = 0.0
 
-res.cnInfoLabelOn              = False
+      res.cnLevelSelectionMode = "ManualLevels"
+      res.cnMinLevelValF       = min_cont
+      res.cnMaxLevelValF       = max_cont
+      res.cnLevelSpacingF      = 1.
+      res.cnLineThicknessF     = 2.5 
 
-res.mpProjection              = "CylindricalEquidistant"
-res.mpLimitMode = "LatLon"    # Limit the map view.
-res.mpMinLonF   = lontr
-res.mpMaxLonF   = lonbl
-res.mpMinLatF   = lattr
-res.mpMaxLatF   = latbl
-res.mpPerimOn   = True
-res.mpOutlineBoundarySets     = "AllBoundaries"
-res.mpNationalLineColor       = "gray40"
-res.mpNationalLineThicknessF  = 1.5
-res.mpGeophysicalLineColor    = "gray40"
-res.mpGeophysicalLineThicknessF = 1.5
-res.cnMonoLineColor           = True
+      # create ws plot for analysis data
 
-max_cont = 30.0
-min_cont = 0.0
-
-res.cnLevelSelectionMode = "ManualLevels"
-res.cnMinLevelValF       = min_cont
-res.cnMaxLevelValF       = max_cont
-res.cnLevelSpacingF      = 1.
-res.cnLineThicknessF     = 2.5 
+      ws_plot = ngl.contour_map(wks,ws,res)
 
-# create ws plot for analysis data
+      # define resources for vectors
 
-ws_plot = ngl.contour_map(wks,ws,res)
+      vcres                         = ngl.Resources()
+      vcres.nglDraw                 = False
+      vcres.nglFrame                = False
 
-# define resources for vectors
+      vcres.vfXArray                = lon2d
+      vcres.vfYArray                = lat2d
 
-vcres                         = ngl.Resources()
-vcres.nglDraw                 = False
-vcres.nglFrame                = False
+      #vcres.vcFillArrowsOn          = True
+      vcres.vcRefMagnitudeF         = 30.0             # define vector ref mag
+      vcres.vcRefLengthF            = 0.03             # define length of vec ref
+      vcres.vcMinFracLengthF        = 0.3
+      vcres.vcMinDistanceF          = 0.02
+      vcres.vcRefAnnoOrthogonalPosF = -0.20
+      vcres.vcRefAnnoFontHeightF    = 0.005
+      vcres.vcLineArrowThicknessF     = 2.0
+      vcres.vcRefAnnoOrthogonalPosF   = -0.06
+      vcres.vcRefAnnoParallelPosF     = 0.094
 
-vcres.vfXArray                = lon2d
-vcres.vfYArray                = lat2d
+      # create vector plot for analysis data and overlay on colour contours
 
-#vcres.vcFillArrowsOn          = True
-vcres.vcRefMagnitudeF         = 30.0             # define vector ref mag
-vcres.vcRefLengthF            = 0.03             # define length of vec ref
-vcres.vcMinFracLengthF        = 0.3
-vcres.vcMinDistanceF          = 0.02
-vcres.vcRefAnnoOrthogonalPosF = -0.20
-vcres.vcRefAnnoFontHeightF    = 0.005
-vcres.vcLineArrowThicknessF     = 2.0
-vcres.vcRefAnnoOrthogonalPosF   = -0.06
-vcres.vcRefAnnoParallelPosF     = 0.094
+      uv_plot  = ngl.vector(wks,u,v,vcres)
 
-# create vector plot for analysis data and overlay on colour contours
+      ngl.overlay(ws_plot,uv_plot)
+      ngl.maximize_plot(wks, ws_plot)
+      ngl.draw(ws_plot)
+      ngl.frame(wks)
 
-uv_plot  = ngl.vector(wks,u,v,vcres)
+      ngl.destroy(wks)
+      del res
+      del vcres
 
-ngl.overlay(ws_plot,uv_plot)
-ngl.maximize_plot(wks, ws_plot)
-ngl.draw(ws_plot)
-ngl.frame(wks)
+   ###################################################################################################
 
-ngl.destroy(wks)
-del res
-del vcres
+   # forecast plots, none when only the analysis is plotted
 
-###################################################################################################
+   if len(fore) > 0:
 
-# open forecast file
+      # open forecast file
 
-f_fili = "GFS_forecast_%s_%s.nc" % (init_dt[:8], init_dt[8:10])
-forecast = nio.open_file(diri+f_fili)
+      f_fili = "GFS_forecast_%s_%s.nc" % (init_dt[:8], init_dt[8:10])
+      forecast = gfs_io.open_file(diri+f_fili, region)
 
-# loop through forecast times
+      # read in and calculate the fields for all forecast times at once, only the plotting is done
+      # for each forecast time
 
-for i in range(0, len(fore)):
+      steps = slice(0, len(fore))
 
-# create string for valid time
+      # read in winds.
 
-   valid_date = (datetime.datetime(int(init_dt[:4]), int(init_dt[4:6]), int(init_dt[6:8]), int(init_dt[8:10])) + datetime.timedelta(hours=int(fore[i]))).strftime("%Y%m%d%H")
+      u_steps = np.mean(geometry.cut(forecast.variables["UGRD_P0_L100_GLL0"], geom, steps, slice(lev2_index, lev1_index)), axis = 1)
+      v_steps = np.mean(geometry.cut(forecast.variables["VGRD_P0_L100_GLL0"], geom, steps, slice(lev2_index, lev1_index)), axis = 1)
 
-# read in winds, checking whether box crosses Greenwich Meridian.
+      # calculate windspeed
 
-   if (np.sign(lonbl) + np.sign(lontr)) >= -1 and (np.sign(lonbl) + np.sign(lontr)) <= 1:
+      ws_steps = np.sqrt(u_steps**2.0 + v_steps**2.0)
 
-      u1 = forecast.variables["UGRD_P0_L100_GLL0"][i,lev2_index:lev1_index,:,:]
-      u_temp1 = np.mean(u1[:,lat_box1:lat_box2,0:lon_box1], axis = 0)
-      u_temp2 = np.mean(u1[:,lat_box1:lat_box2,lon_box2:lon_box3], axis = 0)
-      u = np.concatenate((u_temp2,u_temp1),axis=1)
-      del u1 
-      del u_temp1
-      del u_temp2
+      # loop through forecast times
 
-      v1 = forecast.variables["VGRD_P0_L100_GLL0"][i,lev2_index:lev1_index,:,:]
-      v_temp1 = np.mean(v1[:,lat_box1:lat_box2,0:lon_box1], axis = 0)
-      v_temp2 = np.mean(v1[:,lat_box1:lat_box2,lon_box2:lon_box3], axis = 0)
-      v = np.concatenate((v_temp2,v_temp1),axis=1)
-      del v1
-      del v_temp1
-      del v_temp2
+      for i in range(0, len(fore)):
 
-   else:
- 
-      u1 = forecast.variables["UGRD_P0_L100_GLL0"][i,lev2_index:lev1_index,:,:]
-      u = np.mean(u1[:,lat_box1:lat_box2,lon_box1:lon_box2], axis = 0)
-      del u1
+         # frames already in the ledger for the same files are not plotted again (see ledger.py)
 
-      v1 = forecast.variables["VGRD_P0_L100_GLL0"][i,lev2_index:lev1_index,:,:]
-      v = np.mean(v1[:,lat_box1:lat_box2,lon_box1:lon_box2], axis = 0)
-      del v1
+         if not controls.frame_wanted(fore[i]):
+            continue
 
-# calculate windspeed
+      # create string for valid time
 
-   ws = np.sqrt(u**2.0 + v**2.0)
+         valid_date = (datetime.datetime(int(init_dt[:4]), int(init_dt[4:6]), int(init_dt[6:8]), int(init_dt[8:10])) + datetime.timedelta(hours=int(fore[i]))).strftime("%Y%m%d%H")
 
-# open workspace for forecast plots
+      # fields for this forecast time
 
-   wks_type = "png"
-   wks = ngl.open_wks(wks_type, "GFSforecast_%s_%s_meanwinds_%shPa_%shPa_SNGL_%s_%03d" % (region, valid_date, lev1, lev2, init_dt[0:10], fore[i]))
+         u = u_steps[i]
+         v = v_steps[i]
+         ws = ws_steps[i]
 
-# define resources for forecast plots
+      # open workspace for forecast plots
 
-   res = ngl.Resources()
-   res.nglDraw                     = False
-   res.nglFrame                    = False
+         wks_type = "png"
+         wks = ngl.open_wks(wks_type, "GFSforecast_%s_%s_meanwinds_%shPa_%shPa_SNGL_%s_%03d" % (region, valid_date, lev1, lev2, init_dt[0:10], fore[i]))
 
-   res.vpWidthF  = 0.9
-   res.vpHeightF = 0.6
+      # define resources for forecast plots
 
-   cmap = ngl.read_colormap_file("WhiteBlueGreenYellowRed")
+         res = ngl.Resources()
+         res.nglDraw                     = False
+         res.nglFrame                    = False
 
-   res.pmTickMarkDisplayMode = "Never"
+         res.vpWidthF  = 0.9
+         res.vpHeightF = 0.6
 
-   res.cnLinesOn                   = False
-   res.cnLineLabelsOn              = False
-   res.cnFillOn                    = True
-   res.cnFillPalette               = cmap[15::]
+         cmap = ngl.read_colormap_file("WhiteBlueGreenYellowRed")
 
-   res.lbAutoManage          = False
-   res.lbLabelFontHeightF         = 0.005
-   res.lbOrientation              = "horizontal"
-   res.lbLabelAngleF              = 45
-   res.pmLabelBarOrthogonalPosF = -1.
-   res.pmLabelBarParallelPosF = 0.25
-   res.pmLabelBarWidthF      = 0.3
-   res.pmLabelBarHeightF     = 0.1
-   res.lbTitleString         = "%shPa to %shPa mean winds " % (lev1, lev2)
-   res.lbTitleFontHeightF   = 0.0125
+         res.pmTickMarkDisplayMode = "Never"
 
-   res.mpFillOn                    = False
-   res.mpGeophysicalLineColor      = "Grey18"
-   res.mpGeophysicalLineThicknessF = 1.5
+         res.cnLinesOn                   = False
+         res.cnLineLabelsOn              = False
+         res.cnFillOn                    = True
+         res.cnFillPalette               = cmap[15::]
 
-   res.sfXArray                    = lon2d
-   res.sfYArray                    = lat2d
+         res.lbAutoManage          = False
+         res.lbLabelFontHeightF         = 0.005
+         res.lbOrientation              = "horizontal"
+         res.lbLabelAngleF              = 45
+         res.pmLabelBarOrthogonalPosF = -1.
+         res.pmLabelBarParallelPosF = 0.25
+         res.pmLabelBarWidthF      = 0.3
+         res.pmLabelBarHeightF     = 0.1
+         res.lbTitleString         = "%shPa to %shPa mean winds " % (lev1, lev2)
+         res.lbTitleFontHeightF   = 0.0125
 
-   res.mpGridAndLimbOn        = False
+         res.mpFillOn                    = False
+         res.mpGeophysicalLineColor      = "Grey18"
+         res.mpGeophysicalLineThicknessF = 1.5
 
-   res.cnInfoLabelOn              = False
+         res.sfXArray                    = lon2d
+         res.sfYArray                    = lat2d
 
-   res.mpProjection              = "CylindricalEquidistant"
-   res.mpLimitMode = "LatLon"    # Limit the map view.
-   res.mpMinLonF   = lontr
-   res.mpMaxLonF   = lonbl
-   res.mpMinLatF   = lattr
-   res.mpMaxLatF   = latbl
-   res.mpPerimOn   = True
-   res.mpOutlineBoundarySets     = "AllBoundaries"
-   res.mpNationalLineColor       = "gray40"
-   res.mpNationalLineThicknessF  = 1.5
-   res.mpGeophysicalLineColor    = "gray40"
-   res.mpGeophysicalLineThicknessF = 1.5
-   res.cnMonoLineColor           = True
+         res.mpGridAndLimbOn        = False
 
-   max_cont = 30.0
-   min_cont = 0.0
+         res.cnInfoLabelOn              = False
 
-   res.cnLevelSelectionMode = "ManualLevels"
-   res.cnMinLevelValF       = min_cont
-   res.cnMaxLevelValF       = max_cont
-   res.cnLevelSpacingF      = 1.
-   res.cnLineThicknessF     = 2.5
+         res.mpProjection              = "CylindricalEquidistant"
+         res.mpLimitMode = "LatLon"    # Limit the map view.
+         res.mpMinLonF   = lontr
+         res.mpMaxLonF   = lonbl
+         res.mpMinLatF   = lattr
+         res.mpMaxLatF   = latbl
+         res.mpPerimOn   = True
+         res.mpOutlineBoundarySets     = "AllBoundaries"
+         res.mpNationalLineColor       = "gray40"
+         res.mpNationalLineThicknessF  = 1.5
+         res.mpGeophysicalLineColor    = "gray40"
+         res.mpGeophysicalLineThicknessF = 1.5
+         res.cnMonoLineColor           = True
 
-# create ws plot for analysis data
+         max_cont = 30.0
+         min_cont = 0.0
 
-   ws_plot = ngl.contour_map(wks,ws,res)
+         res.cnLevelSelectionMode = "ManualLevels"
+         res.cnMinLevelValF       = min_cont
+         res.cnMaxLevelValF       = max_cont
+         res.cnLevelSpacingF      = 1.
+         res.cnLineThicknessF     = 2.5
 
-# define resources for vectors
+      # create ws plot for analysis data
 
-   vcres                         = ngl.Resources()
-   vcres.nglDraw                 = False
-   vcres.nglFrame                = False
+         ws_plot = ngl.contour_map(wks,ws,res)
 
-   vcres.vfXArray                = lon2d
-   vcres.vfYArray                = lat2d
+      # define resources for vectors
 
-   #vcres.vcFillArrowsOn          = True
-   vcres.vcRefMagnitudeF         = 30.0             # define vector ref mag
-   vcres.vcRefLengthF            = 0.03             # define length of vec ref
-   vcres.vcMinFracLengthF        = 0.3
-   vcres.vcMinDistanceF          = 0.02
-   vcres.vcRefAnnoOrthogonalPosF = -0.20
-   vcres.vcRefAnnoFontHeightF    = 0.005
-   vcres.vcLineArrowThicknessF     = 2.0
-   vcres.vcRefAnnoOrthogonalPosF   = -0.06
-   vcres.vcRefAnnoParallelPosF     = 0.094
+         vcres                         = ngl.Resources()
+         vcres.nglDraw                 = False
+         vcres.nglFrame                = False
 
-# create vector plot for analysis data and overlay on colour contours
+         vcres.vfXArray                = lon2d
+         vcres.vfYArray                = lat2d
 
-   uv_plot  = ngl.vector(wks,u,v,vcres)
+         #vcres.vcFillArrowsOn          = True
+         vcres.vcRefMagnitudeF         = 30.0             # define vector ref mag
+         vcres.vcRefLengthF            = 0.03             # define length of vec ref
+         vcres.vcMinFracLengthF        = 0.3
+         vcres.vcMinDistanceF          = 0.02
+         vcres.vcRefAnnoOrthogonalPosF = -0.20
+         vcres.vcRefAnnoFontHeightF    = 0.005
+         vcres.vcLineArrowThicknessF     = 2.0
+         vcres.vcRefAnnoOrthogonalPosF   = -0.06
+         vcres.vcRefAnnoParallelPosF     = 0.094
 
-   ngl.overlay(ws_plot,uv_plot)
-   ngl.maximize_plot(wks, ws_plot)
-   ngl.draw(ws_plot)
-   ngl.frame(wks)
+      # create vector plot for analysis data and overlay on colour contours
 
-   ngl.destroy(wks)
-   del res
-   del vcres
+         uv_plot  = ngl.vector(wks,u,v,vcres)
 
-os.system('mogrify -trim *_'+region+'_'+init_dt[0:10]+'_meanwinds_'+lev1+'hPa_'+lev2+'hPa_SNGL.png')
-#if region == "WA" or region == "unknownWA":
-#   os.system('mogrify -resize 886x600 *_'+region+'_'+init_dt[0:10]+'_meanwinds_'+lev1+'hPa_'+lev2+'hPa_SNGL.png')
-#elif region == "EA" or region == "unknownEA":
-#   os.system('mogrify -resize 600x733 *_'+region+'_'+init_dt[0:10]+'_meanwinds_'+lev1+'hPa_'+lev2+'hPa_SNGL.png')
+         ngl.overlay(ws_plot,uv_plot)
+         ngl.maximize_plot(wks, ws_plot)
+         ngl.draw(ws_plot)
+         ngl.frame(wks)
 
-os.system('mv *_'+region+'_'+init_dt[0:10]+'_meanwinds_'+lev1+'hPa_'+lev2+'hPa_SNGL.png %s/MARTIN/GFS/'%(GFS_dir)+region+'/'+init_dt[0:10]+'/mean_winds_800_600')
+         ngl.destroy(wks)
+         del res
+         del vcres
 
-os.system('mogrify -trim *'+region+'_*meanwinds_'+lev1+'hPa_'+lev2+'hPa_SNGL_'+init_dt[0:10]+'*.png')
-#if region == "WA" or region == "unknownWA":
-#   os.system('mogrify -resize 886x600 *'+region+'_*meanwinds_'+lev1+'hPa_'+lev2+'hPa_SNGL_'+init_dt[0:10]+'*.png')
-#elif region == "EA" or region == "unknownEA":
-#   os.system('mogrify -resize 600x733 *'+region+'_*meanwinds_'+lev1+'hPa_'+lev2+'hPa_SNGL_'+init_dt[0:10]+'*.png')
-
-os.system('mv *'+region+'_*meanwinds_'+lev1+'hPa_'+lev2+'hPa_SNGL_'+init_dt[0:10]+'*.png %s/MARTIN/GFS/'%(GFS_dir)+region+'/'+init_dt[0:10]+'/mean_winds_800_600')
+   os.system('mogrify -trim *_'+region+'_'+init_dt[0:10]+'_meanwinds_'+lev1+'hPa_'+lev2+'hPa_SNGL.png')
+   #if region == "WA" or region == "unknownWA":
+   #   os.system('mogrify -resize 886x600 *_'+region+'_'+init_dt[0:10]+'_meanwinds_'+lev1+'hPa_'+lev2+'hPa_SNGL.png')
+   #elif region == "EA" or region == "unknownEA":
+   #   os.system('mogrify -resize 600x733 *_'+region+'_'+init_dt[0:10]+'_meanwinds_'+lev1+'hPa_'+lev2+'hPa_SNGL.png')
 
+   os.system('mv *_'+region+'_'+init_dt[0:10]+'_meanwinds_'+lev1+'hPa_'+lev2+'hPa_SNGL.png %s/MARTIN/GFS/'%(GFS_dir)+region+'/'+init_dt[0:10]+'/mean_winds_800_600')
+
+   os.system('mogrify -trim *'+region+'_*meanwinds_'+lev1+'hPa_'+lev2+'hPa_SNGL_'+init_dt[0:10]+'*.png')
+   #if region == "WA" or region == "unknownWA":
+   #   os.system('mogrify -resize 886x600 *'+region+'_*meanwinds_'+lev1+'hPa_'+lev2+'hPa_SNGL_'+init_dt[0:10]+'*.png')
+   #elif region == "EA" or region == "unknownEA":
+   #   os.system('mogrify -resize 600x733 *'+region+'_*meanwinds_'+lev1+'hPa_'+lev2+'hPa_SNGL_'+init_dt[0:10]+'*.png')
+
+   os.system('mv *'+region+'_*meanwinds_'+lev1+'hPa_'+lev2+'hPa_SNGL_'+init_dt[0:10]+'*.png %s/MARTIN/GFS/'%(GFS_dir)+region+'/'+init_dt[0:10]+'/mean_winds_800_600')
 
+###################################################################################################
 
+if __name__ == "__main__":
+   main(*sys.argv[1:7])
@@ -26,440 +26,315 @@ import sys
 import os
 import datetime
 
-GFS_dir = os.environ['SWIFT_GFS']
-
-#####################################################################################################
+import controls
+import gfs_io
+import geometry
+from smooth import smth9
 
-#  9-point smoother function, required to make the geopotential contours look better.
-#
-def smth9(x,p,q):
-#
-#  Run a 9-point smoother on the 2D numpy.array x using weights
-#  p and q.  Return the smoothed array.
-#
+GFS_dir = os.environ['SWIFT_GFS']
 
-#
-#  Get array dimensions and check on sizes.
-#
-  ni = x.shape[0]
-  nj = x.shape[1]
-  if (ni < 3 or nj < 3):
-    print("smth9: both array dimensions must be at least three.")
-    sys.exit()
+# fields read by main, used by the plot.py scheduler to load (and derive) them before the
+# plotting job runs. Each entry is a variable followed by its levels, in hPa ("lev" is the level
+# main is called with, "lev+1" the next level index, "low:high" all levels in between) or as
+# integer level indices. Single level fields have no levels.
 
-#
-#  Smooth.
-#
-  po4 = p/4.
-  qo4 = q/4.
-
-  output = np.zeros([ni,nj],'f')
-  for j in range(1,nj-1):
-    for i in range(1,ni-1):
-      jm1 = j-1
-      jp1 = j+1
-      im1 = i-1
-      ip1 = i+1
-      term1 = po4*(x[im1,j]+x[i,jm1]+x[ip1,j]+x[i,jp1]-4.*x[i,j])
-      term2 = qo4*(x[im1,jp1]+x[im1,jm1]+x[ip1,jm1]+x[ip1,jp1]-4.*x[i,j])
-      output[i,j] = float(x[i,j]) + term1 + term2
+requires = {"fields": [["PRMSL_P0_L101_GLL0"]],
+            "derived": []}
 
-#
-#  Set the perimeter values to the original x values.
-#
-  output[0,:]    = x[0,:]
-  output[ni-1,:] = x[ni-1,:]
-  output[:,0]    = x[:,0]
-  output[:,nj-1] = x[:,nj-1]
+# names of the images main writes (without .png), used by the plot.py job ledger (see ledger.py)
+# to find the frames already plotted: the analysis image (None if main does not plot the analysis)
+# and the forecast images. {region}, {init}, {valid}, {lev} and {lead} are the region, the
+# initialisation and valid times (YYYYMMDDHH), the level main is called with and the lead time.
 
-#
-#  Return smoothed array.
-#
-  return output
+images = {"analysis": "GFSanalysis_{region}_{init}_mslp_SNGL",
+          "forecast": "GFSforecast_{region}_{valid}_mslp_SNGL_{init}_{lead:03d}"}
 
 ###################################################################################################
 
 # Main script to plot mslp
 
-# define directory
+def main(init_dt, lev_hPa, latbl, lonbl, lattr, lontr):
 
-diri = (os.getcwd())+"/"
+   # define directory
 
-# forecast times (currently set to plot 0 to 48 hours)
+   diri = (os.getcwd())+"/"
 
-fore = (os.popen("cat %s/controls/namelist | grep 'fore:' | awk -F: '{print $2}' | tr ',' ' '"%(GFS_dir))).read().split()
-fore = [np.int(f) for f in fore]
+   # forecast times (currently set to plot 0 to 48 hours)
 
-# read text file with initialisation time and dates
+   fore = controls.forecast_times(GFS_dir)
 
-init_dt = (sys.argv[1])
+   # read text file with initialisation time and dates
 
-# read in domains and accept lat and lon limits as arguments
+   init_dt = str(init_dt)
 
-b = open(GFS_dir+"/controls/domains")
-domains_content = b.readlines()
+   # read in domains and accept lat and lon limits as arguments
 
-key_list = []
-latlon_list = []
+   domains_dict = controls.read_domains(GFS_dir+"/controls/domains")
 
-for domain in domains_content:
-   key_list.append(domain.split(":")[0])
-   latlon_str = (domain.split(":")[1]).strip().split(",")
-   latlon_flt = []
-   for ll in latlon_str:
-      latlon_flt.append(float(ll))
-   latlon_list.append(latlon_flt)
-   del(latlon_flt)
+   latbl = float(latbl)
+   lonbl = float(lonbl)
+   lattr = float(lattr)
+   lontr = float(lontr)
 
-domains_dict = dict(zip(key_list,latlon_list))
+   region = "unnamedregion"
 
-latbl = float(sys.argv[3])
-lonbl = float(sys.argv[4])
-lattr = float(sys.argv[5])
-lontr = float(sys.argv[6])
+   for domain in domains_dict.keys():
+      if ((latbl == domains_dict[domain][0] and lattr == domains_dict[domain][2]) or (latbl == domains_dict[domain][2] or lattr == domains_dict[domain][0])) and ((lonbl == domains_dict[domain][1] and lontr == domains_dict[domain][3]) or (lonbl == domains_dict[domain][3] and lontr == domains_dict[domain][1])):
+         region = domain
 
-region = "unnamedregion"
+   # arrange lat and lon values to get bottom left and top right lat lon values
 
-for domain in domains_dict.keys():
-   if ((latbl == domains_dict[domain][0] and lattr == domains_dict[domain][2]) or (latbl == domains_dict[domain][2] or lattr == domains_dict[domain][0])) and ((lonbl == domains_dict[domain][1] and lontr == domains_dict[domain][3]) or (lonbl == domains_dict[domain][3] and lontr == domains_dict[domain][1])):
-      region = domain
+   if latbl == lattr or lonbl == lontr:
+      sys.exit('lat and lon values must be different')
+   else:
+      if latbl < lattr:
+         latbl, lattr = lattr, latbl
+      if lonbl > lontr:
+         lonbl, lontr = lontr, lonbl
 
-# arrange lat and lon values to get bottom left and top right lat lon values
+   # read in analysis files
 
-if latbl == lattr or lonbl == lontr:
-   sys.exit('lat and lon values must be different')
-else:
-   if latbl < lattr:
-      latbl, lattr = lattr, latbl
-   if lonbl > lontr:
-      lonbl, lontr = lontr, lonbl
+   a_fili = "analysis_gfs_4_%s_%s00_000.nc" % (init_dt[:8], init_dt[8:10])
 
-# read in analysis files
- 
-a_fili = "analysis_gfs_4_%s_%s00_000.nc" % (init_dt[:8], init_dt[8:10])
+   # open analysis file
 
-# open analysis file
+   analysis = gfs_io.open_file(diri+a_fili, region)
 
-analysis = nio.open_file(diri+a_fili)
+   # read in lat and lon of the region from the region geometry cache (for boxes crossing the
+   # Greenwich Meridian lonbl and lontr are swapped and lon values run from -180 to 180)
 
-# read in lat
+   geom = geometry.region(analysis, latbl, lonbl, lattr, lontr)
 
-lat1 = analysis.variables["lat_0"]
-lat_temp = lat1[:]
+   lonbl, lontr = geom.lonbl, geom.lontr
+   lat = geom.lat
+   lon = geom.lon
 
-latbl_idx = (np.abs(lat_temp-latbl)).argmin()
-lattr_idx = (np.abs(lat_temp-lattr)).argmin()
+   # read in mslp.
 
-if latbl_idx == lattr_idx:
-   sys.exit('lat values are not different enough, they must have relate to different grid points')
-elif latbl_idx > 1 and lattr_idx < len(lat_temp)-2:
-   lat_box1 = latbl_idx-2
-   lat_box2 = lattr_idx+2
-   lat = lat_temp[lat_box1:lat_box2]
-else:
-   lat_box1 = latbl_idx
-   lat_box2 = lattr_idx
-   lat = lat_temp[lat_box1:lat_box2]
+   mslp = geometry.cut(analysis.variables["PRMSL_P0_L101_GLL0"], geom)/100.0
+   mslp = smth9(mslp, 0.5, 0.25)
 
-del(latbl_idx)
-del(lattr_idx)
-del(lat1)
-del(lat_temp)
+   # 2d lat and lon
 
-# read in lon
+   lat2d = geom.lat2d
+   lon2d = geom.lon2d
 
-lon1 = analysis.variables["lon_0"]
+   # analysis plot, only the forecast plots are made when a forecast lead time is streamed
+   # (see controls.analysis_plotted)
 
-# check to see if box crosses Greenwich Meridian. If so then the lon values must be modified for plot to work.
+   if controls.analysis_plotted():
 
-if (np.sign(lonbl) + np.sign(lontr)) >= -1 and (np.sign(lonbl) + np.sign(lontr)) <= 1:
+      # open workspace for analysis plot
 
-   lonbl, lontr = lontr, lonbl
+      wks_type = "png"
+      wks_res = ngl.Resources()
+      wks_res.wkBackgroundOpacityF = 0.0
+      wks = ngl.open_wks(wks_type, "GFSanalysis_%s_%s_mslp_SNGL" % (region, init_dt[0:10]), wks_res)
 
-   lon_temp = np.where(lon1[:]>=180.0, lon1[:]-360.0, lon1[:])
+      # define resources for analysis plot
 
-   lonbl_idx = (np.abs(lon_temp-lonbl)).argmin()
-   lontr_idx = (np.abs(lon_temp-lontr)).argmin()
+      res = ngl.Resources()
+      res.nglDraw  = False
+      res.nglFrame = False
 
-   if lonbl_idx == lontr_idx:
-      sys.exit('lon values are not different enough, they must have relate to different grid points')
-   elif lontr_idx > len(lon_temp)/2 and lonbl_idx <= len(lon_temp)/2:
-      lon_box1 = lonbl_idx+2
-      lon_box2 = lontr_idx-2
-      lon_box3 = len(lon_temp)-1
+      res.mpGridAndLimbOn        = False
+      res.pmTickMarkDisplayMode = "Never"
 
-      lon_temp1 = lon_temp[0:lon_box1]
-      lon_temp2 = lon_temp[lon_box2:lon_box3]
-   else:
-      lon_box1 = lonbl_idx
-      lon_box2 = lontr_idx
-      lon_box3 = len(lon_temp)-1
+      res.cnInfoLabelOn              = False
+      res.cnLineLabelsOn             = True
+      res.cnFillOn                   = False
+      res.cnHighLabelBackgroundColor = -1
+      res.cnHighLabelFontColor       = "Black"
+      res.cnHighLabelFontHeightF     = 0.015
+      res.cnHighLabelPerimOn         = False
+      res.cnHighLabelPerimThicknessF = 2.5
+      res.cnHighLabelsOn             = True
+      res.cnHighLowLabelOverlapMode  = "AdjustVPOmitOverHL"
+      res.cnInfoLabelOn              = False
+      res.cnLineLabelBackgroundColor = -1
+      res.cnLineLabelDensityF        = 0.8
+      res.cnLineLabelFontColor       = "Black"
+      res.cnLineLabelFontHeightF     = 0.015
+      res.cnLineLabelPerimOn         = False
+      res.cnLineLabelsOn             = True
+      res.cnLinesOn                  = True
+      res.cnLowLabelBackgroundColor  = -1
+      res.cnLowLabelFontColor        = "Black"
+      res.cnLowLabelFontHeightF      = 0.015
+      res.cnLowLabelPerimOn          = False
+      res.cnLowLabelsOn              = True
+      res.cnMonoLineLabelFontColor   = True
 
-      lon_temp1 = lon_temp[0:lon_box1]
-      lon_temp2 = lon_temp[lon_box2:lon_box3]
+      res.sfXArray = lon2d
+      res.sfYArray = lat2d
 
+      res.mpProjection              = "CylindricalEquidistant"
+      res.mpLimitMode = "LatLon"    # Limit the map view.
+      res.mpMinLonF   = lontr
+      res.mpMaxLonF   = lonbl
+      res.mpMinLatF   = lattr
+      res.mpMaxLatF   = latbl
+      res.mpPerimOn   = True
+      res.mpOutlineBoundarySets     = "AllBoundaries"
+      res.mpNationalLineColor       = "gray40"
+      res.mpNationalLineThicknessF  = 1.5
+      res.mpGeophysicalLineColor    = "gray40"
+      res.mpGeophysicalLineThicknessF = 1.5
+      res.cnMonoLineColor           = True
 
-   lon = np.append(lon_temp2, lon_temp1)
+      max_cont = (2.0*round(np.max(mslp/2.0),0))+10.0
+      min_cont = (2.0*round(np.min(mslp/2.0),0))-10.0
 
-   del(lon_temp1)
-   del(lon_temp2)
-   del(lonbl_idx)
-   del(lontr_idx)
-   del(lon_temp)
+      res.cnLevelSelectionMode = "ManualLevels"
+      res.cnMinLevelValF       = min_cont
+      res.cnMaxLevelValF       = max_cont
+      res.cnLevelSpacingF      = 2.
+      res.cnLineThicknessF     = 2.5 
+
+      # create plot for analysis data
+
+      mslp_plot = ngl.contour_map(wks,mslp,res)
+
+      ngl.maximize_plot(wks, mslp_plot)
+      ngl.draw(mslp_plot)
+      ngl.frame(wks)
+
+      ngl.destroy(wks)
+      del res
+
+   ###################################################################################################
+
+   # forecast plots, none when only the analysis is plotted
+
+   if len(fore) > 0:
+
+      # open forecast file
+
+      f_fili = "GFS_forecast_%s_%s.nc" % (init_dt[:8], init_dt[8:10])
+      forecast = gfs_io.open_file(diri+f_fili, region)
+
+      # read in and calculate the fields for all forecast times at once, only the plotting is done
+      # for each forecast time
+
+      steps = slice(0, len(fore))
+
+      # read in mslp.
+
+      mslp_steps = geometry.cut(forecast.variables["PRMSL_P0_L101_GLL0"], geom, steps)/100.0
+      mslp_steps = smth9(mslp_steps, 0.5, 0.25)
+
+      # loop through forecast times
+
+      for i in range(0, len(fore)):
+
+         # frames already in the ledger for the same files are not plotted again (see ledger.py)
+
+         if not controls.frame_wanted(fore[i]):
+            continue
+
+      # create string for valid time
+
+         valid_date = (datetime.datetime(int(init_dt[:4]), int(init_dt[4:6]), int(init_dt[6:8]), int(init_dt[8:10])) + datetime.timedelta(hours=int(fore[i]))).strftime("%Y%m%d%H")
+
+      # fields for this forecast time
+
+         mslp = mslp_steps[i]
+
+      # open workspace for forecast plots
+
+         wks_type = "png"
+         wks_res = ngl.Resources()
+         wks_res.wkBackgroundOpacityF = 0.0
+         wks = ngl.open_wks(wks_type, "GFSforecast_%s_%s_mslp_SNGL_%s_%03d" % (region, valid_date, init_dt[0:10], fore[i]), wks_res)
+
+      # define resources for forecast plots
+
+         res = ngl.Resources()
+         res.nglDraw  = False
+         res.nglFrame = False
+
+         res.mpGridAndLimbOn        = False
+         res.pmTickMarkDisplayMode = "Never"
 
-else:
+         res.cnInfoLabelOn              = False
+         res.cnLineLabelsOn             = True
+         res.cnFillOn                   = False
+         res.cnHighLabelBackgroundColor = -1
+         res.cnHighLabelFontColor       = "Black"
+         res.cnHighLabelFontHeightF     = 0.015
+         res.cnHighLabelPerimOn         = False
+         res.cnHighLabelPerimThicknessF = 2.5
+         res.cnHighLabelsOn             = True
+         res.cnHighLowLabelOverlapMode  = "AdjustVPOmitOverHL"
+         res.cnInfoLabelOn              = False
+         res.cnLineLabelBackgroundColor = -1
+         res.cnLineLabelDensityF        = 0.8
+         res.cnLineLabelFontColor       = "Black"
+         res.cnLineLabelFontHeightF     = 0.015
+         res.cnLineLabelPerimOn         = False
+         res.cnLineLabelsOn             = True
+         res.cnLinesOn                  = True
+         res.cnLowLabelBackgroundColor  = -1
+         res.cnLowLabelFontColor        = "Black"
+         res.cnLowLabelFontHeightF      = 0.015
+         res.cnLowLabelPerimOn          = False
+         res.cnLowLabelsOn              = True
+         res.cnMonoLineLabelFontColor   = True
 
-   lon_temp = lon1[:]
+         res.sfXArray = lon2d
+         res.sfYArray = lat2d
 
-   lonbl_idx = (np.abs(lon_temp-lonbl)).argmin()
-   lontr_idx = (np.abs(lon_temp-lontr)).argmin()
+         res.mpProjection              = "CylindricalEquidistant"
+         res.mpLimitMode = "LatLon"    # Limit the map view.
+         res.mpMinLonF   = lontr
+         res.mpMaxLonF   = lonbl
+         res.mpMinLatF   = lattr
+         res.mpMaxLatF   = latbl
+         res.mpPerimOn   = True
+         res.mpOutlineBoundarySets     = "AllBoundaries"
+         res.mpNationalLineColor       = "gray40"
+         res.mpNationalLineThicknessF  = 1.5
+         res.mpGeophysicalLineColor    = "gray40"
+         res.mpGeophysicalLineThicknessF = 1.5
+         res.cnMonoLineColor           = True
 
-   if lonbl_idx == lontr_idx:
-      sys.exit('lon values are not different enough, they must have relate to different grid points')
-   elif lonbl_idx > 1 and lontr_idx < len(lon_temp)-2:
-      lon_box1 = lonbl_idx-2
-      lon_box2 = lontr_idx+2
-      lon = lon_temp[lon_box1:lon_box2]
-   else:
-      lon_box1 = lonbl_idx
-      lon_box2 = lontr_idx
-      lon = lon_temp[lon_box1:lon_box2]
+         max_cont = (2.0*round(np.max(mslp/2.0),0))+10.0
+         min_cont = (2.0*round(np.min(mslp/2.0),0))-10.0
 
-# read in mslp, checking whether box crosses Greenwich Meridian.
+         res.cnLevelSelectionMode = "ManualLevels"
+         res.cnMinLevelValF       = min_cont
+         res.cnMaxLevelValF       = max_cont
+         res.cnLevelSpacingF      = 2.
+         res.cnLineThicknessF     = 2.5
 
-if (np.sign(lonbl) + np.sign(lontr)) >= -1 and (np.sign(lonbl) + np.sign(lontr)) <= 1:
+      # create geopotential plots for forecast times
 
-   mslp1 = analysis.variables["PRMSL_P0_L101_GLL0"][:,:]/100.0
-   mslp_temp1 = mslp1[lat_box1:lat_box2,0:lon_box1]
-   mslp_temp2 = mslp1[lat_box1:lat_box2,lon_box2:lon_box3]
-   mslp = np.concatenate((mslp_temp2,mslp_temp1),axis=1)
-   del mslp1
-   del mslp_temp1
-   del mslp_temp2
-   mslp = smth9(mslp, 0.5, 0.25)
+         mslp_plot = ngl.contour_map(wks,mslp,res)
 
-else:
+         ngl.maximize_plot(wks, mslp_plot)
+         ngl.draw(mslp_plot)
+         ngl.frame(wks)
 
-   mslp1 = analysis.variables["PRMSL_P0_L101_GLL0"][:,:]/100.0
-   mslp = mslp1[lat_box1:lat_box2,lon_box1:lon_box2]
-   del mslp1
-   mslp = smth9(mslp, 0.5, 0.25)
+         ngl.destroy(wks)
+         del res
 
-# create 2d lat and lon
-
-lat2d = np.zeros((len(lat),len(lon)))
-lon2d = np.zeros((len(lat),len(lon)))
-
-for i in range(0, len(lon)):
-   lat2d[:,i] = lat
-
-for i in range(0, len(lat)):
-   lon2d[i,:] = lon
-   
-# open workspace for analysis plot
-
-wks_type = "png"
-wks_res = ngl.Resources()
-wks_res.wkBackgroundOpacityF = 0.0
-wks = ngl.open_wks(wks_type, "GFSanalysis_%s_%s_mslp_SNGL" % (region, init_dt[0:10]), wks_res)
-
-# define resources for analysis plot
-
-res = ngl.Resources()
-res.nglDraw  = False
-res.nglFrame = False
-
-res.mpGridAndLimbOn        = False
-res.pmTickMarkDisplayMode = "Never"
-
-res.cnInfoLabelOn              = False
-res.cnLineLabelsOn             = True
-res.cnFillOn                   = False
-res.cnHighLabelBackgroundColor = -1
-res.cnHighLabelFontColor       = "Black"
-res.cnHighLabelFontHeightF     = 0.015
-res.cnHighLabelPerimOn         = False
-res.cnHighLabelPerimThicknessF = 2.5
-res.cnHighLabelsOn             = True
-res.cnHighLowLabelOverlapMode  = "AdjustVPOmitOverHL"
-res.cnInfoLabelOn              = False
-res.cnLineLabelBackgroundColor = -1
-res.cnLineLabelDensityF        = 0.8
-res.cnLineLabelFontColor       = "Black"
-res.cnLineLabelFontHeightF     = 0.015
-res.cnLineLabelPerimOn         = False
-res.cnLineLabelsOn             = True
-res.cnLinesOn                  = True
-res.cnLowLabelBackgroundColor  = -1
-res.cnLowLabelFontColor        = "Black"
-res.cnLowLabelFontHeightF      = 0.015
-res.cnLowLabelPerimOn          = False
-res.cnLowLabelsOn              = True
-res.cnMonoLineLabelFontColor   = True
-
-res.sfXArray = lon2d
-res.sfYArray = lat2d
-
-res.mpProjection              = "CylindricalEquidistant"
-res.mpLimitMode = "LatLon"    # Limit the map view.
-res.mpMinLonF   = lontr
-res.mpMaxLonF   = lonbl
-res.mpMinLatF   = lattr
-res.mpMaxLatF   = latbl
-res.mpPerimOn   = True
-res.mpOutlineBoundarySets     = "AllBoundaries"
-res.mpNationalLineColor       = "gray40"
-res.mpNationalLineThicknessF  = 1.5
-res.mpGeophysicalLineColor    = "gray40"
-res.mpGeophysicalLineThicknessF = 1.5
-res.cnMonoLineColor           = True
-
-max_cont = (2.0*round(np.max(mslp/2.0),0))+10.0
-min_cont = (2.0*round(np.min(mslp/2.0),0))-10.0
-
-res.cnLevelSelectionMode = "ManualLevels"
-res.cnMinLevelValF       = min_cont
-res.cnMaxLevelValF       = max_cont
-res.cnLevelSpacingF      = 2.
-res.cnLineThicknessF     = 2.5 
-
-# create plot for analysis data
-
-mslp_plot = ngl.contour_map(wks,mslp,res)
-
-ngl.maximize_plot(wks, mslp_plot)
-ngl.draw(mslp_plot)
-ngl.frame(wks)
-
-ngl.destroy(wks)
-del res
+   os.system('mogrify -trim *_'+region+'_'+init_dt[0:10]+'_mslp_SNGL.png')
+   #if region == "WA" or region == "unknownWA":
+   #   os.system('mogrify -resize 886x600 *_'+region+'_'+init_dt[0:10]+'_mslp_SNGL.png')
+   #elif region == "EA" or region == "unknownEA":
+   #   os.system('mogrify -resize 600x733 *_'+region+'_'+init_dt[0:10]+'_mslp_SNGL.png')
+
+   os.system('mv *_'+region+'_'+init_dt[0:10]+'_mslp_SNGL.png %s/MARTIN/GFS/'%(GFS_dir)+region+'/'+init_dt[0:10]+'/mslp')
+
+   os.system('mogrify -trim *'+region+'_*mslp_SNGL_'+init_dt[0:10]+'*.png')
+   #if region == "WA" or region == "unknownWA":
+   #   os.system('mogrify -resize 886x600 *'+region+'_*mslp_SNGL_'+init_dt[0:10]+'*.png')
+   #elif region == "EA" or region == "unknownEA":
+   #   os.system('mogrify -resize 600x733 *'+region+'_*mslp_SNGL_'+init_dt[0:10]+'*.png')
+
+   os.system('mv *'+region+'_*mslp_SNGL_'+init_dt[0:10]+'*.png %s/MARTIN/GFS/'%(GFS_dir)+region+'/'+init_dt[0:10]+'/mslp')
 
 ###################################################################################################
 
-# open forecast file
-
-f_fili = "GFS_forecast_%s_%s.nc" % (init_dt[:8], init_dt[8:10])
-forecast = nio.open_file(diri+f_fili)
-
-# loop through forecast times
-
-for i in range(0, len(fore)):
-
-# create string for valid time
-
-   valid_date = (datetime.datetime(int(init_dt[:4]), int(init_dt[4:6]), int(init_dt[6:8]), int(init_dt[8:10])) + datetime.timedelta(hours=int(fore[i]))).strftime("%Y%m%d%H")
-
-
-# read in mslp, checking whether box crosses Greenwich Meridian.
-
-   if (np.sign(lonbl) + np.sign(lontr)) >= -1 and (np.sign(lonbl) + np.sign(lontr)) <= 1:
-
-      mslp1 = forecast.variables["PRMSL_P0_L101_GLL0"][i,:,:]/100.0
-      mslp_temp1 = mslp1[lat_box1:lat_box2,0:lon_box1]
-      mslp_temp2 = mslp1[lat_box1:lat_box2,lon_box2:lon_box3]
-      mslp = np.concatenate((mslp_temp2,mslp_temp1),axis=1)
-      del mslp1
-      del mslp_temp1
-      del mslp_temp2
-      mslp = smth9(mslp, 0.5, 0.25)
-
-   else:
-
-      mslp1 = forecast.variables["PRMSL_P0_L101_GLL0"][i,:,:]/100.0
-      mslp = mslp1[lat_box1:lat_box2,lon_box1:lon_box2]
-      del mslp1
-      mslp = smth9(mslp, 0.5, 0.25)
-
-# open workspace for forecast plots
-
-   wks_type = "png"
-   wks_res = ngl.Resources()
-   wks_res.wkBackgroundOpacityF = 0.0
-   wks = ngl.open_wks(wks_type, "GFSforecast_%s_%s_mslp_SNGL_%s_%03d" % (region, valid_date, init_dt[0:10], fore[i]), wks_res)
-
-# define resources for forecast plots
-
-   res = ngl.Resources()
-   res.nglDraw  = False
-   res.nglFrame = False
-
-   res.mpGridAndLimbOn        = False
-   res.pmTickMarkDisplayMode = "Never"
-
-   res.cnInfoLabelOn              = False
-   res.cnLineLabelsOn             = True
-   res.cnFillOn                   = False
-   res.cnHighLabelBackgroundColor = -1
-   res.cnHighLabelFontColor       = "Black"
-   res.cnHighLabelFontHeightF     = 0.015
-   res.cnHighLabelPerimOn         = False
-   res.cnHighLabelPerimThicknessF = 2.5
-   res.cnHighLabelsOn             = True
-   res.cnHighLowLabelOverlapMode  = "AdjustVPOmitOverHL"
-   res.cnInfoLabelOn              = False
-   res.cnLineLabelBackgroundColor = -1
-   res.cnLineLabelDensityF        = 0.8
-   res.cnLineLabelFontColor       = "Black"
-   res.cnLineLabelFontHeightF     = 0.015
-   res.cnLineLabelPerimOn         = False
-   res.cnLineLabelsOn             = True
-   res.cnLinesOn                  = True
-   res.cnLowLabelBackgroundColor  = -1
-   res.cnLowLabelFontColor        = "Black"
-   res.cnLowLabelFontHeightF      = 0.015
-   res.cnLowLabelPerimOn          = False
-   res.cnLowLabelsOn              = True
-   res.cnMonoLineLabelFontColor   = True
-
-   res.sfXArray = lon2d
-   res.sfYArray = lat2d
-
-   res.mpProjection              = "CylindricalEquidistant"
-   res.mpLimitMode = "LatLon"    # Limit the map view.
-   res.mpMinLonF   = lontr
-   res.mpMaxLonF   = lonbl
-   res.mpMinLatF   = lattr
-   res.mpMaxLatF   = latbl
-   res.mpPerimOn   = True
-   res.mpOutlineBoundarySets     = "AllBoundaries"
-   res.mpNationalLineColor       = "gray40"
-   res.mpNationalLineThicknessF  = 1.5
-   res.mpGeophysicalLineColor    = "gray40"
-   res.mpGeophysicalLineThicknessF = 1.5
-   res.cnMonoLineColor           = True
-
-   max_cont = (2.0*round(np.max(mslp/2.0),0))+10.0
-   min_cont = (2.0*round(np.min(mslp/2.0),0))-10.0
-
-   res.cnLevelSelectionMode = "ManualLevels"
-   res.cnMinLevelValF       = min_cont
-   res.cnMaxLevelValF       = max_cont
-   res.cnLevelSpacingF      = 2.
-   res.cnLineThicknessF     = 2.5
-
-# create geopotential plots for forecast times
-
-   mslp_plot = ngl.contour_map(wks,mslp,res)
-
-   ngl.maximize_plot(wks, mslp_plot)
-   ngl.draw(mslp_plot)
-   ngl.frame(wks)
-
-   ngl.destroy(wks)
-   del res
-
-os.system('mogrify -trim *_'+region+'_'+init_dt[0:10]+'_mslp_SNGL.png')
-#if region == "WA" or region == "unknownWA":
-#   os.system('mogrify -resize 886x600 *_'+region+'_'+init_dt[0:10]+'_mslp_SNGL.png')
-#elif region == "EA" or region == "unknownEA":
-#   os.system('mogrify -resize 600x733 *_'+region+'_'+init_dt[0:10]+'_mslp_SNGL.png')
-
-os.system('mv *_'+region+'_'+init_dt[0:10]+'_mslp_SNGL.png %s/MARTIN/GFS/'%(GFS_dir)+region+'/'+init_dt[0:10]+'/mslp')
-
-os.system('mogrify -trim *'+region+'_*mslp_SNGL_'+init_dt[0:10]+'*.png')
-#if region == "WA" or region == "unknownWA":
-#   os.system('mogrify -resize 886x600 *'+region+'_*mslp_SNGL_'+init_dt[0:10]+'*.png')
-#elif region == "EA" or region == "unknownEA":
-#   os.system('mogrify -resize 600x733 *'+region+'_*mslp_SNGL_'+init_dt[0:10]+'*.png')
-
-os.system('mv *'+region+'_*mslp_SNGL_'+init_dt[0:10]+'*.png %s/MARTIN/GFS/'%(GFS_dir)+region+'/'+init_dt[0:10]+'/mslp')
+if __name__ == "__main__":
+   main(*sys.argv[1:7])
@@ -13,6 +13,17 @@
 #                     parallel by submitting to a pool.
 #
 # Revision History  : Feb 2020 - for sharing of GFS_plotting ihub repository
+#                     Oct 2026 - long-lived render workers that call the plotting scripts' main
+#                                functions instead of starting a new interpreter for every job
+#                     Oct 2026 - clear the gfs_io field cache once a cycle has been plotted
+#                     Oct 2026 - render mode runs jobs through scheduler.py, loading data and
+#                                derived fields before the plotting jobs that need them
+#                     Oct 2026 - render workers hand back the gfs_io working arrays after each job
+#                     Oct 2026 - clear the field cache of GRIB2 manifests (see grib_io.py)
+#                     Oct 2026 - initialisation times can be given in SWIFT_GFS_INIT (see
+#                                backfill.py)
+#                     Oct 2026 - only the frames missing from the job ledger are plotted (see
+#                                ledger.py)
 ###################################################################################################
 
 # worker function that submits the commands to be processed in the background
@@ -20,22 +31,73 @@
 def worker( x ):
    import subprocess
    import os
+   import time
+   import ledger
 
    print ("Running %s %s %s %s %s %s %s %s" % (x["pyver"],x["var"],x["time"], x["lev"], x["lat1"], x["lon1"], x["lat2"], x["lon2"]))
    command = [x["pyver"],x["var"],x["time"], x["lev"], x["lat1"], x["lon1"], x["lat2"], x["lon2"]]
-   p = subprocess.Popen([x["pyver"], x["var"], x["time"], x["lev"], x["lat1"], x["lon1"], x["lat2"], x["lon2"]])
+   env = dict(os.environ)
+   if "frames" in x:
+      env["SWIFT_GFS_FRAMES"] = ",".join(str(lead) for lead in x["frames"])
+   start = time.time()
+   p = subprocess.Popen([x["pyver"], x["var"], x["time"], x["lev"], x["lat1"], x["lon1"], x["lat2"], x["lon2"]], env=env)
    print(p.communicate())
+   ledger.record(x, start)
    return  # ({"out":out})
 
+# initialiser for long-lived render workers, the heavy plotting and data libraries are imported
+# once per pool process rather than once per job
+
+def init_render_worker():
+   import Ngl
+   import Nio
+   import numpy
+
+# render function that runs a plotting job inside a long-lived pool process by importing the
+# plotting script (once per process) and calling its main function
+
+def render( x ):
+   import importlib
+   import time
+   import traceback
+   import controls
+   import gfs_io
+   import ledger
+
+   print ("Rendering %s %s %s %s %s %s %s" % (x["var"],x["time"], x["lev"], x["lat1"], x["lon1"], x["lat2"], x["lon2"]))
+   start = time.time()
+   controls.pending_frames = x.get("frames")
+   try:
+      module = importlib.import_module(x["var"][:-3])
+      module.main(x["time"], x["lev"], x["lat1"], x["lon1"], x["lat2"], x["lon2"])
+   except SystemExit as e:
+      print("%s %s %s exited: %s" % (x["var"], x["lev"], x["lat1"], e))
+   except Exception:
+      print("%s %s %s failed" % (x["var"], x["lev"], x["lat1"]))
+      traceback.print_exc()
+   finally:
+      # working arrays of this job are reused by the next job in this process
+
+      gfs_io.release_buffers()
+      controls.pending_frames = None
+
+   # the frames that have landed in MARTIN/GFS are recorded in the job ledger
+
+   ledger.record(x, start)
+   return
+
 # main function that reads in initiation times from init_dt, variables and levels from m_lev_vars and variables (on single levels) from s_lev_vars
 # commands are then constructed and submitted to a pool to be run in parallel on a user specified number of cores "n_processes"
 
 if __name__ == "__main__":
    
    from multiprocessing.pool import Pool
+   import glob
    import os
    import sys
 
+   import ledger
+
 # Select number of cores to run parallel plotting on
 
    if (len(sys.argv) > 1 ):
@@ -44,6 +106,17 @@ if __name__ == "__main__":
    else:
       n_processes = 4
 
+# Select how jobs are run, "render" (default) runs them as function calls in long-lived worker
+# processes, "subprocess" starts a new python3 interpreter for every job
+
+   if (len(sys.argv) > 2 ):
+      mode = sys.argv[2]
+   else:
+      mode = "render"
+
+   if mode not in ["render", "subprocess"]:
+      sys.exit("Unknown mode %s, use render or subprocess" % (mode))
+
 # define working and current directory
 
    diri = os.environ['SWIFT_GFS']
@@ -61,6 +134,13 @@ if __name__ == "__main__":
    content = a.readlines()
 
    init_dt = ((next((s for s in content if "init" in s), None)).rstrip().split(":"))[1].split(",")
+
+# initialisation times given in the SWIFT_GFS_INIT environment variable are plotted in place of
+# those in the namelist (backfill.py plots one initialisation time at a time)
+
+   if os.environ.get("SWIFT_GFS_INIT", "") != "":
+      init_dt = os.environ["SWIFT_GFS_INIT"].split(",")
+
    m_lev_vars = ((next((s for s in content if "m_lev_vars" in s), None)).rstrip().split(":"))[1].split(",")
    split_m_lev_vars = m_lev_vars[0].split()
    s_lev_vars = ((next((s for s in content if "s_lev_vars" in s), None)).rstrip().split(":"))[1].split(",")
@@ -94,31 +174,58 @@ if __name__ == "__main__":
                if not (os.path.isdir(image_diri+'/GFS'+'/'+region[i].lstrip()+'/'+init_dt[j].lstrip()+'/'+m_lev_vars2+'_'+levs[l].lstrip())):
                   os.mkdir(image_diri+'/GFS'+'/'+region[i].lstrip()+'/'+init_dt[j].lstrip()+'/'+m_lev_vars2+'_'+levs[l].lstrip())
                try:
-                  command_temp = {"pyver":"python3", "var":m_lev_vars2+".py", "time":init_dt[j].lstrip(), "lat1":lat_range[0], "lon1":lon_range[0],"lat2":lat_range[1],"lon2":lon_range[1], "lev":levs[l].lstrip()}
+                  command_temp = {"pyver":"python3", "var":m_lev_vars2+".py", "time":init_dt[j].lstrip(), "lat1":lat_range[0], "lon1":lon_range[0],"lat2":lat_range[1],"lon2":lon_range[1], "lev":levs[l].lstrip(), "region":region[i].lstrip()}
                   command.append(command_temp)
                except NameError:
                   command = []
-                  command_temp = {"pyver":"python3", "var":m_lev_vars2+".py", "time":init_dt[j].lstrip(), "lat1":lat_range[0], "lon1":lon_range[0],"lat2":lat_range[1],"lon2":lon_range[1], "lev":levs[l].lstrip()}
+                  command_temp = {"pyver":"python3", "var":m_lev_vars2+".py", "time":init_dt[j].lstrip(), "lat1":lat_range[0], "lon1":lon_range[0],"lat2":lat_range[1],"lon2":lon_range[1], "lev":levs[l].lstrip(), "region":region[i].lstrip()}
                   command.append(command_temp)
 
          for k in range(len(s_lev_vars)):
             if not (os.path.isdir(image_diri+'/GFS'+'/'+region[i].lstrip()+'/'+init_dt[j].lstrip()+'/'+s_lev_vars[k].lstrip())):
                   os.mkdir(image_diri+'/GFS'+'/'+region[i].lstrip()+'/'+init_dt[j].lstrip()+'/'+s_lev_vars[k].lstrip())
             try:
-               command_temp = {"pyver":"python3", "var":s_lev_vars[k].lstrip()+".py", "time":init_dt[j].lstrip(), "lat1":lat_range[0], "lon1":lon_range[0],"lat2":lat_range[1],"lon2":lon_range[1], "lev":""}
+               command_temp = {"pyver":"python3", "var":s_lev_vars[k].lstrip()+".py", "time":init_dt[j].lstrip(), "lat1":lat_range[0], "lon1":lon_range[0],"lat2":lat_range[1],"lon2":lon_range[1], "lev":"", "region":region[i].lstrip()}
                command.append(command_temp)
             except NameError:
                command = []
-               command_temp = {"pyver":"python3", "var":s_lev_vars[k].lstrip()+".py", "time":init_dt[j].lstrip(), "lat1":lat_range[0], "lon1":lon_range[0],"lat2":lat_range[1],"lon2":lon_range[1], "lev":""}
+               command_temp = {"pyver":"python3", "var":s_lev_vars[k].lstrip()+".py", "time":init_dt[j].lstrip(), "lat1":lat_range[0], "lon1":lon_range[0],"lat2":lat_range[1],"lon2":lon_range[1], "lev":"", "region":region[i].lstrip()}
                command.append(command_temp)
 
-   if int(n_processes) >= 1:
+# frames already plotted from the same files are left out of the jobs, jobs with no frames left
+# are not run (see ledger.py)
+
+   command = ledger.plan(command)
+
+   if int(n_processes) >= 1 and len(command) > 0:
       print("--pooling starts now--")
-      pool = Pool( processes=int(n_processes) )
-      # Calls the 'worker' function in parallel using the 'par' list. 
-      # Each entry will be used once as a task to start a process.
-      r = pool.map_async(worker, command)
-      r.wait() # Wait for the results
-      print("--pooling ended--")
-      if not r.successful():
-         print(r._value, sys.exit("Parallelization not successful"))
+      if mode == "render":
+         import scheduler
+         # The jobs in the 'command' list are turned into a graph of data load, derived field and
+         # plotting jobs. Each pool process imports the plotting libraries once and then runs
+         # jobs as function calls as soon as the data they need has been loaded.
+         graph = scheduler.build_graph(command)
+         wall = scheduler.run(graph, n_processes, render, init_render_worker, os.getcwd()+"/job_times.json")
+         print("--pooling ended--")
+         schedule_report = scheduler.report(graph, wall, n_processes)
+         print(schedule_report)
+         b = open(image_diri+"/GFS/schedule_report.txt", "w")
+         b.write(schedule_report+"\n")
+         b.close()
+      else:
+         pool = Pool( processes=int(n_processes) )
+         # Calls the 'worker' function in parallel using the 'par' list. 
+         # Each entry will be used once as a task to start a process.
+         r = pool.map_async(worker, command)
+         r.wait() # Wait for the results
+         print("--pooling ended--")
+         if not r.successful():
+            print(r._value, sys.exit("Parallelization not successful"))
+
+# remove the field cache built up by the plotting jobs for each initialisation time
+
+   import gfs_io
+
+   for j in range(len(init_dt)):
+      for fili in glob.glob("*_%s_%s*.nc" % (init_dt[j].strip()[:8], init_dt[j].strip()[8:10])) + glob.glob("*_%s_%s*.grib" % (init_dt[j].strip()[:8], init_dt[j].strip()[8:10])):
+         gfs_io.clear_cache(fili)
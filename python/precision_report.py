@@ -0,0 +1,257 @@
+###################################################################################################
+# Project           : Global Challenges Research Fund (GCRF) African SWIFT (Science for Weather
+#                     Information and Forecasting Techniques.
+#
+# Program name      : precision_report.py
+#
+# Author            : Alexander J. Roberts, University of Leeds, NCAS
+#
+# Date created      : Oct 2026
+#
+# Purpose           : Check that keeping fields in the gfs_io working precision (float32) leaves
+#                     the plotted fields unchanged. Every field path of the namelist's plotting
+#                     jobs that is now in the working precision is done in it and in float64 and the
+#                     largest difference is compared with a twentieth of the range of the field
+#                     (about one contour interval of the plots):
+#                        - the fields read by each job, cut out for its region (geometry.cut, from
+#                          the field cache or the regional files)
+#                        - the relative vorticity of rel_vort.py and rel_vort_smooth.py (the
+#                          absolute vorticity less the planetary vorticity of kinematics.py)
+#                        - the derived fields (derived.py, including the vertical difference of PV)
+#                        - the divergence of kinematics.py
+#                        - the 9-point smoothing (smooth.py) of the fields of the scripts that
+#                          smooth them
+#                     No plotting job interpolates fields. Fields where the difference is more than
+#                     tolerance of a twentieth of the range are marked CHECK, a product that needs
+#                     double precision can pass dtype=np.float64 to the function that calculates
+#                     it. The report is printed and written to MARTIN/GFS/precision_report.txt.
+#
+# Revision History  : Oct 2026 - also compare the cut, relative vorticity and smoothed fields
+#
+###################################################################################################
+
+import os
+import sys
+import numpy as np
+
+import controls
+import derived
+import extract_regions
+import geometry
+import gfs_io
+import kinematics
+import scheduler
+from smooth import smth9
+
+# largest difference allowed, as a fraction of a twentieth of the range of the field
+
+tolerance = 0.01
+
+###################################################################################################
+
+# largest difference between a field in the working precision and in float64, and a twentieth of
+# the range of the float64 field
+
+def compare(working, double):
+
+   working = np.asarray(working, dtype=np.float64)
+   double = np.asarray(double, dtype=np.float64)
+
+   diff = float(np.nanmax(np.abs(working-double)))
+   interval = float(np.nanmax(double)-np.nanmin(double))/20.0
+
+   return diff, interval
+
+def report_line(label, fili, diff, interval):
+
+   if interval > 0.0:
+      ratio = diff/interval
+   else:
+      ratio = 0.0
+
+   if ratio > tolerance:
+      status = "CHECK"
+   else:
+      status = "OK"
+
+   return "%-45s %-40s %12.4e %12.4e %10.2e  %s" % (label, os.path.basename(fili), diff, interval, ratio, status)
+
+# True if the plotting script of a job calls the text in its source (e.g. smth9)
+
+def script_calls(job, text):
+
+   f = open(os.path.join(os.path.dirname(os.path.abspath(__file__)), job["var"]))
+   source = f.read()
+   f.close()
+
+   return text+"(" in source
+
+# region bounds of a job as the plotting scripts order them
+
+def bounds(job):
+
+   latbl, lonbl, lattr, lontr = [float(ll) for ll in (job["lat1"], job["lon1"], job["lat2"], job["lon2"])]
+   if latbl < lattr:
+      latbl, lattr = lattr, latbl
+   if lonbl > lontr:
+      lonbl, lontr = lontr, lonbl
+
+   return latbl, lonbl, lattr, lontr
+
+# lines for a field in both precisions, and for the field smoothed as the plotting scripts smooth it
+
+def field_lines(label, fili, working, double, smooth):
+
+   lines = [report_line(label, fili, *compare(working, double))]
+   if smooth:
+      lines.append(report_line(label+" smoothed", fili, *compare(smth9(working, 0.5, 0.25), smth9(np.asarray(double, dtype=np.float64), 0.5, 0.25))))
+
+   return lines
+
+# keys of the load and derived jobs of the graph whose fields are smoothed by a plotting job
+
+def smoothed_keys(graph):
+
+   keys = set()
+   for node in graph.values():
+      if node.kind == "render" and script_calls(node.payload, "smth9"):
+         keys.update(node.deps)
+
+   return keys
+
+# fields read by the plotting jobs, cut out for the region of each job, in both precisions (the
+# float64 field is cut straight from the file). The absolute vorticity read by rel_vort.py and
+# rel_vort_smooth.py is also compared as the relative vorticity they plot.
+
+def cut_lines(graph, init_dt):
+
+   lines = []
+   done = set()
+   smoothed = smoothed_keys(graph)
+
+   for node in sorted(graph.values(), key=lambda node: node.label):
+      if node.kind != "render":
+         continue
+      job = node.payload
+      relative = script_calls(job, "kinematics.grid")
+
+      for key in sorted(node.deps, key=str):
+         load = graph[key]
+         if load.kind != "load" or (job["region"], key, relative) in done:
+            continue
+         done.add((job["region"], key, relative))
+
+         name = load.payload["name"]
+         lev = load.payload["lev"]
+         for fili in controls.cycle_files(init_dt, load.payload["region"]):
+            gfsfile = gfs_io.open_file(fili)
+            if name not in gfsfile.variables:
+               continue
+
+            # leading indices of the variable, all forecast times and the level index if it has
+            # levels
+
+            var = gfsfile.handle.variables[name]
+            lead = (slice(None),)*(len(var.dimensions)-2)
+            label = "%s %s" % (name, job["region"])
+            if lev is not None:
+               lead = lead[:-1]+(lev,)
+               label = "%s %shPa %s" % (name, gfsfile.levels_hPa(name)[lev], job["region"])
+
+            geom = geometry.region(gfsfile, *bounds(job))
+            working = np.array(geometry.cut(gfsfile.variables[name], geom, *lead))
+            double = np.array(geometry.cut(var, geom, *lead), dtype=np.float64)
+
+            if relative:
+               working = working-kinematics.grid(geom).e_vort
+               double = double-0.0000727*np.sin(np.deg2rad(np.asarray(geom.lat2d, dtype=np.float64)))
+               label = label.replace(name, "relative vorticity")
+
+            lines = lines+field_lines("cut "+label, fili, working, double, key in smoothed)
+
+   return lines
+
+# derived fields of the scheduler graph in both precisions
+
+def derived_lines(graph, init_dt):
+
+   lines = []
+   smoothed = smoothed_keys(graph)
+
+   for node in sorted(graph.values(), key=lambda node: node.label):
+      if node.kind != "derived":
+         continue
+      function = getattr(derived, node.payload["kind"])
+      for fili in controls.cycle_files(init_dt, node.payload["region"]):
+         gfsfile = gfs_io.open_file(fili)
+         if not all(name in gfsfile.variables for name in derived.inputs[node.payload["kind"]][0]):
+            continue
+
+         working = function(gfsfile, *node.payload["args"])
+         double = function(gfsfile, *node.payload["args"], dtype=np.float64)
+         if not isinstance(working, tuple):
+            working, double = (working,), (double,)
+
+         for k, (w, d) in enumerate(zip(working, double)):
+            label = node.label
+            if len(working) > 1:
+               label = "%s [%d]" % (label, k)
+            lines = lines+field_lines(label, fili, np.asarray(w.data), d.data, node.key in smoothed)
+
+   return lines
+
+# divergence of each region and level plotted by divergence.py and convergence.py
+
+def kinematics_lines(jobs, init_dt):
+
+   lines = []
+   done = set()
+
+   for region in jobs:
+      for job in jobs[region]:
+         if job["var"] not in ["divergence.py", "convergence.py"] or (region, job["lev"]) in done:
+            continue
+         done.add((region, job["lev"]))
+
+         for fili in controls.cycle_files(init_dt, region):
+            gfsfile = gfs_io.open_file(fili)
+            levs_p = gfsfile.levels_hPa("UGRD_P0_L100_GLL0")
+            if job["lev"] not in levs_p:
+               continue
+            geom = geometry.region(gfsfile, *bounds(job))
+
+            working = kinematics.divergence(gfsfile, geom, levs_p.index(job["lev"]))
+            double = kinematics.divergence(gfsfile, geom, levs_p.index(job["lev"]), dtype=np.float64)
+            lines.append(report_line("divergence %shPa %s" % (job["lev"], region), fili, *compare(working, double)))
+
+   return lines
+
+###################################################################################################
+
+if __name__ == "__main__":
+
+   GFS_dir = os.environ['SWIFT_GFS']
+
+   if len(sys.argv) < 2:
+      sys.exit("Usage: python3 precision_report.py YYYYMMDDHH")
+
+   init_dt = sys.argv[1]
+
+   jobs = extract_regions.plotting_jobs(GFS_dir, init_dt)
+   graph = scheduler.build_graph([job for region in jobs for job in jobs[region]])
+
+   lines = ["working precision %s, tolerance %g of a twentieth of the field range" % (np.dtype(gfs_io.precision).name, tolerance), ""]
+   lines.append("%-45s %-40s %12s %12s %10s  %s" % ("field", "file", "max diff", "range/20", "ratio", "status"))
+   lines = lines + cut_lines(graph, init_dt) + derived_lines(graph, init_dt) + kinematics_lines(jobs, init_dt)
+
+   checks = len([line for line in lines if line.endswith("CHECK")])
+   lines = lines + ["", "%d fields compared, largest ratio %.2e, %d to CHECK" % (len(lines)-3, max([float(line.split()[-2]) for line in lines[3:]] or [0.0]), checks)]
+
+   report = "\n".join(lines)
+   print(report)
+
+   b = open(GFS_dir+"/MARTIN/GFS/precision_report.txt", "w")
+   b.write(report+"\n")
+   b.close()
+
+   gfs_io.close_all()
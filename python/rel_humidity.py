@@ -26,391 +26,317 @@ import sys
 import os
 import datetime
 
-GFS_dir = os.environ['SWIFT_GFS']
-
-###################################################################################################
-
-# Main script to plot relative humidity
-
-# define directory
-
-diri = (os.getcwd())+"/"
-
-# forecast times (currently set to plot 0 to 48 hours)
-
-fore = (os.popen("cat %s/controls/namelist | grep 'fore:' | awk -F: '{print $2}' | tr ',' ' '"%(GFS_dir))).read().split()
-fore = [np.int(f) for f in fore]
-
-# accept initialisation time and level as arguments
-
-init_dt = (sys.argv[1])
-lev_hPa = (sys.argv[2])
+import controls
+import gfs_io
+import geometry
 
-# read in domains and accept lat and lon limits as arguments
+GFS_dir = os.environ['SWIFT_GFS']
 
-b = open(GFS_dir+"/controls/domains")
-domains_content = b.readlines()
+# fields read by main, used by the plot.py scheduler to load (and derive) them before the
+# plotting job runs. Each entry is a variable followed by its levels, in hPa ("lev" is the level
+# main is called with, "lev+1" the next level index, "low:high" all levels in between) or as
+# integer level indices. Single level fields have no levels.
 
-key_list = []
-latlon_list = []
+requires = {"fields": [["RH_P0_L100_GLL0", "lev"]],
+            "derived": []}
 
-for domain in domains_content:
-   key_list.append(domain.split(":")[0])
-   latlon_str = (domain.split(":")[1]).strip().split(",")
-   latlon_flt = []
-   for ll in latlon_str:
-      latlon_flt.append(float(ll))
-   latlon_list.append(latlon_flt)
-   del(latlon_flt)
+# names of the images main writes (without .png), used by the plot.py job ledger (see ledger.py)
+# to find the frames already plotted: the analysis image (None if main does not plot the analysis)
+# and the forecast images. {region}, {init}, {valid}, {lev} and {lead} are the region, the
+# initialisation and valid times (YYYYMMDDHH), the level main is called with and the lead time.
 
-domains_dict = dict(zip(key_list,latlon_list))
+images = {"analysis": "GFSanalysis_{region}_{init}_rel_humidity_{lev}hPa",
+          "forecast": "GFSforecast_{region}_{valid}_rel_humidity_{lev}hPa_{init}_{lead:03d}"}
 
-latbl = float(sys.argv[3])
-lonbl = float(sys.argv[4])
-lattr = float(sys.argv[5])
-lontr = float(sys.argv[6])
+###################################################################################################
 
-region = "unnamedregion"
+# Main script to plot relative humidity
 
-for domain in domains_dict.keys():
-   if ((latbl == domains_dict[domain][0] and lattr == domains_dict[domain][2]) or (latbl == domains_dict[domain][2] or lattr == domains_dict[domain][0])) and ((lonbl == domains_dict[domain][1] and lontr == domains_dict[domain][3]) or (lonbl == domains_dict[domain][3] and lontr == domains_dict[domain][1])):
-      region = domain
+def main(init_dt, lev_hPa, latbl, lonbl, lattr, lontr):
 
-# arrange lat and lon values to get bottom left and top right lat lon values
+   # define directory
 
-if latbl == lattr or lonbl == lontr:
-   sys.exit('lat and lon values must be different')
-else:
-   if latbl < lattr:
-      latbl, lattr = lattr, latbl
-   if lonbl > lontr:
-      lonbl, lontr = lontr, lonbl
+   diri = (os.getcwd())+"/"
 
-# read in analysis files
+   # forecast times (currently set to plot 0 to 48 hours)
 
-a_fili = "analysis_gfs_4_%s_%s00_000.nc" % (init_dt[:8], init_dt[8:10])
+   fore = controls.forecast_times(GFS_dir)
 
-# read pressure levels from analysis file
+   # accept initialisation time and level as arguments
 
-analysis = nio.open_file(diri+a_fili)
+   init_dt = str(init_dt)
+   lev_hPa = str(lev_hPa)
 
-level_dim = analysis.variables["RH_P0_L100_GLL0"].dimensions[0]
+   # read in domains and accept lat and lon limits as arguments
 
-levs_p1 = analysis.variables[level_dim]
-levs_p = ['{:.0f}'.format(x) for x in levs_p1[:]/100.0]
-del levs_p1
+   domains_dict = controls.read_domains(GFS_dir+"/controls/domains")
 
-# identify level index
+   latbl = float(latbl)
+   lonbl = float(lonbl)
+   lattr = float(lattr)
+   lontr = float(lontr)
 
-lev_index = levs_p.index(lev_hPa)
+   region = "unnamedregion"
 
-# read in lat
+   for domain in domains_dict.keys():
+      if ((latbl == domains_dict[domain][0] and lattr == domains_dict[domain][2]) or (latbl == domains_dict[domain][2] or lattr == domains_dict[domain][0])) and ((lonbl == domains_dict[domain][1] and lontr == domains_dict[domain][3]) or (lonbl == domains_dict[domain][3] and lontr == domains_dict[domain][1])):
+         region = domain
 
-lat1 = analysis.variables["lat_0"]
-lat_temp = lat1[:]
+   # arrange lat and lon values to get bottom left and top right lat lon values
 
-latbl_idx = (np.abs(lat_temp-latbl)).argmin()
-lattr_idx = (np.abs(lat_temp-lattr)).argmin()
+   if latbl == lattr or lonbl == lontr:
+      sys.exit('lat and lon values must be different')
+   else:
+      if latbl < lattr:
+         latbl, lattr = lattr, latbl
+      if lonbl > lontr:
+         lonbl, lontr = lontr, lonbl
 
-if latbl_idx == lattr_idx:
-   sys.exit('lat values are not different enough, they must have relate to different grid points')
-elif latbl_idx > 1 and lattr_idx < len(lat_temp)-2:
-   lat_box1 = latbl_idx-2
-   lat_box2 = lattr_idx+2
-   lat = lat_temp[lat_box1:lat_box2]
-else:
-   lat_box1 = latbl_idx
-   lat_box2 = lattr_idx
-   lat = lat_temp[lat_box1:lat_box2]
+   # read in analysis files
 
-del(latbl_idx)
-del(lattr_idx)
-del(lat1)
-del(lat_temp)
+   a_fili = "analysis_gfs_4_%s_%s00_000.nc" % (init_dt[:8], init_dt[8:10])
 
-# read in lon 
+   # read pressure levels from analysis file
 
-lon1 = analysis.variables["lon_0"]
+   analysis = gfs_io.open_file(diri+a_fili, region)
 
-# check to see if box crosses Greenwich Meridian. If so then the lon values must be modified for plot to work.
+   level_dim = analysis.variables["RH_P0_L100_GLL0"].dimensions[0]
 
-if (np.sign(lonbl) + np.sign(lontr)) >= -1 and (np.sign(lonbl) + np.sign(lontr)) <= 1:
+   levs_p1 = analysis.variables[level_dim]
+   levs_p = ['{:.0f}'.format(x) for x in levs_p1[:]/100.0]
+   del levs_p1
 
-   lonbl, lontr = lontr, lonbl
+   # identify level index
 
-   lon_temp = np.where(lon1[:]>=180.0, lon1[:]-360.0, lon1[:])
+   lev_index = levs_p.index(lev_hPa)
 
-   lonbl_idx = (np.abs(lon_temp-lonbl)).argmin()
-   lontr_idx = (np.abs(lon_temp-lontr)).argmin()
+   # read in lat and lon of the region from the region geometry cache (for boxes crossing the
+   # Greenwich Meridian lonbl and lontr are swapped and lon values run from -180 to 180)
 
-   if lonbl_idx == lontr_idx:
-      sys.exit('lon values are not different enough, they must have relate to different grid points')
-   elif lontr_idx > len(lon_temp)/2 and lonbl_idx <= len(lon_temp)/2:
-      lon_box1 = lonbl_idx+2
-      lon_box2 = lontr_idx-2
-      lon_box3 = len(lon_temp)-1
+   geom = geometry.region(analysis, latbl, lonbl, lattr, lontr)
 
-      lon_temp1 = lon_temp[0:lon_box1]
-      lon_temp2 = lon_temp[lon_box2:lon_box3]
-   else:
-      lon_box1 = lonbl_idx
-      lon_box2 = lontr_idx
-      lon_box3 = len(lon_temp)-1
+   lonbl, lontr = geom.lonbl, geom.lontr
+   lat = geom.lat
+   lon = geom.lon
 
-      lon_temp1 = lon_temp[0:lon_box1]
-      lon_temp2 = lon_temp[lon_box2:lon_box3]
+   # read in relative humidity.
 
+   rh = geometry.cut(analysis.variables["RH_P0_L100_GLL0"], geom, lev_index)
 
-   lon = np.append(lon_temp2, lon_temp1)
+   # 2d lat and lon
 
-   del(lon_temp1)
-   del(lon_temp2)
-   del(lonbl_idx)
-   del(lontr_idx)
-   del(lon_temp)
+   lat2d = geom.lat2d
+   lon2d = geom.lon2d
 
-else:
+   # analysis plot, only the forecast plots are made when a forecast lead time is streamed
+   # (see controls.analysis_plotted)
 
-   lon_temp = lon1[:]
+   if controls.analysis_plotted():
 
-   lonbl_idx = (np.abs(lon_temp-lonbl)).argmin()
-   lontr_idx = (np.abs(lon_temp-lontr)).argmin()
+      # open workspace for analysis plot
 
-   if lonbl_idx == lontr_idx:
-      sys.exit('lon values are not different enough, they must have relate to different grid points')
-   elif lonbl_idx > 1 and lontr_idx < len(lon_temp)-2:
-      lon_box1 = lonbl_idx-2
-      lon_box2 = lontr_idx+2
-      lon = lon_temp[lon_box1:lon_box2]
-   else:
-      lon_box1 = lonbl_idx
-      lon_box2 = lontr_idx
-      lon = lon_temp[lon_box1:lon_box2]
-
-# read in relative humidity, checking whether box crosses Greenwich Meridian.
+      wks_type = "png"
+      wks = ngl.open_wks(wks_type, "GFSanalysis_%s_%s_rel_humidity_%shPa" % (region, init_dt[0:10], lev_hPa))
 
-if (np.sign(lonbl) + np.sign(lontr)) >= -1 and (np.sign(lonbl) + np.sign(lontr)) <= 1:
+      # define resources for analysis plot
 
-   rh1 = analysis.variables["RH_P0_L100_GLL0"][lev_index,:,:]
-   rh_temp1 = rh1[lat_box1:lat_box2,0:lon_box1]
-   rh_temp2 = rh1[lat_box1:lat_box2,lon_box2:lon_box3]
-   rh = np.concatenate((rh_temp2,rh_temp1),axis=1)
-   del rh1
-   del rh_temp1
-   del rh_temp2
+      res = ngl.Resources()
+      res.nglDraw                     = False
+      res.nglFrame                    = False
 
-else:
+      cmap = ngl.read_colormap_file("MPL_jet")
 
-   rh1 = analysis.variables["RH_P0_L100_GLL0"][lev_index,:,:]
-   rh = rh1[lat_box1:lat_box2,lon_box1:lon_box2]
-   del rh1
+      res.cnLinesOn                   = False
+      res.cnLineLabelsOn              = False
+      res.cnFillOn                    = True
+      res.cnFillPalette               = cmap[15:,:][::-1]
 
-# create 2d lat and lon
+      res.lbAutoManage          = False
+      res.lbLabelFontHeightF         = 0.005
+      res.lbOrientation              = "horizontal"
+      res.lbLabelAngleF              = 45
+      res.pmLabelBarOrthogonalPosF = -1.
+      res.pmLabelBarParallelPosF = 0.25
+      res.pmLabelBarWidthF      = 0.3
+      res.pmLabelBarHeightF     = 0.1
+      res.lbTitleString         = "%shPa relative humidity (%%)" % (lev_hPa)
+      res.lbTitleFontHeightF   = 0.0125
 
-lat2d = np.zeros((len(lat),len(lon)))
-lon2d = np.zeros((len(lat),len(lon)))
+      res.mpFillOn                    = False
+      res.mpGeophysicalLineColor      = "Grey18"
+      res.mpGeophysicalLineThicknessF = 1.5
 
-for i in range(0, len(lon)):
-   lat2d[:,i] = lat
+      res.sfXArray                    = lon2d
+      res.sfYArray                    = lat2d
 
-for i in range(0, len(lat)):
-   lon2d[i,:] = lon
-   
-# open workspace for analysis plot
+      res.mpGridAndLimbOn        = False
+      res.pmTickMarkDisplayMode = "Never"
 
-wks_type = "png"
-wks = ngl.open_wks(wks_type, "GFSanalysis_%s_%s_rel_humidity_%shPa" % (region, init_dt[0:10], lev_hPa))
+      res.cnInfoLabelOn              = False
 
-# define resources for analysis plot
+      res.mpProjection              = "CylindricalEquidistant"
+      res.mpLimitMode = "LatLon"    # Limit the map view.
+      res.mpMinLonF   = lontr
+      res.mpMaxLonF   = lonbl
+      res.mpMinLatF   = lattr
+      res.mpMaxLatF   = latbl
+      res.mpPerimOn   = True
+      res.mpOutlineBoundarySets     = "AllBoundaries"
+      res.mpNationalLineColor       = "gray40"
+      res.mpNationalLineThicknessF  = 1.5
+      res.mpGeophysicalLineColor    = "gray40"
+      res.mpGeophysicalLineThicknessF = 1.5
+      res.cnMonoLineColor           = True
 
-res = ngl.Resources()
-res.nglDraw                     = False
-res.nglFrame                    = False
+      max_cont = 100.0
+      min_cont = 0.0
 
-cmap = ngl.read_colormap_file("MPL_jet")
+      res.cnLevelSelectionMode = "ManualLevels"
+      res.cnMinLevelValF       = min_cont
+      res.cnMaxLevelValF       = max_cont
+      res.cnLevelSpacingF      = 2.5
+      res.cnLineThicknessF     = 2.5 
 
-res.cnLinesOn                   = False
-res.cnLineLabelsOn              = False
-res.cnFillOn                    = True
-res.cnFillPalette               = cmap[15:,:][::-1]
+      # create relative humidity plot for analysis data
 
-res.lbAutoManage          = False
-res.lbLabelFontHeightF         = 0.005
-res.lbOrientation              = "horizontal"
-res.lbLabelAngleF              = 45
-res.pmLabelBarOrthogonalPosF = -1.
-res.pmLabelBarParallelPosF = 0.25
-res.pmLabelBarWidthF      = 0.3
-res.pmLabelBarHeightF     = 0.1
-res.lbTitleString         = "%shPa relative humidity (%%)" % (lev_hPa)
-res.lbTitleFontHeightF   = 0.0125
+      rh_plot = ngl.contour_map(wks,rh,res)
 
-res.mpFillOn                    = False
-res.mpGeophysicalLineColor      = "Grey18"
-res.mpGeophysicalLineThicknessF = 1.5
+      ngl.maximize_plot(wks, rh_plot)
+      ngl.draw(rh_plot)
+      ngl.frame(wks)
 
-res.sfXArray                    = lon2d
-res.sfYArray                    = lat2d
+      ngl.destroy(wks)
+      del res
 
-res.mpGridAndLimbOn        = False
-res.pmTickMarkDisplayMode = "Never"
+   ###################################################################################################
 
-res.cnInfoLabelOn              = False
+   # forecast plots, none when only the analysis is plotted
 
-res.mpProjection              = "CylindricalEquidistant"
-res.mpLimitMode = "LatLon"    # Limit the map view.
-res.mpMinLonF   = lontr
-res.mpMaxLonF   = lonbl
-res.mpMinLatF   = lattr
-res.mpMaxLatF   = latbl
-res.mpPerimOn   = True
-res.mpOutlineBoundarySets     = "AllBoundaries"
-res.mpNationalLineColor       = "gray40"
-res.mpNationalLineThicknessF  = 1.5
-res.mpGeophysicalLineColor    = "gray40"
-res.mpGeophysicalLineThicknessF = 1.5
-res.cnMonoLineColor           = True
+   if len(fore) > 0:
 
-max_cont = 100.0
-min_cont = 0.0
+      # open forecast file
 
-res.cnLevelSelectionMode = "ManualLevels"
-res.cnMinLevelValF       = min_cont
-res.cnMaxLevelValF       = max_cont
-res.cnLevelSpacingF      = 2.5
-res.cnLineThicknessF     = 2.5 
+      f_fili = "GFS_forecast_%s_%s.nc" % (init_dt[:8], init_dt[8:10])
+      forecast = gfs_io.open_file(diri+f_fili, region)
 
-# create relative humidity plot for analysis data
+      # read in and calculate the fields for all forecast times at once, only the plotting is done
+      # for each forecast time
 
-rh_plot = ngl.contour_map(wks,rh,res)
+      steps = slice(0, len(fore))
 
-ngl.maximize_plot(wks, rh_plot)
-ngl.draw(rh_plot)
-ngl.frame(wks)
+      # read in relative humidity.
 
-ngl.destroy(wks)
-del res
+      rh_steps = geometry.cut(forecast.variables["RH_P0_L100_GLL0"], geom, steps, lev_index)
 
-###################################################################################################
-
-# open forecast file
+      # loop through forecast times
 
-f_fili = "GFS_forecast_%s_%s.nc" % (init_dt[:8], init_dt[8:10])
-forecast = nio.open_file(diri+f_fili)
+      for i in range(0, len(fore)):
 
-# loop through forecast times
+         # frames already in the ledger for the same files are not plotted again (see ledger.py)
 
-for i in range(0, len(fore)):
+         if not controls.frame_wanted(fore[i]):
+            continue
 
-# create string for valid time
+      # create string for valid time
 
-   valid_date = (datetime.datetime(int(init_dt[:4]), int(init_dt[4:6]), int(init_dt[6:8]), int(init_dt[8:10])) + datetime.timedelta(hours=int(fore[i]))).strftime("%Y%m%d%H")
+         valid_date = (datetime.datetime(int(init_dt[:4]), int(init_dt[4:6]), int(init_dt[6:8]), int(init_dt[8:10])) + datetime.timedelta(hours=int(fore[i]))).strftime("%Y%m%d%H")
 
-# read in relative humidity, checking whether box crosses Greenwich Meridian.
+      # fields for this forecast time
 
-   if (np.sign(lonbl) + np.sign(lontr)) >= -1 and (np.sign(lonbl) + np.sign(lontr)) <= 1:
+         rh = rh_steps[i]
 
-      rh1 = forecast.variables["RH_P0_L100_GLL0"][i,lev_index,:,:]
-      rh_temp1 = rh1[lat_box1:lat_box2,0:lon_box1]
-      rh_temp2 = rh1[lat_box1:lat_box2,lon_box2:lon_box3]
-      rh = np.concatenate((rh_temp2,rh_temp1),axis=1)
-      del rh1
-      del rh_temp1
-      del rh_temp2
+      # open workspace for forecast plots
 
-   else:
+         wks_type = "png"
+         wks = ngl.open_wks(wks_type, "GFSforecast_%s_%s_rel_humidity_%shPa_%s_%03d" % (region, valid_date, lev_hPa, init_dt[0:10], fore[i]))
 
-      rh1 = forecast.variables["RH_P0_L100_GLL0"][i,lev_index,:,:]
-      rh = rh1[lat_box1:lat_box2,lon_box1:lon_box2]
-      del rh1
+      # define resources for forecast plots
 
-# open workspace for forecast plots
+         res = ngl.Resources()
+         res.nglDraw                     = False
+         res.nglFrame                    = False
 
-   wks_type = "png"
-   wks = ngl.open_wks(wks_type, "GFSforecast_%s_%s_rel_humidity_%shPa_%s_%03d" % (region, valid_date, lev_hPa, init_dt[0:10], fore[i]))
+         cmap = ngl.read_colormap_file("MPL_jet")
 
-# define resources for forecast plots
+         res.cnLinesOn                   = False
+         res.cnLineLabelsOn              = False
+         res.cnFillOn                    = True
+         res.cnFillPalette               = cmap[15:,:][::-1]
 
-   res = ngl.Resources()
-   res.nglDraw                     = False
-   res.nglFrame                    = False
+         res.lbAutoManage          = False
+         res.lbLabelFontHeightF         = 0.005
+         res.lbOrientation              = "horizontal"
+         res.lbLabelAngleF              = 45
+         res.pmLabelBarOrthogonalPosF = -1.
+         res.pmLabelBarParallelPosF = 0.25
+         res.pmLabelBarWidthF      = 0.3
+         res.pmLabelBarHeightF     = 0.1
+         res.lbTitleString         = "%shPa relative humidity (%%)" % (lev_hPa)
+         res.lbTitleFontHeightF   = 0.0125   
 
-   cmap = ngl.read_colormap_file("MPL_jet")
+         res.mpFillOn                    = False
+         res.mpGeophysicalLineColor      = "Grey18"
+         res.mpGeophysicalLineThicknessF = 1.5
 
-   res.cnLinesOn                   = False
-   res.cnLineLabelsOn              = False
-   res.cnFillOn                    = True
-   res.cnFillPalette               = cmap[15:,:][::-1]
+         res.sfXArray                    = lon2d
+         res.sfYArray                    = lat2d
 
-   res.lbAutoManage          = False
-   res.lbLabelFontHeightF         = 0.005
-   res.lbOrientation              = "horizontal"
-   res.lbLabelAngleF              = 45
-   res.pmLabelBarOrthogonalPosF = -1.
-   res.pmLabelBarParallelPosF = 0.25
-   res.pmLabelBarWidthF      = 0.3
-   res.pmLabelBarHeightF     = 0.1
-   res.lbTitleString         = "%shPa relative humidity (%%)" % (lev_hPa)
-   res.lbTitleFontHeightF   = 0.0125   
+         res.mpGridAndLimbOn        = False
+         res.pmTickMarkDisplayMode = "Never"
 
-   res.mpFillOn                    = False
-   res.mpGeophysicalLineColor      = "Grey18"
-   res.mpGeophysicalLineThicknessF = 1.5
+         res.cnInfoLabelOn              = False
 
-   res.sfXArray                    = lon2d
-   res.sfYArray                    = lat2d
+         res.mpProjection              = "CylindricalEquidistant"
+         res.mpLimitMode = "LatLon"    # Limit the map view.
+         res.mpMinLonF   = lontr
+         res.mpMaxLonF   = lonbl
+         res.mpMinLatF   = lattr
+         res.mpMaxLatF   = latbl
+         res.mpPerimOn   = True
+         res.mpOutlineBoundarySets     = "AllBoundaries"
+         res.mpNationalLineColor       = "gray40"
+         res.mpNationalLineThicknessF  = 1.5
+         res.mpGeophysicalLineColor    = "gray40"
+         res.mpGeophysicalLineThicknessF = 1.5
+         res.cnMonoLineColor           = True
 
-   res.mpGridAndLimbOn        = False
-   res.pmTickMarkDisplayMode = "Never"
+         max_cont = 100.0
+         min_cont = 0.0
 
-   res.cnInfoLabelOn              = False
+         res.cnLevelSelectionMode = "ManualLevels"
+         res.cnMinLevelValF       = min_cont
+         res.cnMaxLevelValF       = max_cont
+         res.cnLevelSpacingF      = 2.5
+         res.cnLineThicknessF     = 2.5
 
-   res.mpProjection              = "CylindricalEquidistant"
-   res.mpLimitMode = "LatLon"    # Limit the map view.
-   res.mpMinLonF   = lontr
-   res.mpMaxLonF   = lonbl
-   res.mpMinLatF   = lattr
-   res.mpMaxLatF   = latbl
-   res.mpPerimOn   = True
-   res.mpOutlineBoundarySets     = "AllBoundaries"
-   res.mpNationalLineColor       = "gray40"
-   res.mpNationalLineThicknessF  = 1.5
-   res.mpGeophysicalLineColor    = "gray40"
-   res.mpGeophysicalLineThicknessF = 1.5
-   res.cnMonoLineColor           = True
+      # create relative humidity plot for analysis data
 
-   max_cont = 100.0
-   min_cont = 0.0
+         rh_plot = ngl.contour_map(wks,rh,res)
 
-   res.cnLevelSelectionMode = "ManualLevels"
-   res.cnMinLevelValF       = min_cont
-   res.cnMaxLevelValF       = max_cont
-   res.cnLevelSpacingF      = 2.5
-   res.cnLineThicknessF     = 2.5
+         ngl.maximize_plot(wks, rh_plot)
+         ngl.draw(rh_plot)
+         ngl.frame(wks)
 
-# create relative humidity plot for analysis data
+         ngl.destroy(wks)
+         del res
 
-   rh_plot = ngl.contour_map(wks,rh,res)
+   os.system('mogrify -trim *_'+region+'_'+init_dt[0:10]+'_rel_humidity_'+lev_hPa+'hPa.png')
+   #if region == "WA" or region == "unknownWA":
+   #   os.system('mogrify -resize 886x600 *_'+region+'_'+init_dt[0:10]+'_rel_humidity_'+lev_hPa+'hPa.png')
+   #elif region == "EA" or region == "unknownEA":
+   #   os.system('mogrify -resize 600x733 *_'+region+'_'+init_dt[0:10]+'_rel_humidity_'+lev_hPa+'hPa.png')
 
-   ngl.maximize_plot(wks, rh_plot)
-   ngl.draw(rh_plot)
-   ngl.frame(wks)
+   os.system('mv *_'+region+'_'+init_dt[0:10]+'_rel_humidity_'+lev_hPa+'hPa.png %s/MARTIN/GFS/'%(GFS_dir)+region+'/'+init_dt[0:10]+'/rel_humidity_'+lev_hPa)
 
-   ngl.destroy(wks)
-   del res
+   os.system('mogrify -trim *'+region+'_*_rel_humidity_'+lev_hPa+'hPa_'+init_dt[0:10]+'*.png')
+   #if region == "WA" or region == "unknownWA":
+   #   os.system('mogrify -resize 886x600 *'+region+'_*_rel_humidity_'+lev_hPa+'hPa_'+init_dt[0:10]+'*.png')
+   #elif region == "EA" or region == "unknownEA":
+   #   os.system('mogrify -resize 600x733 *'+region+'_*_rel_humidity_'+lev_hPa+'hPa_'+init_dt[0:10]+'*.png')
 
-os.system('mogrify -trim *_'+region+'_'+init_dt[0:10]+'_rel_humidity_'+lev_hPa+'hPa.png')
-#if region == "WA" or region == "unknownWA":
-#   os.system('mogrify -resize 886x600 *_'+region+'_'+init_dt[0:10]+'_rel_humidity_'+lev_hPa+'hPa.png')
-#elif region == "EA" or region == "unknownEA":
-#   os.system('mogrify -resize 600x733 *_'+region+'_'+init_dt[0:10]+'_rel_humidity_'+lev_hPa+'hPa.png')
+   os.system('mv *'+region+'_*_rel_humidity_'+lev_hPa+'hPa_'+init_dt[0:10]+'*.png %s/MARTIN/GFS/'%(GFS_dir)+region+'/'+init_dt[0:10]+'/rel_humidity_'+lev_hPa)
 
-os.system('mv *_'+region+'_'+init_dt[0:10]+'_rel_humidity_'+lev_hPa+'hPa.png %s/MARTIN/GFS/'%(GFS_dir)+region+'/'+init_dt[0:10]+'/rel_humidity_'+lev_hPa)
-
-os.system('mogrify -trim *'+region+'_*_rel_humidity_'+lev_hPa+'hPa_'+init_dt[0:10]+'*.png')
-#if region == "WA" or region == "unknownWA":
-#   os.system('mogrify -resize 886x600 *'+region+'_*_rel_humidity_'+lev_hPa+'hPa_'+init_dt[0:10]+'*.png')
-#elif region == "EA" or region == "unknownEA":
-#   os.system('mogrify -resize 600x733 *'+region+'_*_rel_humidity_'+lev_hPa+'hPa_'+init_dt[0:10]+'*.png')
+###################################################################################################
 
-os.system('mv *'+region+'_*_rel_humidity_'+lev_hPa+'hPa_'+init_dt[0:10]+'*.png %s/MARTIN/GFS/'%(GFS_dir)+region+'/'+init_dt[0:10]+'/rel_humidity_'+lev_hPa)
+if __name__ == "__main__":
+   main(*sys.argv[1:7])
@@ -10,7 +10,8 @@
 #
 # Purpose           : Plot relative vorticity images as part of SWIFT_GFSplotting.
 #
-# Revision History  :
+# Revision History  : Oct 2026 - take the planetary vorticity of the region from the kinematics
+#                                module
 #
 # Usage             : Can be used as part of wider plotting repository or independently e.g.
 #                     "python3 rel_vort.py time lev lat lon lat lon"
@@ -26,456 +27,335 @@ import sys
 import os
 import datetime
 
-GFS_dir = os.environ['SWIFT_GFS']
-
-#####################################################################################################
+import controls
+import gfs_io
+import geometry
+import kinematics
+from smooth import smth9
 
-#  9-point smoother function, required to make the geopotential contours look better.
-#
-def smth9(x,p,q):
-#
-#  Run a 9-point smoother on the 2D numpy.array x using weights
-#  p and q.  Return the smoothed array.
-#
+GFS_dir = os.environ['SWIFT_GFS']
 
-#
-#  Get array dimensions and check on sizes.
-#
-  ni = x.shape[0]
-  nj = x.shape[1]
-  if (ni < 3 or nj < 3):
-    print("smth9: both array dimensions must be at least three.")
-    sys.exit()
+# fields read by main, used by the plot.py scheduler to load (and derive) them before the
+# plotting job runs. Each entry is a variable followed by its levels, in hPa ("lev" is the level
+# main is called with, "lev+1" the next level index, "low:high" all levels in between) or as
+# integer level indices. Single level fields have no levels.
 
-#
-#  Smooth.
-#
-  po4 = p/4.
-  qo4 = q/4.
-
-  output = np.zeros([ni,nj],'f')
-  for j in range(1,nj-1):
-    for i in range(1,ni-1):
-      jm1 = j-1
-      jp1 = j+1
-      im1 = i-1
-      ip1 = i+1
-      term1 = po4*(x[im1,j]+x[i,jm1]+x[ip1,j]+x[i,jp1]-4.*x[i,j])
-      term2 = qo4*(x[im1,jp1]+x[im1,jm1]+x[ip1,jm1]+x[ip1,jp1]-4.*x[i,j])
-      output[i,j] = float(x[i,j]) + term1 + term2
+requires = {"fields": [["ABSV_P0_L100_GLL0", "lev"]],
+            "derived": []}
 
-#
-#  Set the perimeter values to the original x values.
-#
-  output[0,:]    = x[0,:]
-  output[ni-1,:] = x[ni-1,:]
-  output[:,0]    = x[:,0]
-  output[:,nj-1] = x[:,nj-1]
+# names of the images main writes (without .png), used by the plot.py job ledger (see ledger.py)
+# to find the frames already plotted: the analysis image (None if main does not plot the analysis)
+# and the forecast images. {region}, {init}, {valid}, {lev} and {lead} are the region, the
+# initialisation and valid times (YYYYMMDDHH), the level main is called with and the lead time.
 
-#
-#  Return smoothed array.
-#
-  return output
+images = {"analysis": "GFSanalysis_{region}_{init}_rel_vort_smoothed_{lev}hPa",
+          "forecast": "GFSforecast_{region}_{valid}_rel_vort_smoothed_{lev}hPa_{init}_{lead:03d}"}
 
 ###################################################################################################
 
 # Main script to plot relative vorticity
 
-# define directory
-
-diri = (os.getcwd())+"/"
-
-# forecast times (currently set to plot 0 to 48 hours)
-
-fore = (os.popen("cat %s/controls/namelist | grep 'fore:' | awk -F: '{print $2}' | tr ',' ' '"%(GFS_dir))).read().split()
-fore = [np.int(f) for f in fore]
-
-# accept initialisation time and level as arguments
-
-init_dt = (sys.argv[1])
-lev_hPa = (sys.argv[2])
-
-# read in domains and accept lat and lon limits as arguments
+def main(init_dt, lev_hPa, latbl, lonbl, lattr, lontr):
 
-b = open(GFS_dir+"/controls/domains")
-domains_content = b.readlines()
+   # define directory
 
-key_list = []
-latlon_list = []
+   diri = (os.getcwd())+"/"
 
-for domain in domains_content:
-   key_list.append(domain.split(":")[0])
-   latlon_str = (domain.split(":")[1]).strip().split(",")
-   latlon_flt = []
-   for ll in latlon_str:
-      latlon_flt.append(float(ll))
-   latlon_list.append(latlon_flt)
-   del(latlon_flt)
+   # forecast times (currently set to plot 0 to 48 hours)
 
-domains_dict = dict(zip(key_list,latlon_list))
+   fore = controls.forecast_times(GFS_dir)
 
-latbl = float(sys.argv[3])
-lonbl = float(sys.argv[4])
-lattr = float(sys.argv[5])
-lontr = float(sys.argv[6])
+   # accept initialisation time and level as arguments
 
-region = "unnamedregion"
+   init_dt = str(init_dt)
+   lev_hPa = str(lev_hPa)
 
-for domain in domains_dict.keys():
-   if ((latbl == domains_dict[domain][0] and lattr == domains_dict[domain][2]) or (latbl == domains_dict[domain][2] or lattr == domains_dict[domain][0])) and ((lonbl == domains_dict[domain][1] and lontr == domains_dict[domain][3]) or (lonbl == domains_dict[domain][3] and lontr == domains_dict[domain][1])):
-      region = domain
+   # read in domains and accept lat and lon limits as arguments
 
-# arrange lat and lon values to get bottom left and top right lat lon values
+   domains_dict = controls.read_domains(GFS_dir+"/controls/domains")
 
-if latbl == lattr or lonbl == lontr:
-   sys.exit('lat and lon values must be different')
-else:
-   if latbl < lattr:
-      latbl, lattr = lattr, latbl
-   if lonbl > lontr:
-      lonbl, lontr = lontr, lonbl
+   latbl = float(latbl)
+   lonbl = float(lonbl)
+   lattr = float(lattr)
+   lontr = float(lontr)
 
-# read in analysis files
+   region = "unnamedregion"
 
-a_fili = "analysis_gfs_4_%s_%s00_000.nc" % (init_dt[:8], init_dt[8:10])
+   for domain in domains_dict.keys():
+      if ((latbl == domains_dict[domain][0] and lattr == domains_dict[domain][2]) or (latbl == domains_dict[domain][2] or lattr == domains_dict[domain][0])) and ((lonbl == domains_dict[domain][1] and lontr == domains_dict[domain][3]) or (lonbl == domains_dict[domain][3] and lontr == domains_dict[domain][1])):
+         region = domain
 
-# read pressure levels from analysis file
+   # arrange lat and lon values to get bottom left and top right lat lon values
 
-analysis = nio.open_file(diri+a_fili)
-
-level_dim = analysis.variables["ABSV_P0_L100_GLL0"].dimensions[0]
-
-levs_p1 = analysis.variables[level_dim]
-levs_p = ['{:.0f}'.format(x) for x in levs_p1[:]/100.0]
-del levs_p1
-
-# identify level index
-
-lev_index = levs_p.index(lev_hPa)
-
-# read in lat
-
-lat1 = analysis.variables["lat_0"]
-lat_temp = lat1[:]
-
-latbl_idx = (np.abs(lat_temp-latbl)).argmin()
-lattr_idx = (np.abs(lat_temp-lattr)).argmin()
-
-if latbl_idx == lattr_idx:
-   sys.exit('lat values are not different enough, they must have relate to different grid points')
-elif latbl_idx > 1 and lattr_idx < len(lat_temp)-2:
-   lat_box1 = latbl_idx-2
-   lat_box2 = lattr_idx+2
-   lat = lat_temp[lat_box1:lat_box2]
-else:
-   lat_box1 = latbl_idx
-   lat_box2 = lattr_idx
-   lat = lat_temp[lat_box1:lat_box2]
-
-del(latbl_idx)
-del(lattr_idx)
-del(lat1)
-del(lat_temp)
-
-# read in lon
+   if latbl == lattr or lonbl == lontr:
+      sys.exit('lat and lon values must be different')
+   else:
+      if latbl < lattr:
+         latbl, lattr = lattr, latbl
+      if lonbl > lontr:
+         lonbl, lontr = lontr, lonbl
 
-lon1 = analysis.variables["lon_0"]
+   # read in analysis files
 
-# check to see if box crosses Greenwich Meridian. If so then the lon values must be modified for plot to work.
+   a_fili = "analysis_gfs_4_%s_%s00_000.nc" % (init_dt[:8], init_dt[8:10])
 
-if (np.sign(lonbl) + np.sign(lontr)) >= -1 and (np.sign(lonbl) + np.sign(lontr)) <= 1:
+   # read pressure levels from analysis file
 
-   lonbl, lontr = lontr, lonbl
+   analysis = gfs_io.open_file(diri+a_fili, region)
 
-   lon_temp = np.where(lon1[:]>=180.0, lon1[:]-360.0, lon1[:])
+   level_dim = analysis.variables["ABSV_P0_L100_GLL0"].dimensions[0]
 
-   lonbl_idx = (np.abs(lon_temp-lonbl)).argmin()
-   lontr_idx = (np.abs(lon_temp-lontr)).argmin()
+   levs_p1 = analysis.variables[level_dim]
+   levs_p = ['{:.0f}'.format(x) for x in levs_p1[:]/100.0]
+   del levs_p1
 
-   if lonbl_idx == lontr_idx:
-      sys.exit('lon values are not different enough, they must have relate to different grid points')
-   elif lontr_idx > len(lon_temp)/2 and lonbl_idx <= len(lon_temp)/2:
-      lon_box1 = lonbl_idx+2
-      lon_box2 = lontr_idx-2
-      lon_box3 = len(lon_temp)-1
+   # identify level index
 
-      lon_temp1 = lon_temp[0:lon_box1]
-      lon_temp2 = lon_temp[lon_box2:lon_box3]
-   else:
-      lon_box1 = lonbl_idx
-      lon_box2 = lontr_idx
-      lon_box3 = len(lon_temp)-1
+   lev_index = levs_p.index(lev_hPa)
 
-      lon_temp1 = lon_temp[0:lon_box1]
-      lon_temp2 = lon_temp[lon_box2:lon_box3]
+   # read in lat and lon of the region from the region geometry cache (for boxes crossing the
+   # Greenwich Meridian lonbl and lontr are swapped and lon values run from -180 to 180)
 
+   geom = geometry.region(analysis, latbl, lonbl, lattr, lontr)
 
-   lon = np.append(lon_temp2, lon_temp1)
+   lonbl, lontr = geom.lonbl, geom.lontr
+   lat = geom.lat
+   lon = geom.lon
 
-   del(lon_temp1)
-   del(lon_temp2)
-   del(lonbl_idx)
-   del(lontr_idx)
-   del(lon_temp)
+   # read in absolute vorticity.
 
-else:
+   vort = geometry.cut(analysis.variables["ABSV_P0_L100_GLL0"], geom, lev_index)
 
-   lon_temp = lon1[:]
+   # 2d lat and lon
 
-   lonbl_idx = (np.abs(lon_temp-lonbl)).argmin()
-   lontr_idx = (np.abs(lon_temp-lontr)).argmin()
+   lat2d = geom.lat2d
+   lon2d = geom.lon2d
 
-   if lonbl_idx == lontr_idx:
-      sys.exit('lon values are not different enough, they must have relate to different grid points')
-   elif lonbl_idx > 1 and lontr_idx < len(lon_temp)-2:
-      lon_box1 = lonbl_idx-2
-      lon_box2 = lontr_idx+2
-      lon = lon_temp[lon_box1:lon_box2]
-   else:
-      lon_box1 = lonbl_idx
-      lon_box2 = lontr_idx
-      lon = lon_temp[lon_box1:lon_box2]
+   # calculate planetary vorticity (earth vorticity)
 
-# read in absolute vorticity, checking whether box crosses Greenwich Meridian.
+   e_vort = kinematics.grid(geom).e_vort
 
-if (np.sign(lonbl) + np.sign(lontr)) >= -1 and (np.sign(lonbl) + np.sign(lontr)) <= 1:
+   # subtract planetary vorticity to produce relative vorticity
 
-   vort1 = analysis.variables["ABSV_P0_L100_GLL0"][lev_index,:,:]
-   vort_temp1 = vort1[lat_box1:lat_box2,0:lon_box1]
-   vort_temp2 = vort1[lat_box1:lat_box2,lon_box2:lon_box3]
-   vort = np.concatenate((vort_temp2,vort_temp1),axis=1)
-   del vort1
-   del vort_temp1
-   del vort_temp2
+   vort = vort - e_vort
+   vort = smth9(vort, 0.5, 0.25)
 
-else:
+   # analysis plot, only the forecast plots are made when a forecast lead time is streamed
+   # (see controls.analysis_plotted)
 
-   vort1 = analysis.variables["ABSV_P0_L100_GLL0"][lev_index,:,:]
-   vort = vort1[lat_box1:lat_box2,lon_box1:lon_box2]
-   del vort1
+   if controls.analysis_plotted():
 
-# create 2d lat and lon
+      # open workspace for analysis plot
 
-lat2d = np.zeros((len(lat),len(lon)))
-lon2d = np.zeros((len(lat),len(lon)))
+      wks_type = "png"
+      wks = ngl.open_wks(wks_type, "GFSanalysis_%s_%s_rel_vort_smoothed_%shPa" % (region, init_dt[0:10], lev_hPa))
 
-for i in range(0, len(lon)):
-   lat2d[:,i] = lat
+      # define resources for analysis plot
 
-for i in range(0, len(lat)):
-   lon2d[i,:] = lon
+      res = ngl.Resources()
+      res.nglDraw                     = False
+      res.nglFrame                    = False
 
-# calculate planetary vorticity (earth vorticity)
+      cmap = ngl.read_colormap_file("testcmap")
 
-e_vort = 0.0000727*np.sin(np.deg2rad(lat2d))
+      res.cnLinesOn                   = False
+      res.cnLineLabelsOn              = False
+      res.cnFillOn                    = True
+      res.cnFillPalette               = cmap
 
-# subtract planetary vorticity to produce relative vorticity
+      res.lbAutoManage          = False
+      res.lbLabelFontHeightF         = 0.005
+      res.lbOrientation              = "horizontal"
+      res.lbLabelAngleF              = 45
+      res.pmLabelBarOrthogonalPosF = -1.
+      res.pmLabelBarParallelPosF = 0.25
+      res.pmLabelBarWidthF      = 0.3
+      res.pmLabelBarHeightF     = 0.1
+      res.lbTitleString         = "%shPa relative vorticity" % (lev_hPa)
+      res.lbTitleFontHeightF   = 0.0125
 
-vort = vort - e_vort
-vort = smth9(vort, 0.5, 0.25)
-   
-# open workspace for analysis plot
+      res.mpFillOn                    = False
+      res.mpGeophysicalLineColor      = "Grey18"
+      res.mpGeophysicalLineThicknessF = 1.5
 
-wks_type = "png"
-wks = ngl.open_wks(wks_type, "GFSanalysis_%s_%s_rel_vort_smoothed_%shPa" % (region, init_dt[0:10], lev_hPa))
+      res.sfXArray                    = lon2d
+      res.sfYArray                    = lat2d
 
-# define resources for analysis plot
+      res.mpGridAndLimbOn        = False
+      res.pmTickMarkDisplayMode = "Never"
 
-res = ngl.Resources()
-res.nglDraw                     = False
-res.nglFrame                    = False
+      res.cnInfoLabelOn              = False
 
-cmap = ngl.read_colormap_file("testcmap")
+      res.mpProjection              = "CylindricalEquidistant"
+      res.mpLimitMode = "LatLon"    # Limit the map view.
+      res.mpMinLonF   = lontr
+      res.mpMaxLonF   = lonbl
+      res.mpMinLatF   = lattr
+      res.mpMaxLatF   = latbl
+      res.mpPerimOn   = True
+      res.mpOutlineBoundarySets     = "AllBoundaries"
+      res.mpNationalLineColor       = "gray40"
+      res.mpNationalLineThicknessF  = 1.5
+      res.mpGeophysicalLineColor    = "gray40"
+      res.mpGeophysicalLineThicknessF = 1.5
+      res.cnMonoLineColor           = True
 
-res.cnLinesOn                   = False
-res.cnLineLabelsOn              = False
-res.cnFillOn                    = True
-res.cnFillPalette               = cmap
+      max_cont = 0.00025
+      min_cont = -0.00025
 
-res.lbAutoManage          = False
-res.lbLabelFontHeightF         = 0.005
-res.lbOrientation              = "horizontal"
-res.lbLabelAngleF              = 45
-res.pmLabelBarOrthogonalPosF = -1.
-res.pmLabelBarParallelPosF = 0.25
-res.pmLabelBarWidthF      = 0.3
-res.pmLabelBarHeightF     = 0.1
-res.lbTitleString         = "%shPa relative vorticity" % (lev_hPa)
-res.lbTitleFontHeightF   = 0.0125
+      res.cnLevelSelectionMode = "ManualLevels"
+      res.cnMinLevelValF       = min_cont
+      res.cnMaxLevelValF       = max_cont
+      res.cnLevelSpacingF      = 0.000025
+      res.cnLineThicknessF     = 2.5 
 
-res.mpFillOn                    = False
-res.mpGeophysicalLineColor      = "Grey18"
-res.mpGeophysicalLineThicknessF = 1.5
+      # create plot for analysis data
 
-res.sfXArray                    = lon2d
-res.sfYArray                    = lat2d
+      vort_plot = ngl.contour_map(wks,vort,res)
 
-res.mpGridAndLimbOn        = False
-res.pmTickMarkDisplayMode = "Never"
+      ngl.maximize_plot(wks, vort_plot)
+      ngl.draw(vort_plot)
+      ngl.frame(wks)
 
-res.cnInfoLabelOn              = False
+      ngl.destroy(wks)
+      del res
 
-res.mpProjection              = "CylindricalEquidistant"
-res.mpLimitMode = "LatLon"    # Limit the map view.
-res.mpMinLonF   = lontr
-res.mpMaxLonF   = lonbl
-res.mpMinLatF   = lattr
-res.mpMaxLatF   = latbl
-res.mpPerimOn   = True
-res.mpOutlineBoundarySets     = "AllBoundaries"
-res.mpNationalLineColor       = "gray40"
-res.mpNationalLineThicknessF  = 1.5
-res.mpGeophysicalLineColor    = "gray40"
-res.mpGeophysicalLineThicknessF = 1.5
-res.cnMonoLineColor           = True
+   ###################################################################################################
 
-max_cont = 0.00025
-min_cont = -0.00025
+   # forecast plots, none when only the analysis is plotted
 
-res.cnLevelSelectionMode = "ManualLevels"
-res.cnMinLevelValF       = min_cont
-res.cnMaxLevelValF       = max_cont
-res.cnLevelSpacingF      = 0.000025
-res.cnLineThicknessF     = 2.5 
+   if len(fore) > 0:
 
-# create plot for analysis data
+      # open forecast file
 
-vort_plot = ngl.contour_map(wks,vort,res)
+      f_fili = "GFS_forecast_%s_%s.nc" % (init_dt[:8], init_dt[8:10])
+      forecast = gfs_io.open_file(diri+f_fili, region)
 
-ngl.maximize_plot(wks, vort_plot)
-ngl.draw(vort_plot)
-ngl.frame(wks)
+      # read in and calculate the fields for all forecast times at once, only the plotting is done
+      # for each forecast time
 
-ngl.destroy(wks)
-del res
+      steps = slice(0, len(fore))
 
-###################################################################################################
+      # read in absolute vorticity.
 
-# open forecast file
+      vort_steps = geometry.cut(forecast.variables["ABSV_P0_L100_GLL0"], geom, steps, lev_index)
 
-f_fili = "GFS_forecast_%s_%s.nc" % (init_dt[:8], init_dt[8:10])
-forecast = nio.open_file(diri+f_fili)
+      # calculate planetary vorticity and subtract from absolute vorticity to give relative vorticity
 
-# loop through forecast times
+      e_vort = kinematics.grid(geom).e_vort
 
-for i in range(0, len(fore)):
+      vort_steps = vort_steps - e_vort
+      vort_steps = smth9(vort_steps, 0.5, 0.25)
 
-# create string for valid time
+      # loop through forecast times
 
-   valid_date = (datetime.datetime(int(init_dt[:4]), int(init_dt[4:6]), int(init_dt[6:8]), int(init_dt[8:10])) + datetime.timedelta(hours=int(fore[i]))).strftime("%Y%m%d%H")
+      for i in range(0, len(fore)):
 
-# read in absolute vorticity, checking whether box crosses Greenwich Meridian.
+         # frames already in the ledger for the same files are not plotted again (see ledger.py)
 
-   if (np.sign(lonbl) + np.sign(lontr)) >= -1 and (np.sign(lonbl) + np.sign(lontr)) <= 1:
+         if not controls.frame_wanted(fore[i]):
+            continue
 
-      vort1 = forecast.variables["ABSV_P0_L100_GLL0"][i,lev_index,:,:]
-      vort_temp1 = vort1[lat_box1:lat_box2,0:lon_box1]
-      vort_temp2 = vort1[lat_box1:lat_box2,lon_box2:lon_box3]
-      vort = np.concatenate((vort_temp2,vort_temp1),axis=1)
-      del vort1
-      del vort_temp1
-      del vort_temp2
+      # create string for valid time
 
-   else:
+         valid_date = (datetime.datetime(int(init_dt[:4]), int(init_dt[4:6]), int(init_dt[6:8]), int(init_dt[8:10])) + datetime.timedelta(hours=int(fore[i]))).strftime("%Y%m%d%H")
 
-      vort1 = forecast.variables["ABSV_P0_L100_GLL0"][i,lev_index,:,:]
-      vort = vort1[lat_box1:lat_box2,lon_box1:lon_box2]
-      del vort1
+      # fields for this forecast time
 
-# calculate planetary vorticity and subtract from absolute vorticity to give relative vorticity
+         vort = vort_steps[i]
 
-   e_vort = 0.0000727*np.sin(np.deg2rad(lat2d))
+      # open workspace for forecast plots
 
-   vort = vort - e_vort
-   vort = smth9(vort, 0.5, 0.25)
+         wks_type = "png"
+         wks = ngl.open_wks(wks_type, "GFSforecast_%s_%s_rel_vort_smoothed_%shPa_%s_%03d" % (region, valid_date, lev_hPa, init_dt[0:10], fore[i]))
 
-# open workspace for forecast plots
+      # define resources for forecast plots
 
-   wks_type = "png"
-   wks = ngl.open_wks(wks_type, "GFSforecast_%s_%s_rel_vort_smoothed_%shPa_%s_%03d" % (region, valid_date, lev_hPa, init_dt[0:10], fore[i]))
+         res = ngl.Resources()
+         res.nglDraw                     = False
+         res.nglFrame                    = False
 
-# define resources for forecast plots
+         cmap = ngl.read_colormap_file("testcmap")
 
-   res = ngl.Resources()
-   res.nglDraw                     = False
-   res.nglFrame                    = False
+         res.cnLinesOn                   = False
+         res.cnLineLabelsOn              = False
+         res.cnFillOn                    = True
+         res.cnFillPalette               = cmap
 
-   cmap = ngl.read_colormap_file("testcmap")
+         res.lbAutoManage          = False
+         res.lbLabelFontHeightF         = 0.005
+         res.lbOrientation              = "horizontal"
+         res.lbLabelAngleF              = 45
+         res.pmLabelBarOrthogonalPosF = -1.
+         res.pmLabelBarParallelPosF = 0.25
+         res.pmLabelBarWidthF      = 0.3
+         res.pmLabelBarHeightF     = 0.1
+         res.lbTitleString         = "%shPa relative vorticity" % (lev_hPa)
+         res.lbTitleFontHeightF   = 0.0125
 
-   res.cnLinesOn                   = False
-   res.cnLineLabelsOn              = False
-   res.cnFillOn                    = True
-   res.cnFillPalette               = cmap
+         res.mpFillOn                    = False
+         res.mpGeophysicalLineColor      = "Grey18"
+         res.mpGeophysicalLineThicknessF = 1.5
 
-   res.lbAutoManage          = False
-   res.lbLabelFontHeightF         = 0.005
-   res.lbOrientation              = "horizontal"
-   res.lbLabelAngleF              = 45
-   res.pmLabelBarOrthogonalPosF = -1.
-   res.pmLabelBarParallelPosF = 0.25
-   res.pmLabelBarWidthF      = 0.3
-   res.pmLabelBarHeightF     = 0.1
-   res.lbTitleString         = "%shPa relative vorticity" % (lev_hPa)
-   res.lbTitleFontHeightF   = 0.0125
+         res.sfXArray                    = lon2d
+         res.sfYArray                    = lat2d
 
-   res.mpFillOn                    = False
-   res.mpGeophysicalLineColor      = "Grey18"
-   res.mpGeophysicalLineThicknessF = 1.5
+         res.mpGridAndLimbOn        = False
+         res.pmTickMarkDisplayMode = "Never"
 
-   res.sfXArray                    = lon2d
-   res.sfYArray                    = lat2d
+         res.cnInfoLabelOn              = False
 
-   res.mpGridAndLimbOn        = False
-   res.pmTickMarkDisplayMode = "Never"
+         res.mpProjection              = "CylindricalEquidistant"
+         res.mpLimitMode = "LatLon"    # Limit the map view.
+         res.mpMinLonF   = lontr
+         res.mpMaxLonF   = lonbl
+         res.mpMinLatF   = lattr
+         res.mpMaxLatF   = latbl
+         res.mpPerimOn   = True
+         res.mpOutlineBoundarySets     = "AllBoundaries"
+         res.mpNationalLineColor       = "gray40"
+         res.mpNationalLineThicknessF  = 1.5
+         res.mpGeophysicalLineColor    = "gray40"
+         res.mpGeophysicalLineThicknessF = 1.5
+         res.cnMonoLineColor           = True
 
-   res.cnInfoLabelOn              = False
+         max_cont = 0.00025
+         min_cont = -0.00025
 
-   res.mpProjection              = "CylindricalEquidistant"
-   res.mpLimitMode = "LatLon"    # Limit the map view.
-   res.mpMinLonF   = lontr
-   res.mpMaxLonF   = lonbl
-   res.mpMinLatF   = lattr
-   res.mpMaxLatF   = latbl
-   res.mpPerimOn   = True
-   res.mpOutlineBoundarySets     = "AllBoundaries"
-   res.mpNationalLineColor       = "gray40"
-   res.mpNationalLineThicknessF  = 1.5
-   res.mpGeophysicalLineColor    = "gray40"
-   res.mpGeophysicalLineThicknessF = 1.5
-   res.cnMonoLineColor           = True
+         res.cnLevelSelectionMode = "ManualLevels"
+         res.cnMinLevelValF       = min_cont
+         res.cnMaxLevelValF       = max_cont
+         res.cnLevelSpacingF      = 0.000025
+         res.cnLineThicknessF     = 2.5
 
-   max_cont = 0.00025
-   min_cont = -0.00025
+      # create relative vorticity plots for forecast times
 
-   res.cnLevelSelectionMode = "ManualLevels"
-   res.cnMinLevelValF       = min_cont
-   res.cnMaxLevelValF       = max_cont
-   res.cnLevelSpacingF      = 0.000025
-   res.cnLineThicknessF     = 2.5
+         vort_plot = ngl.contour_map(wks,vort,res)
 
-# create relative vorticity plots for forecast times
+         ngl.maximize_plot(wks, vort_plot)
+         ngl.draw(vort_plot)
+         ngl.frame(wks)
 
-   vort_plot = ngl.contour_map(wks,vort,res)
+         ngl.destroy(wks)
+         del res
 
-   ngl.maximize_plot(wks, vort_plot)
-   ngl.draw(vort_plot)
-   ngl.frame(wks)
+   os.system('mogrify -trim *_'+region+'_'+init_dt[0:10]+'_rel_vort_smoothed_'+lev_hPa+'hPa.png')
+   #if region == "WA" or region == "unknownWA":
+   #   os.system('mogrify -resize 886x600 *_'+region+'_'+init_dt[0:10]+'_rel_vort_smoothed_'+lev_hPa+'hPa.png')
+   #elif region == "EA" or region == "unknownEA":
+   #   os.system('mogrify -resize 600x733 *_'+region+'_'+init_dt[0:10]+'_rel_vort_smoothed_'+lev_hPa+'hPa.png')
 
-   ngl.destroy(wks)
-   del res
+   os.system('mv *_'+region+'_'+init_dt[0:10]+'_rel_vort_smoothed_'+lev_hPa+'hPa.png %s/MARTIN/GFS/'%(GFS_dir)+region+'/'+init_dt[0:10]+'/rel_vort_smooth_'+lev_hPa)
 
-os.system('mogrify -trim *_'+region+'_'+init_dt[0:10]+'_rel_vort_smoothed_'+lev_hPa+'hPa.png')
-#if region == "WA" or region == "unknownWA":
-#   os.system('mogrify -resize 886x600 *_'+region+'_'+init_dt[0:10]+'_rel_vort_smoothed_'+lev_hPa+'hPa.png')
-#elif region == "EA" or region == "unknownEA":
-#   os.system('mogrify -resize 600x733 *_'+region+'_'+init_dt[0:10]+'_rel_vort_smoothed_'+lev_hPa+'hPa.png')
+   os.system('mogrify -trim *'+region+'_*rel_vort_smoothed_'+lev_hPa+'hPa_'+init_dt[0:10]+'*.png')
+   #if region == "WA" or region == "unknownWA":
+   #   os.system('mogrify -resize 886x600 *'+region+'_*rel_vort_smoothed_'+lev_hPa+'hPa_'+init_dt[0:10]+'*.png')
+   #elif region == "EA" or region == "unknownEA":
+   #   os.system('mogrify -resize 600x733 *'+region+'_*rel_vort_smoothed_'+lev_hPa+'hPa_'+init_dt[0:10]+'*.png')
 
-os.system('mv *_'+region+'_'+init_dt[0:10]+'_rel_vort_smoothed_'+lev_hPa+'hPa.png %s/MARTIN/GFS/'%(GFS_dir)+region+'/'+init_dt[0:10]+'/rel_vort_smooth_'+lev_hPa)
+   os.system('mv *'+region+'_*rel_vort_smoothed_'+lev_hPa+'hPa_'+init_dt[0:10]+'*.png %s/MARTIN/GFS/'%(GFS_dir)+region+'/'+init_dt[0:10]+'/rel_vort_smooth_'+lev_hPa)
 
-os.system('mogrify -trim *'+region+'_*rel_vort_smoothed_'+lev_hPa+'hPa_'+init_dt[0:10]+'*.png')
-#if region == "WA" or region == "unknownWA":
-#   os.system('mogrify -resize 886x600 *'+region+'_*rel_vort_smoothed_'+lev_hPa+'hPa_'+init_dt[0:10]+'*.png')
-#elif region == "EA" or region == "unknownEA":
-#   os.system('mogrify -resize 600x733 *'+region+'_*rel_vort_smoothed_'+lev_hPa+'hPa_'+init_dt[0:10]+'*.png')
+###################################################################################################
 
-os.system('mv *'+region+'_*rel_vort_smoothed_'+lev_hPa+'hPa_'+init_dt[0:10]+'*.png %s/MARTIN/GFS/'%(GFS_dir)+region+'/'+init_dt[0:10]+'/rel_vort_smooth_'+lev_hPa)
+if __name__ == "__main__":
+   main(*sys.argv[1:7])
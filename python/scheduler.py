@@ -0,0 +1,474 @@
+###################################################################################################
+# Project           : Global Challenges Research Fund (GCRF) African SWIFT (Science for Weather
+#                     Information and Forecasting Techniques.
+#
+# Program name      : scheduler.py
+#
+# Author            : Alexander J. Roberts, University of Leeds, NCAS
+#
+# Date created      : Oct 2026
+#
+# Purpose           : Dependency aware job scheduler for plot.py. The plotting jobs built from the
+#                     namelist are turned into a graph of data load jobs (one GFS field, variable
+#                     and level, into the gfs_io field cache), derived field jobs (wind speed,
+#                     shear, maximum shear, dewpoint, potential temperature and PV, see
+#                     derived.py) and plotting
+#                     (render) jobs, using the "requires" entry at the top of each plotting script.
+#                     Jobs are run on a process pool as soon as everything they depend on has
+#                     finished, data jobs needed by the most plotting jobs first and then the
+#                     cheapest plotting jobs first (using job times from previous runs where
+#                     available). Once all jobs have run the critical path through the graph, the
+#                     chain of jobs that bounds the time taken for the cycle, is reported.
+#
+# Revision History  : Oct 2026 - load jobs read the regional files of a region when they exist
+#                     Oct 2026 - "low:high" levels of derived fields are passed as one list
+#                     Oct 2026 - one derived field job for all the levels of the fields in
+#                                derived.batched, input offsets can be given for each variable
+#                     Oct 2026 - cycles can be read from their GRIB2 manifests (see grib_io.py)
+#                     Oct 2026 - load jobs read the file of the streamed lead time when there is one
+#                     Oct 2026 - load and derived field jobs hand back the gfs_io working arrays
+#                     Oct 2026 - files of a cycle from controls.cycle_files
+#
+# Usage             : import scheduler
+#                     graph = scheduler.build_graph(command)
+#                     scheduler.run(graph, n_processes, render, init_render_worker)
+###################################################################################################
+
+import functools
+import heapq
+import json
+import os
+import queue
+import re
+import time
+from multiprocessing.pool import Pool
+
+import controls
+import gfs_io
+import derived
+
+###################################################################################################
+
+# region whose regional files a plotting job reads, None if it reads the global files
+
+def files_region(job):
+
+   region = job.get("region")
+   if region is None:
+      return None
+
+   init_dt = job["time"]
+   filis = ["analysis_gfs_4_%s_%s00_000.nc" % (init_dt[:8], init_dt[8:10]),
+            "GFS_forecast_%s_%s.nc" % (init_dt[:8], init_dt[8:10])]
+
+   if any(os.path.isfile(controls.regional_path(fili, region)) for fili in filis):
+      return region
+
+   return None
+
+# variable in a GFS file, matching rainfall.py, the first variable containing name is used if
+# there is no exact match (e.g. PRATE)
+
+def _variable_name(gfsfile, name):
+
+   if name in gfsfile.variables:
+      return name
+
+   matches = [key for key in gfsfile.variables.keys() if name in key]
+   if len(matches) > 0:
+      return matches[0]
+
+   return None
+
+# level indices for one level entry of a "requires" list, lev_hPa is the level the plotting job
+# is run for and levs_p the pressure levels (hPa) of the variable
+
+def _level_indices(level, lev_hPa, levs_p):
+
+   if isinstance(level, int):
+      if level < 0 or level >= max(len(levs_p), 1):
+         return []
+      return [level]
+
+   def index(side):
+      match = re.match(r"^(lev|\d+)([+-]\d+)?$", side.strip())
+      if match is None:
+         raise ValueError("unknown level %s" % (side))
+      if match.group(1) == "lev":
+         idx = levs_p.index(lev_hPa)
+      else:
+         idx = levs_p.index(match.group(1))
+      if match.group(2) is not None:
+         idx = idx + int(match.group(2))
+      return idx
+
+   try:
+      sides = [index(side) for side in level.split(":")]
+   except ValueError:
+      return []
+
+   # "low:high" levels are returned in the order they are written
+
+   indices = [idx for idx in range(min(sides), max(sides)+1) if idx >= 0 and idx < len(levs_p)]
+   if sides[0] > sides[-1]:
+      indices.reverse()
+
+   return indices
+
+###################################################################################################
+
+# a job in the graph, kind is "load", "derived" or "render"
+
+class Node(object):
+
+   def __init__(self, key, kind, label, payload):
+      self.key = key
+      self.kind = kind
+      self.label = label
+      self.payload = payload
+      self.deps = set()
+      self.users = set()
+      self.n_requests = 0
+      self.cost = 1.0
+      self.start = None
+      self.end = None
+      self.ok = None
+
+   def duration(self):
+      if self.start is None or self.end is None:
+         return 0.0
+      return self.end - self.start
+
+# build the job graph for a list of plotting jobs (the dictionaries created by plot.py)
+
+def build_graph(command):
+
+   nodes = {}
+   levels = {}
+
+   def node(key, kind, label, payload):
+      if key not in nodes:
+         nodes[key] = Node(key, kind, label, payload)
+      return nodes[key]
+
+   # pressure levels of each variable, taken from the analysis file if it has the variable (the
+   # plotting scripts find level indices in the analysis file) otherwise from the forecast file
+
+   def var_levels(init_dt, region, name):
+      if (init_dt, region, name) not in levels:
+         levels[(init_dt, region, name)] = (None, [])
+         for fili in controls.cycle_files(init_dt, region):
+            gfsfile = gfs_io.open_file(fili)
+            var_name = _variable_name(gfsfile, name)
+            if var_name is not None:
+               levels[(init_dt, region, name)] = (var_name, gfsfile.levels_hPa(var_name))
+               break
+      return levels[(init_dt, region, name)]
+
+   def load_nodes(init_dt, region, name, level, lev_hPa):
+      var_name, levs_p = var_levels(init_dt, region, name)
+      if var_name is None:
+         return []
+      if level is None:
+         lev_indices = [None]
+      else:
+         lev_indices = _level_indices(level, lev_hPa, levs_p)
+      loads = []
+      for lev_index in lev_indices:
+         if lev_index is None:
+            label = "load %s" % (var_name)
+         else:
+            label = "load %s %shPa" % (var_name, levs_p[lev_index])
+         if region is not None:
+            label = label + " " + region
+         loads.append(node(("load", init_dt, region, var_name, lev_index), "load", label, {"init_dt": init_dt, "region": region, "name": var_name, "lev": lev_index}))
+      return loads
+
+   for job in command:
+      init_dt = job["time"]
+      region = files_region(job)
+      render = node(("render",)+tuple(sorted(job.items())), "render", "render %s %s %s" % (job["var"][:-3], job["lev"], job.get("region", "")), job)
+
+      requires = controls.read_requires(job["var"])
+
+      for entry in requires["fields"]:
+         for level in (entry[1:] or [None]):
+            for load in load_nodes(init_dt, region, entry[0], level, job["lev"]):
+               render.deps.add(load.key)
+
+      for entry in requires["derived"]:
+         kind = entry[0]
+         names, offsets, with_levels = derived.inputs[kind]
+         _, levs_p = var_levels(init_dt, region, names[0])
+         groups = [_level_indices(level, job["lev"], levs_p) for level in entry[1:]]
+         if any(len(group) == 0 or (len(group) > 1 and ":" not in str(level)) for group, level in zip(groups, entry[1:])):
+            continue
+         lev_indices = [idx for group in groups for idx in group]
+         label = "derived %s %s" % (kind, " ".join(levs_p[idx]+"hPa" for idx in lev_indices))
+         if region is not None:
+            label = label + " " + region
+
+         # derived field functions take level indices (a list of them for "low:high" levels), some
+         # also need the pressure levels
+
+         args = [group if ":" in str(level) else group[0] for group, level in zip(groups, entry[1:])]
+         if with_levels:
+            args.append(levs_p)
+
+         # fields in derived.batched are calculated for all the levels requested for the region in
+         # one job, called with the list of level indices
+
+         if kind in derived.batched:
+            der = node(("derived", init_dt, region, kind), "derived", label, {"init_dt": init_dt, "region": region, "kind": kind, "args": [[]]+args[1:]})
+            batch = der.payload["args"][0]
+            if args[0] not in batch:
+               batch.append(args[0])
+               batch.sort()
+            der.label = "derived %s %s" % (kind, " ".join(levs_p[idx]+"hPa" for idx in batch))
+            if region is not None:
+               der.label = der.label + " " + region
+         else:
+            der = node(("derived", init_dt, region, kind)+tuple(lev_indices), "derived", label, {"init_dt": init_dt, "region": region, "kind": kind, "args": args})
+
+         for name in names:
+            if isinstance(offsets, dict):
+               name_offsets = offsets[name]
+            else:
+               name_offsets = offsets
+            for lev_index in lev_indices:
+               for offset in name_offsets:
+                  for load in load_nodes(init_dt, region, name, lev_index+offset, job["lev"]):
+                     der.deps.add(load.key)
+         render.deps.add(der.key)
+
+   # the files are opened again in each pool process, they must not be shared with them
+
+   gfs_io.close_all()
+
+   for key in nodes:
+      for dep in nodes[key].deps:
+         nodes[dep].users.add(key)
+
+   # number of plotting jobs that need each job, directly or through a derived field
+
+   requested = {}
+
+   def requested_by(key):
+      if key not in requested:
+         if nodes[key].kind == "render":
+            requested[key] = set([key])
+         else:
+            requested[key] = set()
+            for user in nodes[key].users:
+               requested[key] = requested[key] | requested_by(user)
+      return requested[key]
+
+   for key in nodes:
+      nodes[key].n_requests = len(requested_by(key))
+
+   return nodes
+
+###################################################################################################
+
+# job times from previous runs, used to estimate the cost of each job
+
+def _cost_name(node):
+
+   if node.kind == "render":
+      return "render %s" % (node.payload["var"][:-3])
+   elif node.kind == "derived":
+      return "derived %s" % (node.payload["kind"])
+   else:
+      return "load"
+
+def _read_times(times_file):
+
+   if times_file is None or not os.path.isfile(times_file):
+      return {}
+
+   try:
+      b = open(times_file)
+      times = json.load(b)
+      b.close()
+   except ValueError:
+      return {}
+
+   return times
+
+def _write_times(nodes, times_file):
+
+   if times_file is None:
+      return
+
+   totals = {}
+   for node in nodes.values():
+      if node.ok:
+         totals.setdefault(_cost_name(node), []).append(node.duration())
+
+   times = _read_times(times_file)
+   for name in totals:
+      times[name] = sum(totals[name])/len(totals[name])
+
+   b = open(times_file, "w")
+   json.dump(times, b, indent=1, sort_keys=True)
+   b.close()
+
+###################################################################################################
+
+# run one job in a pool process, returning its key, start and end times and whether it worked
+
+def _run_node(key, kind, payload, render):
+
+   import traceback
+
+   start = time.time()
+   ok = True
+
+   try:
+      if kind == "load":
+         for fili in controls.cycle_files(payload["init_dt"], payload["region"]):
+            gfsfile = gfs_io.open_file(fili)
+
+            # with the field cache switched off a load would only fill this process's memory
+
+            if payload["name"] in gfsfile.variables and gfsfile.cache_dir is not None:
+               gfsfile.field(payload["name"], payload["lev"])
+      elif kind == "derived":
+         for fili in controls.cycle_files(payload["init_dt"], payload["region"]):
+            gfsfile = gfs_io.open_file(fili)
+            if all(name in gfsfile.variables for name in derived.inputs[payload["kind"]][0]):
+               getattr(derived, payload["kind"])(gfsfile, *payload["args"])
+      else:
+         render(payload)
+   except Exception:
+      print("%s %s failed" % (kind, key))
+      traceback.print_exc()
+      ok = False
+   finally:
+      # working arrays of a load or derived field job are reused by the next job in this process
+      # (render in plot.py hands back those of a plotting job, which runs in a new interpreter in
+      # subprocess mode)
+
+      if kind != "render":
+         gfs_io.release_buffers()
+
+   return (key, start, time.time(), ok)
+
+# run all jobs in the graph on n_processes pool processes, a job is started once every job it
+# depends on has finished (whether or not it worked, plotting jobs read their own data if a load
+# failed). Returns the wall clock time taken.
+
+def run(nodes, n_processes, render, initializer=None, times_file=None):
+
+   times = _read_times(times_file)
+   for node in nodes.values():
+      node.cost = times.get(_cost_name(node), node.cost)
+
+   waiting = dict((key, len(nodes[key].deps)) for key in nodes)
+   ready = []
+   results = queue.Queue()
+   count = [0]
+
+   # data jobs needed by the most plotting jobs go first, then the cheapest jobs
+
+   def push(key):
+      count[0] = count[0] + 1
+      heapq.heappush(ready, (-nodes[key].n_requests, nodes[key].cost, count[0], key))
+
+   for key in nodes:
+      if waiting[key] == 0:
+         push(key)
+
+   pool = Pool(processes=int(n_processes), initializer=initializer)
+
+   start = time.time()
+   running = 0
+   finished = 0
+
+   while finished < len(nodes):
+      while running < int(n_processes) and len(ready) > 0:
+         key = heapq.heappop(ready)[3]
+         nodes[key].start = time.time()
+         pool.apply_async(_run_node, (key, nodes[key].kind, nodes[key].payload, render), callback=results.put, error_callback=functools.partial(_failed, results, key))
+         running = running + 1
+
+      key, job_start, job_end, ok = results.get()
+      running = running - 1
+      finished = finished + 1
+
+      if job_start is not None:
+         nodes[key].start = job_start
+         nodes[key].end = job_end
+      else:
+         nodes[key].end = time.time()
+      nodes[key].ok = ok
+
+      for user in nodes[key].users:
+         waiting[user] = waiting[user] - 1
+         if waiting[user] == 0:
+            push(user)
+
+   pool.close()
+   pool.join()
+
+   wall = time.time() - start
+
+   _write_times(nodes, times_file)
+
+   return wall
+
+def _failed(results, key, error):
+   print("%s failed: %s" % (key, error))
+   results.put((key, None, None, False))
+
+###################################################################################################
+
+# critical path, the chain of dependent jobs with the longest total run time, as a list of nodes
+# from the first job to the last
+
+def critical_path(nodes):
+
+   longest = {}
+
+   def path_time(key):
+      if key not in longest:
+         best = (0.0, None)
+         for dep in nodes[key].deps:
+            if path_time(dep)[0] > best[0]:
+               best = (path_time(dep)[0], dep)
+         longest[key] = (best[0] + nodes[key].duration(), best[1])
+      return longest[key]
+
+   if len(nodes) == 0:
+      return []
+
+   key = max(nodes, key=lambda k: path_time(k)[0])
+   path = []
+   while key is not None:
+      path.insert(0, nodes[key])
+      key = longest[key][1]
+
+   return path
+
+# text report of the run, job counts and times by kind and the critical path
+
+def report(nodes, wall, n_processes):
+
+   lines = []
+   lines.append("jobs run on %s processes in %.1f s" % (n_processes, wall))
+
+   for kind in ["load", "derived", "render"]:
+      kind_nodes = [node for node in nodes.values() if node.kind == kind]
+      if len(kind_nodes) > 0:
+         lines.append("   %-8s %5d jobs %9.1f s (%d failed)" % (kind, len(kind_nodes), sum(node.duration() for node in kind_nodes), len([node for node in kind_nodes if not node.ok])))
+
+   busy = sum(node.duration() for node in nodes.values())
+   if wall > 0.0:
+      lines.append("   pool utilisation %.0f%%" % (100.0*busy/(wall*int(n_processes))))
+
+   path = critical_path(nodes)
+   lines.append("critical path %.1f s (%d jobs):" % (sum(node.duration() for node in path), len(path)))
+   for node in path:
+      lines.append("   %8.1f s  %s" % (node.duration(), node.label))
+
+   return "\n".join(lines)
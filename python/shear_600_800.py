@@ -26,527 +26,389 @@ import sys
 import os
 import datetime
 
+import controls
+import gfs_io
+import geometry
+import derived
+
 GFS_dir = os.environ['SWIFT_GFS']
 
+# fields read by main, used by the plot.py scheduler to load (and derive) them before the
+# plotting job runs. Each entry is a variable followed by its levels, in hPa ("lev" is the level
+# main is called with, "lev+1" the next level index, "low:high" all levels in between) or as
+# integer level indices. Single level fields have no levels.
+
+requires = {"fields": [["UGRD_P0_L100_GLL0", "800", "600"], ["VGRD_P0_L100_GLL0", "800", "600"]],
+            "derived": [["shear", "800", "600"]]}
+
+# names of the images main writes (without .png), used by the plot.py job ledger (see ledger.py)
+# to find the frames already plotted: the analysis image (None if main does not plot the analysis)
+# and the forecast images. {region}, {init}, {valid}, {lev} and {lead} are the region, the
+# initialisation and valid times (YYYYMMDDHH), the level main is called with and the lead time.
+
+images = {"analysis": "GFSanalysis_{region}_{init}_windshear_600hPa_800hPa_SNGL",
+          "forecast": "GFSforecast_{region}_{valid}_windshear_600hPa_800hPa_SNGL_{init}_{lead:03d}"}
+
 ###################################################################################################
 
 # Main script to plot mid level wind shear
 
-# define directory
+def main(init_dt, lev_hPa, latbl, lonbl, lattr, lontr):
 
-diri = (os.getcwd())+"/"
+   # define directory
 
-# forecast times (currently set to plot 0 to 48 hours)
+   diri = (os.getcwd())+"/"
 
-fore = (os.popen("cat %s/controls/namelist | grep 'fore:' | awk -F: '{print $2}' | tr ',' ' '"%(GFS_dir))).read().split()
-fore = [np.int(f) for f in fore]
+   # forecast times (currently set to plot 0 to 48 hours)
 
-# accept initialisation time and dates as an argument
+   fore = controls.forecast_times(GFS_dir)
 
-init_dt = (sys.argv[1])
-lev1 = "800"
-lev2 = "600"
+   # accept initialisation time and dates as an argument
 
-# read in domains and accept lat and lon limits as arguments
+   init_dt = str(init_dt)
+   lev1 = "800"
+   lev2 = "600"
 
-b = open(GFS_dir+"/controls/domains")
-domains_content = b.readlines()
+   # read in domains and accept lat and lon limits as arguments
 
-key_list = []
-latlon_list = []
+   domains_dict = controls.read_domains(GFS_dir+"/controls/domains")
 
-for domain in domains_content:
-   key_list.append(domain.split(":")[0])
-   latlon_str = (domain.split(":")[1]).strip().split(",")
-   latlon_flt = []
-   for ll in latlon_str:
-      latlon_flt.append(float(ll))
-   latlon_list.append(latlon_flt)
-   del(latlon_flt)
+   latbl = float(latbl)
+   lonbl = float(lonbl)
+   lattr = float(lattr)
+   lontr = float(lontr)
 
-domains_dict = dict(zip(key_list,latlon_list))
+   region = "unnamedregion"
 
-latbl = float(sys.argv[3])
-lonbl = float(sys.argv[4])
-lattr = float(sys.argv[5])
-lontr = float(sys.argv[6])
+   for domain in domains_dict.keys():
+      if ((latbl == domains_dict[domain][0] and lattr == domains_dict[domain][2]) or (latbl == domains_dict[domain][2] or lattr == domains_dict[domain][0])) and ((lonbl == domains_dict[domain][1] and lontr == domains_dict[domain][3]) or (lonbl == domains_dict[domain][3] and lontr == domains_dict[domain][1])):
+         region = domain
 
-region = "unnamedregion"
+   # arrange lat and lon values to get bottom left and top right lat lon values
 
-for domain in domains_dict.keys():
-   if ((latbl == domains_dict[domain][0] and lattr == domains_dict[domain][2]) or (latbl == domains_dict[domain][2] or lattr == domains_dict[domain][0])) and ((lonbl == domains_dict[domain][1] and lontr == domains_dict[domain][3]) or (lonbl == domains_dict[domain][3] and lontr == domains_dict[domain][1])):
-      region = domain
+   if latbl == lattr or lonbl == lontr:
+      sys.exit('lat and lon values must be different')
+   else:
+      if latbl < lattr:
+         latbl, lattr = lattr, latbl
+      if lonbl > lontr:
+         lonbl, lontr = lontr, lonbl
 
-# arrange lat and lon values to get bottom left and top right lat lon values
+   # read in analysis files
 
-if latbl == lattr or lonbl == lontr:
-   sys.exit('lat and lon values must be different')
-else:
-   if latbl < lattr:
-      latbl, lattr = lattr, latbl
-   if lonbl > lontr:
-      lonbl, lontr = lontr, lonbl
+   a_fili = "analysis_gfs_4_%s_%s00_000.nc" % (init_dt[:8], init_dt[8:10])
 
-# read in analysis files
+   # read pressure levels from analysis file
 
-a_fili = "analysis_gfs_4_%s_%s00_000.nc" % (init_dt[:8], init_dt[8:10])
+   analysis = gfs_io.open_file(diri+a_fili, region)
 
-# read pressure levels from analysis file
+   level_dim = analysis.variables["UGRD_P0_L100_GLL0"].dimensions[0]
 
-analysis = nio.open_file(diri+a_fili)
+   levs_p1 = analysis.variables[level_dim]
+   levs_p = ['{:.0f}'.format(x) for x in levs_p1[:]/100.0]
+   del levs_p1
 
-level_dim = analysis.variables["UGRD_P0_L100_GLL0"].dimensions[0]
+   # identify level index
 
-levs_p1 = analysis.variables[level_dim]
-levs_p = ['{:.0f}'.format(x) for x in levs_p1[:]/100.0]
-del levs_p1
+   lev1_index = levs_p.index(lev1)
+   lev2_index = levs_p.index(lev2)
 
-# identify level index
+   # read in lat and lon of the region from the region geometry cache (for boxes crossing the
+   # Greenwich Meridian lonbl and lontr are swapped and lon values run from -180 to 180)
 
-lev1_index = levs_p.index(lev1)
-lev2_index = levs_p.index(lev2)
+   geom = geometry.region(analysis, latbl, lonbl, lattr, lontr)
 
-# read in lat
+   lonbl, lontr = geom.lonbl, geom.lontr
+   lat = geom.lat
+   lon = geom.lon
 
-lat1 = analysis.variables["lat_0"]
-lat_temp = lat1[:]
+   # read in winds.
 
-latbl_idx = (np.abs(lat_temp-latbl)).argmin()
-lattr_idx = (np.abs(lat_temp-lattr)).argmin()
+   u1 = geometry.cut(analysis.variables["UGRD_P0_L100_GLL0"], geom, lev1_index)
+   v1 = geometry.cut(analysis.variables["VGRD_P0_L100_GLL0"], geom, lev1_index)
+   u2 = geometry.cut(analysis.variables["UGRD_P0_L100_GLL0"], geom, lev2_index)
+   v2 = geometry.cut(analysis.variables["VGRD_P0_L100_GLL0"], geom, lev2_index)
 
-if latbl_idx == lattr_idx:
-   sys.exit('lat values are not different enough, they must have relate to different grid points')
-elif latbl_idx > 1 and lattr_idx < len(lat_temp)-2:
-   lat_box1 = latbl_idx-2
-   lat_box2 = lattr_idx+2
-   lat = lat_temp[lat_box1:lat_box2]
-else:
-   lat_box1 = latbl_idx
-   lat_box2 = lattr_idx
-   lat = lat_temp[lat_box1:lat_box2]
+   u_diff = u2-u1
+   v_diff = v2-v1
 
-del(latbl_idx)
-del(lattr_idx)
-del(lat1)
-del(lat_temp)
+   # read in magnitude of the shear (derived from the winds).
 
-# read in lon
+   ws_diff = geometry.cut(derived.shear(analysis, lev1_index, lev2_index), geom)
 
-lon1 = analysis.variables["lon_0"]
+   # 2d lat and lon
 
-# check to see if box crosses Greenwich Meridian. If so then the lon values must be modified for plot to work.
+   lat2d = geom.lat2d
+   lon2d = geom.lon2d
 
-if (np.sign(lonbl) + np.sign(lontr)) >= -1 and (np.sign(lonbl) + np.sign(lontr)) <= 1:
+   # analysis plot, only the forecast plots are made when a forecast lead time is streamed
+   # (see controls.analysis_plotted)
 
-   lonbl, lontr = lontr, lonbl
+   if controls.analysis_plotted():
 
-   lon_temp = np.where(lon1[:]>=180.0, lon1[:]-360.0, lon1[:])
+      # open workspace for analysis plot
 
-   lonbl_idx = (np.abs(lon_temp-lonbl)).argmin()
-   lontr_idx = (np.abs(lon_temp-lontr)).argmin()
+      wks_type = "png"
+      wks = ngl.open_wks(wks_type, "GFSanalysis_%s_%s_windshear_%shPa_%shPa_SNGL" % (region, init_dt[0:10], lev2, lev1))
 
-   if lonbl_idx == lontr_idx:
-      sys.exit('lon values are not different enough, they must have relate to different grid points')
-   elif lontr_idx > len(lon_temp)/2 and lonbl_idx <= len(lon_temp)/2:
-      lon_box1 = lonbl_idx+2
-      lon_box2 = lontr_idx-2
-      lon_box3 = len(lon_temp)-1
+      # define resources for analysis plot
 
-      lon_temp1 = lon_temp[0:lon_box1]
-      lon_temp2 = lon_temp[lon_box2:lon_box3]
-   else:
-      lon_box1 = lonbl_idx
-      lon_box2 = lontr_idx
-      lon_box3 = len(lon_temp)-1
+      res = ngl.Resources()
+      res.nglDraw                     = False
+      res.nglFrame                    = False
 
-      lon_temp1 = lon_temp[0:lon_box1]
-      lon_temp2 = lon_temp[lon_box2:lon_box3]
+      cmap = ngl.read_colormap_file("WhiteBlueGreenYellowRed")
 
+      res.cnLinesOn                   = False
+      res.cnLineLabelsOn              = False
+      res.cnFillOn                    = True
+      res.cnFillPalette               = cmap[15:,:]
 
-   lon = np.append(lon_temp2, lon_temp1)
+      res.lbAutoManage          = False
+      res.lbLabelFontHeightF         = 0.005
+      res.lbOrientation              = "horizontal"
+      res.lbLabelAngleF              = 45
+      res.pmLabelBarOrthogonalPosF = -1.
+      res.pmLabelBarParallelPosF = 0.25
+      res.pmLabelBarWidthF      = 0.3
+      res.pmLabelBarHeightF     = 0.1
+      res.lbTitleString         = "%shPa - %shPa shear" % (lev2, lev1)
+      res.lbTitleFontHeightF   = 0.0125
 
-   del(lon_temp1)
-   del(lon_temp2)
-   del(lonbl_idx)
-   del(lontr_idx)
-   del(lon_temp)
+      res.mpFillOn                    = False
+      res.mpGeophysicalLineColor      = "Grey18"
+      res.mpGeophysicalLineThicknessF = 1.5
 
-else:
+      res.sfXArray                    = lon2d
+      res.sfYArray                    = lat2d
 
-   lon_temp = lon1[:]
+      res.mpGridAndLimbOn        = False
+      res.pmTickMarkDisplayMode = "Never"
 
-   lonbl_idx = (np.abs(lon_temp-lonbl)).argmin()
-   lontr_idx = (np.abs(lon_temp-lontr)).argmin()
+      res.cnInfoLabelOn              = False
 
-   if lonbl_idx == lontr_idx:
-      sys.exit('lon values are not different enough, they must have relate to different grid points')
-   elif lonbl_idx > 1 and lontr_idx < len(lon_temp)-2:
-      lon_box1 = lonbl_idx-2
-      lon_box2 = lontr_idx+2
-      lon = lon_temp[lon_box1:lon_box2]
-   else:
-      lon_box1 = lonbl_idx
-      lon_box2 = lontr_idx
-      lon = lon_temp[lon_box1:lon_box2]
-
-# read in winds, checking whether box crosses Greenwich Meridian.
-
-if (np.sign(lonbl) + np.sign(lontr)) >= -1 and (np.sign(lonbl) + np.sign(lontr)) <= 1:
-
-   u11 = analysis.variables["UGRD_P0_L100_GLL0"][lev1_index,:,:]
-   u1_temp1 = u11[lat_box1:lat_box2,0:lon_box1]
-   u1_temp2 = u11[lat_box1:lat_box2,lon_box2:lon_box3]
-   u1 = np.concatenate((u1_temp2,u1_temp1),axis=1)
-   del u11
-   del u1_temp1
-   del u1_temp2
-
-   v11 = analysis.variables["VGRD_P0_L100_GLL0"][lev1_index,:,:]
-   v1_temp1 = v11[lat_box1:lat_box2,0:lon_box1]
-   v1_temp2 = v11[lat_box1:lat_box2,lon_box2:lon_box3]
-   v1 = np.concatenate((v1_temp2,v1_temp1),axis=1)
-   del v11
-   del v1_temp1
-   del v1_temp2
-
-   u21 = analysis.variables["UGRD_P0_L100_GLL0"][lev2_index,:,:]
-   u2_temp1 = u21[lat_box1:lat_box2,0:lon_box1]
-   u2_temp2 = u21[lat_box1:lat_box2,lon_box2:lon_box3]
-   u2 = np.concatenate((u2_temp2,u2_temp1),axis=1)
-   del u21
-   del u2_temp1
-   del u2_temp2
-
-   v21 = analysis.variables["VGRD_P0_L100_GLL0"][lev2_index,:,:]
-   v2_temp1 = v21[lat_box1:lat_box2,0:lon_box1]
-   v2_temp2 = v21[lat_box1:lat_box2,lon_box2:lon_box3]
-   v2 = np.concatenate((v2_temp2,v2_temp1),axis=1)
-   del v21
-   del v2_temp1
-   del v2_temp2
-
-else:
-
-   u11 = analysis.variables["UGRD_P0_L100_GLL0"][lev1_index,:,:]
-   u1 = u11[lat_box1:lat_box2,lon_box1:lon_box2]
-   del u11
-
-   v11 = analysis.variables["VGRD_P0_L100_GLL0"][lev1_index,:,:]
-   v1 = v11[lat_box1:lat_box2,lon_box1:lon_box2]
-   del v11
-
-   u21 = analysis.variables["UGRD_P0_L100_GLL0"][lev2_index,:,:]
-   u2 = u21[lat_box1:lat_box2,lon_box1:lon_box2]
-   del u21
-
-   v21 = analysis.variables["VGRD_P0_L100_GLL0"][lev2_index,:,:]
-   v2 = v21[lat_box1:lat_box2,lon_box1:lon_box2]
-   del v21
-
-u_diff = u2-u1
-v_diff = v2-v1
-
-# calculate windspeed
-
-ws_diff = np.sqrt(u_diff**2.0 + v_diff**2.0)
-
-# create 2d lat and lon
-
-lat2d = np.zeros((len(lat),len(lon)))
-lon2d = np.zeros((len(lat),len(lon)))
-
-for i in range(0, len(lon)):
-   lat2d[:,i] = lat
-
-for i in range(0, len(lat)):
-   lon2d[i,:] = lon
-   
-# open workspace for analysis plot
-
-wks_type = "png"
-wks = ngl.open_wks(wks_type, "GFSanalysis_%s_%s_windshear_%shPa_%shPa_SNGL" % (region, init_dt[0:10], lev2, lev1))
-
-# define resources for analysis plot
-
-res = ngl.Resources()
-res.nglDraw                     = False
-res.nglFrame                    = False
-
-cmap = ngl.read_colormap_file("WhiteBlueGreenYellowRed")
-
-res.cnLinesOn                   = False
-res.cnLineLabelsOn              = False
-res.cnFillOn                    = True
-res.cnFillPalette               = cmap[15:,:]
-
-res.lbAutoManage          = False
-res.lbLabelFontHeightF         = 0.005
-res.lbOrientation              = "horizontal"
-res.lbLabelAngleF              = 45
-res.pmLabelBarOrthogonalPosF = -1.
-res.pmLabelBarParallelPosF = 0.25
-res.pmLabelBarWidthF      = 0.3
-res.pmLabelBarHeightF     = 0.1
-res.lbTitleString         = "%shPa - %shPa shear" % (lev2, lev1)
-res.lbTitleFontHeightF   = 0.0125
-
-res.mpFillOn                    = False
-res.mpGeophysicalLineColor      = "Grey18"
-res.mpGeophysicalLineThicknessF = 1.5
-
-res.sfXArray                    = lon2d
-res.sfYArray                    = lat2d
-
-res.mpGridAndLimbOn        = False
-res.pmTickMarkDisplayMode = "Never"
-
-res.cnInfoLabelOn              = False
-
-res.mpProjection              = "CylindricalEquidistant"
-res.mpLimitMode = "LatLon"    # Limit the map view.
-res.mpMinLonF   = lontr
-res.mpMaxLonF   = lonbl
-res.mpMinLatF   = lattr
-res.mpMaxLatF   = latbl
-res.mpPerimOn   = True
-res.mpOutlineBoundarySets     = "AllBoundaries"
-res.mpNationalLineColor       = "gray40"
-res.mpNationalLineThicknessF  = 1.5
-res.mpGeophysicalLineColor    = "gray40"
-res.mpGeophysicalLineThicknessF = 1.5
-res.cnMonoLineColor           = True
+      res.mpProjection              = "CylindricalEquidistant"
+      res.mpLimitMode = "LatLon"    # Limit the map view.
+      res.mpMinLonF   = lontr
+      res.mpMaxLonF   = lonbl
+      res.mpMinLatF   = lattr
+      res.mpMaxLatF   = latbl
+      res.mpPerimOn   = True
+      res.mpOutlineBoundarySets     = "AllBoundaries"
+      res.mpNationalLineColor       = "gray40"
+      res.mpNationalLineThicknessF  = 1.5
+      res.mpGeophysicalLineColor    = "gray40"
+      res.mpGeophysicalLineThicknessF = 1.5
+      res.cnMonoLineColor           = True
 
-max_cont = 50.0
-min_cont = 0.0
+      max_cont = 50.0
+      min_cont = 0.0
 
-res.cnLevelSelectionMode = "ManualLevels"
-res.cnMinLevelValF       = min_cont
-res.cnMaxLevelValF       = max_cont
-res.cnLevelSpacingF      = 2.
-res.cnLineThicknessF     = 2.5 
+      res.cnLevelSelectionMode = "ManualLevels"
+      res.cnMinLevelValF       = min_cont
+      res.cnMaxLevelValF       = max_cont
+      res.cnLevelSpacingF      = 2.
+      res.cnLineThicknessF     = 2.5 
 
-# create ws plot for analysis data
+      # create ws plot for analysis data
 
-ws_plot = ngl.contour_map(wks,ws_diff,res)
+      ws_plot = ngl.contour_map(wks,ws_diff,res)
 
-# define resources for vectors
+      # define resources for vectors
 
-vcres                         = ngl.Resources()
-vcres.nglDraw                 = False
-vcres.nglFrame                = False
+      vcres                         = ngl.Resources()
+      vcres.nglDraw                 = False
+      vcres.nglFrame                = False
 
-vcres.vfXArray                = lon2d
-vcres.vfYArray                = lat2d
+      vcres.vfXArray                = lon2d
+      vcres.vfYArray                = lat2d
 
-vcres.vcRefMagnitudeF         = 30.0             # define vector ref mag
-vcres.vcRefLengthF            = 0.03             # define length of vec ref
-vcres.vcMinFracLengthF        = 0.3
-vcres.vcMinDistanceF          = 0.02
-vcres.vcRefAnnoOrthogonalPosF = -0.20
-vcres.vcRefAnnoFontHeightF    = 0.005
-vcres.vcLineArrowThicknessF     = 2.0
+      vcres.vcRefMagnitudeF         = 30.0             # define vector ref mag
+      vcres.vcRefLengthF            = 0.03             # define length of vec ref
+      vcres.vcMinFracLengthF        = 0.3
+      vcres.vcMinDistanceF          = 0.02
+      vcres.vcRefAnnoOrthogonalPosF = -0.20
+      vcres.vcRefAnnoFontHeightF    = 0.005
+      vcres.vcLineArrowThicknessF     = 2.0
 
-# create vector plot for analysis data and overlay on colour contours
+      # create vector plot for analysis data and overlay on colour contours
 
-uv_plot  = ngl.vector(wks,u_diff,v_diff,vcres)
+      uv_plot  = ngl.vector(wks,u_diff,v_diff,vcres)
 
-ngl.overlay(ws_plot,uv_plot)
-ngl.maximize_plot(wks, ws_plot)
-ngl.draw(ws_plot)
-ngl.frame(wks)
+      ngl.overlay(ws_plot,uv_plot)
+      ngl.maximize_plot(wks, ws_plot)
+      ngl.draw(ws_plot)
+      ngl.frame(wks)
 
-ngl.destroy(wks)
-del res
-del vcres
+      ngl.destroy(wks)
+      del res
+      del vcres
 
-###################################################################################################
+   ###################################################################################################
 
-# open forecast file
+   # forecast plots, none when only the analysis is plotted
 
-f_fili = "GFS_forecast_%s_%s.nc" % (init_dt[:8], init_dt[8:10])
-forecast = nio.open_file(diri+f_fili)
+   if len(fore) > 0:
 
-# loop through forecast times
+      # open forecast file
 
-for i in range(0, len(fore)):
+      f_fili = "GFS_forecast_%s_%s.nc" % (init_dt[:8], init_dt[8:10])
+      forecast = gfs_io.open_file(diri+f_fili, region)
 
-# create string for valid time
+      # read in and calculate the fields for all forecast times at once, only the plotting is done
+      # for each forecast time
 
-   valid_date = (datetime.datetime(int(init_dt[:4]), int(init_dt[4:6]), int(init_dt[6:8]), int(init_dt[8:10])) + datetime.timedelta(hours=int(fore[i]))).strftime("%Y%m%d%H")
+      steps = slice(0, len(fore))
 
-# read in winds, checking whether box crosses Greenwich Meridian.
+      # read in winds.
 
-   if (np.sign(lonbl) + np.sign(lontr)) >= -1 and (np.sign(lonbl) + np.sign(lontr)) <= 1:
+      u1_steps = geometry.cut(forecast.variables["UGRD_P0_L100_GLL0"], geom, steps, lev1_index)
+      v1_steps = geometry.cut(forecast.variables["VGRD_P0_L100_GLL0"], geom, steps, lev1_index)
+      u2_steps = geometry.cut(forecast.variables["UGRD_P0_L100_GLL0"], geom, steps, lev2_index)
+      v2_steps = geometry.cut(forecast.variables["VGRD_P0_L100_GLL0"], geom, steps, lev2_index)
 
-      u11 = forecast.variables["UGRD_P0_L100_GLL0"][i,lev1_index,:,:]
-      u1_temp1 = u11[lat_box1:lat_box2,0:lon_box1]
-      u1_temp2 = u11[lat_box1:lat_box2,lon_box2:lon_box3]
-      u1 = np.concatenate((u1_temp2,u1_temp1),axis=1)
-      del u11
-      del u1_temp1
-      del u1_temp2
+      u_diff_steps = u2_steps-u1_steps
+      v_diff_steps = v2_steps-v1_steps
 
-      v11 = forecast.variables["VGRD_P0_L100_GLL0"][i,lev1_index,:,:]
-      v1_temp1 = v11[lat_box1:lat_box2,0:lon_box1]
-      v1_temp2 = v11[lat_box1:lat_box2,lon_box2:lon_box3]
-      v1 = np.concatenate((v1_temp2,v1_temp1),axis=1)
-      del v11
-      del v1_temp1
-      del v1_temp2
+      # read in magnitude of the shear (derived from the winds).
 
-      u21 = forecast.variables["UGRD_P0_L100_GLL0"][i,lev2_index,:,:]
-      u2_temp1 = u21[lat_box1:lat_box2,0:lon_box1]
-      u2_temp2 = u21[lat_box1:lat_box2,lon_box2:lon_box3]
-      u2 = np.concatenate((u2_temp2,u2_temp1),axis=1)
-      del u21
-      del u2_temp1
-      del u2_temp2
+      ws_diff_steps = geometry.cut(derived.shear(forecast, lev1_index, lev2_index), geom, steps)
 
-      v21 = forecast.variables["VGRD_P0_L100_GLL0"][i,lev2_index,:,:]
-      v2_temp1 = v21[lat_box1:lat_box2,0:lon_box1]
-      v2_temp2 = v21[lat_box1:lat_box2,lon_box2:lon_box3]
-      v2 = np.concatenate((v2_temp2,v2_temp1),axis=1)
-      del v21
-      del v2_temp1
-      del v2_temp2
+      # loop through forecast times
 
-   else:
+      for i in range(0, len(fore)):
 
-      u11 = forecast.variables["UGRD_P0_L100_GLL0"][i,lev1_index,:,:]
-      u1 = u11[lat_box1:lat_box2,lon_box1:lon_box2]
-      del u11
+         # frames already in the ledger for the same files are not plotted again (see ledger.py)
 
-      v11 = forecast.variables["VGRD_P0_L100_GLL0"][i,lev1_index,:,:]
-      v1 = v11[lat_box1:lat_box2,lon_box1:lon_box2]
-      del v11
+         if not controls.frame_wanted(fore[i]):
+            continue
 
-      u21 = forecast.variables["UGRD_P0_L100_GLL0"][i,lev2_index,:,:]
-      u2 = u21[lat_box1:lat_box2,lon_box1:lon_box2]
-      del u21
+      # create string for valid time
 
-      v21 = forecast.variables["VGRD_P0_L100_GLL0"][i,lev2_index,:,:]
-      v2 = v21[lat_box1:lat_box2,lon_box1:lon_box2]
-      del v21
+         valid_date = (datetime.datetime(int(init_dt[:4]), int(init_dt[4:6]), int(init_dt[6:8]), int(init_dt[8:10])) + datetime.timedelta(hours=int(fore[i]))).strftime("%Y%m%d%H")
 
-   u_diff = u2-u1
-   v_diff = v2-v1
+      # fields for this forecast time
 
-# calculate windspeed
+         u_diff = u_diff_steps[i]
+         v_diff = v_diff_steps[i]
+         ws_diff = ws_diff_steps[i]
 
-   ws_diff = np.sqrt(u_diff**2.0 + v_diff**2.0)
+      # open workspace for forecast plots
 
-# open workspace for forecast plots
+         wks_type = "png"
+         wks = ngl.open_wks(wks_type, "GFSforecast_%s_%s_windshear_%shPa_%shPa_SNGL_%s_%03d" % (region, valid_date, lev2, lev1, init_dt[0:10], fore[i]))
 
-   wks_type = "png"
-   wks = ngl.open_wks(wks_type, "GFSforecast_%s_%s_windshear_%shPa_%shPa_SNGL_%s_%03d" % (region, valid_date, lev2, lev1, init_dt[0:10], fore[i]))
+      # define resources for forecast plots
 
-# define resources for forecast plots
+         res = ngl.Resources()
+         res.nglDraw                     = False
+         res.nglFrame                    = False
 
-   res = ngl.Resources()
-   res.nglDraw                     = False
-   res.nglFrame                    = False
+         cmap = ngl.read_colormap_file("WhiteBlueGreenYellowRed")
 
-   cmap = ngl.read_colormap_file("WhiteBlueGreenYellowRed")
+         res.cnLinesOn                   = False
+         res.cnLineLabelsOn              = False
+         res.cnFillOn                    = True
+         res.cnFillPalette               = cmap[15:,:]
 
-   res.cnLinesOn                   = False
-   res.cnLineLabelsOn              = False
-   res.cnFillOn                    = True
-   res.cnFillPalette               = cmap[15:,:]
+         res.lbAutoManage          = False
+         res.lbLabelFontHeightF         = 0.005
+         res.lbOrientation              = "horizontal"
+         res.lbLabelAngleF              = 45
+         res.pmLabelBarOrthogonalPosF = -1.
+         res.pmLabelBarParallelPosF = 0.25
+         res.pmLabelBarWidthF      = 0.3
+         res.pmLabelBarHeightF     = 0.1
+         res.lbTitleString         = "%shPa - %shPa shear" % (lev2, lev1)
+         res.lbTitleFontHeightF   = 0.0125
 
-   res.lbAutoManage          = False
-   res.lbLabelFontHeightF         = 0.005
-   res.lbOrientation              = "horizontal"
-   res.lbLabelAngleF              = 45
-   res.pmLabelBarOrthogonalPosF = -1.
-   res.pmLabelBarParallelPosF = 0.25
-   res.pmLabelBarWidthF      = 0.3
-   res.pmLabelBarHeightF     = 0.1
-   res.lbTitleString         = "%shPa - %shPa shear" % (lev2, lev1)
-   res.lbTitleFontHeightF   = 0.0125
+         res.mpFillOn                    = False
+         res.mpGeophysicalLineColor      = "Grey18"
+         res.mpGeophysicalLineThicknessF = 1.5
 
-   res.mpFillOn                    = False
-   res.mpGeophysicalLineColor      = "Grey18"
-   res.mpGeophysicalLineThicknessF = 1.5
+         res.sfXArray                    = lon2d
+         res.sfYArray                    = lat2d
 
-   res.sfXArray                    = lon2d
-   res.sfYArray                    = lat2d
+         res.mpGridAndLimbOn        = False
+         res.pmTickMarkDisplayMode = "Never"
 
-   res.mpGridAndLimbOn        = False
-   res.pmTickMarkDisplayMode = "Never"
+         res.cnInfoLabelOn              = False
 
-   res.cnInfoLabelOn              = False
+         res.mpProjection              = "CylindricalEquidistant"
+         res.mpLimitMode = "LatLon"    # Limit the map view.
+         res.mpMinLonF   = lontr
+         res.mpMaxLonF   = lonbl
+         res.mpMinLatF   = lattr
+         res.mpMaxLatF   = latbl
+         res.mpPerimOn   = True
+         res.mpOutlineBoundarySets     = "AllBoundaries"
+         res.mpNationalLineColor       = "gray40"
+         res.mpNationalLineThicknessF  = 1.5
+         res.mpGeophysicalLineColor    = "gray40"
+         res.mpGeophysicalLineThicknessF = 1.5
+         res.cnMonoLineColor           = True
 
-   res.mpProjection              = "CylindricalEquidistant"
-   res.mpLimitMode = "LatLon"    # Limit the map view.
-   res.mpMinLonF   = lontr
-   res.mpMaxLonF   = lonbl
-   res.mpMinLatF   = lattr
-   res.mpMaxLatF   = latbl
-   res.mpPerimOn   = True
-   res.mpOutlineBoundarySets     = "AllBoundaries"
-   res.mpNationalLineColor       = "gray40"
-   res.mpNationalLineThicknessF  = 1.5
-   res.mpGeophysicalLineColor    = "gray40"
-   res.mpGeophysicalLineThicknessF = 1.5
-   res.cnMonoLineColor           = True
+         max_cont = 50.0
+         min_cont = 0.0
 
-   max_cont = 50.0
-   min_cont = 0.0
+         res.cnLevelSelectionMode = "ManualLevels"
+         res.cnMinLevelValF       = min_cont
+         res.cnMaxLevelValF       = max_cont
+         res.cnLevelSpacingF      = 2.
+         res.cnLineThicknessF     = 2.5
 
-   res.cnLevelSelectionMode = "ManualLevels"
-   res.cnMinLevelValF       = min_cont
-   res.cnMaxLevelValF       = max_cont
-   res.cnLevelSpacingF      = 2.
-   res.cnLineThicknessF     = 2.5
+      # create ws plot for analysis data
 
-# create ws plot for analysis data
+         ws_plot = ngl.contour_map(wks,ws_diff,res)
 
-   ws_plot = ngl.contour_map(wks,ws_diff,res)
+      # define resources for vectors
 
-# define resources for vectors
+         vcres                         = ngl.Resources()
+         vcres.nglDraw                 = False
+         vcres.nglFrame                = False
 
-   vcres                         = ngl.Resources()
-   vcres.nglDraw                 = False
-   vcres.nglFrame                = False
+         vcres.vfXArray                = lon2d
+         vcres.vfYArray                = lat2d
 
-   vcres.vfXArray                = lon2d
-   vcres.vfYArray                = lat2d
+         #vcres.vcFillArrowsOn          = True
+         vcres.vcRefMagnitudeF         = 30.0             # define vector ref mag
+         vcres.vcRefLengthF            = 0.03             # define length of vec ref
+         vcres.vcMinFracLengthF        = 0.3
+         vcres.vcMinDistanceF          = 0.02
+         vcres.vcRefAnnoOrthogonalPosF = -0.20
+         vcres.vcRefAnnoFontHeightF    = 0.005
+         vcres.vcLineArrowThicknessF     = 2.0
 
-   #vcres.vcFillArrowsOn          = True
-   vcres.vcRefMagnitudeF         = 30.0             # define vector ref mag
-   vcres.vcRefLengthF            = 0.03             # define length of vec ref
-   vcres.vcMinFracLengthF        = 0.3
-   vcres.vcMinDistanceF          = 0.02
-   vcres.vcRefAnnoOrthogonalPosF = -0.20
-   vcres.vcRefAnnoFontHeightF    = 0.005
-   vcres.vcLineArrowThicknessF     = 2.0
+      # create vector plot for analysis data and overlay on colour contours
 
-# create vector plot for analysis data and overlay on colour contours
+         uv_plot  = ngl.vector(wks,u_diff,v_diff,vcres)
 
-   uv_plot  = ngl.vector(wks,u_diff,v_diff,vcres)
+         ngl.overlay(ws_plot,uv_plot)
+         ngl.maximize_plot(wks, ws_plot)
+         ngl.draw(ws_plot)
+         ngl.frame(wks)
 
-   ngl.overlay(ws_plot,uv_plot)
-   ngl.maximize_plot(wks, ws_plot)
-   ngl.draw(ws_plot)
-   ngl.frame(wks)
+         ngl.destroy(wks)
+         del res
+         del vcres
 
-   ngl.destroy(wks)
-   del res
-   del vcres
+   os.system('mogrify -trim *_'+region+'_'+init_dt[0:10]+'_windshear_'+lev2+'hPa_'+lev1+'hPa_SNGL.png')
+   #if region == "WA" or region == "unknownWA":
+   #   os.system('mogrify -resize 886x600 *_'+region+'_'+init_dt[0:10]+'_windshear_'+lev2+'hPa_'+lev1+'hPa_SNGL.png')
+   #elif region == "EA" or region == "unknownEA":
+   #   os.system('mogrify -resize 600x733 *_'+region+'_'+init_dt[0:10]+'_windshear_'+lev2+'hPa_'+lev1+'hPa_SNGL.png')
 
-os.system('mogrify -trim *_'+region+'_'+init_dt[0:10]+'_windshear_'+lev2+'hPa_'+lev1+'hPa_SNGL.png')
-#if region == "WA" or region == "unknownWA":
-#   os.system('mogrify -resize 886x600 *_'+region+'_'+init_dt[0:10]+'_windshear_'+lev2+'hPa_'+lev1+'hPa_SNGL.png')
-#elif region == "EA" or region == "unknownEA":
-#   os.system('mogrify -resize 600x733 *_'+region+'_'+init_dt[0:10]+'_windshear_'+lev2+'hPa_'+lev1+'hPa_SNGL.png')
+   os.system('mv *_'+region+'_'+init_dt[0:10]+'_windshear_'+lev2+'hPa_'+lev1+'hPa_SNGL.png %s/MARTIN/GFS/'%(GFS_dir)+region+'/'+init_dt[0:10]+'/shear_600_800')
+
+   os.system('mogrify -trim *'+region+'_*windshear_'+lev2+'hPa_'+lev1+'hPa_SNGL_'+init_dt[0:10]+'*.png')
+   #if region == "WA" or region == "unknownWA":
+   #   os.system('mogrify -resize 886x600 *'+region+'_*windshear_'+lev2+'hPa_'+lev1+'hPa_SNGL_'+init_dt[0:10]+'*.png')
+   #elif region == "EA" or region == "unknownEA":
+   #   os.system('mogrify -resize 600x733 *'+region+'_*windshear_'+lev2+'hPa_'+lev1+'hPa_SNGL_'+init_dt[0:10]+'*.png')
+
+   os.system('mv *'+region+'_*windshear_'+lev2+'hPa_'+lev1+'hPa_SNGL_'+init_dt[0:10]+'*.png %s/MARTIN/GFS/'%(GFS_dir)+region+'/'+init_dt[0:10]+'/shear_600_800')
 
-os.system('mv *_'+region+'_'+init_dt[0:10]+'_windshear_'+lev2+'hPa_'+lev1+'hPa_SNGL.png %s/MARTIN/GFS/'%(GFS_dir)+region+'/'+init_dt[0:10]+'/shear_600_800')
-
-os.system('mogrify -trim *'+region+'_*windshear_'+lev2+'hPa_'+lev1+'hPa_SNGL_'+init_dt[0:10]+'*.png')
-#if region == "WA" or region == "unknownWA":
-#   os.system('mogrify -resize 886x600 *'+region+'_*windshear_'+lev2+'hPa_'+lev1+'hPa_SNGL_'+init_dt[0:10]+'*.png')
-#elif region == "EA" or region == "unknownEA":
-#   os.system('mogrify -resize 600x733 *'+region+'_*windshear_'+lev2+'hPa_'+lev1+'hPa_SNGL_'+init_dt[0:10]+'*.png')
-
-os.system('mv *'+region+'_*windshear_'+lev2+'hPa_'+lev1+'hPa_SNGL_'+init_dt[0:10]+'*.png %s/MARTIN/GFS/'%(GFS_dir)+region+'/'+init_dt[0:10]+'/shear_600_800')
+###################################################################################################
 
+if __name__ == "__main__":
+   main(*sys.argv[1:7])
@@ -26,576 +26,432 @@ import sys
 import os
 import datetime
 
-###################################################################################################
-
-# Main script to plot winds
-
-# define directory
-
-diri = (os.getcwd())+"/"
-
-# forecast times (currently set to plot 0 to 48 hours)
-
-fore = np.arange(3,73,3)
-
-# accept initialisation time and level as arguments
-
-init_dt = (sys.argv[1])
-lev1_hPa = "925"
-lev2_hPa = "700"
-
-# read in domains and accept lat and lon limits as arguments
-
-b = open(diri+"/domains")
-domains_content = b.readlines()
-
-key_list = []
-latlon_list = []
-
-for domain in domains_content:
-   key_list.append(domain.split(":")[0])
-   latlon_str = (domain.split(":")[1]).strip().split(",")
-   latlon_flt = []
-   for ll in latlon_str:
-      latlon_flt.append(float(ll))
-   latlon_list.append(latlon_flt)
-   del(latlon_flt)
-
-domains_dict = dict(zip(key_list,latlon_list))
-
-latbl = float(sys.argv[3])
-lonbl = float(sys.argv[4])
-lattr = float(sys.argv[5])
-lontr = float(sys.argv[6])
-
-region = "unnamedregion"
-
-for domain in domains_dict.keys():
-   if ((latbl == domains_dict[domain][0] and lattr == domains_dict[domain][2]) or (latbl == domains_dict[domain][2] or lattr == domains_dict[domain][0])) and ((lonbl == domains_dict[domain][1] and lontr == domains_dict[domain][3]) or (lonbl == domains_dict[domain][3] and lontr == domains_dict[domain][1])):
-      region = domain
-
-# arrange lat and lon values to get bottom left and top right lat lon values
-
-if latbl == lattr or lonbl == lontr:
-   sys.exit('lat and lon values must be different')
-else:
-   if latbl < lattr:
-      latbl, lattr = lattr, latbl
-   if lonbl > lontr:
-      lonbl, lontr = lontr, lonbl
+import controls
+import gfs_io
+import geometry
 
-# read in analysis files
+# fields read by main, used by the plot.py scheduler to load (and derive) them before the
+# plotting job runs. Each entry is a variable followed by its levels, in hPa ("lev" is the level
+# main is called with, "lev+1" the next level index, "low:high" all levels in between) or as
+# integer level indices. Single level fields have no levels.
 
-a_fili = "analysis_gfs_4_%s_%s00_000.nc" % (init_dt[:8], init_dt[8:10])
+requires = {"fields": [["UGRD_P0_L100_GLL0", "lev", "925", "700"],
+                       ["VGRD_P0_L100_GLL0", "lev", "925", "700"]],
+            "derived": []}
 
-# read pressure levels from analysis file
+# names of the images main writes (without .png), used by the plot.py job ledger (see ledger.py)
+# to find the frames already plotted: the analysis image (None if main does not plot the analysis)
+# and the forecast images. {region}, {init}, {valid}, {lev} and {lead} are the region, the
+# initialisation and valid times (YYYYMMDDHH), the level main is called with and the lead time.
 
-analysis = nio.open_file(diri+a_fili)
+images = {"analysis": "GFSanalysis_{region}_{init}_shear_925hPa_700hPa",
+          "forecast": "GFSforecast_{region}_{init}_shear_925hPa_700hPa_{init}_{lead:03d}"}
 
-#####float UGRD_P0_L100_GLL0(lv_ISBL5, lat_0, lon_0) 
-
-levs_p1 = analysis.variables["lv_ISBL5"]
-levs_p = ['{:.0f}'.format(x) for x in levs_p1[:]/100.0]
-del levs_p1
-
-# identify level index
+###################################################################################################
 
-lev_index1 = levs_p.index(lev1_hPa)
-lev_index2 = levs_p.index(lev2_hPa)
+# Main script to plot winds
 
-# read in lat
+def main(init_dt, lev_hPa, latbl, lonbl, lattr, lontr):
 
-lat1 = analysis.variables["lat_0"]
-lat_temp = lat1[:]
+   # define directory
 
-latbl_idx = (np.abs(lat_temp-latbl)).argmin()
-lattr_idx = (np.abs(lat_temp-lattr)).argmin()
+   diri = (os.getcwd())+"/"
 
-if latbl_idx == lattr_idx:
-   sys.exit('lat values are not different enough, they must have relate to different grid points')
-elif latbl_idx > 1 and lattr_idx < len(lat_temp)-2:
-   lat_box1 = latbl_idx-2
-   lat_box2 = lattr_idx+2
-   lat = lat_temp[lat_box1:lat_box2]
-else:
-   lat_box1 = latbl_idx
-   lat_box2 = lattr_idx
-   lat = lat_temp[lat_box1:lat_box2]
+   # forecast times (currently set to plot 0 to 48 hours)
 
-del(latbl_idx)
-del(lattr_idx)
-del(lat1)
-del(lat_temp)
+   fore = controls.streamed_times(np.arange(3,73,3))
 
-# read in lon 
+   # accept initialisation time and level as arguments
 
-lon1 = analysis.variables["lon_0"]
+   init_dt = str(init_dt)
+   lev1_hPa = "925"
+   lev2_hPa = "700"
 
-# check to see if box crosses Greenwich Meridian. If so then the lon values must be modified for plot to work.
+   # read in domains and accept lat and lon limits as arguments
 
-if (np.sign(lonbl) + np.sign(lontr)) >= -1 and (np.sign(lonbl) + np.sign(lontr)) <= 1:
+   domains_dict = controls.read_domains(diri+"/domains")
 
-   lonbl, lontr = lontr, lonbl
+   latbl = float(latbl)
+   lonbl = float(lonbl)
+   lattr = float(lattr)
+   lontr = float(lontr)
 
-   lon_temp = np.where(lon1[:]>=180.0, lon1[:]-360.0, lon1[:])
+   region = "unnamedregion"
 
-   lonbl_idx = (np.abs(lon_temp-lonbl)).argmin()
-   lontr_idx = (np.abs(lon_temp-lontr)).argmin()
+   for domain in domains_dict.keys():
+      if ((latbl == domains_dict[domain][0] and lattr == domains_dict[domain][2]) or (latbl == domains_dict[domain][2] or lattr == domains_dict[domain][0])) and ((lonbl == domains_dict[domain][1] and lontr == domains_dict[domain][3]) or (lonbl == domains_dict[domain][3] and lontr == domains_dict[domain][1])):
+         region = domain
 
-   if lonbl_idx == lontr_idx:
-      sys.exit('lon values are not different enough, they must have relate to different grid points')
-   elif lontr_idx > len(lon_temp)/2 and lonbl_idx <= len(lon_temp)/2:
-      lon_box1 = lonbl_idx+2
-      lon_box2 = lontr_idx-2
-      lon_box3 = len(lon_temp)-1
+   # arrange lat and lon values to get bottom left and top right lat lon values
 
-      lon_temp1 = lon_temp[0:lon_box1]
-      lon_temp2 = lon_temp[lon_box2:lon_box3]
+   if latbl == lattr or lonbl == lontr:
+      sys.exit('lat and lon values must be different')
    else:
-      lon_box1 = lonbl_idx
-      lon_box2 = lontr_idx
-      lon_box3 = len(lon_temp)-1
+      if latbl < lattr:
+         latbl, lattr = lattr, latbl
+      if lonbl > lontr:
+         lonbl, lontr = lontr, lonbl
 
-      lon_temp1 = lon_temp[0:lon_box1]
-      lon_temp2 = lon_temp[lon_box2:lon_box3]
+   # read in analysis files
 
+   a_fili = "analysis_gfs_4_%s_%s00_000.nc" % (init_dt[:8], init_dt[8:10])
 
-   lon = np.append(lon_temp2, lon_temp1)
+   # read pressure levels from analysis file
 
-   del(lon_temp1)
-   del(lon_temp2)
-   del(lonbl_idx)
-   del(lontr_idx)
-   del(lon_temp)
+   analysis = gfs_io.open_file(diri+a_fili, region)
 
-else:
+   levs_p = analysis.levels_hPa("UGRD_P0_L100_GLL0")
 
-   lon_temp = lon1[:]
+   # identify level index
 
-   lonbl_idx = (np.abs(lon_temp-lonbl)).argmin()
-   lontr_idx = (np.abs(lon_temp-lontr)).argmin()
+   lev_index1 = levs_p.index(lev1_hPa)
+   lev_index2 = levs_p.index(lev2_hPa)
 
-   if lonbl_idx == lontr_idx:
-      sys.exit('lon values are not different enough, they must have relate to different grid points')
-   elif lonbl_idx > 1 and lontr_idx < len(lon_temp)-2:
-      lon_box1 = lonbl_idx-2
-      lon_box2 = lontr_idx+2
-      lon = lon_temp[lon_box1:lon_box2]
-   else:
-      lon_box1 = lonbl_idx
-      lon_box2 = lontr_idx
-      lon = lon_temp[lon_box1:lon_box2]
-
-# read in winds, checking whether box crosses Greenwich Meridian.
-
-if (np.sign(lonbl) + np.sign(lontr)) >= -1 and (np.sign(lonbl) + np.sign(lontr)) <= 1:
-
-   u1_1 = analysis.variables["UGRD_P0_L100_GLL0"][lev_index1,:,:]
-   u_1_temp1 = u1_1[lat_box1:lat_box2,0:lon_box1]
-   u_1_temp2 = u1_1[lat_box1:lat_box2,lon_box2:lon_box3]
-   u_1 = np.concatenate((u_1_temp2,u_1_temp1),axis=1)
-   del u1_1
-   del u_1_temp1
-   del u_1_temp2
+   # read in lat and lon of the region from the region geometry cache (for boxes crossing the
+   # Greenwich Meridian lonbl and lontr are swapped and lon values run from -180 to 180)
 
-   v1_1 = analysis.variables["VGRD_P0_L100_GLL0"][lev_index1,:,:]
-   v_1_temp1 = v1_1[lat_box1:lat_box2,0:lon_box1]
-   v_1_temp2 = v1_1[lat_box1:lat_box2,lon_box2:lon_box3]
-   v_1 = np.concatenate((v_1_temp2,v_1_temp1),axis=1)
-   del v1_1
-   del v_1_temp1
-   del v_1_temp2
-
-   u1_2 = analysis.variables["UGRD_P0_L100_GLL0"][lev_index2,:,:]
-   u_2_temp1 = u1_2[lat_box1:lat_box2,0:lon_box1]
-   u_2_temp2 = u1_2[lat_box1:lat_box2,lon_box2:lon_box3]
-   u_2 = np.concatenate((u_2_temp2,u_2_temp1),axis=1)
-   del u1_2
-   del u_2_temp1
-   del u_2_temp2
-
-   v1_2 = analysis.variables["VGRD_P0_L100_GLL0"][lev_index2,:,:]
-   v_2_temp1 = v1_2[lat_box1:lat_box2,0:lon_box1]
-   v_2_temp2 = v1_2[lat_box1:lat_box2,lon_box2:lon_box3]
-   v_2 = np.concatenate((v_2_temp2,v_2_temp1),axis=1)
-   del v1_2
-   del v_2_temp1
-   del v_2_temp2
-
-else:
-
-   u1_1 = analysis.variables["UGRD_P0_L100_GLL0"][lev_index1,:,:]
-   u_1 = u1_1[lat_box1:lat_box2,lon_box1:lon_box2]
-   del u1_1
-
-   v1_1 = analysis.variables["VGRD_P0_L100_GLL0"][lev_index1,:,:]
-   v_1 = v1_1[lat_box1:lat_box2,lon_box1:lon_box2]
-   del v1_1
+   geom = geometry.region(analysis, latbl, lonbl, lattr, lontr)
 
-   u1_2 = analysis.variables["UGRD_P0_L100_GLL0"][lev_index2,:,:]
-   u_2 = u1_2[lat_box1:lat_box2,lon_box1:lon_box2]
-   del u1_2
-
-   v1_2 = analysis.variables["VGRD_P0_L100_GLL0"][lev_index2,:,:]
-   v_2 = v1_2[lat_box1:lat_box2,lon_box1:lon_box2]
-   del v1_2
-
-# calculate windspeed
-
-#ws = np.sqrt(u**2.0 + v**2.0)
+   lonbl, lontr = geom.lonbl, geom.lontr
+   lat = geom.lat
+   lon = geom.lon
 
-shear = np.sqrt((u_2-u_1)**2.0 + (v_2-v_1)**2.0)
+   # read in winds.
 
-# create 2d lat and lon
+   u_1 = geometry.cut(analysis.variables["UGRD_P0_L100_GLL0"], geom, lev_index1)
+   v_1 = geometry.cut(analysis.variables["VGRD_P0_L100_GLL0"], geom, lev_index1)
+   u_2 = geometry.cut(analysis.variables["UGRD_P0_L100_GLL0"], geom, lev_index2)
+   v_2 = geometry.cut(analysis.variables["VGRD_P0_L100_GLL0"], geom, lev_index2)
 
-lat2d = np.zeros((len(lat),len(lon)))
-lon2d = np.zeros((len(lat),len(lon)))
+   # calculate windspeed
 
-for i in range(0, len(lon)):
-   lat2d[:,i] = lat
+   #ws = np.sqrt(u**2.0 + v**2.0)
 
-for i in range(0, len(lat)):
-   lon2d[i,:] = lon
-   
-# open workspace for analysis plot
+   shear = np.sqrt((u_2-u_1)**2.0 + (v_2-v_1)**2.0)
 
-wks_type = "png"
-wks = ngl.open_wks(wks_type, "GFSanalysis_%s_%s_shear_%shPa_%shPa" % (region, init_dt[0:10], lev1_hPa, lev2_hPa))
+   # 2d lat and lon
 
-# define resources for analysis plot
+   lat2d = geom.lat2d
+   lon2d = geom.lon2d
 
-res = ngl.Resources()
-res.nglDraw                     = False
-res.nglFrame                    = False
+   # analysis plot, only the forecast plots are made when a forecast lead time is streamed
+   # (see controls.analysis_plotted)
 
-cmap = ngl.read_colormap_file("WhiteBlueGreenYellowRed")
+   if controls.analysis_plotted():
 
-res.cnLinesOn                   = False
-res.cnLineLabelsOn              = False
-res.cnFillOn                    = True
-res.cnFillPalette               = cmap[15:,:]
+      # open workspace for analysis plot
 
-res.lbAutoManage          = False
-res.lbLabelFontHeightF         = 0.005
-res.lbOrientation              = "horizontal"
-res.lbLabelAngleF              = 45
-res.pmLabelBarOrthogonalPosF = -1.
-res.pmLabelBarParallelPosF = 0.25
-res.pmLabelBarWidthF      = 0.3
-res.pmLabelBarHeightF     = 0.1
-res.lbTitleString         = "%shPa to %shPa shear (m/s)" % (lev1_hPa, lev2_hPa)
-res.lbTitleFontHeightF   = 0.0125
+      wks_type = "png"
+      wks = ngl.open_wks(wks_type, "GFSanalysis_%s_%s_shear_%shPa_%shPa" % (region, init_dt[0:10], lev1_hPa, lev2_hPa))
 
-res.mpFillOn                    = False
-res.mpGeophysicalLineColor      = "Grey18"
-res.mpGeophysicalLineThicknessF = 1.5
+      # define resources for analysis plot
 
-res.sfXArray                    = lon2d
-res.sfYArray                    = lat2d
+      res = ngl.Resources()
+      res.nglDraw                     = False
+      res.nglFrame                    = False
 
-res.mpGridAndLimbOn        = False
-res.pmTickMarkDisplayMode = "Never"
+      cmap = ngl.read_colormap_file("WhiteBlueGreenYellowRed")
 
-res.cnInfoLabelOn              = False
+      res.cnLinesOn                   = False
+      res.cnLineLabelsOn              = False
+      res.cnFillOn                    = True
+      res.cnFillPalette               = cmap[15:,:]
 
-res.mpProjection              = "CylindricalEquidistant"
-res.mpLimitMode = "LatLon"    # Limit the map view.
-res.mpMinLonF   = lontr
-res.mpMaxLonF   = lonbl
-res.mpMinLatF   = lattr
-res.mpMaxLatF   = latbl
-res.mpPerimOn   = True
-res.mpOutlineBoundarySets     = "AllBoundaries"
-res.mpNationalLineColor       = "gray40"
-res.mpNationalLineThicknessF  = 1.5
-res.mpGeophysicalLineColor    = "gray40"
-res.mpGeophysicalLineThicknessF = 1.5
-res.cnMonoLineColor           = True
+      res.lbAutoManage          = False
+      res.lbLabelFontHeightF         = 0.005
+      res.lbOrientation              = "horizontal"
+      res.lbLabelAngleF              = 45
+      res.pmLabelBarOrthogonalPosF = -1.
+      res.pmLabelBarParallelPosF = 0.25
+      res.pmLabelBarWidthF      = 0.3
+      res.pmLabelBarHeightF     = 0.1
+      res.lbTitleString         = "%shPa to %shPa shear (m/s)" % (lev1_hPa, lev2_hPa)
+      res.lbTitleFontHeightF   = 0.0125
 
-#max_cont = 50.0
-#min_cont = 0.0
+      res.mpFillOn                    = False
+      res.mpGeophysicalLineColor      = "Grey18"
+      res.mpGeophysicalLineThicknessF = 1.5
 
-res.cnLevelSelectionMode = "ExplicitLevels"
-res.cnLevels = [10.0, 12.0, 14.0, 16.0, 18.0, 20.0, 22.0, 24.0, 26.0, 28.0, 30.0, 32.0, 34.0, 36.0, 38.0, 40.0]
-res.cnFillColors = [-1, 15, 30, 45, 60, 75, 90, 105, 120, 135, 150, 165, 180, 195, 210, 225,237 ]
+      res.sfXArray                    = lon2d
+      res.sfYArray                    = lat2d
 
-# create shear plot for analysis data
+      res.mpGridAndLimbOn        = False
+      res.pmTickMarkDisplayMode = "Never"
 
-shear_plot = ngl.contour_map(wks,shear,res)
+      res.cnInfoLabelOn              = False
 
-# define resources for vectors
+      res.mpProjection              = "CylindricalEquidistant"
+      res.mpLimitMode = "LatLon"    # Limit the map view.
+      res.mpMinLonF   = lontr
+      res.mpMaxLonF   = lonbl
+      res.mpMinLatF   = lattr
+      res.mpMaxLatF   = latbl
+      res.mpPerimOn   = True
+      res.mpOutlineBoundarySets     = "AllBoundaries"
+      res.mpNationalLineColor       = "gray40"
+      res.mpNationalLineThicknessF  = 1.5
+      res.mpGeophysicalLineColor    = "gray40"
+      res.mpGeophysicalLineThicknessF = 1.5
+      res.cnMonoLineColor           = True
 
-vcres                         = ngl.Resources()
-vcres.nglDraw                 = False
-vcres.nglFrame                = False
+      #max_cont = 50.0
+      #min_cont = 0.0
 
-vcres.vfXArray                = lon2d
-vcres.vfYArray                = lat2d
+      res.cnLevelSelectionMode = "ExplicitLevels"
+      res.cnLevels = [10.0, 12.0, 14.0, 16.0, 18.0, 20.0, 22.0, 24.0, 26.0, 28.0, 30.0, 32.0, 34.0, 36.0, 38.0, 40.0]
+      res.cnFillColors = [-1, 15, 30, 45, 60, 75, 90, 105, 120, 135, 150, 165, 180, 195, 210, 225,237 ]
 
-vcres.vcRefMagnitudeF         = 30.0             # define vector ref mag
-vcres.vcRefLengthF            = 0.03             # define length of vec ref
-vcres.vcMinFracLengthF        = 0.3
-vcres.vcMinDistanceF          = 0.02
-vcres.vcRefAnnoOrthogonalPosF = -0.20
-vcres.vcRefAnnoFontHeightF    = 0.005
-vcres.vcLineArrowThicknessF     = 2.0
+      # create shear plot for analysis data
 
-# create vector plot for analysis data and overlay on colour contours level 1
+      shear_plot = ngl.contour_map(wks,shear,res)
 
-uv_plot1  = ngl.vector(wks,u_1,v_1,vcres)
+      # define resources for vectors
 
-# create vector plot for analysis data and overlay on colour contours level2
+      vcres                         = ngl.Resources()
+      vcres.nglDraw                 = False
+      vcres.nglFrame                = False
 
-vcres.vcLineArrowColor = "Red"
+      vcres.vfXArray                = lon2d
+      vcres.vfYArray                = lat2d
 
-uv_plot2 = ngl.vector(wks,u_2,v_2,vcres)
+      vcres.vcRefMagnitudeF         = 30.0             # define vector ref mag
+      vcres.vcRefLengthF            = 0.03             # define length of vec ref
+      vcres.vcMinFracLengthF        = 0.3
+      vcres.vcMinDistanceF          = 0.02
+      vcres.vcRefAnnoOrthogonalPosF = -0.20
+      vcres.vcRefAnnoFontHeightF    = 0.005
+      vcres.vcLineArrowThicknessF     = 2.0
 
-ngl.overlay(shear_plot,uv_plot1)
-ngl.overlay(shear_plot,uv_plot2)
-ngl.maximize_plot(wks, shear_plot)
-ngl.draw(shear_plot)
-ngl.frame(wks)
+      # create vector plot for analysis data and overlay on colour contours level 1
 
-ngl.destroy(wks)
-del res
-del vcres
+      uv_plot1  = ngl.vector(wks,u_1,v_1,vcres)
 
+      # create vector plot for analysis data and overlay on colour contours level2
 
-###################################################################################################
+      vcres.vcLineArrowColor = "Red"
 
-# open forecast file
+      uv_plot2 = ngl.vector(wks,u_2,v_2,vcres)
 
-f_fili = "GFS_48h_forecast_%s_%s.nc" % (init_dt[:8], init_dt[8:10])
-forecast = nio.open_file(diri+f_fili)
+      ngl.overlay(shear_plot,uv_plot1)
+      ngl.overlay(shear_plot,uv_plot2)
+      ngl.maximize_plot(wks, shear_plot)
+      ngl.draw(shear_plot)
+      ngl.frame(wks)
 
-# loop through forecast times
+      ngl.destroy(wks)
+      del res
+      del vcres
 
-for i in range(0, len(fore)):
 
-# create string for valid time
+   ###################################################################################################
 
-   valid_date = (datetime.datetime(int(init_dt[:4]), int(init_dt[4:6]), int(init_dt[6:8]), int(init_dt[8:10])) + datetime.timedelta(hours=int(fore[i]))).strftime("%Y%m%d%H")
+   # forecast plots, none when only the analysis is plotted
 
-# read in winds, checking whether box crosses Greenwich Meridian.
+   if len(fore) > 0:
 
-   if (np.sign(lonbl) + np.sign(lontr)) >= -1 and (np.sign(lonbl) + np.sign(lontr)) <= 1:
+      # open forecast file
 
-      u1_1 = forecast.variables["UGRD_P0_L100_GLL0"][i,lev_index1,:,:]
-      u_1_temp1 = u1_1[lat_box1:lat_box2,0:lon_box1]
-      u_1_temp2 = u1_1[lat_box1:lat_box2,lon_box2:lon_box3]
-      u_1 = np.concatenate((u_1_temp2,u_1_temp1),axis=1)
-      del u1_1
-      del u_1_temp1
-      del u_1_temp2
+      f_fili = "GFS_48h_forecast_%s_%s.nc" % (init_dt[:8], init_dt[8:10])
+      forecast = gfs_io.open_file(diri+f_fili, region)
 
-      v1_1 = forecast.variables["VGRD_P0_L100_GLL0"][i,lev_index1,:,:]
-      v_1_temp1 = v1_1[lat_box1:lat_box2,0:lon_box1]
-      v_1_temp2 = v1_1[lat_box1:lat_box2,lon_box2:lon_box3]
-      v_1 = np.concatenate((v_1_temp2,v_1_temp1),axis=1)
-      del v1_1
-      del v_1_temp1
-      del v_1_temp2
+      # read in and calculate the fields for all forecast times at once, only the plotting is done
+      # for each forecast time
 
-      u1_2 = forecast.variables["UGRD_P0_L100_GLL0"][i,lev_index2,:,:]
-      u_2_temp1 = u1_2[lat_box1:lat_box2,0:lon_box1]
-      u_2_temp2 = u1_2[lat_box1:lat_box2,lon_box2:lon_box3]
-      u_2 = np.concatenate((u_2_temp2,u_2_temp1),axis=1)
-      del u1_2
-      del u_2_temp1
-      del u_2_temp2
+      steps = slice(0, len(fore))
 
-      v1_2 = forecast.variables["VGRD_P0_L100_GLL0"][i,lev_index2,:,:]
-      v_2_temp1 = v1_2[lat_box1:lat_box2,0:lon_box1]
-      v_2_temp2 = v1_2[lat_box1:lat_box2,lon_box2:lon_box3]
-      v_2 = np.concatenate((v_2_temp2,v_2_temp1),axis=1)
-      del v1_2
-      del v_2_temp1
-      del v_2_temp2
+      # read in winds.
 
-   else:
+      u_1_steps = geometry.cut(forecast.variables["UGRD_P0_L100_GLL0"], geom, steps, lev_index1)
+      v_1_steps = geometry.cut(forecast.variables["VGRD_P0_L100_GLL0"], geom, steps, lev_index1)
+      u_2_steps = geometry.cut(forecast.variables["UGRD_P0_L100_GLL0"], geom, steps, lev_index2)
+      v_2_steps = geometry.cut(forecast.variables["VGRD_P0_L100_GLL0"], geom, steps, lev_index2)
 
-      u1_1 = forecast.variables["UGRD_P0_L100_GLL0"][i, lev_index1,:,:]
-      u_1 = u1_1[lat_box1:lat_box2,lon_box1:lon_box2]
-      del u1_1
+      #   if (np.sign(lonbl) + np.sign(lontr)) >= -1 and (np.sign(lonbl) + np.sign(lontr)) <= 1:
+      #
+      #      u1 = forecast.variables["UGRD_P0_L100_GLL0"][i,lev_index,:,:]
+      #      u_temp1 = u1[lat_box1:lat_box2,0:lon_box1]
+      #      u_temp2 = u1[lat_box1:lat_box2,lon_box2:lon_box3]
+      #      u = np.concatenate((u_temp2,u_temp1),axis=1)
+      #      del u1 
+      #      del u_temp1
+      #      del u_temp2
+      #
+      #      v1 = forecast.variables["VGRD_P0_L100_GLL0"][i,lev_index,:,:]
+      #      v_temp1 = v1[lat_box1:lat_box2,0:lon_box1]
+      #      v_temp2 = v1[lat_box1:lat_box2,lon_box2:lon_box3]
+      #      v = np.concatenate((v_temp2,v_temp1),axis=1)
+      #      del v1
+      #      del v_temp1
+      #      del v_temp2
+      #
+      #   else:
+      #
+      #      u1 = forecast.variables["UGRD_P0_L100_GLL0"][i,lev_index,:,:]
+      #      u = u1[lat_box1:lat_box2,lon_box1:lon_box2]
+      #      del u1
+      #
+      #      v1 = forecast.variables["VGRD_P0_L100_GLL0"][i,lev_index,:,:]
+      #      v = v1[lat_box1:lat_box2,lon_box1:lon_box2]
+      #      del v1
+      #
+      # calculate shear
 
-      v1_1 = forecast.variables["VGRD_P0_L100_GLL0"][i, lev_index1,:,:]
-      v_1 = v1_1[lat_box1:lat_box2,lon_box1:lon_box2]
-      del v1_1
+      #   ws = np.sqrt(u**2.0 + v**2.0)
 
-      u1_2 = forecast.variables["UGRD_P0_L100_GLL0"][i, lev_index2,:,:]
-      u_2 = u1_2[lat_box1:lat_box2,lon_box1:lon_box2]
-      del u1_2
+      shear_steps = np.sqrt((u_2_steps-u_1_steps)**2.0 + (v_2_steps-v_1_steps)**2.0)
 
-      v1_2 = forecast.variables["VGRD_P0_L100_GLL0"][i, lev_index2,:,:]
-      v_2 = v1_2[lat_box1:lat_box2,lon_box1:lon_box2]
-      del v1_2
+      # loop through forecast times
 
+      for i in range(0, len(fore)):
 
-#   if (np.sign(lonbl) + np.sign(lontr)) >= -1 and (np.sign(lonbl) + np.sign(lontr)) <= 1:
-#
-#      u1 = forecast.variables["UGRD_P0_L100_GLL0"][i,lev_index,:,:]
-#      u_temp1 = u1[lat_box1:lat_box2,0:lon_box1]
-#      u_temp2 = u1[lat_box1:lat_box2,lon_box2:lon_box3]
-#      u = np.concatenate((u_temp2,u_temp1),axis=1)
-#      del u1 
-#      del u_temp1
-#      del u_temp2
-#
-#      v1 = forecast.variables["VGRD_P0_L100_GLL0"][i,lev_index,:,:]
-#      v_temp1 = v1[lat_box1:lat_box2,0:lon_box1]
-#      v_temp2 = v1[lat_box1:lat_box2,lon_box2:lon_box3]
-#      v = np.concatenate((v_temp2,v_temp1),axis=1)
-#      del v1
-#      del v_temp1
-#      del v_temp2
-#
-#   else:
-#
-#      u1 = forecast.variables["UGRD_P0_L100_GLL0"][i,lev_index,:,:]
-#      u = u1[lat_box1:lat_box2,lon_box1:lon_box2]
-#      del u1
-#
-#      v1 = forecast.variables["VGRD_P0_L100_GLL0"][i,lev_index,:,:]
-#      v = v1[lat_box1:lat_box2,lon_box1:lon_box2]
-#      del v1
-#
-# calculate shear
+         # frames already in the ledger for the same files are not plotted again (see ledger.py)
 
-#   ws = np.sqrt(u**2.0 + v**2.0)
+         if not controls.frame_wanted(fore[i]):
+            continue
 
-   shear = np.sqrt((u_2-u_1)**2.0 + (v_2-v_1)**2.0)
+      # fields for this forecast time
 
+         u_1 = u_1_steps[i]
+         v_1 = v_1_steps[i]
+         u_2 = u_2_steps[i]
+         v_2 = v_2_steps[i]
+         shear = shear_steps[i]
 
-# open workspace for forecast plots
 
-   wks_type = "png"
-   wks = ngl.open_wks(wks_type, "GFSforecast_%s_%s_shear_%shPa_%shPa_%s_%03d" % (region, init_dt[0:10], lev1_hPa, lev2_hPa, init_dt[0:10], fore[i]))
-#   wks = ngl.open_wks(wks_type, "GFSforecast_%s_%s_wind_%shPa_%s_%03d" % (region, valid_date, lev_hPa, init_dt[0:10], fore[i]))
+      # open workspace for forecast plots
 
-# define resources for forecast plots
+         wks_type = "png"
+         wks = ngl.open_wks(wks_type, "GFSforecast_%s_%s_shear_%shPa_%shPa_%s_%03d" % (region, init_dt[0:10], lev1_hPa, lev2_hPa, init_dt[0:10], fore[i]))
+      #   wks = ngl.open_wks(wks_type, "GFSforecast_%s_%s_wind_%shPa_%s_%03d" % (region, valid_date, lev_hPa, init_dt[0:10], fore[i]))
 
-   res = ngl.Resources()
-   res.nglDraw                     = False
-   res.nglFrame                    = False
+      # define resources for forecast plots
 
-   cmap = ngl.read_colormap_file("WhiteBlueGreenYellowRed")
+         res = ngl.Resources()
+         res.nglDraw                     = False
+         res.nglFrame                    = False
 
-   res.cnLinesOn                   = False
-   res.cnLineLabelsOn              = False
-   res.cnFillOn                    = True
-   res.cnFillPalette               = cmap[15:,:]
+         cmap = ngl.read_colormap_file("WhiteBlueGreenYellowRed")
 
-   res.lbAutoManage          = False
-   res.lbLabelFontHeightF         = 0.005
-   res.lbOrientation              = "horizontal"
-   res.lbLabelAngleF              = 45
-   res.pmLabelBarOrthogonalPosF = -1.
-   res.pmLabelBarParallelPosF = 0.25
-   res.pmLabelBarWidthF      = 0.3
-   res.pmLabelBarHeightF     = 0.1
-   res.lbTitleString         = "%shPa to %shPa shear (m/s)" % (lev1_hPa, lev2_hPa)
-   res.lbTitleFontHeightF   = 0.0125   
+         res.cnLinesOn                   = False
+         res.cnLineLabelsOn              = False
+         res.cnFillOn                    = True
+         res.cnFillPalette               = cmap[15:,:]
 
-   res.mpFillOn                    = False
-   res.mpGeophysicalLineColor      = "Grey18"
-   res.mpGeophysicalLineThicknessF = 1.5
+         res.lbAutoManage          = False
+         res.lbLabelFontHeightF         = 0.005
+         res.lbOrientation              = "horizontal"
+         res.lbLabelAngleF              = 45
+         res.pmLabelBarOrthogonalPosF = -1.
+         res.pmLabelBarParallelPosF = 0.25
+         res.pmLabelBarWidthF      = 0.3
+         res.pmLabelBarHeightF     = 0.1
+         res.lbTitleString         = "%shPa to %shPa shear (m/s)" % (lev1_hPa, lev2_hPa)
+         res.lbTitleFontHeightF   = 0.0125   
+
+         res.mpFillOn                    = False
+         res.mpGeophysicalLineColor      = "Grey18"
+         res.mpGeophysicalLineThicknessF = 1.5
+
+         res.sfXArray                    = lon2d
+         res.sfYArray                    = lat2d
+
+         res.mpGridAndLimbOn        = False
+         res.pmTickMarkDisplayMode = "Never"
+
+         res.cnInfoLabelOn              = False
+
+         res.mpProjection              = "CylindricalEquidistant"
+         res.mpLimitMode = "LatLon"    # Limit the map view.
+         res.mpMinLonF   = lontr
+         res.mpMaxLonF   = lonbl
+         res.mpMinLatF   = lattr
+         res.mpMaxLatF   = latbl
+         res.mpPerimOn   = True
+         res.mpOutlineBoundarySets     = "AllBoundaries"
+         res.mpNationalLineColor       = "gray40"
+         res.mpNationalLineThicknessF  = 1.5
+         res.mpGeophysicalLineColor    = "gray40"
+         res.mpGeophysicalLineThicknessF = 1.5
+         res.cnMonoLineColor           = True
 
-   res.sfXArray                    = lon2d
-   res.sfYArray                    = lat2d
+      #   max_cont = 50.0
+      #   min_cont = 0.0
 
-   res.mpGridAndLimbOn        = False
-   res.pmTickMarkDisplayMode = "Never"
+      #   res.cnLevelSelectionMode = "ManualLevels"
+      #   res.cnMinLevelValF       = min_cont
+      #   res.cnMaxLevelValF       = max_cont
+      #   res.cnLevelSpacingF      = 2.
+      #   res.cnLineThicknessF     = 2.5
 
-   res.cnInfoLabelOn              = False
+         res.cnLevelSelectionMode = "ExplicitLevels"
+         res.cnLevels = [10.0, 12.0, 14.0, 16.0, 18.0, 20.0, 22.0, 24.0, 26.0, 28.0, 30.0, 32.0, 34.0, 36.0, 38.0, 40.0]
+         res.cnFillColors = [-1, 15, 30, 45, 60, 75, 90, 105, 120, 135, 150, 165, 180, 195, 210, 225,237 ]
 
-   res.mpProjection              = "CylindricalEquidistant"
-   res.mpLimitMode = "LatLon"    # Limit the map view.
-   res.mpMinLonF   = lontr
-   res.mpMaxLonF   = lonbl
-   res.mpMinLatF   = lattr
-   res.mpMaxLatF   = latbl
-   res.mpPerimOn   = True
-   res.mpOutlineBoundarySets     = "AllBoundaries"
-   res.mpNationalLineColor       = "gray40"
-   res.mpNationalLineThicknessF  = 1.5
-   res.mpGeophysicalLineColor    = "gray40"
-   res.mpGeophysicalLineThicknessF = 1.5
-   res.cnMonoLineColor           = True
+      # create ws plot for analysis data
 
-#   max_cont = 50.0
-#   min_cont = 0.0
+      #   ws_plot = ngl.contour_map(wks,ws,res)
+         shear_plot = ngl.contour_map(wks,shear,res)
 
-#   res.cnLevelSelectionMode = "ManualLevels"
-#   res.cnMinLevelValF       = min_cont
-#   res.cnMaxLevelValF       = max_cont
-#   res.cnLevelSpacingF      = 2.
-#   res.cnLineThicknessF     = 2.5
 
-   res.cnLevelSelectionMode = "ExplicitLevels"
-   res.cnLevels = [10.0, 12.0, 14.0, 16.0, 18.0, 20.0, 22.0, 24.0, 26.0, 28.0, 30.0, 32.0, 34.0, 36.0, 38.0, 40.0]
-   res.cnFillColors = [-1, 15, 30, 45, 60, 75, 90, 105, 120, 135, 150, 165, 180, 195, 210, 225,237 ]
+      # define resources for vectors
 
-# create ws plot for analysis data
+         vcres                         = ngl.Resources()
+         vcres.nglDraw                 = False
+         vcres.nglFrame                = False
 
-#   ws_plot = ngl.contour_map(wks,ws,res)
-   shear_plot = ngl.contour_map(wks,shear,res)
+         vcres.vfXArray                = lon2d
+         vcres.vfYArray                = lat2d
 
+         #vcres.vcFillArrowsOn          = True
+         res.vcLineArrowColor          = "Black"
+         vcres.vcRefMagnitudeF         = 30.0             # define vector ref mag
+         vcres.vcRefLengthF            = 0.03             # define length of vec ref
+         vcres.vcMinFracLengthF        = 0.3
+         vcres.vcMinDistanceF          = 0.02
+         vcres.vcRefAnnoOrthogonalPosF = -0.20
+         vcres.vcRefAnnoFontHeightF    = 0.005
+         vcres.vcLineArrowThicknessF     = 2.0
 
-# define resources for vectors
+      # create vector plot for analysis data and overlay on colour contours
 
-   vcres                         = ngl.Resources()
-   vcres.nglDraw                 = False
-   vcres.nglFrame                = False
+         uv_plot1  = ngl.vector(wks,u_1,v_1,vcres)
 
-   vcres.vfXArray                = lon2d
-   vcres.vfYArray                = lat2d
+      # create vector plot for analysis data and overlay on colour contours level2
 
-   #vcres.vcFillArrowsOn          = True
-   res.vcLineArrowColor          = "Black"
-   vcres.vcRefMagnitudeF         = 30.0             # define vector ref mag
-   vcres.vcRefLengthF            = 0.03             # define length of vec ref
-   vcres.vcMinFracLengthF        = 0.3
-   vcres.vcMinDistanceF          = 0.02
-   vcres.vcRefAnnoOrthogonalPosF = -0.20
-   vcres.vcRefAnnoFontHeightF    = 0.005
-   vcres.vcLineArrowThicknessF     = 2.0
+         vcres.vcLineArrowColor = "Red"
 
-# create vector plot for analysis data and overlay on colour contours
+         uv_plot2 = ngl.vector(wks,u_2,v_2,vcres)
 
-   uv_plot1  = ngl.vector(wks,u_1,v_1,vcres)
+         ngl.overlay(shear_plot,uv_plot1)
+         ngl.overlay(shear_plot,uv_plot2)
+         ngl.maximize_plot(wks, shear_plot)
+         ngl.draw(shear_plot)
+         ngl.frame(wks)
 
-# create vector plot for analysis data and overlay on colour contours level2
+         ngl.destroy(wks)
+         del res
+         del vcres
 
-   vcres.vcLineArrowColor = "Red"
+   #GFSanalysis_WA_2021032206_shear_925hPa_700hPa.png
+   #GFSforecast_WA_2021032206_shear_925hPa_700hPa_2021032206_033.png
 
-   uv_plot2 = ngl.vector(wks,u_2,v_2,vcres)
+   os.system('mogrify -trim *_'+region+'_'+init_dt[0:10]+'_shear_'+lev1_hPa+'hPa_'+lev2_hPa+'hPa.png')
+   if region == "WA" or region == "unknownWA":
+      os.system('mogrify -resize 886x600 *_'+region+'_'+init_dt[0:10]+'_shear_'+lev1_hPa+'hPa_'+lev2_hPa+'hPa.png')
+   elif region == "EA" or region == "unknownEA":
+      os.system('mogrify -resize 600x733 *_'+region+'_'+init_dt[0:10]+'_shear_'+lev1_hPa+'hPa_'+lev2_hPa+'hPa.png')
 
-   ngl.overlay(shear_plot,uv_plot1)
-   ngl.overlay(shear_plot,uv_plot2)
-   ngl.maximize_plot(wks, shear_plot)
-   ngl.draw(shear_plot)
-   ngl.frame(wks)
+   os.system('mv *_'+region+'_'+init_dt[0:10]+'_shear_'+lev1_hPa+'hPa_'+lev2_hPa+'hPa.png MARTIN/GFS/'+region+'/'+init_dt[0:10]+'/shear_'+lev1_hPa+'_'+lev2_hPa)
 
-   ngl.destroy(wks)
-   del res
-   del vcres
+   os.system('mogrify -trim *'+region+'_*_shear_'+lev1_hPa+'hPa_'+lev2_hPa+'hPa_'+init_dt[0:10]+'*.png')
+   if region == "WA" or region == "unknownWA":
+      os.system('mogrify -resize 886x600 *'+region+'_*_shear_'+lev1_hPa+'hPa_'+lev2_hPa+'hPa_'+init_dt[0:10]+'*.png')
+   elif region == "EA" or region == "unknownEA":
+      os.system('mogrify -resize 600x733 *'+region+'_*_shear_'+lev1_hPa+'hPa_'+lev2_hPa+'hPa_'+init_dt[0:10]+'*.png')
 
-#GFSanalysis_WA_2021032206_shear_925hPa_700hPa.png
-#GFSforecast_WA_2021032206_shear_925hPa_700hPa_2021032206_033.png
+   os.system('mv *'+region+'_*_shear_'+lev1_hPa+'hPa_'+lev2_hPa+'hPa_'+init_dt[0:10]+'*.png MARTIN/GFS/'+region+'/'+init_dt[0:10]+'/shear_'+lev1_hPa+'_'+lev2_hPa)
 
-os.system('mogrify -trim *_'+region+'_'+init_dt[0:10]+'_shear_'+lev1_hPa+'hPa_'+lev2_hPa+'hPa.png')
-if region == "WA" or region == "unknownWA":
-   os.system('mogrify -resize 886x600 *_'+region+'_'+init_dt[0:10]+'_shear_'+lev1_hPa+'hPa_'+lev2_hPa+'hPa.png')
-elif region == "EA" or region == "unknownEA":
-   os.system('mogrify -resize 600x733 *_'+region+'_'+init_dt[0:10]+'_shear_'+lev1_hPa+'hPa_'+lev2_hPa+'hPa.png')
-
-os.system('mv *_'+region+'_'+init_dt[0:10]+'_shear_'+lev1_hPa+'hPa_'+lev2_hPa+'hPa.png MARTIN/GFS/'+region+'/'+init_dt[0:10]+'/shear_'+lev1_hPa+'_'+lev2_hPa)
-
-os.system('mogrify -trim *'+region+'_*_shear_'+lev1_hPa+'hPa_'+lev2_hPa+'hPa_'+init_dt[0:10]+'*.png')
-if region == "WA" or region == "unknownWA":
-   os.system('mogrify -resize 886x600 *'+region+'_*_shear_'+lev1_hPa+'hPa_'+lev2_hPa+'hPa_'+init_dt[0:10]+'*.png')
-elif region == "EA" or region == "unknownEA":
-   os.system('mogrify -resize 600x733 *'+region+'_*_shear_'+lev1_hPa+'hPa_'+lev2_hPa+'hPa_'+init_dt[0:10]+'*.png')
-
-os.system('mv *'+region+'_*_shear_'+lev1_hPa+'hPa_'+lev2_hPa+'hPa_'+init_dt[0:10]+'*.png MARTIN/GFS/'+region+'/'+init_dt[0:10]+'/shear_'+lev1_hPa+'_'+lev2_hPa)
+###################################################################################################
 
+if __name__ == "__main__":
+   main(*sys.argv[1:7])
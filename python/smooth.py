@@ -0,0 +1,75 @@
+###################################################################################################
+# Project           : Global Challenges Research Fund (GCRF) African SWIFT (Science for Weather
+#                     Information and Forecasting Techniques.
+#
+# Program name      : smooth.py
+#
+# Author            : Alexander J. Roberts, University of Leeds, NCAS
+#
+# Date created      : Oct 2026
+#
+# Purpose           : Shared 9-point smoother used by the SWIFT_GFSplotting scripts. Replaces the
+#                     per-script copies of smth9 with a slice based (vectorised) version.
+#
+# Revision History  : Oct 2026 - smooth the last two dimensions, so the fields of all forecast
+#                                times can be smoothed in one call
+#
+# Usage             : from smooth import smth9
+###################################################################################################
+
+import numpy as np
+import sys
+
+#####################################################################################################
+
+#  9-point smoother function, required to make the geopotential contours look better.
+#
+def smth9(x,p,q):
+#
+#  Run a 9-point smoother on the 2D numpy.array x (or on each 2D field
+#  in the last two dimensions of x) using weights p and q.  Return the
+#  smoothed array.
+#
+#  The stencil is applied to the interior of the array with shifted slices rather than a loop
+#  over every grid point. The arithmetic is done in the same order and precision as the original
+#  loop (neighbour sums in the precision of x, remaining terms in double precision) so the output
+#  is identical.
+#
+
+#
+#  Get array dimensions and check on sizes.
+#
+  x = np.asarray(x)
+
+  ni = x.shape[-2]
+  nj = x.shape[-1]
+  if (ni < 3 or nj < 3):
+    print("smth9: both array dimensions must be at least three.")
+    sys.exit()
+
+#
+#  Smooth.
+#
+  po4 = p/4.
+  qo4 = q/4.
+
+  centre = x[...,1:ni-1,1:nj-1].astype(np.float64)
+
+  term1 = po4*((x[...,0:ni-2,1:nj-1]+x[...,1:ni-1,0:nj-2]+x[...,2:ni,1:nj-1]+x[...,1:ni-1,2:nj]).astype(np.float64)-4.*centre)
+  term2 = qo4*((x[...,0:ni-2,2:nj]+x[...,0:ni-2,0:nj-2]+x[...,2:ni,0:nj-2]+x[...,2:ni,2:nj]).astype(np.float64)-4.*centre)
+
+  output = np.zeros(x.shape,'f')
+  output[...,1:ni-1,1:nj-1] = centre + term1 + term2
+
+#
+#  Set the perimeter values to the original x values.
+#
+  output[...,0,:]    = x[...,0,:]
+  output[...,ni-1,:] = x[...,ni-1,:]
+  output[...,:,0]    = x[...,:,0]
+  output[...,:,nj-1] = x[...,:,nj-1]
+
+#
+#  Return smoothed array.
+#
+  return output
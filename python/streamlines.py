@@ -26,406 +26,311 @@ import sys
 import os
 import datetime
 
+import controls
+import gfs_io
+import geometry
+
 GFS_dir = os.environ['SWIFT_GFS']
 
+# fields read by main, used by the plot.py scheduler to load (and derive) them before the
+# plotting job runs. Each entry is a variable followed by its levels, in hPa ("lev" is the level
+# main is called with, "lev+1" the next level index, "low:high" all levels in between) or as
+# integer level indices. Single level fields have no levels.
+
+requires = {"fields": [["UGRD_P0_L100_GLL0", "lev"], ["VGRD_P0_L100_GLL0", "lev"]],
+            "derived": []}
+
+# names of the images main writes (without .png), used by the plot.py job ledger (see ledger.py)
+# to find the frames already plotted: the analysis image (None if main does not plot the analysis)
+# and the forecast images. {region}, {init}, {valid}, {lev} and {lead} are the region, the
+# initialisation and valid times (YYYYMMDDHH), the level main is called with and the lead time.
+
+images = {"analysis": "GFSanalysis_{region}_{init}_stream_{lev}hPa",
+          "forecast": "GFSforecast_{region}_{valid}_stream_{lev}hPa_{init}_{lead:03d}"}
+
 # Main script to polot streamlines
 
-# define directory
+def main(init_dt, lev_hPa, latbl, lonbl, lattr, lontr):
 
-diri = (os.getcwd())+"/"
+   # define directory
 
-# forecast times (currently set to plot 0 to 48 hours)
+   diri = (os.getcwd())+"/"
 
-fore = (os.popen("cat %s/controls/namelist | grep 'fore:' | awk -F: '{print $2}' | tr ',' ' '"%(GFS_dir))).read().split()
-fore = [np.int(f) for f in fore]
+   # forecast times (currently set to plot 0 to 48 hours)
 
-# accept initialisation time and level as arguments
+   fore = controls.forecast_times(GFS_dir)
 
-init_dt = (sys.argv[1])
-lev_hPa = (sys.argv[2])
+   # accept initialisation time and level as arguments
 
-# read in domains and accept lat and lon limits as arguments
+   init_dt = str(init_dt)
+   lev_hPa = str(lev_hPa)
 
-b = open(GFS_dir+"/controls/domains")
-domains_content = b.readlines()
+   # read in domains and accept lat and lon limits as arguments
 
-key_list = []
-latlon_list = []
+   domains_dict = controls.read_domains(GFS_dir+"/controls/domains")
 
-for domain in domains_content:
-   key_list.append(domain.split(":")[0])
-   latlon_str = (domain.split(":")[1]).strip().split(",")
-   latlon_flt = []
-   for ll in latlon_str:
-      latlon_flt.append(float(ll))
-   latlon_list.append(latlon_flt)
-   del(latlon_flt)
+   latbl = float(latbl)
+   lonbl = float(lonbl)
+   lattr = float(lattr)
+   lontr = float(lontr)
 
-domains_dict = dict(zip(key_list,latlon_list))
+   region = "unnamedregion"
 
-latbl = float(sys.argv[3])
-lonbl = float(sys.argv[4])
-lattr = float(sys.argv[5])
-lontr = float(sys.argv[6])
+   for domain in domains_dict.keys():
+      if ((latbl == domains_dict[domain][0] and lattr == domains_dict[domain][2]) or (latbl == domains_dict[domain][2] or lattr == domains_dict[domain][0])) and ((lonbl == domains_dict[domain][1] and lontr == domains_dict[domain][3]) or (lonbl == domains_dict[domain][3] and lontr == domains_dict[domain][1])):
+         region = domain
 
-region = "unnamedregion"
+   # arrange lat and lon values to get bottom left and top right lat lon values
 
-for domain in domains_dict.keys():
-   if ((latbl == domains_dict[domain][0] and lattr == domains_dict[domain][2]) or (latbl == domains_dict[domain][2] or lattr == domains_dict[domain][0])) and ((lonbl == domains_dict[domain][1] and lontr == domains_dict[domain][3]) or (lonbl == domains_dict[domain][3] and lontr == domains_dict[domain][1])):
-      region = domain
+   if latbl == lattr or lonbl == lontr:
+      sys.exit('lat and lon values must be different')
+   else:
+      if latbl < lattr:
+         latbl, lattr = lattr, latbl
+      if lonbl > lontr:
+         lonbl, lontr = lontr, lonbl
 
-# arrange lat and lon values to get bottom left and top right lat lon values
+   # read in analysis files
 
-if latbl == lattr or lonbl == lontr:
-   sys.exit('lat and lon values must be different')
-else:
-   if latbl < lattr:
-      latbl, lattr = lattr, latbl
-   if lonbl > lontr:
-      lonbl, lontr = lontr, lonbl
+   a_fili = "analysis_gfs_4_%s_%s00_000.nc" % (init_dt[:8], init_dt[8:10])
 
-# read in analysis files
+   # read pressure levels from analysis file
 
-a_fili = "analysis_gfs_4_%s_%s00_000.nc" % (init_dt[:8], init_dt[8:10])
+   analysis = gfs_io.open_file(diri+a_fili, region)
 
-# read pressure levels from analysis file
+   level_dim = analysis.variables["UGRD_P0_L100_GLL0"].dimensions[0]
 
-analysis = nio.open_file(diri+a_fili)
+   levs_p1 = analysis.variables[level_dim]
+   levs_p = ['{:.0f}'.format(x) for x in levs_p1[:]/100.0]
+   del levs_p1
 
-level_dim = analysis.variables["UGRD_P0_L100_GLL0"].dimensions[0]
+   # identify level index
 
-levs_p1 = analysis.variables[level_dim]
-levs_p = ['{:.0f}'.format(x) for x in levs_p1[:]/100.0]
-del levs_p1
+   lev_index = levs_p.index(lev_hPa)
 
-# identify level index
+   # read in lat and lon of the region from the region geometry cache (for boxes crossing the
+   # Greenwich Meridian lonbl and lontr are swapped and lon values run from -180 to 180)
 
-lev_index = levs_p.index(lev_hPa)
+   geom = geometry.region(analysis, latbl, lonbl, lattr, lontr)
 
-# read in lat
+   lonbl, lontr = geom.lonbl, geom.lontr
+   lat = geom.lat
+   lon = geom.lon
 
-lat1 = analysis.variables["lat_0"]
-lat_temp = lat1[:]
+   # read in winds.
 
-latbl_idx = (np.abs(lat_temp-latbl)).argmin()
-lattr_idx = (np.abs(lat_temp-lattr)).argmin()
+   u = geometry.cut(analysis.variables["UGRD_P0_L100_GLL0"], geom, lev_index)
+   v = geometry.cut(analysis.variables["VGRD_P0_L100_GLL0"], geom, lev_index)
 
-if latbl_idx == lattr_idx:
-   sys.exit('lat values are not different enough, they must have relate to different grid points')
-elif latbl_idx > 1 and lattr_idx < len(lat_temp)-2:
-   lat_box1 = latbl_idx-2
-   lat_box2 = lattr_idx+2
-   lat = lat_temp[lat_box1:lat_box2]
-else:
-   lat_box1 = latbl_idx
-   lat_box2 = lattr_idx
-   lat = lat_temp[lat_box1:lat_box2]
+   # 2d lat and lon
 
-del(latbl_idx)
-del(lattr_idx)
-del(lat1)
-del(lat_temp)
+   lat2d = geom.lat2d
+   lon2d = geom.lon2d
 
-# read in lon
+   # analysis plot, only the forecast plots are made when a forecast lead time is streamed
+   # (see controls.analysis_plotted)
 
-lon1 = analysis.variables["lon_0"]
+   if controls.analysis_plotted():
 
-# check to see if box crosses Greenwich Meridian. If so then the lon values must be modified for plot to work.
+      # open workspace for analysis plot
 
-if (np.sign(lonbl) + np.sign(lontr)) >= -1 and (np.sign(lonbl) + np.sign(lontr)) <= 1:
+      wks_type = "png"
+      wks_res = ngl.Resources()
+      wks_res.wkBackgroundOpacityF = 0.0
+      wks = ngl.open_wks(wks_type, "GFSanalysis_%s_%s_stream_%shPa" % (region, init_dt[0:10], lev_hPa), wks_res)
 
-   lonbl, lontr = lontr, lonbl
 
-   lon_temp = np.where(lon1[:]>=180.0, lon1[:]-360.0, lon1[:])
+      # define resources for analysis plot
 
-   lonbl_idx = (np.abs(lon_temp-lonbl)).argmin()
-   lontr_idx = (np.abs(lon_temp-lontr)).argmin()
+      res = ngl.Resources()
+      res.nglDraw                     = False
+      res.nglFrame                    = False
 
-   if lonbl_idx == lontr_idx:
-      sys.exit('lon values are not different enough, they must have relate to different grid points')
-   elif lontr_idx > len(lon_temp)/2 and lonbl_idx <= len(lon_temp)/2:
-      lon_box1 = lonbl_idx+2
-      lon_box2 = lontr_idx-2
-      lon_box3 = len(lon_temp)-1
+      cmap = ngl.read_colormap_file("WhiteBlueGreenYellowRed")
 
-      lon_temp1 = lon_temp[0:lon_box1]
-      lon_temp2 = lon_temp[lon_box2:lon_box3]
-   else:
-      lon_box1 = lonbl_idx
-      lon_box2 = lontr_idx
-      lon_box3 = len(lon_temp)-1
+      res.lbAutoManage          = False
+      res.pmLabelBarSide               = "Bottom"
+      res.lbLabelFontHeightF         = 0.005
+      res.lbOrientation              = "horizontal"
+      res.lbLabelAngleF              = 45
+      res.pmLabelBarOrthogonalPosF = -1.
+      res.pmLabelBarParallelPosF = 0.25
+      res.pmLabelBarWidthF      = 0.3
+      res.pmLabelBarHeightF     = 0.1
+      res.lbTitleString         = "%shPa winds m/s" % (lev_hPa)
+      res.lbTitleFontHeightF   = 0.0125
 
-      lon_temp1 = lon_temp[0:lon_box1]
-      lon_temp2 = lon_temp[lon_box2:lon_box3]
 
 
-   lon = np.append(lon_temp2, lon_temp1)
+      res.stLevelPalette              = cmap[15:,:]
+      res.stMonoLineColor             = False
+      res.stLineThicknessF            = 3.0
+      res.stLevelSelectionMode        = "ManualLevels"
+      res.stMinLevelValF              = 0.0
+      res.stMaxLevelValF              = 50.
+      res.stLevelSpacingF             = 2.0
+      res.stArrowLengthF              = 0.0025
+      res.stMinDistanceF              = 0.025
 
-   del(lon_temp1)
-   del(lon_temp2)
-   del(lonbl_idx)
-   del(lontr_idx)
-   del(lon_temp)
+      res.mpFillOn                    = False
+      res.mpGeophysicalLineColor      = "Grey18"
+      res.mpGeophysicalLineThicknessF = 1.5
 
-else:
+      res.vfXArray                    = lon2d
+      res.vfYArray                    = lat2d
 
-   lon_temp = lon1[:]
+      res.mpGridAndLimbOn        = False
+      res.pmTickMarkDisplayMode = "Never"
 
-   lonbl_idx = (np.abs(lon_temp-lonbl)).argmin()
-   lontr_idx = (np.abs(lon_temp-lontr)).argmin()
+      res.mpProjection              = "CylindricalEquidistant"
+      res.mpLimitMode = "LatLon"    # Limit the map view.
+      res.mpMinLonF   = lontr
+      res.mpMaxLonF   = lonbl
+      res.mpMinLatF   = lattr
+      res.mpMaxLatF   = latbl
+      res.mpPerimOn   = True
+      res.mpOutlineBoundarySets     = "AllBoundaries"
+      res.mpNationalLineColor       = "gray40"
+      res.mpNationalLineThicknessF  = 1.5
+      res.mpGeophysicalLineColor    = "gray40"
+      res.mpGeophysicalLineThicknessF = 1.5
 
-   if lonbl_idx == lontr_idx:
-      sys.exit('lon values are not different enough, they must have relate to different grid points')
-   elif lonbl_idx > 1 and lontr_idx < len(lon_temp)-2:
-      lon_box1 = lonbl_idx-2
-      lon_box2 = lontr_idx+2
-      lon = lon_temp[lon_box1:lon_box2]
-   else:
-      lon_box1 = lonbl_idx
-      lon_box2 = lontr_idx
-      lon = lon_temp[lon_box1:lon_box2]
-
-# read in winds, checking whether box crosses Greenwich Meridian.
-
-if (np.sign(lonbl) + np.sign(lontr)) >= -1 and (np.sign(lonbl) + np.sign(lontr)) <= 1:
-
-   u1 = analysis.variables["UGRD_P0_L100_GLL0"][lev_index,:,:]
-   u_temp1 = u1[lat_box1:lat_box2,0:lon_box1]
-   u_temp2 = u1[lat_box1:lat_box2,lon_box2:lon_box3]
-   u = np.concatenate((u_temp2,u_temp1),axis=1)
-   del u1
-   del u_temp1
-   del u_temp2
-
-   v1 = analysis.variables["VGRD_P0_L100_GLL0"][lev_index,:,:]
-   v_temp1 = v1[lat_box1:lat_box2,0:lon_box1]
-   v_temp2 = v1[lat_box1:lat_box2,lon_box2:lon_box3]
-   v = np.concatenate((v_temp2,v_temp1),axis=1)
-   del v1
-   del v_temp1
-   del v_temp2
+      # create plot for analysis data
 
-else:
+      str_plot = ngl.streamline_map(wks, u, v, res)
 
-   u1 = analysis.variables["UGRD_P0_L100_GLL0"][lev_index,:,:]
-   u = u1[lat_box1:lat_box2,lon_box1:lon_box2]
-   del u1
+      ngl.draw(str_plot)
+      ngl.frame(wks)
 
-   v1 = analysis.variables["VGRD_P0_L100_GLL0"][lev_index,:,:]
-   v = v1[lat_box1:lat_box2,lon_box1:lon_box2]
-   del v1
+      ngl.destroy(wks)
+      del res
 
-# create 2d lat and lon
+   ###################################################################################################
 
-lat2d = np.zeros((len(lat),len(lon)))
-lon2d = np.zeros((len(lat),len(lon)))
+   # forecast plots, none when only the analysis is plotted
 
-for i in range(0, len(lon)):
-   lat2d[:,i] = lat
+   if len(fore) > 0:
 
-for i in range(0, len(lat)):
-   lon2d[i,:] = lon
-  
-# open workspace for analysis plot
+      # open forecast file
 
-wks_type = "png"
-wks_res = ngl.Resources()
-wks_res.wkBackgroundOpacityF = 0.0
-wks = ngl.open_wks(wks_type, "GFSanalysis_%s_%s_stream_%shPa" % (region, init_dt[0:10], lev_hPa), wks_res)
+      f_fili = "GFS_forecast_%s_%s.nc" % (init_dt[:8], init_dt[8:10])
+      forecast = gfs_io.open_file(diri+f_fili, region)
 
+      # read in and calculate the fields for all forecast times at once, only the plotting is done
+      # for each forecast time
 
-# define resources for analysis plot
+      steps = slice(0, len(fore))
 
-res = ngl.Resources()
-res.nglDraw                     = False
-res.nglFrame                    = False
+      # read in u and v.
 
-cmap = ngl.read_colormap_file("WhiteBlueGreenYellowRed")
+      u_steps = geometry.cut(forecast.variables["UGRD_P0_L100_GLL0"], geom, steps, lev_index)
+      v_steps = geometry.cut(forecast.variables["VGRD_P0_L100_GLL0"], geom, steps, lev_index)
 
-res.lbAutoManage          = False
-res.pmLabelBarSide               = "Bottom"
-res.lbLabelFontHeightF         = 0.005
-res.lbOrientation              = "horizontal"
-res.lbLabelAngleF              = 45
-res.pmLabelBarOrthogonalPosF = -1.
-res.pmLabelBarParallelPosF = 0.25
-res.pmLabelBarWidthF      = 0.3
-res.pmLabelBarHeightF     = 0.1
-res.lbTitleString         = "%shPa winds m/s" % (lev_hPa)
-res.lbTitleFontHeightF   = 0.0125
+      # loop through forecast times
 
+      for i in range(0, len(fore)):
 
+         # frames already in the ledger for the same files are not plotted again (see ledger.py)
 
-res.stLevelPalette              = cmap[15:,:]
-res.stMonoLineColor             = False
-res.stLineThicknessF            = 3.0
-res.stLevelSelectionMode        = "ManualLevels"
-res.stMinLevelValF              = 0.0
-res.stMaxLevelValF              = 50.
-res.stLevelSpacingF             = 2.0
-res.stArrowLengthF              = 0.0025
-res.stMinDistanceF              = 0.025
+         if not controls.frame_wanted(fore[i]):
+            continue
 
-res.mpFillOn                    = False
-res.mpGeophysicalLineColor      = "Grey18"
-res.mpGeophysicalLineThicknessF = 1.5
+      # create string for valid time
 
-res.vfXArray                    = lon2d
-res.vfYArray                    = lat2d
+         valid_date = (datetime.datetime(int(init_dt[:4]), int(init_dt[4:6]), int(init_dt[6:8]), int(init_dt[8:10])) + datetime.timedelta(hours=int(fore[i]))).strftime("%Y%m%d%H")
 
-res.mpGridAndLimbOn        = False
-res.pmTickMarkDisplayMode = "Never"
+      # fields for this forecast time
 
-res.mpProjection              = "CylindricalEquidistant"
-res.mpLimitMode = "LatLon"    # Limit the map view.
-res.mpMinLonF   = lontr
-res.mpMaxLonF   = lonbl
-res.mpMinLatF   = lattr
-res.mpMaxLatF   = latbl
-res.mpPerimOn   = True
-res.mpOutlineBoundarySets     = "AllBoundaries"
-res.mpNationalLineColor       = "gray40"
-res.mpNationalLineThicknessF  = 1.5
-res.mpGeophysicalLineColor    = "gray40"
-res.mpGeophysicalLineThicknessF = 1.5
+         u = u_steps[i]
+         v = v_steps[i]
 
-# create plot for analysis data
-
-str_plot = ngl.streamline_map(wks, u, v, res)
+      # open workspace for forecast plots
 
-ngl.draw(str_plot)
-ngl.frame(wks)
+         wks_type = "png"
+         wks_res = ngl.Resources()
+         wks_res.wkBackgroundOpacityF = 0.0
+         wks = ngl.open_wks(wks_type, "GFSforecast_%s_%s_stream_%shPa_%s_%03d" % (region, valid_date, lev_hPa, init_dt[0:10], fore[i]), wks_res)
 
-ngl.destroy(wks)
-del res
+      # define resources for forecast plots
 
-###################################################################################################
+         res = ngl.Resources()
+         res.nglDraw                     = False
+         res.nglFrame                    = False
 
-# open forecast file
+         cmap = ngl.read_colormap_file("WhiteBlueGreenYellowRed")
 
-f_fili = "GFS_forecast_%s_%s.nc" % (init_dt[:8], init_dt[8:10])
-forecast = nio.open_file(diri+f_fili)
+         res.lbAutoManage          = False
+         res.pmLabelBarSide               = "Bottom"
+         res.lbLabelFontHeightF         = 0.005
+         res.lbOrientation              = "horizontal"
+         res.lbLabelAngleF              = 45
+         res.pmLabelBarOrthogonalPosF = -1.
+         res.pmLabelBarParallelPosF = 0.25
+         res.pmLabelBarWidthF      = 0.3
+         res.pmLabelBarHeightF     = 0.1
+         res.lbTitleString         = "%shPa winds m/s" % (lev_hPa)
+         res.lbTitleFontHeightF   = 0.0125
 
-# loop through forecast times
+         res.stLevelPalette              = cmap[15:,:]
+         res.stMonoLineColor             = False
+         res.stLineThicknessF            = 3.0
+         res.stLevelSelectionMode        = "ManualLevels"
+         res.stMinLevelValF              = 0.0
+         res.stMaxLevelValF              = 50.
+         res.stLevelSpacingF             = 2.0
+         res.stArrowLengthF              = 0.0025
+         res.stMinDistanceF              = 0.025
 
-for i in range(0, len(fore)):
+         res.mpFillOn                    = False
+         res.mpGeophysicalLineColor      = "Grey18"
+         res.mpGeophysicalLineThicknessF = 1.5
 
-# create string for valid time
+         res.vfXArray                    = lon2d
+         res.vfYArray                    = lat2d
 
-   valid_date = (datetime.datetime(int(init_dt[:4]), int(init_dt[4:6]), int(init_dt[6:8]), int(init_dt[8:10])) + datetime.timedelta(hours=int(fore[i]))).strftime("%Y%m%d%H")
+         res.mpGridAndLimbOn        = False
+         res.pmTickMarkDisplayMode = "Never"
 
-# read in u and v, checking whether box crosses Greenwich Meridian.
+         res.mpProjection              = "CylindricalEquidistant"
+         res.mpLimitMode = "LatLon"    # Limit the map view.
+         res.mpMinLonF   = lontr
+         res.mpMaxLonF   = lonbl
+         res.mpMinLatF   = lattr
+         res.mpMaxLatF   = latbl
+         res.mpPerimOn   = True
+         res.mpOutlineBoundarySets     = "AllBoundaries"
+         res.mpNationalLineColor       = "gray40"
+         res.mpNationalLineThicknessF  = 1.5
+         res.mpGeophysicalLineColor    = "gray40"
+         res.mpGeophysicalLineThicknessF = 1.5
 
-   if (np.sign(lonbl) + np.sign(lontr)) >= -1 and (np.sign(lonbl) + np.sign(lontr)) <= 1:
+      # create streamline plots for forecast times
 
-      u1 = forecast.variables["UGRD_P0_L100_GLL0"][i,lev_index,:,:]
-      u_temp1 = u1[lat_box1:lat_box2,0:lon_box1]
-      u_temp2 = u1[lat_box1:lat_box2,lon_box2:lon_box3]
-      u = np.concatenate((u_temp2,u_temp1),axis=1)
-      del u1 
-      del u_temp1
-      del u_temp2
+         str_plot = ngl.streamline_map(wks, u, v, res)
 
-      v1 = forecast.variables["VGRD_P0_L100_GLL0"][i,lev_index,:,:]
-      v_temp1 = v1[lat_box1:lat_box2,0:lon_box1]
-      v_temp2 = v1[lat_box1:lat_box2,lon_box2:lon_box3]
-      v = np.concatenate((v_temp2,v_temp1),axis=1)
-      del v1
-      del v_temp1
-      del v_temp2
+         ngl.draw(str_plot)
+         ngl.frame(wks)
 
-   else:
+         ngl.destroy(wks)
+         del res
+
+   os.system('mogrify -trim *_'+region+'_'+init_dt[0:10]+'_stream_'+lev_hPa+'hPa.png')
+   #if region == "WA" or region == "unknownWA":
+   #   os.system('mogrify -resize 886x600 *_'+region+'_'+init_dt[0:10]+'_stream_'+lev_hPa+'hPa.png')
+   #elif region == "EA" or region == "unknownEA":
+   #   os.system('mogrify -resize 600x733 *_'+region+'_'+init_dt[0:10]+'_stream_'+lev_hPa+'hPa.png')
+
+   os.system('mv *_'+region+'_'+init_dt[0:10]+'_stream_'+lev_hPa+'hPa.png %s/MARTIN/GFS/'%(GFS_dir)+region+'/'+init_dt[0:10]+'/streamlines_'+lev_hPa)
+
+   os.system('mogrify -trim *'+region+'_*stream_'+lev_hPa+'hPa_'+init_dt[0:10]+'*.png')
+   #if region == "WA" or region == "unknownWA":
+   #   os.system('mogrify -resize 886x600 *'+region+'_*stream_'+lev_hPa+'hPa_'+init_dt[0:10]+'*.png')
+   #elif region == "EA" or region == "unknownEA":
+   #   os.system('mogrify -resize 600x733 *'+region+'_*stream_'+lev_hPa+'hPa_'+init_dt[0:10]+'*.png')
+
+   os.system('mv *'+region+'_*stream_'+lev_hPa+'hPa_'+init_dt[0:10]+'*.png %s/MARTIN/GFS/'%(GFS_dir)+region+'/'+init_dt[0:10]+'/streamlines_'+lev_hPa)
+
+###################################################################################################
 
-      u1 = forecast.variables["UGRD_P0_L100_GLL0"][i,lev_index,:,:]
-      u = u1[lat_box1:lat_box2,lon_box1:lon_box2]
-      del u1
-
-      v1 = forecast.variables["VGRD_P0_L100_GLL0"][i,lev_index,:,:]
-      v = v1[lat_box1:lat_box2,lon_box1:lon_box2]
-      del v1
-
-# open workspace for forecast plots
-
-   wks_type = "png"
-   wks_res = ngl.Resources()
-   wks_res.wkBackgroundOpacityF = 0.0
-   wks = ngl.open_wks(wks_type, "GFSforecast_%s_%s_stream_%shPa_%s_%03d" % (region, valid_date, lev_hPa, init_dt[0:10], fore[i]), wks_res)
-
-# define resources for forecast plots
-
-   res = ngl.Resources()
-   res.nglDraw                     = False
-   res.nglFrame                    = False
-
-   cmap = ngl.read_colormap_file("WhiteBlueGreenYellowRed")
-   
-   res.lbAutoManage          = False
-   res.pmLabelBarSide               = "Bottom"
-   res.lbLabelFontHeightF         = 0.005
-   res.lbOrientation              = "horizontal"
-   res.lbLabelAngleF              = 45
-   res.pmLabelBarOrthogonalPosF = -1.
-   res.pmLabelBarParallelPosF = 0.25
-   res.pmLabelBarWidthF      = 0.3
-   res.pmLabelBarHeightF     = 0.1
-   res.lbTitleString         = "%shPa winds m/s" % (lev_hPa)
-   res.lbTitleFontHeightF   = 0.0125
-
-   res.stLevelPalette              = cmap[15:,:]
-   res.stMonoLineColor             = False
-   res.stLineThicknessF            = 3.0
-   res.stLevelSelectionMode        = "ManualLevels"
-   res.stMinLevelValF              = 0.0
-   res.stMaxLevelValF              = 50.
-   res.stLevelSpacingF             = 2.0
-   res.stArrowLengthF              = 0.0025
-   res.stMinDistanceF              = 0.025
-
-   res.mpFillOn                    = False
-   res.mpGeophysicalLineColor      = "Grey18"
-   res.mpGeophysicalLineThicknessF = 1.5
-
-   res.vfXArray                    = lon2d
-   res.vfYArray                    = lat2d
-
-   res.mpGridAndLimbOn        = False
-   res.pmTickMarkDisplayMode = "Never"
-
-   res.mpProjection              = "CylindricalEquidistant"
-   res.mpLimitMode = "LatLon"    # Limit the map view.
-   res.mpMinLonF   = lontr
-   res.mpMaxLonF   = lonbl
-   res.mpMinLatF   = lattr
-   res.mpMaxLatF   = latbl
-   res.mpPerimOn   = True
-   res.mpOutlineBoundarySets     = "AllBoundaries"
-   res.mpNationalLineColor       = "gray40"
-   res.mpNationalLineThicknessF  = 1.5
-   res.mpGeophysicalLineColor    = "gray40"
-   res.mpGeophysicalLineThicknessF = 1.5
-
-# create streamline plots for forecast times
-
-   str_plot = ngl.streamline_map(wks, u, v, res)
-
-   ngl.draw(str_plot)
-   ngl.frame(wks)
-
-   ngl.destroy(wks)
-   del res
-
-os.system('mogrify -trim *_'+region+'_'+init_dt[0:10]+'_stream_'+lev_hPa+'hPa.png')
-#if region == "WA" or region == "unknownWA":
-#   os.system('mogrify -resize 886x600 *_'+region+'_'+init_dt[0:10]+'_stream_'+lev_hPa+'hPa.png')
-#elif region == "EA" or region == "unknownEA":
-#   os.system('mogrify -resize 600x733 *_'+region+'_'+init_dt[0:10]+'_stream_'+lev_hPa+'hPa.png')
-
-os.system('mv *_'+region+'_'+init_dt[0:10]+'_stream_'+lev_hPa+'hPa.png %s/MARTIN/GFS/'%(GFS_dir)+region+'/'+init_dt[0:10]+'/streamlines_'+lev_hPa)
-
-os.system('mogrify -trim *'+region+'_*stream_'+lev_hPa+'hPa_'+init_dt[0:10]+'*.png')
-#if region == "WA" or region == "unknownWA":
-#   os.system('mogrify -resize 886x600 *'+region+'_*stream_'+lev_hPa+'hPa_'+init_dt[0:10]+'*.png')
-#elif region == "EA" or region == "unknownEA":
-#   os.system('mogrify -resize 600x733 *'+region+'_*stream_'+lev_hPa+'hPa_'+init_dt[0:10]+'*.png')
-
-os.system('mv *'+region+'_*stream_'+lev_hPa+'hPa_'+init_dt[0:10]+'*.png %s/MARTIN/GFS/'%(GFS_dir)+region+'/'+init_dt[0:10]+'/streamlines_'+lev_hPa)
+if __name__ == "__main__":
+   main(*sys.argv[1:7])
@@ -26,468 +26,344 @@ import sys
 import os
 import datetime
 
+import controls
+import gfs_io
+import geometry
+from smooth import smth9
+
 GFS_dir = os.environ['SWIFT_GFS']
 
-#####################################################################################################
+# fields read by main, used by the plot.py scheduler to load (and derive) them before the
+# plotting job runs. Each entry is a variable followed by its levels, in hPa ("lev" is the level
+# main is called with, "lev+1" the next level index, "low:high" all levels in between) or as
+# integer level indices. Single level fields have no levels.
 
-#  9-point smoother function, required to make the geopotential contours look better.
-#
-def smth9(x,p,q):
-#
-#  Run a 9-point smoother on the 2D numpy.array x using weights
-#  p and q.  Return the smoothed array.
-#
+requires = {"fields": [["TMP_P0_L100_GLL0", "lev"]],
+            "derived": []}
 
-#
-#  Get array dimensions and check on sizes.
-#
-  ni = x.shape[0]
-  nj = x.shape[1]
-  if (ni < 3 or nj < 3):
-    print("smth9: both array dimensions must be at least three.")
-    sys.exit()
+# names of the images main writes (without .png), used by the plot.py job ledger (see ledger.py)
+# to find the frames already plotted: the analysis image (None if main does not plot the analysis)
+# and the forecast images. {region}, {init}, {valid}, {lev} and {lead} are the region, the
+# initialisation and valid times (YYYYMMDDHH), the level main is called with and the lead time.
 
-#
-#  Smooth.
-#
-  po4 = p/4.
-  qo4 = q/4.
-
-  output = np.zeros([ni,nj],'f')
-  for j in range(1,nj-1):
-    for i in range(1,ni-1):
-      jm1 = j-1
-      jp1 = j+1
-      im1 = i-1
-      ip1 = i+1
-      term1 = po4*(x[im1,j]+x[i,jm1]+x[ip1,j]+x[i,jp1]-4.*x[i,j])
-      term2 = qo4*(x[im1,jp1]+x[im1,jm1]+x[ip1,jm1]+x[ip1,jp1]-4.*x[i,j])
-      output[i,j] = float(x[i,j]) + term1 + term2
-
-#
-#  Set the perimeter values to the original x values.
-#
-  output[0,:]    = x[0,:]
-  output[ni-1,:] = x[ni-1,:]
-  output[:,0]    = x[:,0]
-  output[:,nj-1] = x[:,nj-1]
-
-#
-#  Return smoothed array.
-#
-  return output
+images = {"analysis": "GFSanalysis_{region}_{init}_temperature_{lev}hPa",
+          "forecast": "GFSforecast_{region}_{valid}_temperature_{lev}hPa_{init}_{lead:03d}"}
 
 ###################################################################################################
 
 # Main script to plot potential temperature
 
-# define directory
+def main(init_dt, lev_hPa, latbl, lonbl, lattr, lontr):
 
-diri = (os.getcwd())+"/"
+   # define directory
 
-# forecast times (currently set to plot 0 to 48 hours)
+   diri = (os.getcwd())+"/"
 
-fore = (os.popen("cat %s/controls/namelist | grep 'fore:' | awk -F: '{print $2}' | tr ',' ' '"%(GFS_dir))).read().split()
-fore = [np.int(f) for f in fore]
+   # forecast times (currently set to plot 0 to 48 hours)
 
-# accept initialisation time and level as arguments
+   fore = controls.forecast_times(GFS_dir)
 
-init_dt = (sys.argv[1])
-lev_hPa = (sys.argv[2])
+   # accept initialisation time and level as arguments
 
-# read in domains and accept lat and lon limits as arguments
+   init_dt = str(init_dt)
+   lev_hPa = str(lev_hPa)
 
-b = open(GFS_dir+"/controls/domains")
-domains_content = b.readlines()
+   # read in domains and accept lat and lon limits as arguments
 
-key_list = []
-latlon_list = []
+   domains_dict = controls.read_domains(GFS_dir+"/controls/domains")
 
-for domain in domains_content:
-   key_list.append(domain.split(":")[0])
-   latlon_str = (domain.split(":")[1]).strip().split(",")
-   latlon_flt = []
-   for ll in latlon_str:
-      latlon_flt.append(float(ll))
-   latlon_list.append(latlon_flt)
-   del(latlon_flt)
+   latbl = float(latbl)
+   lonbl = float(lonbl)
+   lattr = float(lattr)
+   lontr = float(lontr)
 
-domains_dict = dict(zip(key_list,latlon_list))
+   region = "unnamedregion"
 
-latbl = float(sys.argv[3])
-lonbl = float(sys.argv[4])
-lattr = float(sys.argv[5])
-lontr = float(sys.argv[6])
+   for domain in domains_dict.keys():
+      if ((latbl == domains_dict[domain][0] and lattr == domains_dict[domain][2]) or (latbl == domains_dict[domain][2] or lattr == domains_dict[domain][0])) and ((lonbl == domains_dict[domain][1] and lontr == domains_dict[domain][3]) or (lonbl == domains_dict[domain][3] and lontr == domains_dict[domain][1])):
+         region = domain
 
-region = "unnamedregion"
+   # arrange lat and lon values to get bottom left and top right lat lon values
 
-for domain in domains_dict.keys():
-   if ((latbl == domains_dict[domain][0] and lattr == domains_dict[domain][2]) or (latbl == domains_dict[domain][2] or lattr == domains_dict[domain][0])) and ((lonbl == domains_dict[domain][1] and lontr == domains_dict[domain][3]) or (lonbl == domains_dict[domain][3] and lontr == domains_dict[domain][1])):
-      region = domain
+   if latbl == lattr or lonbl == lontr:
+      sys.exit('lat and lon values must be different')
+   else:
+      if latbl < lattr:
+         latbl, lattr = lattr, latbl
+      if lonbl > lontr:
+         lonbl, lontr = lontr, lonbl
 
-# arrange lat and lon values to get bottom left and top right lat lon values
+   # read in analysis files
 
-if latbl == lattr or lonbl == lontr:
-   sys.exit('lat and lon values must be different')
-else:
-   if latbl < lattr:
-      latbl, lattr = lattr, latbl
-   if lonbl > lontr:
-      lonbl, lontr = lontr, lonbl
+   a_fili = "analysis_gfs_4_%s_%s00_000.nc" % (init_dt[:8], init_dt[8:10])
 
-# read in analysis files
+   # read pressure levels from analysis file
 
-a_fili = "analysis_gfs_4_%s_%s00_000.nc" % (init_dt[:8], init_dt[8:10])
+   analysis = gfs_io.open_file(diri+a_fili, region)
 
-# read pressure levels from analysis file
+   level_dim = analysis.variables["TMP_P0_L100_GLL0"].dimensions[0]
 
-analysis = nio.open_file(diri+a_fili)
+   levs_p1 = analysis.variables[level_dim]
+   levs_p = ['{:.0f}'.format(x) for x in levs_p1[:]/100.0]
+   del levs_p1
 
-level_dim = analysis.variables["TMP_P0_L100_GLL0"].dimensions[0]
+   # identify level index
 
-levs_p1 = analysis.variables[level_dim]
-levs_p = ['{:.0f}'.format(x) for x in levs_p1[:]/100.0]
-del levs_p1
+   lev_index = levs_p.index(lev_hPa)
 
-# identify level index
+   # read in lat and lon of the region from the region geometry cache (for boxes crossing the
+   # Greenwich Meridian lonbl and lontr are swapped and lon values run from -180 to 180)
 
-lev_index = levs_p.index(lev_hPa)
+   geom = geometry.region(analysis, latbl, lonbl, lattr, lontr)
 
-# read in lat
+   lonbl, lontr = geom.lonbl, geom.lontr
+   lat = geom.lat
+   lon = geom.lon
 
-lat1 = analysis.variables["lat_0"]
-lat_temp = lat1[:]
+   # read in temperature.
 
-latbl_idx = (np.abs(lat_temp-latbl)).argmin()
-lattr_idx = (np.abs(lat_temp-lattr)).argmin()
+   temp = geometry.cut(analysis.variables["TMP_P0_L100_GLL0"], geom, lev_index)
+   temp = smth9(temp, 0.5, 0.25)
 
-if latbl_idx == lattr_idx:
-   sys.exit('lat values are not different enough, they must have relate to different grid points')
-elif latbl_idx > 1 and lattr_idx < len(lat_temp)-2:
-   lat_box1 = latbl_idx-2
-   lat_box2 = lattr_idx+2
-   lat = lat_temp[lat_box1:lat_box2]
-else:
-   lat_box1 = latbl_idx
-   lat_box2 = lattr_idx
-   lat = lat_temp[lat_box1:lat_box2]
+   # 2d lat and lon
+
+   lat2d = geom.lat2d
+   lon2d = geom.lon2d
+
+   # analysis plot, only the forecast plots are made when a forecast lead time is streamed
+   # (see controls.analysis_plotted)
+
+   if controls.analysis_plotted():
 
-del(latbl_idx)
-del(lattr_idx)
-del(lat1)
-del(lat_temp)
+      # open workspace for analysis plot
 
-# read in lon 
+      wks_type = "png"
+      wks = ngl.open_wks(wks_type, "GFSanalysis_%s_%s_temperature_%shPa" % (region, init_dt[0:10], lev_hPa))
 
-lon1 = analysis.variables["lon_0"]
+      # define resources for analysis plot
 
-# check to see if box crosses Greenwich Meridian. If so then the lon values must be modified for plot to work.
+      res = ngl.Resources()
+      res.nglDraw  = False
+      res.nglFrame = False
 
-if (np.sign(lonbl) + np.sign(lontr)) >= -1 and (np.sign(lonbl) + np.sign(lontr)) <= 1:
+      res.mpGridAndLimbOn        = False
+      res.pmTickMarkDisplayMode = "Never"
 
-   lonbl, lontr = lontr, lonbl
+      res.cnInfoLabelOn              = False
+      res.cnLineLabelsOn             = True
+      res.cnFillOn                   = True
+      res.cnInfoLabelOn              = False
+      res.cnLineLabelBackgroundColor = -1
+      res.cnLineLabelDensityF        = 0.8
+      res.cnLineLabelFontColor       = "Black"
+      res.cnLineLabelFontHeightF     = 0.015
+      res.cnLineLabelPerimOn         = False
+      res.cnLineLabelsOn             = True
+      res.cnLinesOn                  = True
+      res.cnMonoLineLabelFontColor   = True
 
-   lon_temp = np.where(lon1[:]>=180.0, lon1[:]-360.0, lon1[:])
+      res.lbAutoManage          = False
+      res.lbLabelFontHeightF         = 0.005
+      res.lbOrientation              = "horizontal"
+      res.lbLabelAngleF              = 45
+      res.pmLabelBarOrthogonalPosF = -1.
+      res.pmLabelBarParallelPosF = 0.25
+      res.pmLabelBarWidthF      = 0.3
+      res.pmLabelBarHeightF     = 0.1
+      res.lbTitleString         = "%shPa temperature" % (lev_hPa)
+      res.lbTitleFontHeightF   = 0.0125
 
-   lonbl_idx = (np.abs(lon_temp-lonbl)).argmin()
-   lontr_idx = (np.abs(lon_temp-lontr)).argmin()
+      res.sfXArray = lon2d
+      res.sfYArray = lat2d
 
-   if lonbl_idx == lontr_idx:
-      sys.exit('lon values are not different enough, they must have relate to different grid points')
-   elif lontr_idx > len(lon_temp)/2 and lonbl_idx <= len(lon_temp)/2:
-      lon_box1 = lonbl_idx+2
-      lon_box2 = lontr_idx-2
-      lon_box3 = len(lon_temp)-1
+      res.mpProjection              = "CylindricalEquidistant"
+      res.mpLimitMode = "LatLon"    # Limit the map view.
+      res.mpMinLonF   = lontr
+      res.mpMaxLonF   = lonbl
+      res.mpMinLatF   = lattr
+      res.mpMaxLatF   = latbl
+      res.mpPerimOn   = True
+      res.mpOutlineBoundarySets     = "AllBoundaries"
+      res.mpNationalLineColor       = "gray40"
+      res.mpNationalLineThicknessF  = 1.5
+      res.mpGeophysicalLineColor    = "gray40"
+      res.mpGeophysicalLineThicknessF = 1.5
+      res.cnMonoLineColor           = True
 
-      lon_temp1 = lon_temp[0:lon_box1]
-      lon_temp2 = lon_temp[lon_box2:lon_box3]
-   else:
-      lon_box1 = lonbl_idx
-      lon_box2 = lontr_idx
-      lon_box3 = len(lon_temp)-1
+      if float(lev_hPa) < 300.0:
+         max_cont = 255.0
+         min_cont = 215.0
+         lev_space = 2.0
+      if float(lev_hPa) >= 300.0 and float(lev_hPa) <700:
+         max_cont = 280.0
+         min_cont = 240.0
+         lev_space = 2.0
+      if float(lev_hPa) >=700:
+         max_cont = 305.0
+         min_cont = 265.0
+         lev_space = 2.0
 
-      lon_temp1 = lon_temp[0:lon_box1]
-      lon_temp2 = lon_temp[lon_box2:lon_box3]
 
+      res.cnLevelSelectionMode = "ManualLevels"
+      res.cnMinLevelValF       = min_cont
+      res.cnMaxLevelValF       = max_cont
+      res.cnLevelSpacingF      = lev_space
+      res.cnLineThicknessF     = 2.5 
 
-   lon = np.append(lon_temp2, lon_temp1)
+      # create plot for analysis data
 
-   del(lon_temp1)
-   del(lon_temp2)
-   del(lonbl_idx)
-   del(lontr_idx)
-   del(lon_temp)
+      temp_plot = ngl.contour_map(wks,temp,res)
 
-else:
+      ngl.maximize_plot(wks, temp_plot)
+      ngl.draw(temp_plot)
+      ngl.frame(wks)
 
-   lon_temp = lon1[:]
+      ngl.destroy(wks)
+      del res
+
+   ###################################################################################################
+
+   # forecast plots, none when only the analysis is plotted
+
+   if len(fore) > 0:
+
+      # open forecast file
+
+      f_fili = "GFS_forecast_%s_%s.nc" % (init_dt[:8], init_dt[8:10])
+      forecast = gfs_io.open_file(diri+f_fili, region)
+
+      # read in and calculate the fields for all forecast times at once, only the plotting is done
+      # for each forecast time
+
+      steps = slice(0, len(fore))
+
+      # read in temperature and convert to potential temperature.
+
+      temp_steps = geometry.cut(forecast.variables["TMP_P0_L100_GLL0"], geom, steps, lev_index)
+      temp_steps = smth9(temp_steps, 0.5, 0.25)
+
+      # loop through forecast times
+
+      for i in range(0, len(fore)):
+
+         # frames already in the ledger for the same files are not plotted again (see ledger.py)
+
+         if not controls.frame_wanted(fore[i]):
+            continue
+
+      # create string for valid time
+
+         valid_date = (datetime.datetime(int(init_dt[:4]), int(init_dt[4:6]), int(init_dt[6:8]), int(init_dt[8:10])) + datetime.timedelta(hours=int(fore[i]))).strftime("%Y%m%d%H")
+
+      # fields for this forecast time
+
+         temp = temp_steps[i]
+
+      # open workspace for forecast plots
+
+         wks_type = "png"
+         wks = ngl.open_wks(wks_type, "GFSforecast_%s_%s_temperature_%shPa_%s_%03d" % (region, valid_date, lev_hPa, init_dt[0:10], fore[i]))
+
+      # define resources for forecast plots
 
-   lonbl_idx = (np.abs(lon_temp-lonbl)).argmin()
-   lontr_idx = (np.abs(lon_temp-lontr)).argmin()
+         res = ngl.Resources()
+         res.nglDraw  = False
+         res.nglFrame = False
 
-   if lonbl_idx == lontr_idx:
-      sys.exit('lon values are not different enough, they must have relate to different grid points')
-   elif lonbl_idx > 1 and lontr_idx < len(lon_temp)-2:
-      lon_box1 = lonbl_idx-2
-      lon_box2 = lontr_idx+2
-      lon = lon_temp[lon_box1:lon_box2]
-   else:
-      lon_box1 = lonbl_idx
-      lon_box2 = lontr_idx
-      lon = lon_temp[lon_box1:lon_box2]
+         res.mpGridAndLimbOn        = False
+         res.pmTickMarkDisplayMode = "Never"
 
-# read in temperature.
+         res.cnInfoLabelOn              = False
+         res.cnLineLabelsOn             = True
+         res.cnFillOn                   = True
+         res.cnInfoLabelOn              = False
+         res.cnLineLabelBackgroundColor = -1
+         res.cnLineLabelDensityF        = 0.8
+         res.cnLineLabelFontColor       = "Black"
+         res.cnLineLabelFontHeightF     = 0.015
+         res.cnLineLabelPerimOn         = False
+         res.cnLineLabelsOn             = True
+         res.cnLinesOn                  = True
+         res.cnMonoLineLabelFontColor   = True
 
-if (np.sign(lonbl) + np.sign(lontr)) >= -1 and (np.sign(lonbl) + np.sign(lontr)) <= 1:
+         res.lbAutoManage          = False
+         res.lbLabelFontHeightF         = 0.005
+         res.lbOrientation              = "horizontal"
+         res.lbLabelAngleF              = 45
+         res.pmLabelBarOrthogonalPosF = -1.
+         res.pmLabelBarParallelPosF = 0.25
+         res.pmLabelBarWidthF      = 0.3
+         res.pmLabelBarHeightF     = 0.1
+         res.lbTitleString         = "%shPa temperature" % (lev_hPa)
+         res.lbTitleFontHeightF   = 0.0125
 
-   temp1 = analysis.variables["TMP_P0_L100_GLL0"][lev_index,:,:]
-   temp_temp1 = temp1[lat_box1:lat_box2,0:lon_box1]
-   temp_temp2 = temp1[lat_box1:lat_box2,lon_box2:lon_box3]
-   temp = np.concatenate((temp_temp2,temp_temp1),axis=1)
-   del temp1
-   del temp_temp1
-   del temp_temp2
-   temp = smth9(temp, 0.5, 0.25)
 
-else:
+         res.sfXArray = lon2d
+         res.sfYArray = lat2d
 
-   temp1 = analysis.variables["TMP_P0_L100_GLL0"][lev_index,:,:]
-   temp = temp1[lat_box1:lat_box2,lon_box1:lon_box2]
-   del temp1
-   temp = smth9(temp, 0.5, 0.25)
+         res.mpProjection              = "CylindricalEquidistant"
+         res.mpLimitMode = "LatLon"    # Limit the map view.
+         res.mpMinLonF   = lontr
+         res.mpMaxLonF   = lonbl
+         res.mpMinLatF   = lattr
+         res.mpMaxLatF   = latbl
+         res.mpPerimOn   = True
+         res.mpOutlineBoundarySets     = "AllBoundaries"
+         res.mpNationalLineColor       = "gray40"
+         res.mpNationalLineThicknessF  = 1.5
+         res.mpGeophysicalLineColor    = "gray40"
+         res.mpGeophysicalLineThicknessF = 1.5
+         res.cnMonoLineColor           = True
 
-# create 2d lat and lon
-
-lat2d = np.zeros((len(lat),len(lon)))
-lon2d = np.zeros((len(lat),len(lon)))
-
-for i in range(0, len(lon)):
-   lat2d[:,i] = lat
-
-for i in range(0, len(lat)):
-   lon2d[i,:] = lon
-   
-# open workspace for analysis plot
-
-wks_type = "png"
-wks = ngl.open_wks(wks_type, "GFSanalysis_%s_%s_temperature_%shPa" % (region, init_dt[0:10], lev_hPa))
-
-# define resources for analysis plot
-
-res = ngl.Resources()
-res.nglDraw  = False
-res.nglFrame = False
-
-res.mpGridAndLimbOn        = False
-res.pmTickMarkDisplayMode = "Never"
-
-res.cnInfoLabelOn              = False
-res.cnLineLabelsOn             = True
-res.cnFillOn                   = True
-res.cnInfoLabelOn              = False
-res.cnLineLabelBackgroundColor = -1
-res.cnLineLabelDensityF        = 0.8
-res.cnLineLabelFontColor       = "Black"
-res.cnLineLabelFontHeightF     = 0.015
-res.cnLineLabelPerimOn         = False
-res.cnLineLabelsOn             = True
-res.cnLinesOn                  = True
-res.cnMonoLineLabelFontColor   = True
-
-res.lbAutoManage          = False
-res.lbLabelFontHeightF         = 0.005
-res.lbOrientation              = "horizontal"
-res.lbLabelAngleF              = 45
-res.pmLabelBarOrthogonalPosF = -1.
-res.pmLabelBarParallelPosF = 0.25
-res.pmLabelBarWidthF      = 0.3
-res.pmLabelBarHeightF     = 0.1
-res.lbTitleString         = "%shPa temperature" % (lev_hPa)
-res.lbTitleFontHeightF   = 0.0125
-
-res.sfXArray = lon2d
-res.sfYArray = lat2d
-
-res.mpProjection              = "CylindricalEquidistant"
-res.mpLimitMode = "LatLon"    # Limit the map view.
-res.mpMinLonF   = lontr
-res.mpMaxLonF   = lonbl
-res.mpMinLatF   = lattr
-res.mpMaxLatF   = latbl
-res.mpPerimOn   = True
-res.mpOutlineBoundarySets     = "AllBoundaries"
-res.mpNationalLineColor       = "gray40"
-res.mpNationalLineThicknessF  = 1.5
-res.mpGeophysicalLineColor    = "gray40"
-res.mpGeophysicalLineThicknessF = 1.5
-res.cnMonoLineColor           = True
-
-if float(lev_hPa) < 300.0:
-   max_cont = 255.0
-   min_cont = 215.0
-   lev_space = 2.0
-if float(lev_hPa) >= 300.0 and float(lev_hPa) <700:
-   max_cont = 280.0
-   min_cont = 240.0
-   lev_space = 2.0
-if float(lev_hPa) >=700:
-   max_cont = 305.0
-   min_cont = 265.0
-   lev_space = 2.0
-
-
-res.cnLevelSelectionMode = "ManualLevels"
-res.cnMinLevelValF       = min_cont
-res.cnMaxLevelValF       = max_cont
-res.cnLevelSpacingF      = lev_space
-res.cnLineThicknessF     = 2.5 
-
-# create plot for analysis data
-
-temp_plot = ngl.contour_map(wks,temp,res)
-
-ngl.maximize_plot(wks, temp_plot)
-ngl.draw(temp_plot)
-ngl.frame(wks)
-
-ngl.destroy(wks)
-del res
+         if float(lev_hPa) < 300.0:
+            max_cont = 255.0
+            min_cont = 215.0
+            lev_space = 2.0
+         if float(lev_hPa) >= 300.0 and float(lev_hPa) <700:
+            max_cont = 280.0
+            min_cont = 240.0
+            lev_space = 2.0
+         if float(lev_hPa) >=700:
+            max_cont = 305.0
+            min_cont = 265.0
+            lev_space = 2.0
 
-###################################################################################################
-
-# open forecast file
-
-f_fili = "GFS_forecast_%s_%s.nc" % (init_dt[:8], init_dt[8:10])
-forecast = nio.open_file(diri+f_fili)
+         res.cnLevelSelectionMode = "ManualLevels"
+         res.cnMinLevelValF       = min_cont
+         res.cnMaxLevelValF       = max_cont
+         res.cnLevelSpacingF      = lev_space
+         res.cnLineThicknessF     = 2.5
 
-# loop through forecast times
+      # create geopotential plots for forecast times
 
-for i in range(0, len(fore)):
+         temp_plot = ngl.contour_map(wks,temp,res)
 
-# create string for valid time
+         ngl.maximize_plot(wks, temp_plot)
+         ngl.draw(temp_plot)
+         ngl.frame(wks)
 
-   valid_date = (datetime.datetime(int(init_dt[:4]), int(init_dt[4:6]), int(init_dt[6:8]), int(init_dt[8:10])) + datetime.timedelta(hours=int(fore[i]))).strftime("%Y%m%d%H")
 
-# read in temperature and convert to potential temperature, checking whether box crosses Greenwich Meridian.
+         ngl.destroy(wks)
+         del res
 
-   if (np.sign(lonbl) + np.sign(lontr)) >= -1 and (np.sign(lonbl) + np.sign(lontr)) <= 1:
 
-      temp1 = forecast.variables["TMP_P0_L100_GLL0"][i,lev_index,:,:]
-      temp_temp1 = temp1[lat_box1:lat_box2,0:lon_box1]
-      temp_temp2 = temp1[lat_box1:lat_box2,lon_box2:lon_box3]
-      temp = np.concatenate((temp_temp2,temp_temp1),axis=1)
-      del temp1
-      del temp_temp1
-      del temp_temp2
-      temp = smth9(temp, 0.5, 0.25)
-
-   else:
+   os.system('mogrify -trim *_'+region+'_'+init_dt[0:10]+'_temperature_'+lev_hPa+'hPa.png')
+   #if region == "WA" or region == "unknownWA":
+   #   os.system('mogrify -resize 886x600 *_'+region+'_'+init_dt[0:10]+'_temperature_'+lev_hPa+'hPa.png')
+   #elif region == "EA" or region == "unknownEA":
+   #   os.system('mogrify -resize 600x733 *_'+region+'_'+init_dt[0:10]+'_temperature_'+lev_hPa+'hPa.png')
+
+   os.system('mv *_'+region+'_'+init_dt[0:10]+'_temperature_'+lev_hPa+'hPa.png %s/MARTIN/GFS/'%(GFS_dir)+region+'/'+init_dt[0:10]+'/temperature_'+lev_hPa)
+
+   os.system('mogrify -trim *'+region+'_*temperature_'+lev_hPa+'hPa_'+init_dt[0:10]+'*.png')
+   #if region == "WA" or region == "unknownWA":
+   #   os.system('mogrify -resize 886x600 *'+region+'_*temperature_'+lev_hPa+'hPa_'+init_dt[0:10]+'*.png')
+   #elif region == "EA" or region == "unknownEA":
+   #   os.system('mogrify -resize 600x733 *'+region+'_*temperature_'+lev_hPa+'hPa_'+init_dt[0:10]+'*.png')
+
+   os.system('mv *'+region+'_*temperature_'+lev_hPa+'hPa_'+init_dt[0:10]+'*.png %s/MARTIN/GFS/'%(GFS_dir)+region+'/'+init_dt[0:10]+'/temperature_'+lev_hPa)
+
+###################################################################################################
 
-      temp1 = forecast.variables["TMP_P0_L100_GLL0"][i,lev_index,:,:]
-      temp = temp1[lat_box1:lat_box2,lon_box1:lon_box2]
-      del temp1
-      temp = smth9(temp, 0.5, 0.25)
-
-# open workspace for forecast plots
-
-   wks_type = "png"
-   wks = ngl.open_wks(wks_type, "GFSforecast_%s_%s_temperature_%shPa_%s_%03d" % (region, valid_date, lev_hPa, init_dt[0:10], fore[i]))
-
-# define resources for forecast plots
-
-   res = ngl.Resources()
-   res.nglDraw  = False
-   res.nglFrame = False
-
-   res.mpGridAndLimbOn        = False
-   res.pmTickMarkDisplayMode = "Never"
-
-   res.cnInfoLabelOn              = False
-   res.cnLineLabelsOn             = True
-   res.cnFillOn                   = True
-   res.cnInfoLabelOn              = False
-   res.cnLineLabelBackgroundColor = -1
-   res.cnLineLabelDensityF        = 0.8
-   res.cnLineLabelFontColor       = "Black"
-   res.cnLineLabelFontHeightF     = 0.015
-   res.cnLineLabelPerimOn         = False
-   res.cnLineLabelsOn             = True
-   res.cnLinesOn                  = True
-   res.cnMonoLineLabelFontColor   = True
-
-   res.lbAutoManage          = False
-   res.lbLabelFontHeightF         = 0.005
-   res.lbOrientation              = "horizontal"
-   res.lbLabelAngleF              = 45
-   res.pmLabelBarOrthogonalPosF = -1.
-   res.pmLabelBarParallelPosF = 0.25
-   res.pmLabelBarWidthF      = 0.3
-   res.pmLabelBarHeightF     = 0.1
-   res.lbTitleString         = "%shPa temperature" % (lev_hPa)
-   res.lbTitleFontHeightF   = 0.0125
-
-
-   res.sfXArray = lon2d
-   res.sfYArray = lat2d
-
-   res.mpProjection              = "CylindricalEquidistant"
-   res.mpLimitMode = "LatLon"    # Limit the map view.
-   res.mpMinLonF   = lontr
-   res.mpMaxLonF   = lonbl
-   res.mpMinLatF   = lattr
-   res.mpMaxLatF   = latbl
-   res.mpPerimOn   = True
-   res.mpOutlineBoundarySets     = "AllBoundaries"
-   res.mpNationalLineColor       = "gray40"
-   res.mpNationalLineThicknessF  = 1.5
-   res.mpGeophysicalLineColor    = "gray40"
-   res.mpGeophysicalLineThicknessF = 1.5
-   res.cnMonoLineColor           = True
-
-   if float(lev_hPa) < 300.0:
-      max_cont = 255.0
-      min_cont = 215.0
-      lev_space = 2.0
-   if float(lev_hPa) >= 300.0 and float(lev_hPa) <700:
-      max_cont = 280.0
-      min_cont = 240.0
-      lev_space = 2.0
-   if float(lev_hPa) >=700:
-      max_cont = 305.0
-      min_cont = 265.0
-      lev_space = 2.0
-
-   res.cnLevelSelectionMode = "ManualLevels"
-   res.cnMinLevelValF       = min_cont
-   res.cnMaxLevelValF       = max_cont
-   res.cnLevelSpacingF      = lev_space
-   res.cnLineThicknessF     = 2.5
-
-# create geopotential plots for forecast times
-
-   temp_plot = ngl.contour_map(wks,temp,res)
-
-   ngl.maximize_plot(wks, temp_plot)
-   ngl.draw(temp_plot)
-   ngl.frame(wks)
-
-
-   ngl.destroy(wks)
-   del res
-
-
-os.system('mogrify -trim *_'+region+'_'+init_dt[0:10]+'_temperature_'+lev_hPa+'hPa.png')
-#if region == "WA" or region == "unknownWA":
-#   os.system('mogrify -resize 886x600 *_'+region+'_'+init_dt[0:10]+'_temperature_'+lev_hPa+'hPa.png')
-#elif region == "EA" or region == "unknownEA":
-#   os.system('mogrify -resize 600x733 *_'+region+'_'+init_dt[0:10]+'_temperature_'+lev_hPa+'hPa.png')
-
-os.system('mv *_'+region+'_'+init_dt[0:10]+'_temperature_'+lev_hPa+'hPa.png %s/MARTIN/GFS/'%(GFS_dir)+region+'/'+init_dt[0:10]+'/temperature_'+lev_hPa)
-
-os.system('mogrify -trim *'+region+'_*temperature_'+lev_hPa+'hPa_'+init_dt[0:10]+'*.png')
-#if region == "WA" or region == "unknownWA":
-#   os.system('mogrify -resize 886x600 *'+region+'_*temperature_'+lev_hPa+'hPa_'+init_dt[0:10]+'*.png')
-#elif region == "EA" or region == "unknownEA":
-#   os.system('mogrify -resize 600x733 *'+region+'_*temperature_'+lev_hPa+'hPa_'+init_dt[0:10]+'*.png')
-
-os.system('mv *'+region+'_*temperature_'+lev_hPa+'hPa_'+init_dt[0:10]+'*.png %s/MARTIN/GFS/'%(GFS_dir)+region+'/'+init_dt[0:10]+'/temperature_'+lev_hPa)
+if __name__ == "__main__":
+   main(*sys.argv[1:7])
@@ -0,0 +1,301 @@
+###################################################################################################
+# Project           : Global Challenges Research Fund (GCRF) African SWIFT (Science for Weather
+#                     Information and Forecasting Techniques.
+#
+# Program name      : test_gfs_download.py
+#
+# Author            : Alexander J. Roberts, University of Leeds, NCAS
+#
+# Date created      : Oct 2026
+#
+# Purpose           : Tests of gfs_download.py and idx_download.py against the stand-in server of
+#                     idx_download.py (RangeHandler) serving small made-up GRIB2 files: the
+#                     selection of the messages and byte ranges from an .idx inventory, whole file
+#                     and selected message downloads, carrying on after the server closes the
+#                     connection part way through a response (with and without a Content-Length)
+#                     and downloading several lead times at once. Only needs the standard library.
+#
+# Revision History  :
+#
+# Usage             : Run from the python directory
+#                     "python3 -m unittest test_gfs_download"
+###################################################################################################
+
+import os
+import struct
+import shutil
+import tempfile
+import threading
+import unittest
+import urllib.parse
+
+import grib_cache
+import gfs_download
+import idx_download
+
+init_dt = "2020022106"
+
+# made-up GRIB2 message, the indicator section (GRIB, 4 bytes, 8 byte length), a body and 7777
+
+def message(var, size):
+
+   body = (var.encode("ascii")*size)[:size]
+
+   return b"GRIB"+b"\x00\x00\x00\x02"+struct.pack(">Q", 16+size+4)+body+b"7777"
+
+# GRIB2 file of made-up messages and its .idx inventory
+
+def grib_file(messages):
+
+   data = b""
+   lines = []
+   for i, (var, level, size) in enumerate(messages):
+      lines.append("%d:%d:d=%s:%s:%s:3 hour fcst:" % (i+1, len(data), init_dt, var, level))
+      data = data+message(var, size)
+
+   return data, "\n".join(lines)+"\n"
+
+fields = [("TMP", "500 mb", 3000), ("TMP", "850 mb", 3000), ("UGRD", "500 mb", 5000),
+          ("PRATE", "surface", 2000), ("VGRD", "500 mb", 5000)]
+
+# messages of a file on the stand-in server the pairs select
+
+def messages(name, pairs):
+
+   f = open("%s/%s.idx" % (Handler.root, name))
+   text = f.read()
+   f.close()
+
+   return idx_download.select(idx_download.read_inventory(text), pairs)
+
+###################################################################################################
+
+# stand-in server rooted at a directory of its own (the downloads are written to the working
+# directory), truncate is the number of responses still to be cut short to the fraction keep of
+# their length. With length False the cut responses are sent without a Content-Length, so the client
+# only sees the connection closing.
+
+class Handler(idx_download.RangeHandler):
+
+   root = None
+   truncate = 0
+   keep = 0.5
+   length = True
+
+   def log_message(self, *args):
+      pass
+
+   def translate_path(self, path):
+      return os.path.join(self.root, urllib.parse.urlsplit(path).path.lstrip("/"))
+
+   def send_header(self, keyword, value):
+      if keyword == "Content-Length" and self.cut and not Handler.length:
+         return
+      idx_download.RangeHandler.send_header(self, keyword, value)
+
+   def send_head(self):
+      self.cut = Handler.truncate > 0 and not self.path.endswith(".idx") and "Range" in self.headers
+      part = idx_download.RangeHandler.send_head(self)
+      if self.cut and part is not None:
+         Handler.truncate = Handler.truncate-1
+         part.length = int(part.length*Handler.keep)
+         self.close_connection = True
+      return part
+
+class DownloadTest(unittest.TestCase):
+
+   @classmethod
+   def setUpClass(cls):
+
+      cls.tmp = tempfile.mkdtemp()
+      Handler.root = cls.tmp+"/srv"
+      os.makedirs(Handler.root)
+
+      cls.files = {}
+      for i, lead in enumerate(["000", "003", "006", "009"]):
+         data, idx = grib_file([(var, level, size+100*i) for var, level, size in fields])
+         cls.files[lead] = data
+         f = open("%s/%s" % (Handler.root, idx_download.grib_name(init_dt, lead)), "wb")
+         f.write(data)
+         f.close()
+         f = open("%s/%s.idx" % (Handler.root, idx_download.grib_name(init_dt, lead)), "w")
+         f.write(idx)
+         f.close()
+
+      cls.server = idx_download.ThreadingServer(("127.0.0.1", 0), Handler)
+      cls.thread = threading.Thread(target=cls.server.serve_forever)
+      cls.thread.daemon = True
+      cls.thread.start()
+      cls.base = "http://127.0.0.1:%d/" % (cls.server.server_address[1])
+
+      cls.cwd = os.getcwd()
+      cls.quota = grib_cache.quota
+      grib_cache.quota = 0.0
+
+   @classmethod
+   def tearDownClass(cls):
+
+      for server in gfs_download.servers:
+         server.close()
+      cls.server.shutdown()
+      cls.server.server_close()
+      grib_cache.quota = cls.quota
+      shutil.rmtree(cls.tmp)
+
+   def setUp(self):
+
+      self.out = tempfile.mkdtemp(dir=self.tmp)
+      os.chdir(self.out)
+      Handler.truncate = 0
+      Handler.keep = 0.5
+      Handler.length = True
+
+   def tearDown(self):
+
+      os.chdir(self.cwd)
+
+   def read(self, lead):
+
+      f = open(idx_download.grib_name(init_dt, lead), "rb")
+      data = f.read()
+      f.close()
+
+      return data
+
+   # the messages of a file the pairs select, as idx_download.py downloads them
+
+   def selected(self, lead, pairs):
+
+      data = self.files[lead]
+      return b"".join(data[start:(len(data) if end is None else end+1)] for start, end, var, level in messages(idx_download.grib_name(init_dt, lead), pairs))
+
+###################################################################################################
+
+   def test_byte_ranges(self):
+
+      data, idx = grib_file(fields)
+      messages = idx_download.read_inventory(idx)
+      self.assertEqual(messages[-1][1], None)
+      self.assertEqual(messages[0][1]+1, messages[1][0])
+
+      pairs = idx_download.wanted(["TMP_P0_L100_GLL0", "UGRD_P0_L100_GLL0", "VGRD_P0_L100_GLL0"])
+      selected = idx_download.select(messages, pairs)
+      self.assertEqual([(var, level) for start, end, var, level in selected], [(var, level) for var, level, size in fields if var != "PRATE"])
+
+      # the TMP and UGRD messages are next to each other and are fetched in one range, the last
+      # message runs to the end of the file
+
+      self.assertEqual(idx_download.byte_ranges(selected), [(0, messages[2][1]), (messages[4][0], None)])
+
+      self.assertEqual(idx_download.select(messages, []), messages)
+
+   def test_remaining(self):
+
+      ranges = [(0, 99), (200, 299), (400, None)]
+      self.assertEqual(gfs_download.remaining(ranges, 0), ranges)
+      self.assertEqual(gfs_download.remaining(ranges, 150), [(250, 299), (400, None)])
+      self.assertEqual(gfs_download.remaining(ranges, 200), [(400, None)])
+      self.assertEqual(gfs_download.remaining(ranges, 250), [(450, None)])
+
+   def test_whole_file(self):
+
+      result = gfs_download.download(self.base, init_dt, "003", None)
+      self.assertEqual(result, (len(self.files["003"]), len(self.files["003"]), len(self.files["003"])))
+      self.assertEqual(self.read("003"), self.files["003"])
+      self.assertFalse(os.path.exists(idx_download.grib_name(init_dt, "003")+".part"))
+
+   def test_selected_messages(self):
+
+      pairs = idx_download.wanted(["TMP_P0_L100_GLL0", "VGRD_P0_L100_GLL0"])
+      result = gfs_download.download(self.base, init_dt, "006", pairs)
+      self.assertIsNotNone(result)
+      self.assertEqual(self.read("006"), self.selected("006", pairs))
+      self.assertTrue(idx_download.valid_grib_file(idx_download.grib_name(init_dt, "006")))
+
+   def test_not_on_server(self):
+
+      self.assertIsNone(gfs_download.download(self.base, init_dt, "012", None))
+      self.assertFalse(os.path.exists(idx_download.grib_name(init_dt, "012")+".part"))
+
+   # the server closes the connection half way through the file, the .part file is kept and the
+   # next attempt carries on from its last byte
+
+   def test_whole_file_truncated(self):
+
+      name = idx_download.grib_name(init_dt, "003")
+      Handler.truncate = 1
+      self.assertIsNone(gfs_download.download(self.base, init_dt, "003", None))
+      self.assertFalse(os.path.exists(name))
+      size = os.path.getsize(name+".part")
+      self.assertTrue(0 < size < len(self.files["003"]))
+
+      result = gfs_download.download(self.base, init_dt, "003", None)
+      self.assertEqual(result, (len(self.files["003"])-size, len(self.files["003"]), len(self.files["003"])))
+      self.assertEqual(self.read("003"), self.files["003"])
+
+   # as above without a Content-Length in the cut response, a range that stops at the end of a
+   # message still leaves a file of complete GRIB2 messages, which must not be taken as complete
+
+   def test_selected_messages_truncated(self):
+
+      name = idx_download.grib_name(init_dt, "009")
+      pairs = idx_download.wanted(["TMP_P0_L100_GLL0", "UGRD_P0_L100_GLL0", "VGRD_P0_L100_GLL0"])
+      Handler.truncate = 1
+      Handler.length = False
+      self.assertIsNone(gfs_download.download(self.base, init_dt, "009", pairs))
+      self.assertFalse(os.path.exists(name))
+      self.assertTrue(os.path.getsize(name+".part") > 0)
+
+      self.assertIsNotNone(gfs_download.download(self.base, init_dt, "009", pairs))
+      self.assertEqual(self.read("009"), self.selected("009", pairs))
+
+      # the connection closes before the last range, the file is then complete GRIB2 messages but
+      # not all of them
+
+      os.remove(name)
+      ranges = idx_download.byte_ranges(messages(name, pairs))
+      f = open(name+".part", "wb")
+      f.write(self.files["009"][ranges[0][0]:ranges[0][1]+1])
+      f.close()
+      self.assertTrue(idx_download.valid_grib_file(name+".part"))
+      Handler.truncate = 1
+      Handler.keep = 0.0
+      self.assertIsNone(gfs_download.download(self.base, init_dt, "009", pairs))
+      self.assertFalse(os.path.exists(name))
+
+      self.assertIsNotNone(gfs_download.download(self.base, init_dt, "009", pairs))
+      self.assertEqual(self.read("009"), self.selected("009", pairs))
+
+   # a .part file that already holds the whole file gets a 416 from the server and is complete
+
+   def test_part_complete(self):
+
+      name = idx_download.grib_name(init_dt, "000")
+      f = open(name+".part", "wb")
+      f.write(self.files["000"])
+      f.close()
+
+      result = gfs_download.download(self.base, init_dt, "000", None)
+      self.assertEqual(result[:2], (0, len(self.files["000"])))
+      self.assertEqual(self.read("000"), self.files["000"])
+
+   def test_download_all(self):
+
+      connections = gfs_download.connections
+      gfs_download.connections = 2
+      try:
+         base = idx_download.url
+         idx_download.url = self.base
+         try:
+            results = gfs_download.download_all(init_dt, ["000", "003", "006", "009"], None)
+         finally:
+            idx_download.url = base
+      finally:
+         gfs_download.connections = connections
+
+      self.assertEqual(results, [True, True, True, True])
+      for lead in ["000", "003", "006", "009"]:
+         self.assertEqual(self.read(lead), self.files[lead])
+
+if __name__ == "__main__":
+   unittest.main()
@@ -0,0 +1,131 @@
+###################################################################################################
+# Project           : Global Challenges Research Fund (GCRF) African SWIFT (Science for Weather
+#                     Information and Forecasting Techniques.
+#
+# Program name      : untar_tape.py
+#
+# Author            : Alexander J. Roberts, University of Leeds, NCAS
+#
+# Date created      : Oct 2026
+#
+# Purpose           : Extract the forecast times in the namelist from the tar files of the HAS tape
+#                     orders downloaded by get_GFS_archived_tape.sh. Each tar file is read once,
+#                     from start to end, and the wanted members (gfs_4_YYYYMMDD_HH00_FFF.grb2) are
+#                     written straight to GFS_NWP/YYYYMMDDHH/gfs.tHHz.pgrb2.0p50.fFFF as they go
+#                     past. The tar files are read in parallel by a pool of SWIFT_GFS_UNTAR_WORKERS
+#                     (default 4) processes. The members are added to the local GRIB2 cache and
+#                     those already in it are taken from it, a tar file is not read at all when all
+#                     of its members are in the cache (see grib_cache.py). A line starting with the
+#                     initialisation time is printed as soon as a tar file is done, which
+#                     untar_tape_data.sh uses to start converting that initialisation time while
+#                     the others are still being extracted. The order directories are removed at
+#                     the end. Only needs the standard library so it can run outside the pyn_env
+#                     environment.
+#
+# Revision History  :
+#
+# Usage             : "python3 untar_tape.py GFS_NWP_directory 000 003 006 ..." (see
+#                     untar_tape_data.sh)
+###################################################################################################
+
+import os
+import re
+import sys
+import time
+import shutil
+import tarfile
+from multiprocessing.pool import Pool
+
+import grib_cache
+
+workers = int(os.environ.get("SWIFT_GFS_UNTAR_WORKERS", "4"))
+
+member_name = re.compile(r"gfs_4_(\d{8})_(\d{2})00_(\d{3})\.grb2$")
+
+chunk = 1 << 20
+
+###################################################################################################
+
+def out_path(GFS_NWP, init_dt, lead):
+
+   return "%s/%s/gfs.t%sz.pgrb2.0p50.f%s" % (GFS_NWP, init_dt, init_dt[8:10], lead)
+
+# extract the wanted members of one tar file in a single pass, returns the initialisation time, the
+# number of members extracted and the number taken from the cache
+
+def extract(args):
+
+   GFS_NWP, path, leads = args
+
+   # the tar files are named after their initialisation time (e.g. gfs_4_2019061200.g2.tar), the
+   # members of an initialisation time that are all in the cache are taken from it without reading
+   # the tar file
+
+   init_dt = os.path.basename(path)[6:16]
+   cached = 0
+   if re.match(r"\d{10}$", init_dt):
+      os.makedirs("%s/%s" % (GFS_NWP, init_dt), exist_ok=True)
+      for lead in leads:
+         if grib_cache.fetch(init_dt, lead, "0p50", out_path(GFS_NWP, init_dt, lead)):
+            cached = cached+1
+      if cached == len(leads):
+         return init_dt, 0, cached
+   else:
+      init_dt = None
+
+   extracted = 0
+   tar = tarfile.open(path, "r|*")
+
+   for member in tar:
+      match = member_name.search(member.name)
+      if match is None or match.group(3) not in leads or not member.isfile():
+         continue
+
+      init_dt = match.group(1)+match.group(2)
+      out = out_path(GFS_NWP, init_dt, match.group(3))
+      if os.path.isfile(out):
+         continue
+
+      os.makedirs(os.path.dirname(out), exist_ok=True)
+      src = tar.extractfile(member)
+      f = open(out+".part", "wb")
+      shutil.copyfileobj(src, f, chunk)
+      f.close()
+      os.rename(out+".part", out)
+
+      grib_cache.store(init_dt, match.group(3), "0p50", out)
+      extracted = extracted+1
+
+   tar.close()
+
+   return init_dt, extracted, cached
+
+###################################################################################################
+
+if __name__ == "__main__":
+
+   if len(sys.argv) < 3:
+      sys.exit("Usage: python3 untar_tape.py GFS_NWP_directory XXX [XXX ...]")
+
+   GFS_NWP = sys.argv[1]
+   leads = sys.argv[2:]
+
+   orders = sorted(order for order in os.listdir(GFS_NWP+"/tape") if os.path.isdir(GFS_NWP+"/tape/"+order))
+   paths = []
+   for order in orders:
+      for fil in sorted(os.listdir(GFS_NWP+"/tape/"+order)):
+         if os.path.isfile(GFS_NWP+"/tape/"+order+"/"+fil):
+            paths.append(GFS_NWP+"/tape/"+order+"/"+fil)
+
+   start = time.time()
+   pool = Pool(processes=min(workers, max(len(paths), 1)))
+
+   for init_dt, extracted, cached in pool.imap_unordered(extract, [(GFS_NWP, path, leads) for path in paths]):
+      if init_dt is not None:
+         print("%s %d extracted %d from the cache %.1f s" % (init_dt, extracted, cached, time.time()-start), flush=True)
+
+   pool.close()
+   pool.join()
+
+   for order in orders:
+      shutil.rmtree(GFS_NWP+"/tape/"+order)
@@ -23,6 +23,7 @@ done
 cd ${SWIFT_GFS}/python
 
 find . -mmin +${tim_mins} -type l -name "*.nc" -exec unlink {} \;
+find . -mmin +${tim_mins} -type l -name "*.grib" -exec unlink {} \;
 
 cd ${SWIFT_GFS}/MARTIN
 
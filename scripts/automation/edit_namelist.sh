@@ -23,7 +23,7 @@ then
 elif [ "$HH" -ge  15 ] && [ "$HH" -lt  21 ]
 then
    HH="12"
-elif [ "$HH" -ge  21 ] && [ "$HH" -lt  23 ]
+elif [ "$HH" -ge  21 ] && [ "$HH" -le  23 ]
 then
    HH="18"
 elif [ "$HH" -lt  3 ]
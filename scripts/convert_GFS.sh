@@ -1,6 +1,6 @@
 #!/bin/bash
 
-if [ "$#" -eq  "1" ]
+if [ "$#" -ge  "1" ]
 then
    SWIFT_GFS=$1
    echo "${SWIFT_GFS}"
@@ -8,11 +8,102 @@ else
    echo "Attempting to use existing SWIFT_GFS environment variable"
 fi
 
+# "regions" after the SWIFT_GFS directory also writes compact files for each region in the namelist,
+# holding only the variables and levels its plotting jobs need (see python/extract_regions.py)
+#
+# "grib" after the SWIFT_GFS directory leaves the GRIB2 files as they are and writes manifests and
+# message indexes the plotting scripts read them through (see python/grib_io.py) instead of
+# converting them to netCDF
+#
+# YYYYMMDDHH arguments after the SWIFT_GFS directory convert only those initialisation times (see
+# untar_tape_data.sh), otherwise every directory in GFS_NWP is converted
+
+regions=0
+grib=0
+cycles=""
+
+for arg in "${@:2}"
+do
+   if [ "${arg}" == "regions" ]
+   then
+      regions=1
+   elif [ "${arg}" == "grib" ]
+   then
+      grib=1
+   elif [[ "${arg}" =~ ^[0-9]{10}$ ]]
+   then
+      cycles="${cycles} ${arg}"
+   fi
+done
+
+if [ "${regions}" -eq "1" ] || [ "${grib}" -eq "1" ]
+then
+   export SWIFT_GFS=${SWIFT_GFS}
+   source ~/anaconda3/etc/profile.d/conda.sh #<-- Modify this line if you have anaconda installed anywhere but your home directory.
+   conda activate pyn_env
+fi
+
+# variables selected from the forecast files if the variables needed for plotting cannot be worked
+# out from the namelist
+
+all_vars=TMP_P0_L1_GLL0,TMP_P0_L6_GLL0,TMP_P0_L7_GLL0,TMP_P0_L100_GLL0,TMP_P0_L102_GLL0,TMP_P0_L103_GLL0,TMP_P0_L104_GLL0,TMP_P0_2L108_GLL0,TMP_P0_L109_GLL0,POT_P0_L104_GLL0,DPT_P0_L103_GLL0,APTMP_P0_L103_GLL0,SPFH_P0_L103_GLL0,SPFH_P0_2L108_GLL0,RH_P0_L4_GLL0,RH_P0_L100_GLL0,RH_P0_L103_GLL0,RH_P0_2L104_GLL0,RH_P0_L104_GLL0,RH_P0_2L108_GLL0,RH_P0_L200_GLL0,RH_P0_L204_GLL0,PWAT_P0_L200_GLL0,PRATE_P0_L1_GLL0,PRATE_P8_L1_GLL0_avg,PRATE_P8_L1_GLL0_avg3h,PRATE_P8_L1_GLL0_avg6h,SNOD_P0_L1_GLL0,WEASD_P0_L1_GLL0,CLWMR_P0_L100_GLL0,CLWMR_P0_L105_GLL0,ICMR_P0_L100_GLL0,ICMR_P0_L105_GLL0,RWMR_P0_L100_GLL0,RWMR_P0_L105_GLL0,SNMR_P0_L100_GLL0,SNMR_P0_L105_GLL0,GRLE_P0_L100_GLL0,GRLE_P0_L105_GLL0,CPRAT_P0_L1_GLL0,CPOFP_P0_L1_GLL0,CRAIN_P0_L1_GLL0,CFRZR_P0_L1_GLL0,CICEP_P0_L1_GLL0,CSNOW_P0_L1_GLL0,PEVPR_P0_L1_GLL0,UGRD_P0_L6_GLL0,UGRD_P0_L7_GLL0,UGRD_P0_L100_GLL0,UGRD_P0_L102_GLL0,UGRD_P0_L103_GLL0,UGRD_P0_L104_GLL0,UGRD_P0_2L108_GLL0,UGRD_P0_L109_GLL0,UGRD_P0_L220_GLL0,VGRD_P0_L6_GLL0,VGRD_P0_L7_GLL0,VGRD_P0_L100_GLL0,VGRD_P0_L102_GLL0,VGRD_P0_L103_GLL0,VGRD_P0_L104_GLL0,VGRD_P0_2L108_GLL0,VGRD_P0_L109_GLL0,VGRD_P0_L220_GLL0,VVEL_P0_L100_GLL0,VVEL_P0_L104_GLL0,DZDT_P0_L100_GLL0,ABSV_P0_L100_GLL0,GUST_P0_L1_GLL0,VWSH_P0_L7_GLL0,VWSH_P0_L109_GLL0,USTM_P0_2L103_GLL0,VSTM_P0_2L103_GLL0,VRATE_P0_L220_GLL0,PRES_P0_L1_GLL0,PRES_P0_L6_GLL0,PRES_P0_L7_GLL0,PRES_P0_L103_GLL0,PRES_P0_L109_GLL0,PRES_P0_L242_GLL0,PRES_P0_L243_GLL0,PRMSL_P0_L101_GLL0,ICAHT_P0_L6_GLL0,ICAHT_P0_L7_GLL0,HGT_P0_L1_GLL0,HGT_P0_L4_GLL0,HGT_P0_L6_GLL0,HGT_P0_L7_GLL0,HGT_P0_L100_GLL0,HGT_P0_L109_GLL0,HGT_P0_L204_GLL0,MSLET_P0_L101_GLL0,\5WAVH_P0_L100_GLL0,HPBL_P0_L1_GLL0,PLPL_P0_2L108_GLL0,TCDC_P0_L100_GLL0,TCDC_P0_L244_GLL0,CWAT_P0_L200_GLL0,SUNSD_P0_L1_GLL0,CAPE_P0_L1_GLL0,CAPE_P0_2L108_GLL0,CIN_P0_L1_GLL0,CIN_P0_2L108_GLL0,HLCY_P0_2L103_GLL0,LFTX_P0_L1_GLL0,\4LFTX_P0_L1_GLL0,TOZNE_P0_L200_GLL0,O3MR_P0_L100_GLL0,REFC_P0_L10_GLL0,VIS_P0_L1_GLL0,ICSEV_P0_L100_GLL0,LAND_P0_L1_GLL0,TSOIL_P0_2L106_GLL0,SOILW_P0_2L106_GLL0,WILT_P0_L1_GLL0,FLDCP_P0_L1_GLL0,HINDEX_P0_L1_GLL0
+
+# number of GRIB2 files converted at the same time (set SWIFT_GFS_CONVERT_WORKERS to change it)
+
+workers=${SWIFT_GFS_CONVERT_WORKERS:-4}
+
+# seconds between two times from date +%s.%N
+
+elapsed()
+{
+   awk -v start=$1 -v end=$2 'BEGIN { printf "%.1f", end-start }'
+}
+
+# convert one GRIB2 file of a cycle to netCDF, the analysis (f000) is renamed and the forecast
+# steps are cut down to the variables the plotting scripts in the namelist need (see
+# python/conversion_vars.py), all_vars if they cannot be worked out. Prints the time taken by each
+# part for the timing report.
+
+convert_file()
+{
+   file=$( basename $1 .grb2 )
+
+   start=$( date +%s.%N )
+   ncl_convert2nc ${file}.grb2 > /dev/null
+   rm ${file}.grb2
+   converted=$( date +%s.%N )
+
+   if [ "${file}" == "gfs.t${HH}z.pgrb2.0p50.f000" ]
+   then
+      mv ${file}.nc analysis_gfs_4_${YYYY}${MM}${DD}_${HH}00_000.nc
+   else
+      vars=$( SWIFT_GFS=${SWIFT_GFS} python3 ${SWIFT_GFS}/python/conversion_vars.py $( cdo -s showname ${file}.nc ) )
+      if [ -z "${vars}" ]
+      then
+         vars=${all_vars}
+      fi
+
+      cdo -s select,name=${vars} ${file}.nc new_${file}.nc
+      rm ${file}.nc
+   fi
+   selected=$( date +%s.%N )
+
+   echo "${file} $( elapsed ${start} ${converted} ) $( elapsed ${converted} ${selected} )"
+}
+
+export -f elapsed convert_file
+export SWIFT_GFS all_vars
+
 cd ${SWIFT_GFS}/GFS_NWP
 
 for date in */
 do
 
+   if [ -n "${cycles}" ] && ! [[ " ${cycles} " == *" $( basename ${date} ) "* ]]
+   then
+      continue
+   fi
+
    if ! [ $( basename ${date} ) == "tape"  ]
    then  
       date=$( basename ${date} )
@@ -23,29 +114,52 @@ do
 
       cd ${SWIFT_GFS}/GFS_NWP/${date}
 
-      for file in gfs*
-      do
-         mv ${file} ${file}.grb2
-      done
-
-      echo $NCARG_ROOT
-      ncl_convert2nc gfs.t${HH}z.pgrb2.0p50.f000.grb2
-      
-      mv gfs.t${HH}z.pgrb2.0p50.f000.nc analysis_gfs_4_${YYYY}${MM}${DD}_${HH}00_000.nc
-      rm gfs.t${HH}z.pgrb2.0p50.f000.grb2
-  
-      ncl_convert2nc *.grb2
-      rm *.grb2
-      for file in gfs*.nc
-      do
-         cdo select,name=TMP_P0_L1_GLL0,TMP_P0_L6_GLL0,TMP_P0_L7_GLL0,TMP_P0_L100_GLL0,TMP_P0_L102_GLL0,TMP_P0_L103_GLL0,TMP_P0_L104_GLL0,TMP_P0_2L108_GLL0,TMP_P0_L109_GLL0,POT_P0_L104_GLL0,DPT_P0_L103_GLL0,APTMP_P0_L103_GLL0,SPFH_P0_L103_GLL0,SPFH_P0_2L108_GLL0,RH_P0_L4_GLL0,RH_P0_L100_GLL0,RH_P0_L103_GLL0,RH_P0_2L104_GLL0,RH_P0_L104_GLL0,RH_P0_2L108_GLL0,RH_P0_L200_GLL0,RH_P0_L204_GLL0,PWAT_P0_L200_GLL0,PRATE_P0_L1_GLL0,PRATE_P8_L1_GLL0_avg,PRATE_P8_L1_GLL0_avg3h,PRATE_P8_L1_GLL0_avg6h,SNOD_P0_L1_GLL0,WEASD_P0_L1_GLL0,CLWMR_P0_L100_GLL0,CLWMR_P0_L105_GLL0,ICMR_P0_L100_GLL0,ICMR_P0_L105_GLL0,RWMR_P0_L100_GLL0,RWMR_P0_L105_GLL0,SNMR_P0_L100_GLL0,SNMR_P0_L105_GLL0,GRLE_P0_L100_GLL0,GRLE_P0_L105_GLL0,CPRAT_P0_L1_GLL0,CPOFP_P0_L1_GLL0,CRAIN_P0_L1_GLL0,CFRZR_P0_L1_GLL0,CICEP_P0_L1_GLL0,CSNOW_P0_L1_GLL0,PEVPR_P0_L1_GLL0,UGRD_P0_L6_GLL0,UGRD_P0_L7_GLL0,UGRD_P0_L100_GLL0,UGRD_P0_L102_GLL0,UGRD_P0_L103_GLL0,UGRD_P0_L104_GLL0,UGRD_P0_2L108_GLL0,UGRD_P0_L109_GLL0,UGRD_P0_L220_GLL0,VGRD_P0_L6_GLL0,VGRD_P0_L7_GLL0,VGRD_P0_L100_GLL0,VGRD_P0_L102_GLL0,VGRD_P0_L103_GLL0,VGRD_P0_L104_GLL0,VGRD_P0_2L108_GLL0,VGRD_P0_L109_GLL0,VGRD_P0_L220_GLL0,VVEL_P0_L100_GLL0,VVEL_P0_L104_GLL0,DZDT_P0_L100_GLL0,ABSV_P0_L100_GLL0,GUST_P0_L1_GLL0,VWSH_P0_L7_GLL0,VWSH_P0_L109_GLL0,USTM_P0_2L103_GLL0,VSTM_P0_2L103_GLL0,VRATE_P0_L220_GLL0,PRES_P0_L1_GLL0,PRES_P0_L6_GLL0,PRES_P0_L7_GLL0,PRES_P0_L103_GLL0,PRES_P0_L109_GLL0,PRES_P0_L242_GLL0,PRES_P0_L243_GLL0,PRMSL_P0_L101_GLL0,ICAHT_P0_L6_GLL0,ICAHT_P0_L7_GLL0,HGT_P0_L1_GLL0,HGT_P0_L4_GLL0,HGT_P0_L6_GLL0,HGT_P0_L7_GLL0,HGT_P0_L100_GLL0,HGT_P0_L109_GLL0,HGT_P0_L204_GLL0,MSLET_P0_L101_GLL0,\5WAVH_P0_L100_GLL0,HPBL_P0_L1_GLL0,PLPL_P0_2L108_GLL0,TCDC_P0_L100_GLL0,TCDC_P0_L244_GLL0,CWAT_P0_L200_GLL0,SUNSD_P0_L1_GLL0,CAPE_P0_L1_GLL0,CAPE_P0_2L108_GLL0,CIN_P0_L1_GLL0,CIN_P0_2L108_GLL0,HLCY_P0_2L103_GLL0,LFTX_P0_L1_GLL0,\4LFTX_P0_L1_GLL0,TOZNE_P0_L200_GLL0,O3MR_P0_L100_GLL0,REFC_P0_L10_GLL0,VIS_P0_L1_GLL0,ICSEV_P0_L100_GLL0,LAND_P0_L1_GLL0,TSOIL_P0_2L106_GLL0,SOILW_P0_2L106_GLL0,WILT_P0_L1_GLL0,FLDCP_P0_L1_GLL0,HINDEX_P0_L1_GLL0 ${file} new_${file}
-         rm ${file} 
-      done
-   
-      cdo cat new_gfs*.nc GFS_forecast_${YYYY}${MM}${DD}"_"${HH}".nc" 
-      rm new_gfs.t*.nc
-
-      ln -s ${SWIFT_GFS}/GFS_NWP/${YYYY}${MM}${DD}${HH}/GFS_forecast_${YYYY}${MM}${DD}_${HH}.nc ${SWIFT_GFS}/python/.
-      ln -s ${SWIFT_GFS}/GFS_NWP/${YYYY}${MM}${DD}${HH}/analysis_gfs_4_${YYYY}${MM}${DD}_${HH}00_000.nc ${SWIFT_GFS}/python/.
+      if [ "${grib}" -eq "1" ]
+      then
+         python3 ${SWIFT_GFS}/python/grib_io.py ${YYYY}${MM}${DD}${HH}
+
+         ln -sf ${SWIFT_GFS}/GFS_NWP/${YYYY}${MM}${DD}${HH}/GFS_forecast_${YYYY}${MM}${DD}_${HH}.grib ${SWIFT_GFS}/python/.
+         ln -sf ${SWIFT_GFS}/GFS_NWP/${YYYY}${MM}${DD}${HH}/analysis_gfs_4_${YYYY}${MM}${DD}_${HH}00_000.grib ${SWIFT_GFS}/python/.
+      else
+         for file in gfs*
+         do
+            mv ${file} ${file}.grb2
+         done
+
+         echo $NCARG_ROOT
+
+         # the GRIB2 files are converted by a pool of workers, then the forecast steps are put
+         # together in one file. The time taken by each step is written to conversion_times.txt.
+
+         export YYYY MM DD HH
+         cycle_start=$( date +%s.%N )
+
+         echo "file convert(s) select(s)" > conversion_times.txt
+         ls gfs*.grb2 | xargs -P ${workers} -I {} bash -c 'convert_file {}' | sort >> conversion_times.txt
+         converted=$( date +%s.%N )
+
+         cdo cat new_gfs*.nc GFS_forecast_${YYYY}${MM}${DD}"_"${HH}".nc"
+         rm new_gfs.t*.nc
+         merged=$( date +%s.%N )
+
+         echo "workers ${workers} conversion $( elapsed ${cycle_start} ${converted} ) merge $( elapsed ${converted} ${merged} ) total $( elapsed ${cycle_start} ${merged} )" >> conversion_times.txt
+         cat conversion_times.txt
+
+         ln -s ${SWIFT_GFS}/GFS_NWP/${YYYY}${MM}${DD}${HH}/GFS_forecast_${YYYY}${MM}${DD}_${HH}.nc ${SWIFT_GFS}/python/.
+         ln -s ${SWIFT_GFS}/GFS_NWP/${YYYY}${MM}${DD}${HH}/analysis_gfs_4_${YYYY}${MM}${DD}_${HH}00_000.nc ${SWIFT_GFS}/python/.
+      fi
+
+      if [ "${regions}" -eq "1" ]
+      then
+         python3 ${SWIFT_GFS}/python/extract_regions.py ${YYYY}${MM}${DD}${HH}
+
+         for file in GFS_forecast_${YYYY}${MM}${DD}_${HH}_*.nc analysis_gfs_4_${YYYY}${MM}${DD}_${HH}00_000_*.nc
+         do
+            if [ -f ${file} ]
+            then
+               ln -sf ${SWIFT_GFS}/GFS_NWP/${YYYY}${MM}${DD}${HH}/${file} ${SWIFT_GFS}/python/.
+            fi
+         done
+      fi
    fi
 done
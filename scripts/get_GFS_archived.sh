@@ -37,20 +37,45 @@ FORE_TERMS="000 "$( cat ${SWIFT_GFS}/controls/namelist | grep "fore:" | awk -F:
 YYYY=${YYYYMMDD:0:4}
 MM=${YYYYMMDD:4:2}
 
-#Connect to NCEP to download NWP-GFS files
+#Connect to NCEP to download NWP-GFS files, files downloaded before are taken from the local cache
+#and new ones are added to it (see python/grib_cache.py)
 missing_flag="0"
 for f in $FORE_TERMS
 do
+   file=gfs.t${HH}z.pgrb2.0p50.f${f}
+
+   if [ -f ${file} ] || SWIFT_GFS=${SWIFT_GFS} python3 ${SWIFT_GFS}/python/grib_cache.py get ${YYYYMMDD}${HH} ${f} 0p50 ${file}
+   then
+      continue
+   fi
+
    if curl --no-keepalive --output /dev/null --silent --head --fail "ftp://nomads.ncdc.noaa.gov/GFS/Grid4/${YYYY}${MM}/${YYYYMMDD}/gfs_4_${YYYYMMDD}_${HH}00_${f}.grb2"
    then
-      curl --no-keepalive "ftp://nomads.ncdc.noaa.gov/GFS/Grid4/${YYYY}${MM}/${YYYYMMDD}/gfs_4_${YYYYMMDD}_${HH}00_${f}.grb2" -o "gfs.t${HH}z.pgrb2.0p50.f${f}"
+      curl --no-keepalive --fail "ftp://nomads.ncdc.noaa.gov/GFS/Grid4/${YYYY}${MM}/${YYYYMMDD}/gfs_4_${YYYYMMDD}_${HH}00_${f}.grb2" -o "${file}.part"
+      status=$?
    elif curl --no-keepalive --output /dev/null --silent --head --fail curl "https://www.ncei.noaa.gov/thredds/fileServer/gfs-004-files/"$YYYY$MM"/"$YYYYMMDD"/gfs_4_"$YYYYMMDD"_"$HH"00_"$f".grb2"
    then
-      curl --no-keepalive "https://www.ncei.noaa.gov/thredds/fileServer/gfs-004-files/"$YYYY$MM"/"$YYYYMMDD"/gfs_4_"$YYYYMMDD"_"$HH"00_"$f".grb2" -o "gfs.t${HH}z.pgrb2.0p50.f${f}"
+      curl --no-keepalive --fail "https://www.ncei.noaa.gov/thredds/fileServer/gfs-004-files/"$YYYY$MM"/"$YYYYMMDD"/gfs_4_"$YYYYMMDD"_"$HH"00_"$f".grb2" -o "${file}.part"
+      status=$?
    else
-      echo "gfs.t${HH}z.pgrb2.0p50.f${f} not in archive"
+      echo "${file} not in archive"
+      missing_flag="1"
+      continue
+   fi
+
+   # a failed or cut short download is not kept (nor cached), only complete GRIB2 files are
+   # renamed to their final name
+
+   if [ ${status} -ne 0 ] || ! python3 ${SWIFT_GFS}/python/idx_download.py check ${file}.part
+   then
+      echo "${file} download failed"
+      rm -f ${file}.part
       missing_flag="1"
+      continue
    fi
+
+   mv ${file}.part ${file}
+   SWIFT_GFS=${SWIFT_GFS} python3 ${SWIFT_GFS}/python/grib_cache.py put ${YYYYMMDD}${HH} ${f} 0p50 ${file}
 done
 
 if [ ${missing_flag} == "1" ]
@@ -3,7 +3,7 @@
 # Script for downloading GFS forecast data (GRIB files).
 #
 
-if [ "$#" -eq  "1" ]
+if [ "$#" -ge  "1" ]
 then
    SWIFT_GFS=$1
    echo "${SWIFT_GFS}"
@@ -11,6 +11,17 @@ else
    echo "Attempting to use existing SWIFT_GFS environment variable"
 fi
 
+# "idx" as the second argument downloads only the GRIB2 messages the plotting scripts in the
+# namelist need, with HTTP range requests worked out from the .idx files (see
+# python/idx_download.py), rather than the whole files
+
+if [ "$#" -ge  "2" ] && [ "$2" == "idx" ]
+then
+   idx="idx"
+else
+   idx=""
+fi
+
 #If GFS_NWP directory does not exist create it and navigate to it
 
 if [ ! -d ${SWIFT_GFS}/GFS_NWP ];
@@ -55,79 +66,11 @@ HHcode="t"$HH"0"
 mkdir ${YYYYMMDD}${HH}
 cd ${YYYYMMDD}${HH}
 
-# name FTP batch file for latest date and time
-FTP_BATCH=get_GFS.batch${YYYYMMDD}${HH}
-
-#Forecast terms (hours) and model resolution (degrees)
+#Forecast terms (hours)
 FORE_TERMS="000 "$( cat ${SWIFT_GFS}/controls/namelist | grep "fore:" | awk -F: '{print $2}' | tr ',' ' ')
-RESOL=0p50
-
-EMAIL="your_email_here"
-
-# echo commands to connect to NCEP to download latest GFS data to the FTP batch file named above make the FTP batch fiel executable and run it
-echo ftp -p -v -n ftp.ncep.noaa.gov \<\< \\FINFTP > $FTP_BATCH
-echo user anonymous $EMAIL >> $FTP_BATCH
-echo bin >> $FTP_BATCH
-echo prompt >> $FTP_BATCH
-echo cd pub/data/nccf/com/gfs/prod >> $FTP_BATCH
-echo cd gfs.$YYYYMMDD >> $FTP_BATCH
-echo cd $HH >> $FTP_BATCH
-for f in $FORE_TERMS
-do
-  echo get gfs.t${HH}z.pgrb2.${RESOL}.f${f} >> $FTP_BATCH
-done
-echo close >> $FTP_BATCH
-echo FINFTP >> $FTP_BATCH
-
-chmod 775 $FTP_BATCH
-./$FTP_BATCH
-
-#set counter for attempts to download GFS data
-i="0"
-
-# Start loop to check if all requested files are present after first attempt.
-while [ ${i} -lt 24 ]
-do
-   flag="0"
-   echo ${flag}
-   for f in $FORE_TERMS
-   do
-      if [ ${flag} == "0" ]
-      then
-         if ! [[ -f gfs.t${HH}z.pgrb2.${RESOL}.f${f} ]]
-         then
-            flag="1"
-         fi
-      fi
-   done
 
-   if [ ${flag} == "1" ]
-   then
-      rm -rf $FTP_BATCH
-      echo ftp -p -v -n ftp.ncep.noaa.gov \<\< \\FINFTP > $FTP_BATCH
-      echo user anonymous $EMAIL >> $FTP_BATCH
-      echo bin >> $FTP_BATCH
-      echo prompt >> $FTP_BATCH
-      echo cd pub/data/nccf/com/gfs/prod >> $FTP_BATCH
-      echo cd gfs.$YYYYMMDD >> $FTP_BATCH
-      echo cd $HH >> $FTP_BATCH
-      for f in $FORE_TERMS
-      do
-         if ! [ -f gfs.t${HH}z.pgrb2.${RESOL}.f${f} ]
-         then
-            echo get gfs.t${HH}z.pgrb2.${RESOL}.f${f} >> $FTP_BATCH
-         fi
-      done
-      echo close >> $FTP_BATCH
-      echo FINFTP >> $FTP_BATCH
-      chmod 775 $FTP_BATCH
-      sleep 5m
-      ./$FTP_BATCH
-      i=$(($i + 1))
-      echo $i
-   else
-      i="24"
-   fi
-done
+# the files are downloaded over HTTP a few at a time, each as soon as it is on the NCEP server. The
+# files that are not there yet are tried again every 5 minutes, up to 24 times (see
+# python/gfs_download.py)
 
-rm $FTP_BATCH
+SWIFT_GFS=${SWIFT_GFS} python3 ${SWIFT_GFS}/python/gfs_download.py ${idx} ${YYYYMMDD}${HH} ${FORE_TERMS}
@@ -0,0 +1,177 @@
+#!/bin/bash
+#
+# Script for downloading, converting and plotting the latest GFS forecast one lead time at a time.
+# Each GRIB2 file is plotted as soon as it has arrived (for all the variables and regions in the
+# namelist) while the later lead times are still being downloaded.
+#
+# "grib" after the SWIFT_GFS directory reads the GRIB2 files directly (see python/grib_io.py)
+# rather than converting them to netCDF.
+#
+
+if [ "$#" -ge  "1" ]
+then
+   SWIFT_GFS=$1
+   echo "${SWIFT_GFS}"
+else
+   echo "Attempting to use existing SWIFT_GFS environment variable"
+fi
+
+if [ "$#" -ge  "2" ] && [ "$2" == "grib" ]
+then
+   grib=1
+else
+   grib=0
+fi
+
+export SWIFT_GFS=${SWIFT_GFS}
+source ~/anaconda3/etc/profile.d/conda.sh #<-- Modify this line if you have anaconda installed anywhere but your home directory.
+conda activate pyn_env
+
+#If GFS_NWP directory does not exist create it and navigate to it
+
+if [ ! -d ${SWIFT_GFS}/GFS_NWP ];
+then
+   mkdir ${SWIFT_GFS}/GFS_NWP
+fi
+
+cd ${SWIFT_GFS}/GFS_NWP
+
+#Date for today
+YYYY=`date -u --date='today' +%Y`
+MM=`date -u --date='today' +%m`
+DD=`date -u --date='today' +%d`
+HH=`date -u --date='today' +%H`
+YYYYMMDD=`date -u --date='today' +%Y%m%d`
+
+# Depending on time find last viable GFS initialisation time (and date), the same one
+# automation/edit_namelist.sh puts in the namelist
+if [ "$HH" -ge  3 ] && [ "$HH" -lt  9 ]
+then
+   HH="00"
+elif [ "$HH" -ge  9 ] && [ "$HH" -lt  15 ]
+then
+   HH="06"
+elif [ "$HH" -ge  15 ] && [ "$HH" -lt  21 ]
+then
+   HH="12"
+elif [ "$HH" -ge  21 ] && [ "$HH" -le  23 ]
+then
+   HH="18"
+elif [ "$HH" -lt  3 ]
+then
+   YYYY=`date -u --date='yesterday' +%Y`
+   MM=`date -u --date='yesterday' +%m`
+   DD=`date -u --date='yesterday' +%d`
+   YYYYMMDD=`date -u --date='yesterday' +%Y%m%d`
+   HH="18"
+fi
+
+#create directory for latest initialisation code
+mkdir -p ${YYYYMMDD}${HH}
+cd ${YYYYMMDD}${HH}
+
+#Forecast terms (hours) and model resolution (degrees)
+FORE_TERMS="000 "$( cat ${SWIFT_GFS}/controls/namelist | grep "fore:" | awk -F: '{print $2}' | tr ',' ' ')
+RESOL=0p50
+
+# variables selected from the forecast files if the variables needed for plotting cannot be worked
+# out from the namelist (see convert_GFS.sh)
+
+all_vars=$( grep "^all_vars=" ${SWIFT_GFS}/scripts/convert_GFS.sh | cut -d= -f2 )
+
+# download the GRIB2 file of one lead time, trying again every 5 minutes (up to 24 times) until
+# it is on the NCEP server (see python/gfs_download.py)
+
+download()
+{
+   python3 ${SWIFT_GFS}/python/gfs_download.py ${YYYYMMDD}${HH} $1
+}
+
+# convert the GRIB2 file of one lead time to netCDF (or write its manifest for grib_io.py) and link
+# it into the python directory. The analysis is written as convert_GFS.sh writes it, forecast lead
+# times are written to a file of their own (GFS_forecast_YYYYMMDD_HH_fXXX.nc), which the plotting
+# scripts read in place of the forecast file while the lead time is streamed.
+
+convert()
+{
+   file=gfs.t${HH}z.pgrb2.${RESOL}.f$1
+
+   if [ "$1" == "000" ]
+   then
+      out=analysis_gfs_4_${YYYYMMDD}_${HH}00_000
+   else
+      out=GFS_forecast_${YYYYMMDD}_${HH}_f$1
+   fi
+
+   if [ "${grib}" -eq "1" ]
+   then
+      python3 ${SWIFT_GFS}/python/grib_io.py ${YYYYMMDD}${HH} $1
+      ln -sf ${SWIFT_GFS}/GFS_NWP/${YYYYMMDD}${HH}/${out}.grib ${SWIFT_GFS}/python/.
+   else
+      cp ${file} ${file}.grb2
+      ncl_convert2nc ${file}.grb2
+      rm ${file}.grb2
+
+      if [ "$1" == "000" ]
+      then
+         mv ${file}.nc ${out}.nc
+      else
+         vars=$( python3 ${SWIFT_GFS}/python/conversion_vars.py $( cdo -s showname ${file}.nc ) )
+         if [ -z "${vars}" ]
+         then
+            vars=${all_vars}
+         fi
+
+         cdo select,name=${vars} ${file}.nc new_${file}.nc
+         cdo cat new_${file}.nc ${out}.nc
+         rm ${file}.nc new_${file}.nc
+      fi
+      ln -sf ${SWIFT_GFS}/GFS_NWP/${YYYYMMDD}${HH}/${out}.nc ${SWIFT_GFS}/python/.
+   fi
+}
+
+# plot one lead time of the initialisation time being streamed (given to plot.py in SWIFT_GFS_INIT)
+# for all the variables and regions in the namelist, in the background so the next lead time is
+# downloaded meanwhile (one lead time is plotted at a time)
+
+plot_pid=""
+
+for f in ${FORE_TERMS}
+do
+   download ${f}
+
+   if ! [ -f gfs.t${HH}z.pgrb2.${RESOL}.f${f} ]
+   then
+      echo "gfs.t${HH}z.pgrb2.${RESOL}.f${f} not available, lead time ${f} not plotted"
+      continue
+   fi
+
+   convert ${f}
+
+   if [ -n "${plot_pid}" ]
+   then
+      wait ${plot_pid}
+   fi
+
+   ( cd ${SWIFT_GFS}/python ; SWIFT_GFS_INIT=${YYYYMMDD}${HH} SWIFT_GFS_LEAD=${f} python3 plot.py 4 ) &
+   plot_pid=$!
+done
+
+wait
+
+# the lead times are put together into the files convert_GFS.sh writes, so the cycle can be plotted
+# again as a whole
+
+if [ "${grib}" -eq "1" ]
+then
+   python3 ${SWIFT_GFS}/python/grib_io.py ${YYYYMMDD}${HH}
+   rm -f GFS_forecast_${YYYYMMDD}_${HH}_f*.grib
+   ln -sf ${SWIFT_GFS}/GFS_NWP/${YYYYMMDD}${HH}/GFS_forecast_${YYYYMMDD}_${HH}.grib ${SWIFT_GFS}/python/.
+   ln -sf ${SWIFT_GFS}/GFS_NWP/${YYYYMMDD}${HH}/analysis_gfs_4_${YYYYMMDD}_${HH}00_000.grib ${SWIFT_GFS}/python/.
+else
+   cdo cat GFS_forecast_${YYYYMMDD}_${HH}_f*.nc GFS_forecast_${YYYYMMDD}_${HH}.nc
+   rm -f GFS_forecast_${YYYYMMDD}_${HH}_f*.nc gfs.t${HH}z.pgrb2.${RESOL}.f*
+   ln -sf ${SWIFT_GFS}/GFS_NWP/${YYYYMMDD}${HH}/GFS_forecast_${YYYYMMDD}_${HH}.nc ${SWIFT_GFS}/python/.
+fi
+
+find ${SWIFT_GFS}/python -maxdepth 1 -xtype l -name "GFS_forecast_${YYYYMMDD}_${HH}_f*" -exec unlink {} \;
@@ -1,28 +1,37 @@
 #!/bin/bash
+#
+# Script for extracting the forecast times in the namelist from the HAS tape orders downloaded by
+# get_GFS_archived_tape.sh. Each tar file is read once, several at a time (see
+# python/untar_tape.py).
+#
+# "convert" as an argument converts each initialisation time (with convert_GFS.sh) as soon as its
+# tar file has been extracted, while the others are still being extracted. Any other arguments
+# (e.g. "grib" or "regions") are passed on to convert_GFS.sh.
+#
+
+convert=0
+convert_args=""
+
+for arg in "$@"
+do
+   if [ "${arg}" == "convert" ]
+   then
+      convert=1
+   else
+      convert_args="${convert_args} ${arg}"
+   fi
+done
 
 FORE_TERMS="000 "$( cat ${SWIFT_GFS}/controls/namelist | grep "fore:" | awk -F: '{print $2}' | tr ',' ' ')
 
 dir=${SWIFT_GFS}/GFS_NWP
 
-for order in ${dir}/tape/*/
+SWIFT_GFS=${SWIFT_GFS} python3 ${SWIFT_GFS}/python/untar_tape.py ${dir} ${FORE_TERMS} | while read init_dt report
 do
-   order=$( basename ${order} )
-   cd ${dir}/tape/${order}
-   for fil in ${dir}/tape/${order}/*
-   do
-      fil=$( basename ${fil} )
-      YYYY=${fil:6:4}
-      MM=${fil:10:2}
-      DD=${fil:12:2}
-      HH=${fil:14:2}
-  
-      mkdir ${dir}/${YYYY}${MM}${DD}${HH}
+   echo "${init_dt} ${report}"
 
-      for fore in ${FORE_TERMS}
-      do
-         tar -xvf ${fil} gfs_4_${YYYY}${MM}${DD}_${HH}00_${fore}.grb2 
-         mv gfs_4_${YYYY}${MM}${DD}_${HH}00_${fore}.grb2 ${dir}/${YYYY}${MM}${DD}${HH}/gfs.t${HH}z.pgrb2.0p50.f${fore}
-      done
-   done
-   rm -rf ${dir}/tape/${order}
+   if [ "${convert}" -eq "1" ]
+   then
+      /bin/bash ${SWIFT_GFS}/scripts/convert_GFS.sh ${SWIFT_GFS} ${init_dt} ${convert_args}
+   fi
 done